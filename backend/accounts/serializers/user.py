@@ -163,12 +163,13 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'last_name',
             'full_name',
             'roles',
+            'station',
             'is_verified',
             'is_active',
             'created_at',
             'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'station', 'created_at', 'updated_at']
 
     def get_full_name(self, obj):
         return obj.get_full_name()
@@ -233,6 +234,7 @@ class UserDetailSerializer(serializers.ModelSerializer):
             'last_name',
             'full_name',
             'roles',
+            'station',
             'is_verified',
             'is_active',
             'created_at',
@@ -259,6 +261,7 @@ class UserUpdateSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'roles',
+            'station',
             'is_verified',
             'is_active'
         ]
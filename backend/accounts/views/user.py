@@ -21,6 +21,7 @@ from accounts.serializers import (
     ActionPermissionSerializer,
     ActionPermissionCreateUpdateSerializer,
 )
+from core.fieldsets import SparseFieldsetMixin
 from accounts.permissions import IsSystemAdmin
 
 
@@ -223,7 +224,7 @@ class ChangePasswordView(APIView):
         )
 
 
-class RoleViewSet(viewsets.ModelViewSet):
+class RoleViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     Role Management ViewSet
 
@@ -262,7 +263,7 @@ class RoleViewSet(viewsets.ModelViewSet):
         return super().destroy(request, *args, **kwargs)
 
 
-class ActionPermissionViewSet(viewsets.ModelViewSet):
+class ActionPermissionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     Action Permission CRUD ViewSet
 
@@ -277,7 +278,7 @@ class ActionPermissionViewSet(viewsets.ModelViewSet):
         return ActionPermissionSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     User Management ViewSet
 
@@ -0,0 +1,71 @@
+"""
+Canonical keys for `DocumentEvidence.document_attributes`.
+
+Keys are stored in snake_case (`ID_Number`, `idNumber` and `id-number` all become
+`id_number`) and known synonyms are folded onto one name, so `national_id` is the only
+spelling queries need to know about.
+
+Values keep the JSON type they were given, so a query value (always text) is also matched
+as the number, boolean or null it spells: see `attribute_value_candidates`.
+"""
+import json
+import math
+import re
+
+ATTRIBUTE_KEY_ALIASES = {
+    'id_number': 'national_id',
+    'id_no': 'national_id',
+    'national_code': 'national_id',
+    'national_id_number': 'national_id',
+    'passport_no': 'passport_number',
+    'license_no': 'license_number',
+    'licence_number': 'license_number',
+    'dob': 'date_of_birth',
+    'birth_date': 'date_of_birth',
+    'issued_on': 'issue_date',
+    'expires_on': 'expiry_date',
+    'expiration_date': 'expiry_date',
+}
+
+_CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_SEPARATORS = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_attribute_key(key):
+    text = _CAMEL_BOUNDARY.sub('_', str(key).strip())
+    text = _SEPARATORS.sub('_', text.lower()).strip('_')
+    return ATTRIBUTE_KEY_ALIASES.get(text, text)
+
+
+def _is_empty(value):
+    return value is None or value == ''
+
+
+def normalize_attributes(attributes):
+    """
+    Return a copy of `attributes` with canonical keys. When two spellings collapse onto
+    one key, a non-empty value wins over an empty one; otherwise the later one wins.
+    """
+    normalized = {}
+    for key, value in (attributes or {}).items():
+        canonical = normalize_attribute_key(key)
+        if not canonical:
+            continue
+        if _is_empty(value) and not _is_empty(normalized.get(canonical)):
+            continue
+        normalized[canonical] = value
+    return normalized
+
+
+def attribute_value_candidates(text):
+    """The stored values `text` stands for: the string itself and the JSON scalar it parses as."""
+    candidates = [text]
+    try:
+        parsed = json.loads(text)
+    except ValueError:
+        return candidates
+    if isinstance(parsed, float) and not math.isfinite(parsed):
+        return candidates
+    if parsed is None or isinstance(parsed, (bool, int, float)):
+        candidates.append(parsed)
+    return candidates
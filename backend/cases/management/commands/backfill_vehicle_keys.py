@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cases.models import VehicleEvidence
+from core.models import ChangeOp
+from core.services.changes import record_changes
+
+
+class Command(BaseCommand):
+    help = 'Fill normalized plate/VIN keys on existing vehicle evidence, in primary-key batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(
+                VehicleEvidence.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .only('pk', 'license_plate', 'vin_number', 'plate_key', 'plate_ocr_key', 'vin_key')[:batch_size]
+            )
+            if not batch:
+                break
+            for vehicle in batch:
+                vehicle.populate_derived_fields()
+            with transaction.atomic():
+                VehicleEvidence.objects.bulk_update(batch, ['plate_key', 'plate_ocr_key', 'vin_key'])
+                record_changes(VehicleEvidence, [vehicle.pk for vehicle in batch], ChangeOp.UPDATE,
+                               ['plate_key', 'plate_ocr_key', 'vin_key'])
+            updated += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f'- {updated} rows normalized (up to id {last_pk})')
+        self.stdout.write(self.style.SUCCESS(f'Completed! {updated} vehicle evidence rows normalized.'))
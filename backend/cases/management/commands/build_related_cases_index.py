@@ -0,0 +1,45 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from cases.services.related_cases import (
+    SNAPSHOT_CONSUMER, RelatedCaseIndex, case_documents, evidence_cases, index_path, iter_case_documents,
+)
+from core.services.changes import commit, head
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TF-IDF snapshot used by /cases/{id}/related/ (run periodically, e.g. nightly)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Snapshot path (default: settings.RELATED_CASES_INDEX_PATH)')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--benchmark', type=int, default=0, help='Time this many lookups after building')
+
+    def handle(self, *args, **options):
+        path = options['output'] or index_path()
+        started = time.perf_counter()
+        cursor = head()
+        index = RelatedCaseIndex.build(iter_case_documents(batch_size=options['batch_size']), cursor, evidence_cases())
+        index.save(path)
+        # Keeps `prune` from deleting the changes processes must replay on top of this snapshot.
+        commit(SNAPSHOT_CONSUMER, cursor)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Completed! {len(index)} cases, {len(index.rows)} postings written to {path} in {elapsed:.1f}s.'
+        ))
+
+        lookups = min(options['benchmark'], len(index))
+        if not lookups:
+            return
+        sample = [int(pk) for pk in np.random.default_rng(0).choice(index.ids, size=lookups, replace=False)]
+        documents = case_documents(sample)
+        timings = []
+        for pk in sample:
+            started = time.perf_counter()
+            index.related(pk, documents.get(pk, ''))
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f'- {lookups} lookups: median {np.median(timings):.2f} ms, p95 {np.percentile(timings, 95):.2f} ms'
+        )
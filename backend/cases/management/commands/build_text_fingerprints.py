@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from cases.models import Complaint, WitnessTestimony, TextFingerprint
+
+
+class Command(BaseCommand):
+    help = 'Build MinHash/LSH fingerprints for existing complaints and witness testimonies, in primary-key batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model, fields in (
+            (Complaint, ('pk', 'case', 'title', 'description')),
+            (WitnessTestimony, ('pk', 'case', 'testimony_text')),
+        ):
+            last_pk = 0
+            indexed = 0
+            while True:
+                batch = list(model.objects.filter(pk__gt=last_pk).order_by('pk').only(*fields)[:batch_size])
+                if not batch:
+                    break
+                TextFingerprint.objects.index(batch)
+                indexed += len(batch)
+                last_pk = batch[-1].pk
+                self.stdout.write(f'- {indexed} {model._meta.verbose_name_plural} indexed (up to id {last_pk})')
+            self.stdout.write(self.style.SUCCESS(
+                f'Completed! {indexed} {model._meta.verbose_name_plural} fingerprinted.'
+            ))
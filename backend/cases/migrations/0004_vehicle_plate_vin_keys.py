@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0003_case_bail_amount_case_fine_amount_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicleevidence',
+            name='plate_key',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='Normalized License Plate'),
+        ),
+        migrations.AddField(
+            model_name='vehicleevidence',
+            name='plate_ocr_key',
+            field=models.CharField(blank=True, editable=False, max_length=20, verbose_name='OCR-folded License Plate'),
+        ),
+        migrations.AddField(
+            model_name='vehicleevidence',
+            name='vin_key',
+            field=models.CharField(blank=True, editable=False, max_length=50, verbose_name='Normalized VIN'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicleevidence',
+            index=models.Index(fields=['plate_key'], name='vehicle_plate_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicleevidence',
+            index=models.Index(fields=['plate_ocr_key'], name='vehicle_plate_ocr_key_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='vehicleevidence',
+            index=models.Index(fields=['vin_key'], name='vehicle_vin_key_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:49
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.fields.json
+
+from cases.attributes import normalize_attributes
+
+
+def normalize_existing_attributes(apps, schema_editor):
+    DocumentEvidence = apps.get_model('cases', 'DocumentEvidence')
+    changed = []
+    for document in DocumentEvidence.objects.only('pk', 'document_attributes').iterator(chunk_size=1000):
+        attributes = normalize_attributes(document.document_attributes)
+        if attributes != document.document_attributes:
+            document.document_attributes = attributes
+            changed.append(document)
+        if len(changed) >= 1000:
+            DocumentEvidence.objects.bulk_update(changed, ['document_attributes'])
+            changed = []
+    if changed:
+        DocumentEvidence.objects.bulk_update(changed, ['document_attributes'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0004_vehicle_plate_vin_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_existing_attributes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='documentevidence',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['document_attributes'], name='document_attributes_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='documentevidence',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.fields.json.KeyTextTransform('national_id', 'document_attributes'), name='text_pattern_ops'), name='document_national_id_idx'),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:04
+
+import re
+
+from django.db import migrations
+
+from core.models.journal import journal_hash
+
+NOTE_SPLIT = re.compile(r'\n\n(?=(?:Approval note|Rejection note|Witness National IDs): )')
+NOTE_KINDS = (
+    ('Approval note: ', 'APPROVAL'),
+    ('Rejection note: ', 'REJECTION'),
+    ('Witness National IDs: ', 'WITNESSES'),
+)
+EVIDENCE_MODELS = ('witnesstestimony', 'biologicalevidence', 'vehicleevidence', 'documentevidence', 'otherevidence')
+
+
+def _note_entry(chunk):
+    for prefix, kind in NOTE_KINDS:
+        if chunk.startswith(prefix):
+            body = chunk if kind == 'WITNESSES' else chunk[len(prefix):]
+            return kind, body
+    return 'NOTE', chunk
+
+
+def split_text_blobs(apps, schema_editor):
+    """Move appended case notes and custody text into journal entries."""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    JournalEntry = apps.get_model('core', 'JournalEntry')
+    Case = apps.get_model('cases', 'Case')
+
+    case_type, _ = ContentType.objects.get_or_create(app_label='cases', model='case')
+    entries = []
+    for case in Case.objects.exclude(notes='').only('pk', 'notes', 'updated_at').iterator(chunk_size=500):
+        base, *appended = NOTE_SPLIT.split(case.notes)
+        if not appended:
+            continue
+        for chunk in appended:
+            kind, body = _note_entry(chunk)
+            entries.append(JournalEntry(
+                content_type_id=case_type.pk, object_id=case.pk,
+                kind=kind, body=body, created_at=case.updated_at,
+            ))
+        Case.objects.filter(pk=case.pk).update(notes=base)
+
+    for model_name in EVIDENCE_MODELS:
+        model = apps.get_model('cases', model_name)
+        content_type, _ = ContentType.objects.get_or_create(app_label='cases', model=model_name)
+        for evidence in model.objects.exclude(chain_of_custody='').only('pk', 'chain_of_custody', 'updated_at'):
+            previous = ''
+            for line in evidence.chain_of_custody.splitlines():
+                if not line.strip():
+                    continue
+                entry_hash = journal_hash(
+                    previous, content_type.pk, evidence.pk, None, evidence.updated_at, 'CUSTODY', line,
+                )
+                entries.append(JournalEntry(
+                    content_type_id=content_type.pk, object_id=evidence.pk,
+                    kind='CUSTODY', body=line, created_at=evidence.updated_at,
+                    prev_hash=previous, entry_hash=entry_hash,
+                ))
+                previous = entry_hash
+    JournalEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0005_document_attributes_index'),
+        ('core', '0008_journal_entry'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_text_blobs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='biologicalevidence',
+            name='chain_of_custody',
+        ),
+        migrations.RemoveField(
+            model_name='documentevidence',
+            name='chain_of_custody',
+        ),
+        migrations.RemoveField(
+            model_name='otherevidence',
+            name='chain_of_custody',
+        ),
+        migrations.RemoveField(
+            model_name='vehicleevidence',
+            name='chain_of_custody',
+        ),
+        migrations.RemoveField(
+            model_name='witnesstestimony',
+            name='chain_of_custody',
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0006_journal_from_text_blobs'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='biologicalevidence',
+            index=models.Index(fields=['case', '-collected_date', '-id'], name='cases_biolo_case_id_590b97_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(fields=['case', '-created_at', '-id'], name='cases_compl_case_id_2225e7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentevidence',
+            index=models.Index(fields=['case', '-collected_date', '-id'], name='cases_docum_case_id_52e7b5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='otherevidence',
+            index=models.Index(fields=['case', '-collected_date', '-id'], name='cases_other_case_id_13088a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicleevidence',
+            index=models.Index(fields=['case', '-collected_date', '-id'], name='cases_vehic_case_id_4dded6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='witnesstestimony',
+            index=models.Index(fields=['case', '-collected_date', '-id'], name='cases_witne_case_id_80f909_idx'),
+        ),
+    ]
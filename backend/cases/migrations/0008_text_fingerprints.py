@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:17
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('cases', '0007_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TextFingerprint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('signature', models.BinaryField(verbose_name='MinHash Signature')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('case', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='text_fingerprints', to='cases.case', verbose_name='Case')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Text Fingerprint',
+                'verbose_name_plural': 'Text Fingerprints',
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='LshBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField(verbose_name='Band Key')),
+                ('fingerprint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='buckets', to='cases.textfingerprint')),
+            ],
+            options={
+                'verbose_name': 'LSH Bucket',
+                'verbose_name_plural': 'LSH Buckets',
+                'indexes': [models.Index(fields=['key', 'fingerprint'], name='cases_lshbu_key_782af8_idx')],
+            },
+        ),
+    ]
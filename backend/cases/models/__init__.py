@@ -9,6 +9,7 @@ from .evidence import (
     EvidenceStatus,
     EvidenceType,
 )
+from .similarity import TextFingerprint, LshBucket
 __all__ = [
     'Case',
     'CasePriority',
@@ -22,4 +23,6 @@ __all__ = [
     'VehicleEvidence',
     'DocumentEvidence',
     'OtherEvidence',
+    'TextFingerprint',
+    'LshBucket',
 ]
@@ -2,7 +2,7 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from django.conf import settings
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedModel, JournalEntry, JournalKind, render_journal
 
 
 class CaseStatus(models.TextChoices):
@@ -20,7 +20,7 @@ class CasePriority(models.TextChoices):
     CRITICAL = 'CRITICAL', 'Critical'
 
 
-class Case(BaseModel):
+class Case(ChangeTrackedModel, BaseModel):
     case_number = models.CharField(
         max_length=50,
         unique=True,
@@ -120,18 +120,32 @@ class Case(BaseModel):
     def __str__(self):
         return f"{self.case_number} - {self.title}"
 
+    @staticmethod
+    def status_is_active(status):
+        return status in [CaseStatus.OPEN, CaseStatus.UNDER_INVESTIGATION]
+
+    @staticmethod
+    def count_days_open(status, created_at, solved_date, closed_date):
+        from django.utils import timezone
+        if status == CaseStatus.SOLVED and solved_date:
+            return (solved_date - created_at).days
+        elif status == CaseStatus.CLOSED and closed_date:
+            return (closed_date - created_at).days
+        return (timezone.now() - created_at).days
+
     @property
     def is_active(self):
-        return self.status in [CaseStatus.OPEN, CaseStatus.UNDER_INVESTIGATION]
+        return self.status_is_active(self.status)
+
+    @property
+    def notes_text(self):
+        """`notes` followed by the journal entries, as the single text blob notes used to be."""
+        entries = [entry for entry in JournalEntry.objects.entries(self) if entry.kind != JournalKind.CUSTODY]
+        return render_journal(self.notes, entries)
 
     @property
     def days_open(self):
-        from django.utils import timezone
-        if self.status == CaseStatus.SOLVED and self.solved_date:
-            return (self.solved_date - self.created_at).days
-        elif self.status == CaseStatus.CLOSED and self.closed_date:
-            return (self.closed_date - self.created_at).days
-        return (timezone.now() - self.created_at).days
+        return self.count_days_open(self.status, self.created_at, self.solved_date, self.closed_date)
 
     def save(self, *args, **kwargs):
         if not self.case_number:
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
 
 from core.models import BaseModel
 
@@ -52,17 +53,22 @@ class Complaint(BaseModel):
         blank=True,
         related_name='officer_reviewed_complaints'
     )
+    fingerprints = GenericRelation('cases.TextFingerprint')
 
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['complainant']),
+            models.Index(fields=['case', '-created_at', '-id']),
         ]
 
     def __str__(self):
         return f"Complaint #{self.id} - {self.title}"
 
+    def similarity_text(self):
+        return f"{self.title}\n{self.description}"
+
     @property
     def is_voided(self):
         return self.status == ComplaintStatus.VOIDED or self.rejection_count >= 3
@@ -1,11 +1,36 @@
 from django.db import models
 from django.core.validators import MinValueValidator, FileExtensionValidator
+from django.core.exceptions import ValidationError
 from django.conf import settings
-
-from core.models import BaseModel
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import transaction
+from django.db.models import F, Func, Value
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from core.models import BaseModel, ChangeOp, ChangeTrackedModel, JournalEntry, JournalKind, JournaledQuerySet
+from core.services.changes import record_changes
+from cases.attributes import normalize_attribute_key, normalize_attributes
+from cases.plates import normalize_plate, normalize_vin, ocr_fold
 from .case import Case
 
 
+class JSONBConcat(Func):
+    """`lhs || rhs` on jsonb: shallow merge, right-hand keys win."""
+    arg_joiner = ' || '
+    template = '(%(expressions)s)'
+    output_field = models.JSONField()
+
+
+class JSONBDeleteKey(Func):
+    """`lhs - key` on jsonb: drop one top-level key."""
+    arg_joiner = ' - '
+    template = '(%(expressions)s)'
+    output_field = models.JSONField()
+
+
 class EvidenceStatus(models.TextChoices):
     COLLECTED = 'COLLECTED', 'Collected'
     UNDER_ANALYSIS = 'UNDER_ANALYSIS', 'Under Analysis'
@@ -21,7 +46,7 @@ class EvidenceType(models.TextChoices):
     OTHER = 'OTHER', 'Other Evidence'
 
 
-class BaseEvidence(BaseModel):
+class BaseEvidence(ChangeTrackedModel, BaseModel):
     case = models.ForeignKey(
         Case,
         on_delete=models.CASCADE,
@@ -67,15 +92,13 @@ class BaseEvidence(BaseModel):
         default=EvidenceStatus.COLLECTED,
         verbose_name="Status"
     )
-    chain_of_custody = models.TextField(
-        blank=True,
-        verbose_name="Chain of Custody"
-    )
     notes = models.TextField(
         blank=True,
         verbose_name="Notes"
     )
 
+    objects = JournaledQuerySet.as_manager()
+
     class Meta:
         abstract = True
         ordering = ['-collected_date']
@@ -86,8 +109,18 @@ class BaseEvidence(BaseModel):
     def save(self, *args, **kwargs):
         if not self.evidence_number:
             self.evidence_number = self.generate_evidence_number()
+        self.populate_derived_fields()
         super().save(*args, **kwargs)
 
+    def populate_derived_fields(self):
+        """Fill columns computed from other fields. Called by save() and by bulk inserts."""
+
+    @property
+    def chain_of_custody(self):
+        """Custody journal entries rendered one per line, as the old text field held them."""
+        entries = JournalEntry.objects.entries(self)
+        return '\n'.join(entry.body for entry in entries if entry.kind == JournalKind.CUSTODY)
+
     @staticmethod
     def generate_evidence_number():
         from django.utils import timezone
@@ -96,6 +129,23 @@ class BaseEvidence(BaseModel):
         random_num = random.randint(1000, 9999)
         return f"EV-{year}-{random_num}"
 
+    @classmethod
+    def allocate_evidence_numbers(cls, count, max_rounds=20):
+        """Reserve `count` unused evidence numbers, checking collisions with one query per round."""
+        numbers = set()
+        for _ in range(max_rounds):
+            missing = count - len(numbers)
+            if missing <= 0:
+                break
+            candidates = {cls.generate_evidence_number() for _ in range(missing)} - numbers
+            taken = set(
+                cls.objects.filter(evidence_number__in=candidates).values_list('evidence_number', flat=True)
+            )
+            numbers |= candidates - taken
+        if len(numbers) < count:
+            raise ValidationError(f'Could not allocate {count} unique evidence numbers.')
+        return list(numbers)
+
 
 class WitnessTestimony(BaseEvidence):
     witness_name = models.CharField(
@@ -140,15 +190,22 @@ class WitnessTestimony(BaseEvidence):
         validators=[FileExtensionValidator(['mp4', 'avi', 'mov'])],
         verbose_name="Video Recording"
     )
+    fingerprints = GenericRelation('cases.TextFingerprint')
 
     class Meta:
         verbose_name = "Witness Testimony"
         verbose_name_plural = "Witness Testimonies"
         ordering = ['-testimony_date']
+        indexes = [
+            models.Index(fields=['case', '-collected_date', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.evidence_number} - {self.witness_name}"
 
+    def similarity_text(self):
+        return self.testimony_text
+
 
 class BiologicalEvidence(BaseEvidence):
     sample_type = models.CharField(
@@ -218,6 +275,9 @@ class BiologicalEvidence(BaseEvidence):
         verbose_name = "Biological Evidence"
         verbose_name_plural = "Biological Evidence"
         ordering = ['-collected_date']
+        indexes = [
+            models.Index(fields=['case', '-collected_date', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.evidence_number} - {self.sample_type}"
@@ -283,15 +343,48 @@ class VehicleEvidence(BaseEvidence):
         null=True,
         verbose_name="Vehicle Images"
     )
+    plate_key = models.CharField(
+        max_length=20,
+        blank=True,
+        editable=False,
+        verbose_name="Normalized License Plate"
+    )
+    plate_ocr_key = models.CharField(
+        max_length=20,
+        blank=True,
+        editable=False,
+        verbose_name="OCR-folded License Plate"
+    )
+    vin_key = models.CharField(
+        max_length=50,
+        blank=True,
+        editable=False,
+        verbose_name="Normalized VIN"
+    )
 
     class Meta:
         verbose_name = "Vehicle Evidence"
         verbose_name_plural = "Vehicle Evidence"
         ordering = ['-collected_date']
+        indexes = [
+            models.Index(fields=['plate_key'], name='vehicle_plate_key_idx'),
+            models.Index(
+                fields=['plate_ocr_key'],
+                name='vehicle_plate_ocr_key_idx',
+                opclasses=['varchar_pattern_ops'],
+            ),
+            models.Index(fields=['vin_key'], name='vehicle_vin_key_idx'),
+            models.Index(fields=['case', '-collected_date', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.evidence_number} - {self.vehicle_type}"
 
+    def populate_derived_fields(self):
+        self.plate_key = normalize_plate(self.license_plate)
+        self.plate_ocr_key = ocr_fold(self.plate_key)
+        self.vin_key = normalize_vin(self.vin_number)
+
     def clean(self):
         from django.core.exceptions import ValidationError
         has_plate = bool(self.license_plate and self.license_plate.strip())
@@ -389,10 +482,16 @@ class DocumentEvidence(BaseEvidence):
         verbose_name_plural = "Document Evidence"
         ordering = ['-collected_date']
         indexes = [
+            models.Index(fields=['case', '-collected_date', '-id']),
             models.Index(fields=['document_type']),
             models.Index(fields=['is_identification_document']),
             models.Index(fields=['owner_full_name']),
             models.Index(fields=['is_authenticated']),
+            GinIndex(fields=['document_attributes'], name='document_attributes_gin'),
+            models.Index(
+                OpClass(KeyTextTransform('national_id', 'document_attributes'), name='text_pattern_ops'),
+                name='document_national_id_idx',
+            ),
         ]
 
     def __str__(self):
@@ -400,25 +499,43 @@ class DocumentEvidence(BaseEvidence):
             return f"{self.evidence_number} - {self.document_type} ({self.owner_full_name})"
         return f"{self.evidence_number} - {self.document_type}"
 
+    def populate_derived_fields(self):
+        self.document_attributes = normalize_attributes(self.document_attributes)
+
+    def _apply_attributes_change(self, expression):
+        """Apply a jsonb expression to the stored attributes in one UPDATE and reload them."""
+        with transaction.atomic():
+            type(self).objects.filter(pk=self.pk).update(
+                document_attributes=expression,
+                updated_at=timezone.now(),
+            )
+            record_changes(type(self), [self.pk], ChangeOp.UPDATE, ['document_attributes'])
+        self.refresh_from_db(fields=['document_attributes', 'updated_at'])
+
     def add_attribute(self, key, value):
-        if not self.document_attributes:
-            self.document_attributes = {}
-        self.document_attributes[key] = value
-        self.save()
+        self.update_attributes({key: value})
 
     def remove_attribute(self, key):
-        if self.document_attributes and key in self.document_attributes:
-            del self.document_attributes[key]
-            self.save()
+        key = normalize_attribute_key(key)
+        if self.pk is None:
+            self.get_all_attributes().pop(key, None)
+            return
+        self._apply_attributes_change(
+            JSONBDeleteKey(F('document_attributes'), Cast(Value(key), models.TextField()))
+        )
 
     def get_attribute(self, key, default=None):
-        return self.document_attributes.get(key, default) if self.document_attributes else default
+        return self.get_all_attributes().get(normalize_attribute_key(key), default)
 
     def update_attributes(self, attributes_dict):
-        if not self.document_attributes:
-            self.document_attributes = {}
-        self.document_attributes.update(attributes_dict)
-        self.save()
+        attributes = normalize_attributes(attributes_dict)
+        if self.pk is None:
+            self.document_attributes = {**self.get_all_attributes(), **attributes}
+            self.save()
+            return
+        self._apply_attributes_change(
+            JSONBConcat(F('document_attributes'), Cast(Value(attributes, models.JSONField()), models.JSONField()))
+        )
 
     def get_all_attributes(self):
         return self.document_attributes or {}
@@ -520,6 +637,9 @@ class OtherEvidence(BaseEvidence):
         verbose_name = "Other Evidence"
         verbose_name_plural = "Other Evidence"
         ordering = ['-collected_date']
+        indexes = [
+            models.Index(fields=['case', '-collected_date', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.evidence_number} - {self.item_name}"
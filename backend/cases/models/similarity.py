@@ -0,0 +1,137 @@
+from collections import Counter
+
+import numpy as np
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, transaction
+
+from cases.similarity import minhash, band_keys, is_empty, estimated_similarity, decode_signature
+
+DEFAULT_MIN_SIMILARITY = 0.5
+MAX_LSH_CANDIDATES = 500
+
+
+class TextFingerprintManager(models.Manager):
+    def index(self, objects):
+        """
+        (Re)index objects exposing `similarity_text()`: one fingerprint per object plus one
+        bucket row per LSH band, written with bulk inserts.
+        """
+        objects = [obj for obj in objects if obj.pk]
+        if not objects:
+            return []
+        fingerprints = []
+        for obj in objects:
+            signature = minhash(obj.similarity_text())
+            if is_empty(signature):
+                continue
+            fingerprints.append(self.model(
+                content_type=ContentType.objects.get_for_model(obj),
+                object_id=obj.pk,
+                case_id=obj.case_id,
+                signature=signature.tobytes(),
+            ))
+        with transaction.atomic():
+            for model, ids in _ids_by_model(objects).items():
+                self.filter(content_type=ContentType.objects.get_for_model(model), object_id__in=ids).delete()
+            created = self.bulk_create(fingerprints)
+            LshBucket.objects.bulk_create([
+                LshBucket(fingerprint=fingerprint, key=key)
+                for fingerprint in created
+                for key in band_keys(decode_signature(fingerprint.signature))
+            ])
+        return created
+
+    def similar_to(self, obj, min_similarity=DEFAULT_MIN_SIMILARITY, limit=20):
+        """
+        Indexed texts similar to `obj`, as [(fingerprint, similarity)] best first. Candidates
+        come from the LSH buckets only; their signatures are then compared to estimate Jaccard.
+        """
+        fingerprint = self.filter(
+            content_type=ContentType.objects.get_for_model(obj), object_id=obj.pk
+        ).first()
+        if fingerprint is None:
+            return []
+        keys = list(fingerprint.buckets.values_list('key', flat=True))
+        collisions = Counter(
+            LshBucket.objects.filter(key__in=keys)
+            .exclude(fingerprint=fingerprint)
+            .values_list('fingerprint_id', flat=True)
+        )
+        candidate_ids = [pk for pk, _ in collisions.most_common(MAX_LSH_CANDIDATES)]
+        candidates = list(self.filter(pk__in=candidate_ids))
+        if not candidates:
+            return []
+        scores = estimated_similarity(
+            decode_signature(fingerprint.signature),
+            np.stack([decode_signature(candidate.signature) for candidate in candidates]),
+        )
+        ranked = sorted(
+            (
+                (candidate, float(score))
+                for candidate, score in zip(candidates, scores)
+                if score >= min_similarity
+            ),
+            key=lambda pair: (-pair[1], pair[0].pk),
+        )
+        return ranked[:limit]
+
+
+def _ids_by_model(objects):
+    grouped = {}
+    for obj in objects:
+        grouped.setdefault(type(obj), []).append(obj.pk)
+    return grouped
+
+
+class TextFingerprint(models.Model):
+    """
+    MinHash signature of a complaint or witness testimony text, used to find near-duplicates
+    across cases (see cases.similarity).
+    """
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveIntegerField()
+    source = GenericForeignKey('content_type', 'object_id')
+    case = models.ForeignKey(
+        'Case',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='text_fingerprints',
+        verbose_name="Case"
+    )
+    signature = models.BinaryField(verbose_name="MinHash Signature")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+
+    objects = TextFingerprintManager()
+
+    class Meta:
+        verbose_name = "Text Fingerprint"
+        verbose_name_plural = "Text Fingerprints"
+        unique_together = [['content_type', 'object_id']]
+
+    def __str__(self):
+        return f"Fingerprint of {self.content_type_id}:{self.object_id}"
+
+
+class LshBucket(models.Model):
+    fingerprint = models.ForeignKey(
+        TextFingerprint,
+        on_delete=models.CASCADE,
+        related_name='buckets'
+    )
+    key = models.BigIntegerField(verbose_name="Band Key")
+
+    class Meta:
+        verbose_name = "LSH Bucket"
+        verbose_name_plural = "LSH Buckets"
+        indexes = [
+            models.Index(fields=['key', 'fingerprint']),
+        ]
+
+    def __str__(self):
+        return f"{self.key} -> {self.fingerprint_id}"
@@ -0,0 +1,61 @@
+"""
+License plate and VIN normalization.
+
+`plate_key` is the plate with Persian/Arabic-Indic digits mapped to ASCII, upper-cased and
+stripped of spaces, dashes and other separators. `plate_ocr_key` additionally folds
+characters that plate readers commonly confuse (0/O/D/Q, 1/I/L, 2/Z, 5/S, 8/B, 6/G) onto
+one representative, so an exact match on it is a fuzzy match on the plate.
+"""
+import re
+import unicodedata
+
+DIGIT_TRANSLATION = str.maketrans(
+    '۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩',
+    '01234567890123456789',
+)
+
+OCR_TRANSLATION = str.maketrans({
+    'O': '0', 'D': '0', 'Q': '0',
+    'I': '1', 'L': '1',
+    'Z': '2',
+    'S': '5',
+    'B': '8',
+    'G': '6',
+})
+
+VIN_TRANSLATION = str.maketrans({'I': '1', 'O': '0', 'Q': '0'})
+
+WILDCARDS = {'*': '.*', '?': '.'}
+
+
+def _compact(value, keep=''):
+    text = unicodedata.normalize('NFKC', str(value or '')).translate(DIGIT_TRANSLATION).upper()
+    return ''.join(ch for ch in text if ch.isalnum() or ch in keep)
+
+
+def normalize_plate(value):
+    return _compact(value)
+
+
+def ocr_fold(plate_key):
+    return plate_key.translate(OCR_TRANSLATION)
+
+
+def normalize_vin(value):
+    """VINs never contain I, O or Q, so those are read as 1, 0, 0."""
+    return _compact(value).translate(VIN_TRANSLATION)
+
+
+def has_wildcards(query):
+    return any(ch in query for ch in WILDCARDS)
+
+
+def plate_pattern(query):
+    """
+    Turn a partial plate such as `12?34*` into (literal prefix, regex) over `plate_ocr_key`.
+    `*` matches any run of characters, `?` exactly one.
+    """
+    folded = ocr_fold(_compact(query, keep=''.join(WILDCARDS)))
+    prefix = re.split(r'[*?]', folded, maxsplit=1)[0]
+    regex = ''.join(WILDCARDS.get(ch, re.escape(ch)) for ch in folded)
+    return prefix, f'^{regex}$'
@@ -2,7 +2,8 @@ from django.utils import timezone
 from rest_framework import serializers
 
 from cases.models import Case
-from core.models import UserProfile
+from core.models import UserProfile, JournalEntry, JournalKind
+from core.fieldsets import full_name
 
 
 class CaseCreateFromSceneSerializer(serializers.ModelSerializer):
@@ -38,9 +39,14 @@ class CaseCreateFromSceneSerializer(serializers.ModelSerializer):
         case = super().create(validated_data)
 
         if witness_national_ids or witness_phones:
-            case.notes += f"\n\nWitness National IDs: {', '.join(witness_national_ids)}"
-            case.notes += f"\nWitness Phones: {', '.join(witness_phones)}"
-            case.save()
+            request = self.context.get('request')
+            JournalEntry.objects.append(
+                case,
+                JournalKind.WITNESSES,
+                f"Witness National IDs: {', '.join(witness_national_ids)}\n"
+                f"Witness Phones: {', '.join(witness_phones)}",
+                author=request.user if request else None,
+            )
 
         return case
 
@@ -61,6 +67,11 @@ class CaseListSerializer(serializers.ModelSerializer):
             'incident_date', 'incident_location', 'assigned_detective',
             'detective_name', 'days_open', 'is_active', 'created_at'
         ]
+        projection = {
+            'detective_name': (('assigned_detective__first_name', 'assigned_detective__last_name'), full_name),
+            'days_open': (('status', 'created_at', 'solved_date', 'closed_date'), Case.count_days_open),
+            'is_active': (('status',), Case.status_is_active),
+        }
 
 
 from .complaint import ComplaintSerializer
@@ -75,6 +86,7 @@ class CaseDetailSerializer(serializers.ModelSerializer):
     days_open = serializers.IntegerField(read_only=True)
     is_active = serializers.BooleanField(read_only=True)
     complaints = ComplaintSerializer(many=True, read_only=True)
+    notes = serializers.CharField(source='notes_text', read_only=True)
 
     class Meta:
         model = Case
@@ -1,7 +1,7 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from cases.models import Complaint, Case
+from cases.models import Complaint, Case, TextFingerprint
 from cases.models.complaint import ComplaintStatus
 from cases.models.case import CaseStatus
 
@@ -33,7 +33,9 @@ class ComplaintCreateSerializer(serializers.ModelSerializer):
         validated_data['complainant'] = self.context['request'].user
         validated_data['status'] = ComplaintStatus.PENDING_CADET
         validated_data['case'] = case
-        return super().create(validated_data)
+        complaint = super().create(validated_data)
+        TextFingerprint.objects.index([complaint])
+        return complaint
 
 
 class ComplaintSerializer(serializers.ModelSerializer):
@@ -124,4 +126,5 @@ class ComplaintUpdateSerializer(serializers.ModelSerializer):
         instance = super().update(instance, validated_data)
         instance.status = ComplaintStatus.PENDING_CADET
         instance.save(update_fields=['status'])
+        TextFingerprint.objects.index([instance])
         return instance
\ No newline at end of file
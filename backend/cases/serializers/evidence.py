@@ -10,6 +10,7 @@ from cases.models import (
     OtherEvidence,
     EvidenceStatus,
     EvidenceType,
+    TextFingerprint,
 )
 from core.models import UserProfile
 
@@ -22,7 +23,45 @@ def base_evidence_fields():
     ]
 
 
-class WitnessTestimonyCreateSerializer(serializers.ModelSerializer):
+class CustodyReadOnlyMixin:
+    """The chain of custody is the evidence's CUSTODY journal; entries go through /custody/."""
+
+    def validate(self, attrs):
+        if 'chain_of_custody' in self.initial_data:
+            raise serializers.ValidationError({
+                'chain_of_custody': 'Read-only: append custody entries with POST to the custody endpoint.'
+            })
+        return super().validate(attrs)
+
+
+class BaseEvidenceCreateSerializer(serializers.ModelSerializer):
+    """Shared create path for evidence registered under a case (`context['case']`)."""
+    evidence_type = None
+
+    def get_default_title(self, validated_data):
+        return ''
+
+    def get_evidence_data(self, validated_data):
+        data = dict(validated_data)
+        data.setdefault('title', self.get_default_title(data)[:255])
+        data['case'] = self.context['case']
+        data['collected_by'] = self.context['request'].user
+        data['collected_date'] = timezone.now()
+        data['evidence_type'] = self.evidence_type
+        data['status'] = EvidenceStatus.COLLECTED
+        return data
+
+    def build_instance(self):
+        """Unsaved instance from validated data, for callers that bulk-insert."""
+        return self.Meta.model(**self.get_evidence_data(self.validated_data))
+
+    def create(self, validated_data):
+        return super().create(self.get_evidence_data(validated_data))
+
+
+class WitnessTestimonyCreateSerializer(BaseEvidenceCreateSerializer):
+    evidence_type = EvidenceType.WITNESS
+
     class Meta:
         model = WitnessTestimony
         fields = [
@@ -41,19 +80,16 @@ class WitnessTestimonyCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Collection date cannot be in the future.')
         return value
 
+    def get_default_title(self, validated_data):
+        return validated_data.get('witness_name', '')
+
     def create(self, validated_data):
-        case = self.context['case']
-        user = self.context['request'].user
-        validated_data.setdefault('title', validated_data.get('witness_name', '')[:255])
-        validated_data['case'] = case
-        validated_data['collected_by'] = user
-        validated_data['collected_date'] = timezone.now()
-        validated_data['evidence_type'] = EvidenceType.WITNESS
-        validated_data['status'] = EvidenceStatus.COLLECTED
-        return super().create(validated_data)
-
-
-class WitnessTestimonySerializer(serializers.ModelSerializer):
+        testimony = super().create(validated_data)
+        TextFingerprint.objects.index([testimony])
+        return testimony
+
+
+class WitnessTestimonySerializer(CustodyReadOnlyMixin, serializers.ModelSerializer):
     collected_by_name = serializers.CharField(source='collected_by.get_full_name', read_only=True, allow_null=True)
 
     class Meta:
@@ -66,7 +102,9 @@ class WitnessTestimonySerializer(serializers.ModelSerializer):
         read_only_fields = ['evidence_number', 'evidence_type', 'collected_by', 'collected_date']
 
 
-class BiologicalEvidenceCreateSerializer(serializers.ModelSerializer):
+class BiologicalEvidenceCreateSerializer(BaseEvidenceCreateSerializer):
+    evidence_type = EvidenceType.BIOLOGICAL
+
     class Meta:
         model = BiologicalEvidence
         fields = [
@@ -75,19 +113,11 @@ class BiologicalEvidenceCreateSerializer(serializers.ModelSerializer):
             'match_found', 'match_details', 'image', 'notes',
         ]
 
-    def create(self, validated_data):
-        case = self.context['case']
-        user = self.context['request'].user
-        validated_data.setdefault('title', validated_data.get('sample_type', '')[:255])
-        validated_data['case'] = case
-        validated_data['collected_by'] = user
-        validated_data['collected_date'] = timezone.now()
-        validated_data['evidence_type'] = EvidenceType.BIOLOGICAL
-        validated_data['status'] = EvidenceStatus.COLLECTED
-        return super().create(validated_data)
-
-
-class BiologicalEvidenceSerializer(serializers.ModelSerializer):
+    def get_default_title(self, validated_data):
+        return validated_data.get('sample_type', '')
+
+
+class BiologicalEvidenceSerializer(CustodyReadOnlyMixin, serializers.ModelSerializer):
     collected_by_name = serializers.CharField(source='collected_by.get_full_name', read_only=True, allow_null=True)
     coroner_approved_by_name = serializers.CharField(source='coroner_approved_by.get_full_name', read_only=True, allow_null=True)
 
@@ -107,7 +137,9 @@ class CoronerApprovalSerializer(serializers.Serializer):
     follow_up_result = serializers.CharField(required=False, allow_blank=True)
 
 
-class VehicleEvidenceCreateSerializer(serializers.ModelSerializer):
+class VehicleEvidenceCreateSerializer(BaseEvidenceCreateSerializer):
+    evidence_type = EvidenceType.VEHICLE
+
     class Meta:
         model = VehicleEvidence
         fields = [
@@ -125,19 +157,11 @@ class VehicleEvidenceCreateSerializer(serializers.ModelSerializer):
             )
         return data
 
-    def create(self, validated_data):
-        case = self.context['case']
-        user = self.context['request'].user
-        validated_data.setdefault('title', (validated_data.get('model') or validated_data.get('vehicle_type', ''))[:255])
-        validated_data['case'] = case
-        validated_data['collected_by'] = user
-        validated_data['collected_date'] = timezone.now()
-        validated_data['evidence_type'] = EvidenceType.VEHICLE
-        validated_data['status'] = EvidenceStatus.COLLECTED
-        return super().create(validated_data)
-
-
-class VehicleEvidenceSerializer(serializers.ModelSerializer):
+    def get_default_title(self, validated_data):
+        return validated_data.get('model') or validated_data.get('vehicle_type', '')
+
+
+class VehicleEvidenceSerializer(CustodyReadOnlyMixin, serializers.ModelSerializer):
     collected_by_name = serializers.CharField(source='collected_by.get_full_name', read_only=True, allow_null=True)
 
     class Meta:
@@ -150,7 +174,9 @@ class VehicleEvidenceSerializer(serializers.ModelSerializer):
         read_only_fields = ['evidence_number', 'evidence_type', 'collected_by', 'collected_date']
 
 
-class DocumentEvidenceCreateSerializer(serializers.ModelSerializer):
+class DocumentEvidenceCreateSerializer(BaseEvidenceCreateSerializer):
+    evidence_type = EvidenceType.DOCUMENT
+
     document_attributes = serializers.JSONField(required=False, default=dict)
 
     class Meta:
@@ -162,19 +188,11 @@ class DocumentEvidenceCreateSerializer(serializers.ModelSerializer):
             'is_identification_document', 'notes',
         ]
 
-    def create(self, validated_data):
-        case = self.context['case']
-        user = self.context['request'].user
-        validated_data.setdefault('title', (validated_data.get('document_type') or 'Document')[:255])
-        validated_data['case'] = case
-        validated_data['collected_by'] = user
-        validated_data['collected_date'] = timezone.now()
-        validated_data['evidence_type'] = EvidenceType.DOCUMENT
-        validated_data['status'] = EvidenceStatus.COLLECTED
-        return super().create(validated_data)
-
-
-class DocumentEvidenceSerializer(serializers.ModelSerializer):
+    def get_default_title(self, validated_data):
+        return validated_data.get('document_type') or 'Document'
+
+
+class DocumentEvidenceSerializer(CustodyReadOnlyMixin, serializers.ModelSerializer):
     collected_by_name = serializers.CharField(source='collected_by.get_full_name', read_only=True, allow_null=True)
 
     class Meta:
@@ -188,7 +206,9 @@ class DocumentEvidenceSerializer(serializers.ModelSerializer):
         read_only_fields = ['evidence_number', 'evidence_type', 'collected_by', 'collected_date']
 
 
-class OtherEvidenceCreateSerializer(serializers.ModelSerializer):
+class OtherEvidenceCreateSerializer(BaseEvidenceCreateSerializer):
+    evidence_type = EvidenceType.OTHER
+
     class Meta:
         model = OtherEvidence
         fields = [
@@ -197,19 +217,11 @@ class OtherEvidenceCreateSerializer(serializers.ModelSerializer):
             'material', 'serial_number', 'image', 'additional_files', 'notes',
         ]
 
-    def create(self, validated_data):
-        case = self.context['case']
-        user = self.context['request'].user
-        validated_data.setdefault('title', (validated_data.get('item_name') or 'Other item')[:255])
-        validated_data['case'] = case
-        validated_data['collected_by'] = user
-        validated_data['collected_date'] = timezone.now()
-        validated_data['evidence_type'] = EvidenceType.OTHER
-        validated_data['status'] = EvidenceStatus.COLLECTED
-        return super().create(validated_data)
-
-
-class OtherEvidenceSerializer(serializers.ModelSerializer):
+    def get_default_title(self, validated_data):
+        return validated_data.get('item_name') or 'Other item'
+
+
+class OtherEvidenceSerializer(CustodyReadOnlyMixin, serializers.ModelSerializer):
     collected_by_name = serializers.CharField(source='collected_by.get_full_name', read_only=True, allow_null=True)
 
     class Meta:
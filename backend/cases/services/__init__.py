@@ -0,0 +1,51 @@
+from .bulk_import import (
+    ManifestError,
+    parse_manifest,
+    open_media_archive,
+    validate_rows,
+    bulk_create_evidence,
+)
+from .duplicates import (
+    DEFAULT_DUPLICATES_LIMIT,
+    MAX_DUPLICATES_LIMIT,
+    find_similar,
+)
+from .related_cases import (
+    DEFAULT_RELATED_LIMIT,
+    MAX_RELATED_LIMIT,
+    LiveRelatedCaseIndex,
+    RelatedCaseIndex,
+    get_related_index,
+    reset_related_index,
+    related_cases,
+)
+from .timeline import (
+    TimelineCursorError,
+    case_timeline,
+    encode_cursor,
+    decode_cursor,
+)
+from .visibility import visible_cases
+
+__all__ = [
+    'ManifestError',
+    'parse_manifest',
+    'open_media_archive',
+    'validate_rows',
+    'bulk_create_evidence',
+    'DEFAULT_DUPLICATES_LIMIT',
+    'MAX_DUPLICATES_LIMIT',
+    'find_similar',
+    'DEFAULT_RELATED_LIMIT',
+    'MAX_RELATED_LIMIT',
+    'LiveRelatedCaseIndex',
+    'RelatedCaseIndex',
+    'get_related_index',
+    'reset_related_index',
+    'related_cases',
+    'TimelineCursorError',
+    'case_timeline',
+    'encode_cursor',
+    'decode_cursor',
+    'visible_cases',
+]
@@ -0,0 +1,190 @@
+"""
+Bulk crime-scene evidence import.
+
+A manifest (CSV or JSONL) lists evidence items of mixed types for one case; every row
+names its type in `evidence_type`. File fields may reference members of an optional zip
+of media. All rows are validated with the regular create serializers before anything is
+written; the insert is then one `bulk_create` per evidence model inside one transaction.
+"""
+import csv
+import io
+import json
+import os
+import zipfile
+from collections import defaultdict
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+
+from cases.models import EvidenceType, TextFingerprint
+from core.models import ChangeOp
+from core.services.changes import record_changes
+from cases.serializers.evidence import (
+    WitnessTestimonyCreateSerializer,
+    BiologicalEvidenceCreateSerializer,
+    VehicleEvidenceCreateSerializer,
+    DocumentEvidenceCreateSerializer,
+    OtherEvidenceCreateSerializer,
+)
+
+MAX_MANIFEST_ROWS = 5000
+
+CREATE_SERIALIZERS = {
+    EvidenceType.WITNESS: WitnessTestimonyCreateSerializer,
+    EvidenceType.BIOLOGICAL: BiologicalEvidenceCreateSerializer,
+    EvidenceType.VEHICLE: VehicleEvidenceCreateSerializer,
+    EvidenceType.DOCUMENT: DocumentEvidenceCreateSerializer,
+    EvidenceType.OTHER: OtherEvidenceCreateSerializer,
+}
+
+JSON_COLUMNS = ('document_attributes', 'additional_images')
+
+
+class ManifestError(Exception):
+    pass
+
+
+def _detect_format(upload, requested_format):
+    if requested_format:
+        return requested_format.lower()
+    name = (getattr(upload, 'name', '') or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return 'csv'
+
+
+def _csv_rows(text):
+    rows = []
+    for raw in csv.DictReader(io.StringIO(text)):
+        row = {}
+        for key, value in raw.items():
+            if key is None or value is None or value == '':
+                continue
+            key = key.strip()
+            if key in JSON_COLUMNS:
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            row[key] = value
+        rows.append(row)
+    return rows
+
+
+def _jsonl_rows(text):
+    rows = []
+    for line_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise ManifestError(f'Line {line_number} is not valid JSON.')
+        if not isinstance(row, dict):
+            raise ManifestError(f'Line {line_number} must be a JSON object.')
+        rows.append(row)
+    return rows
+
+
+def parse_manifest(upload, requested_format=None):
+    """Return the manifest rows as a list of dicts."""
+    manifest_format = _detect_format(upload, requested_format)
+    try:
+        text = upload.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ManifestError('Manifest must be UTF-8 encoded.')
+    if manifest_format == 'csv':
+        rows = _csv_rows(text)
+    elif manifest_format in ('jsonl', 'ndjson'):
+        rows = _jsonl_rows(text)
+    else:
+        raise ManifestError('Manifest format must be csv or jsonl.')
+    if not rows:
+        raise ManifestError('Manifest is empty.')
+    if len(rows) > MAX_MANIFEST_ROWS:
+        raise ManifestError(f'Manifest may contain at most {MAX_MANIFEST_ROWS} rows.')
+    return rows
+
+
+def _file_fields(serializer_class):
+    model = serializer_class.Meta.model
+    return [
+        field.name for field in model._meta.fields
+        if field.name in serializer_class.Meta.fields and field.get_internal_type() in ('FileField', 'ImageField')
+    ]
+
+
+def _attach_media(row, serializer_class, media):
+    """Replace file-field references in a row by the matching zip members."""
+    errors = {}
+    for field_name in _file_fields(serializer_class):
+        reference = row.get(field_name)
+        if not reference:
+            continue
+        if media is None:
+            errors[field_name] = [f'"{reference}" refers to media but no media archive was uploaded.']
+            continue
+        try:
+            content = media.read(reference)
+        except KeyError:
+            errors[field_name] = [f'"{reference}" is not in the media archive.']
+            continue
+        row[field_name] = SimpleUploadedFile(os.path.basename(reference), content)
+    return errors
+
+
+def open_media_archive(upload):
+    if upload is None:
+        return None
+    try:
+        return zipfile.ZipFile(upload)
+    except zipfile.BadZipFile:
+        raise ManifestError('Media must be a zip archive.')
+
+
+def validate_rows(case, rows, request, media=None):
+    """Validate every row; return (serializers, errors). Nothing is written."""
+    validated = []
+    errors = []
+    context = {'request': request, 'case': case}
+    for row_number, raw in enumerate(rows, start=1):
+        row = dict(raw)
+        evidence_type = str(row.pop('evidence_type', '')).strip().upper()
+        serializer_class = CREATE_SERIALIZERS.get(evidence_type)
+        if serializer_class is None:
+            errors.append({
+                'row': row_number,
+                'errors': {'evidence_type': [f'Must be one of: {", ".join(CREATE_SERIALIZERS)}.']},
+            })
+            continue
+        media_errors = _attach_media(row, serializer_class, media)
+        serializer = serializer_class(data=row, context=context)
+        if not serializer.is_valid() or media_errors:
+            errors.append({
+                'row': row_number,
+                'evidence_type': evidence_type,
+                'errors': {**serializer.errors, **media_errors},
+            })
+            continue
+        validated.append(serializer)
+    return validated, errors
+
+
+def bulk_create_evidence(serializers):
+    """Insert validated rows with one `bulk_create` per evidence model; return created instances by type."""
+    instances_by_model = defaultdict(list)
+    for serializer in serializers:
+        instance = serializer.build_instance()
+        instance.populate_derived_fields()
+        instances_by_model[type(instance)].append(instance)
+
+    created = {}
+    with transaction.atomic():
+        for model, instances in instances_by_model.items():
+            numbers = model.allocate_evidence_numbers(len(instances))
+            for instance, number in zip(instances, numbers):
+                instance.evidence_number = number
+            created[instances[0].evidence_type] = model.objects.bulk_create(instances)
+            record_changes(model, [instance.pk for instance in instances], ChangeOp.INSERT)
+        TextFingerprint.objects.index(created.get(EvidenceType.WITNESS, []))
+    return created
@@ -0,0 +1,58 @@
+"""
+Possible duplicates of a complaint or witness testimony.
+
+Candidates come from the LSH index (`TextFingerprint.objects.similar_to`), so a lookup
+reads only the texts sharing a band key with the source instead of the whole corpus. The
+matches are then described with one values() query per source model.
+"""
+from django.contrib.contenttypes.models import ContentType
+
+from cases.models import Complaint, WitnessTestimony, TextFingerprint
+from cases.models.similarity import DEFAULT_MIN_SIMILARITY
+
+DEFAULT_DUPLICATES_LIMIT = 20
+MAX_DUPLICATES_LIMIT = 100
+EXCERPT_LENGTH = 200
+
+
+def _excerpt(text):
+    text = ' '.join((text or '').split())
+    return text if len(text) <= EXCERPT_LENGTH else text[:EXCERPT_LENGTH - 3] + '...'
+
+
+SOURCES = {
+    Complaint: (
+        'complaint',
+        ('id', 'case_id', 'title', 'status', 'description'),
+        lambda row: {'title': row['title'], 'status': row['status'], 'excerpt': _excerpt(row['description'])},
+    ),
+    WitnessTestimony: (
+        'witness_testimony',
+        ('id', 'case_id', 'evidence_number', 'witness_name', 'testimony_text'),
+        lambda row: {
+            'title': f"{row['evidence_number']} {row['witness_name']}".strip(),
+            'excerpt': _excerpt(row['testimony_text']),
+        },
+    ),
+}
+
+
+def find_similar(obj, min_similarity=DEFAULT_MIN_SIMILARITY, limit=DEFAULT_DUPLICATES_LIMIT):
+    """Complaints and testimonies similar to `obj`, best first, as plain dicts."""
+    matches = TextFingerprint.objects.similar_to(obj, min_similarity=min_similarity, limit=limit)
+    results = []
+    for model, (name, fields, describe) in SOURCES.items():
+        content_type = ContentType.objects.get_for_model(model)
+        scores = {fp.object_id: score for fp, score in matches if fp.content_type_id == content_type.id}
+        if not scores:
+            continue
+        for row in model.objects.filter(pk__in=scores).values(*fields):
+            results.append({
+                'source': name,
+                'id': row['id'],
+                'case': row['case_id'],
+                'similarity': round(scores[row['id']], 3),
+                **describe(row),
+            })
+    results.sort(key=lambda result: (-result['similarity'], result['source'], result['id']))
+    return results
@@ -0,0 +1,302 @@
+"""
+Related-case recommender over hashed TF-IDF vectors.
+
+A case document is its title, description, incident location and the titles and
+descriptions of all its evidence. Word unigrams and bigrams are hashed into
+`N_FEATURES` buckets, weighted by sublinear TF times IDF and L2-normalized, so the dot
+product of two vectors is their cosine similarity.
+
+The index is stored as a feature-major inverted matrix (`indptr`, `rows`, `weights`
+float32 arrays, as in CSC) plus the IDF vector, and written to an `.npz` snapshot by the
+`build_related_cases_index` command. Scoring a case reads only the postings of its own
+features. The snapshot records the change-feed position it is current to, and
+`LiveRelatedCaseIndex` follows the feed from there (core.services.indexes): cases whose own
+row or evidence was written or deleted since are masked out of the snapshot and
+re-vectorized with its IDF into a new index; a periodic rebuild folds them back into the
+snapshot. Without a snapshot the index is built in memory. The build command registers
+the snapshot as a feed consumer, so `prune` keeps the records written since it.
+"""
+import hashlib
+import os
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.conf import settings
+
+from cases.models import (
+    Case,
+    WitnessTestimony,
+    BiologicalEvidence,
+    VehicleEvidence,
+    DocumentEvidence,
+    OtherEvidence,
+)
+from cases.similarity import tokenize
+from core.services.changes import START, Cursor, head, pruned_past
+from core.services.indexes import LiveIndex
+
+N_FEATURES = 2 ** 18
+MAX_DF_RATIO = 0.5
+MIN_DOCS_FOR_MAX_DF = 50
+DEFAULT_RELATED_LIMIT = 10
+MAX_RELATED_LIMIT = 50
+SNAPSHOT_CONSUMER = 'related-cases-snapshot'
+EVIDENCE_MODELS = (WitnessTestimony, BiologicalEvidence, VehicleEvidence, DocumentEvidence, OtherEvidence)
+
+
+def index_path():
+    return getattr(settings, 'RELATED_CASES_INDEX_PATH', None)
+
+
+def _feature(term):
+    return int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=4).digest(), 'little') % N_FEATURES
+
+
+def term_frequencies(text):
+    """Hashed feature -> raw count for the unigrams and bigrams of `text`."""
+    tokens = [token for token in tokenize(text) if len(token) > 1]
+    terms = tokens + [f'{a} {b}' for a, b in zip(tokens, tokens[1:])]
+    return Counter(_feature(term) for term in terms)
+
+
+def case_documents(case_ids):
+    """{case_id: document text} for the given cases, with one query per table."""
+    parts = defaultdict(list)
+    for pk, title, description, location in Case.objects.filter(pk__in=case_ids).values_list(
+        'pk', 'title', 'description', 'incident_location'
+    ):
+        parts[pk].extend([title, description, location])
+    for model in EVIDENCE_MODELS:
+        for case_id, title, description in model.objects.filter(case_id__in=case_ids).values_list(
+            'case_id', 'title', 'description'
+        ):
+            parts[case_id].extend([title, description])
+    return {pk: '\n'.join(filter(None, texts)) for pk, texts in parts.items()}
+
+
+def iter_case_documents(after_id=0, batch_size=2000):
+    """Yield (case_id, text) for every case with id > after_id, in id order."""
+    last_id = after_id
+    while True:
+        ids = list(Case.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        documents = case_documents(ids)
+        for pk in ids:
+            yield pk, documents.get(pk, '')
+        last_id = ids[-1]
+
+
+def evidence_cases():
+    """(model numbers, evidence ids, case ids) of all evidence; model numbers index EVIDENCE_MODELS."""
+    kinds, ids, case_ids = [], [], []
+    for kind, model in enumerate(EVIDENCE_MODELS):
+        rows = np.array(model.objects.values_list('pk', 'case_id'), dtype=np.int64).reshape(-1, 2)
+        kinds.append(np.full(len(rows), kind, dtype=np.int8))
+        ids.append(rows[:, 0])
+        case_ids.append(rows[:, 1])
+    return np.concatenate(kinds), np.concatenate(ids), np.concatenate(case_ids)
+
+
+class RelatedCaseIndex:
+    """
+    A snapshot and the cases vectorized since (`delta`: {case_id: (features, weights)}, in
+    rows after the snapshot's); snapshot rows of cases changed or deleted since are masked
+    by `removed`. Never changed once built: `changed` returns a new index.
+    """
+
+    def __init__(self, ids, indptr, rows, weights, idf, built_at=None, cursor=START, evidence=None,
+                 removed=None, delta=None):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.built_at = built_at or time.time()
+        self.cursor = cursor
+        self.evidence = evidence
+        self.removed = np.zeros(len(self.ids), dtype=bool) if removed is None else removed
+        self.delta = delta or {}
+        self.delta_ids = np.fromiter(self.delta, dtype=np.int64, count=len(self.delta))
+        self.delta_postings = defaultdict(list)
+        for row, (features, weights) in enumerate(self.delta.values(), start=len(self.ids)):
+            for feature, weight in zip(features, weights):
+                self.delta_postings[int(feature)].append((row, float(weight)))
+
+    def __len__(self):
+        return len(self.ids) - int(self.removed.sum()) + len(self.delta)
+
+    @classmethod
+    def build(cls, documents, cursor=START, evidence=None):
+        """Build from an iterable of (case_id, text), current to the feed `cursor`."""
+        ids, doc_rows, features, counts = [], [], [], []
+        for row, (pk, text) in enumerate(documents):
+            ids.append(pk)
+            tf = term_frequencies(text)
+            doc_rows.append(np.full(len(tf), row, dtype=np.int32))
+            features.append(np.fromiter(tf.keys(), dtype=np.int64, count=len(tf)))
+            counts.append(np.fromiter(tf.values(), dtype=np.float32, count=len(tf)))
+        n_docs = len(ids)
+        doc_rows = np.concatenate(doc_rows) if doc_rows else np.empty(0, dtype=np.int32)
+        features = np.concatenate(features) if features else np.empty(0, dtype=np.int64)
+        counts = np.concatenate(counts) if counts else np.empty(0, dtype=np.float32)
+
+        df = np.bincount(features, minlength=N_FEATURES)
+        idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+        if n_docs >= MIN_DOCS_FOR_MAX_DF:
+            idf[df > MAX_DF_RATIO * n_docs] = 0
+
+        weights = (1 + np.log(counts)) * idf[features]
+        norms = np.sqrt(np.bincount(doc_rows, weights=weights.astype(np.float64) ** 2, minlength=n_docs))
+        weights = (weights / np.maximum(norms[doc_rows], 1e-12)).astype(np.float32)
+
+        keep = weights > 0
+        doc_rows, features, weights = doc_rows[keep], features[keep], weights[keep]
+        order = np.argsort(features, kind='stable')
+        indptr = np.zeros(N_FEATURES + 1, dtype=np.int64)
+        np.cumsum(np.bincount(features, minlength=N_FEATURES), out=indptr[1:])
+        return cls(ids, indptr, doc_rows[order], weights[order], idf, cursor=cursor, evidence=evidence)
+
+    def save(self, path):
+        """Write the snapshot atomically (temporary file, then rename)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temporary = f'{path}.tmp'
+        kinds, evidence_ids, case_ids = self.evidence if self.evidence is not None else evidence_cases()
+        with open(temporary, 'wb') as handle:
+            np.savez(
+                handle, ids=self.ids, indptr=self.indptr, rows=self.rows,
+                weights=self.weights, idf=self.idf, built_at=np.float64(self.built_at),
+                cursor=np.array(self.cursor, dtype=np.int64),
+                evidence_kinds=kinds, evidence_ids=evidence_ids, evidence_cases=case_ids,
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            has_feed = 'cursor' in data.files
+            return cls(
+                data['ids'], data['indptr'], data['rows'], data['weights'], data['idf'],
+                built_at=float(data['built_at']),
+                cursor=Cursor(*map(int, data['cursor'])) if has_feed else START,
+                evidence=(
+                    (data['evidence_kinds'], data['evidence_ids'], data['evidence_cases']) if has_feed else None
+                ),
+            )
+
+    def vectorize(self, text):
+        """(features, weights) of `text`, L2-normalized with this index's IDF."""
+        tf = term_frequencies(text)
+        features = np.fromiter(tf.keys(), dtype=np.int64, count=len(tf))
+        weights = (1 + np.log(np.fromiter(tf.values(), dtype=np.float32, count=len(tf)))) * self.idf[features]
+        norm = float(np.linalg.norm(weights))
+        if norm == 0:
+            return features[:0], weights[:0]
+        keep = weights > 0
+        return features[keep], (weights[keep] / norm).astype(np.float32)
+
+    def changed(self, case_ids, documents):
+        """A new index with the cases `case_ids` replaced by their `documents` (absent: deleted)."""
+        case_ids = set(case_ids)
+        delta = {pk: vector for pk, vector in self.delta.items() if pk not in case_ids}
+        delta.update((pk, self.vectorize(text)) for pk, text in documents.items())
+        return RelatedCaseIndex(
+            self.ids, self.indptr, self.rows, self.weights, self.idf, self.built_at, self.cursor, self.evidence,
+            removed=self.removed | np.isin(self.ids, list(case_ids)), delta=delta,
+        )
+
+    def score(self, features, weights):
+        """Cosine similarity of the query vector to every indexed case."""
+        scores = np.zeros(len(self.ids) + len(self.delta_ids), dtype=np.float32)
+        for feature, weight in zip(features, weights):
+            start, end = self.indptr[feature], self.indptr[feature + 1]
+            if end > start:
+                # Rows are unique within one feature's postings, so fancy-index += is safe.
+                scores[self.rows[start:end]] += weight * self.weights[start:end]
+            for row, delta_weight in self.delta_postings.get(int(feature), ()):
+                scores[row] += weight * delta_weight
+        scores[:len(self.ids)][self.removed] = 0
+        return scores
+
+    def related(self, pk, text, limit=DEFAULT_RELATED_LIMIT):
+        """[(case_id, similarity)] best first for the case `pk` with document `text`."""
+        features, weights = self.vectorize(text)
+        if not len(features) or not len(self):
+            return []
+        scores = self.score(features, weights)
+        all_ids = np.concatenate([self.ids, self.delta_ids])
+        scores[all_ids == pk] = 0
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        return [(int(all_ids[i]), float(scores[i])) for i in hits]
+
+
+class LiveRelatedCaseIndex(LiveIndex):
+    """
+    The snapshot on disk (reloaded when the file changes) or, without one, an index built in
+    memory, kept current with the cases whose own row or evidence changed since.
+    """
+    watches = (Case,) + EVIDENCE_MODELS
+
+    def __init__(self):
+        super().__init__()
+        self.mtime = None
+        # {(evidence model number, evidence id): case id}, to find the case of deleted evidence.
+        self.evidence_cases = {}
+
+    def stale(self):
+        path = index_path()
+        return bool(path) and os.path.exists(path) and os.path.getmtime(path) != self.mtime
+
+    def load(self):
+        path = index_path()
+        if path and os.path.exists(path):
+            self.mtime = os.path.getmtime(path)
+            index = RelatedCaseIndex.load(path)
+            if index.evidence is not None and not pruned_past(index.cursor):
+                self._map_evidence(index.evidence)
+                return index, index.cursor
+        cursor = head()
+        evidence = evidence_cases()
+        self._map_evidence(evidence)
+        return RelatedCaseIndex.build(iter_case_documents(), cursor, evidence), cursor
+
+    def _map_evidence(self, evidence):
+        self.evidence_cases = {(int(kind), int(pk)): int(case_id) for kind, pk, case_id in zip(*evidence)}
+
+    def update(self, index, changes):
+        case_ids = set(changes.touched(Case))
+        for kind, model in enumerate(EVIDENCE_MODELS):
+            for pk in changes.touched(model):
+                case_id = self.evidence_cases.pop((kind, pk), None)
+                if case_id is not None:
+                    case_ids.add(case_id)
+            for pk, case_id in model.objects.filter(pk__in=changes.written(model)).values_list('pk', 'case_id'):
+                self.evidence_cases[(kind, pk)] = case_id
+                case_ids.add(case_id)
+        return index.changed(case_ids, case_documents(case_ids))
+
+
+def get_related_index():
+    """The process-wide index, brought up to date with the case and evidence changes since its last use."""
+    return LiveRelatedCaseIndex.shared().current()
+
+
+def reset_related_index():
+    LiveRelatedCaseIndex.reset_shared()
+
+
+def related_cases(case, limit=DEFAULT_RELATED_LIMIT):
+    """Cases most similar to `case`, best first, as plain dicts."""
+    index = get_related_index()
+    text = case_documents([case.pk]).get(case.pk, '')
+    scores = dict(index.related(case.pk, text, limit=limit))
+    rows = Case.objects.filter(pk__in=scores).values(
+        'id', 'case_number', 'title', 'status', 'incident_date', 'incident_location'
+    )
+    results = [{**row, 'similarity': round(scores[row['id']], 3)} for row in rows]
+    results.sort(key=lambda row: (-row['similarity'], row['id']))
+    return results
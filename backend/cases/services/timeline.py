@@ -0,0 +1,170 @@
+"""
+Chronological activity feed for one case.
+
+Every source (complaints, each evidence table, report submissions and reviews, suspect
+assessments, interrogations, the trial verdict) is read with its own keyset-filtered,
+index-ordered query limited to one page, and the streams are merged lazily with
+`heapq.merge`. A page therefore reads at most `limit` rows per source no matter how much
+history the case has.
+
+Events are ordered newest first by (timestamp, source, id). A cursor is that triple
+encoded as `<iso timestamp>|<source>|<id>`; `before` pages towards older events and
+`after` towards newer ones.
+"""
+import heapq
+from itertools import islice
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from cases.models import (
+    Complaint,
+    WitnessTestimony,
+    BiologicalEvidence,
+    VehicleEvidence,
+    DocumentEvidence,
+    OtherEvidence,
+)
+from investigation.models import DetectiveReport, SuspectCaseLink, Interrogation, Trial
+
+DEFAULT_TIMELINE_LIMIT = 50
+MAX_TIMELINE_LIMIT = 200
+
+
+class TimelineCursorError(ValueError):
+    pass
+
+
+class TimelineSource:
+    def __init__(self, name, model, time_field, case_lookup='case', fields=(), summary=None):
+        self.name = name
+        self.model = model
+        self.time_field = time_field
+        self.case_lookup = case_lookup
+        self.fields = fields
+        self.summary = summary or (lambda row: '')
+
+    def queryset(self, case):
+        return self.model.objects.filter(
+            **{self.case_lookup: case, f'{self.time_field}__isnull': False}
+        )
+
+    def keyset(self, cursor, older):
+        """Filter for rows strictly past `cursor` in the requested direction."""
+        timestamp, source, pk = cursor
+        t = self.time_field
+        past = 'lt' if older else 'gt'
+        if self.name == source:
+            return Q(**{f'{t}__{past}': timestamp}) | Q(**{t: timestamp, f'pk__{past}': pk})
+        # Same timestamp: the source name breaks the tie.
+        tie_is_past = self.name < source if older else self.name > source
+        return Q(**{f'{t}__{past}e' if tie_is_past else f'{t}__{past}': timestamp})
+
+    def rows(self, case, cursor, older, limit):
+        queryset = self.queryset(case)
+        if cursor is not None:
+            queryset = queryset.filter(self.keyset(cursor, older))
+        t = self.time_field
+        ordering = (f'-{t}', '-pk') if older else (t, 'pk')
+        values = queryset.order_by(*ordering).values('pk', t, *self.fields)[:limit]
+        for row in values:
+            yield {
+                'source': self.name,
+                'id': row['pk'],
+                'timestamp': row[t],
+                'summary': self.summary(row),
+            }
+
+
+def _evidence_source(name, model):
+    return TimelineSource(
+        name, model, 'collected_date', fields=('evidence_number', 'title'),
+        summary=lambda row: f"{row['evidence_number']} {row['title']}".strip(),
+    )
+
+
+SOURCES = [
+    TimelineSource(
+        'complaint', Complaint, 'created_at', fields=('title', 'status'),
+        summary=lambda row: f"Complaint filed: {row['title']}",
+    ),
+    _evidence_source('witness_testimony', WitnessTestimony),
+    _evidence_source('biological_evidence', BiologicalEvidence),
+    _evidence_source('vehicle_evidence', VehicleEvidence),
+    _evidence_source('document_evidence', DocumentEvidence),
+    _evidence_source('other_evidence', OtherEvidence),
+    TimelineSource(
+        'report_submitted', DetectiveReport, 'submitted_at', fields=('detective_id',),
+        summary=lambda row: 'Detective report submitted',
+    ),
+    TimelineSource(
+        'report_reviewed', DetectiveReport, 'reviewed_at', fields=('status',),
+        summary=lambda row: f"Detective report reviewed: {row['status']}",
+    ),
+    TimelineSource(
+        'detective_assessment', SuspectCaseLink, 'detective_assessment_date',
+        fields=('suspect_id', 'detective_guilt_score'),
+        summary=lambda row: f"Detective guilt score {row['detective_guilt_score']} for suspect {row['suspect_id']}",
+    ),
+    TimelineSource(
+        'sergeant_assessment', SuspectCaseLink, 'sergeant_assessment_date',
+        fields=('suspect_id', 'sergeant_guilt_score'),
+        summary=lambda row: f"Sergeant guilt score {row['sergeant_guilt_score']} for suspect {row['suspect_id']}",
+    ),
+    TimelineSource(
+        'captain_opinion', SuspectCaseLink, 'captain_opinion_at', fields=('suspect_id',),
+        summary=lambda row: f"Captain opinion on suspect {row['suspect_id']}",
+    ),
+    TimelineSource(
+        'chief_review', SuspectCaseLink, 'chief_approval_at', fields=('suspect_id', 'chief_approved'),
+        summary=lambda row: (
+            f"Chief {'approved' if row['chief_approved'] else 'rejected'} opinion on suspect {row['suspect_id']}"
+        ),
+    ),
+    TimelineSource(
+        'interrogation', Interrogation, 'scheduled_date', case_lookup='suspect_case_link__case',
+        fields=('interrogation_number', 'status'),
+        summary=lambda row: f"Interrogation {row['interrogation_number']} ({row['status']})",
+    ),
+    TimelineSource(
+        'trial_verdict', Trial, 'verdict_date', fields=('verdict',),
+        summary=lambda row: f"Trial verdict: {row['verdict']}",
+    ),
+]
+
+
+def encode_cursor(event):
+    return f"{event['timestamp'].isoformat()}|{event['source']}|{event['id']}"
+
+
+def decode_cursor(value):
+    try:
+        timestamp, source, pk = value.rsplit('|', 2)
+        parsed = parse_datetime(timestamp)
+        pk = int(pk)
+    except (ValueError, TypeError):
+        raise TimelineCursorError('Invalid timeline cursor.')
+    if parsed is None:
+        raise TimelineCursorError('Invalid timeline cursor.')
+    return parsed, source, pk
+
+
+def _sort_key(event):
+    return (event['timestamp'], event['source'], event['id'])
+
+
+def case_timeline(case, limit=DEFAULT_TIMELINE_LIMIT, before=None, after=None):
+    """
+    Return (events newest first, has_more). `before`/`after` are decoded cursors; at most one
+    should be given. Without either, the newest events are returned.
+    """
+    older = after is None
+    cursor = before if older else after
+    streams = [source.rows(case, cursor, older, limit + 1) for source in SOURCES]
+    merged = heapq.merge(*streams, key=_sort_key, reverse=older)
+    events = list(islice(merged, limit + 1))
+    has_more = len(events) > limit
+    events = events[:limit]
+    if not older:
+        events.reverse()
+    return events, has_more
@@ -0,0 +1,28 @@
+"""
+Which cases a user may see in case listings, by role. Shared by the case list and the bulk
+exports (core.services.exports) so both apply the same rules.
+"""
+from django.db.models import Q
+
+from cases.models import Case, CaseStatus
+
+
+def visible_cases(user, queryset=None):
+    """`queryset` (all cases by default) limited to the cases `user` may list."""
+    queryset = Case.objects.all() if queryset is None else queryset
+
+    if user.has_role('Detective'):
+        return queryset.filter(
+            Q(assigned_detective=user)
+            | Q(team_members=user)
+            | Q(status__in=[CaseStatus.OPEN, CaseStatus.UNDER_INVESTIGATION])
+        ).distinct()
+    if user.has_role('Cadet'):
+        return queryset.filter(status=CaseStatus.OPEN)
+    if user.has_any_role(['Police Officer', 'Sergeant', 'Captain', 'Police Chief']):
+        return queryset
+    if user.is_superuser or user.has_role('System Administrator'):
+        return queryset
+    if user.has_role('Judge'):
+        return queryset.filter(trial__isnull=False)  # only cases with trials
+    return queryset.none()
@@ -0,0 +1,80 @@
+"""
+MinHash signatures and LSH band keys for near-duplicate text.
+
+Text is lower-cased, split into word tokens (any script) and turned into overlapping
+three-word shingles. The signature holds, for each of `NUM_PERMUTATIONS` fixed hash
+functions, the minimum hashed shingle; the fraction of equal positions between two
+signatures estimates the Jaccard similarity of their shingle sets.
+
+The signature is cut into `BANDS` bands of `ROWS_PER_BAND` values and each band is hashed
+to one signed 64-bit key. Texts sharing any band key are candidate duplicates; with 32 x 4
+the probability of becoming a candidate is about 1 - (1 - s^4)^32, i.e. ~0.5 at s = 0.42
+and above 0.99 from s = 0.7.
+"""
+import hashlib
+import re
+
+import numpy as np
+
+NUM_PERMUTATIONS = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; a, b < 2**32 keeps
+# a * x + b inside uint64. The seed is fixed so signatures are comparable across processes.
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240917)
+_A = _rng.integers(1, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_EMPTY = np.full(NUM_PERMUTATIONS, np.iinfo(np.uint32).max, dtype=np.uint32)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or '').lower())
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return {' '.join(tokens)} if tokens else set()
+    return {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def _hash32(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def minhash(text):
+    """uint32 signature of length NUM_PERMUTATIONS; all-max for text without tokens."""
+    items = shingles(text)
+    if not items:
+        return _EMPTY.copy()
+    hashed = np.fromiter((_hash32(item) for item in items), dtype=np.uint64, count=len(items))
+    values = (_A[:, None] * hashed[None, :] + _B[:, None]) % _PRIME
+    return values.min(axis=1).astype(np.uint32)
+
+
+def is_empty(signature):
+    return bool((signature == _EMPTY).all())
+
+
+def band_keys(signature):
+    """One signed 64-bit key per band; the band number is hashed in so bands never collide."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'little', signed=True))
+    return keys
+
+
+def estimated_similarity(signature, others):
+    """Estimated Jaccard similarity of `signature` to each row of the (n, NUM_PERMUTATIONS) array."""
+    return (others == signature).mean(axis=1)
+
+
+def decode_signature(raw):
+    return np.frombuffer(bytes(raw), dtype=np.uint32)
@@ -0,0 +1,114 @@
+"""
+Case activity timeline: per-source limited queries merged newest first, with before/after cursors.
+"""
+from datetime import timedelta
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, OtherEvidence, WitnessTestimony
+from cases.services import case_timeline
+from investigation.models import DetectiveReport
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % (10**12)
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class CaseTimelineTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.officer = make_user('officer_timeline')
+        self.officer.roles.add(Role.objects.get_or_create(name='Police Officer', defaults={'is_active': True})[0])
+        self.detective = make_user('detective_timeline')
+        self.client.force_authenticate(user=self.officer)
+        self.case = Case.objects.create(
+            title='Scene',
+            description='D',
+            incident_date=timezone.now(),
+            incident_location='Here',
+            status=CaseStatus.UNDER_INVESTIGATION,
+        )
+        self.start = timezone.now() - timedelta(days=10)
+        OtherEvidence.objects.bulk_create([
+            OtherEvidence(
+                case=self.case,
+                evidence_number=f'EV-T-{i}',
+                description='Item',
+                location='Here',
+                collected_date=self.start + timedelta(minutes=2 * i),
+                evidence_type='OTHER',
+                item_name=f'Item {i}',
+                item_category='Misc',
+                physical_description='-',
+                condition='-',
+            )
+            for i in range(40)
+        ])
+        WitnessTestimony.objects.bulk_create([
+            WitnessTestimony(
+                case=self.case,
+                evidence_number=f'EV-W-{i}',
+                description='Statement',
+                location='Here',
+                collected_date=self.start + timedelta(minutes=2 * i + 1),
+                evidence_type='WITNESS',
+                witness_name=f'Witness {i}',
+                testimony_date=self.start,
+                testimony_text='Saw it',
+            )
+            for i in range(30)
+        ])
+        self.report = DetectiveReport.objects.create(case=self.case, detective=self.detective)
+        self.url = f'/api/v1/cases/{self.case.id}/timeline/'
+
+    def test_newest_first_across_sources(self):
+        events, has_more = case_timeline(self.case, limit=5)
+        self.assertTrue(has_more)
+        self.assertEqual(events[0]['source'], 'report_submitted')
+        self.assertEqual([event['source'] for event in events[1:3]], ['other_evidence', 'other_evidence'])
+        timestamps = [event['timestamp'] for event in events]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+
+    def test_paging_with_before_and_after_cursors(self):
+        resp = self.client.get(self.url, {'limit': 50})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        first_page = resp.data['data']
+        self.assertEqual(len(first_page['events']), 50)
+        self.assertTrue(first_page['has_more'])
+
+        resp = self.client.get(self.url, {'limit': 50, 'before': first_page['before']})
+        second_page = resp.data['data']
+        self.assertEqual(len(second_page['events']), 21)
+        self.assertFalse(second_page['has_more'])
+        seen = {(e['source'], e['id']) for e in first_page['events'] + second_page['events']}
+        self.assertEqual(len(seen), 71)
+
+        resp = self.client.get(self.url, {'limit': 3, 'after': second_page['after']})
+        newer = resp.data['data']['events']
+        self.assertEqual(
+            [(e['source'], e['id']) for e in newer],
+            [(e['source'], e['id']) for e in first_page['events'][-3:]],
+        )
+
+    def test_invalid_cursor(self):
+        resp = self.client.get(self.url, {'before': 'garbage'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
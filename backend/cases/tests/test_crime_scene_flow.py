@@ -115,8 +115,8 @@ class CrimeSceneRegistrationFlowTestCase(TestCase):
         self.assertEqual(create_resp.status_code, status.HTTP_201_CREATED)
         case_id = create_resp.data['data']['id']
         case = Case.objects.get(pk=case_id)
-        self.assertIn('09123456789', case.notes)
-        self.assertIn('1234567890', case.notes)
+        self.assertIn('09123456789', case.notes_text)
+        self.assertIn('1234567890', case.notes_text)
 
     def test_incident_date_recorded(self):
         """Police records the time/hour (incident_date) in the case."""
@@ -0,0 +1,106 @@
+"""
+Document attributes: canonical keys on write, atomic partial updates and cross-case search.
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, DocumentEvidence
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % (10**12)
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+def make_case(title):
+    return Case.objects.create(
+        title=title,
+        description='Description',
+        incident_date=timezone.now(),
+        incident_location='Somewhere',
+        status=CaseStatus.UNDER_INVESTIGATION,
+    )
+
+
+def make_document(case, attributes):
+    return DocumentEvidence.objects.create(
+        case=case,
+        description='Card',
+        location='Street',
+        collected_date=timezone.now(),
+        evidence_type='DOCUMENT',
+        document_type='National ID',
+        document_attributes=attributes,
+    )
+
+
+class DocumentAttributesTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        role = Role.objects.get_or_create(name='Police Officer', defaults={'is_active': True})[0]
+        self.officer = make_user('officer_documents')
+        self.officer.roles.add(role)
+        self.client.force_authenticate(user=self.officer)
+        self.case_a = make_case('Fraud')
+        self.case_b = make_case('Theft')
+        self.doc_a = make_document(self.case_a, {'ID_Number': '1234567890', 'Issue Date': '2020-01-01'})
+        self.doc_b = make_document(self.case_b, {'nationalCode': '1234567890'})
+        self.doc_c = make_document(self.case_b, {'national_code': '9876543210', 'passportNo': ''})
+
+    def test_keys_are_canonical_on_save(self):
+        self.assertEqual(self.doc_a.document_attributes, {'national_id': '1234567890', 'issue_date': '2020-01-01'})
+        self.assertEqual(self.doc_b.get_attribute('national_code'), '1234567890')
+
+    def test_partial_updates_do_not_clobber_concurrent_changes(self):
+        stale = DocumentEvidence.objects.get(pk=self.doc_a.pk)
+        self.doc_a.add_attribute('Expiry-Date', '2030-01-01')
+        stale.update_attributes({'issuer_city': 'Tehran'})
+        stale.remove_attribute('Issue_Date')
+        self.assertEqual(
+            stale.document_attributes,
+            {'national_id': '1234567890', 'expiry_date': '2030-01-01', 'issuer_city': 'Tehran'},
+        )
+
+    def test_search_by_value_across_cases(self):
+        resp = self.client.get('/api/v1/documents/attributes/', {'key': 'ID_Number', 'value': '1234567890'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['data']['key'], 'national_id')
+        ids = {item['id'] for item in resp.data['data']['evidence']}
+        self.assertEqual(ids, {self.doc_a.id, self.doc_b.id})
+
+    def test_search_by_value_matches_numbers_and_booleans(self):
+        numeric = make_document(self.case_a, {'badge_number': 4521, 'verified': True})
+        text = make_document(self.case_b, {'badge_number': '4521', 'verified': 'true'})
+        resp = self.client.get('/api/v1/documents/attributes/', {'key': 'badge_number', 'value': '4521'})
+        self.assertEqual({item['id'] for item in resp.data['data']['evidence']}, {numeric.id, text.id})
+        resp = self.client.get('/api/v1/documents/attributes/', {'key': 'verified', 'value': 'true'})
+        self.assertEqual({item['id'] for item in resp.data['data']['evidence']}, {numeric.id, text.id})
+        resp = self.client.get('/api/v1/documents/attributes/', {'key': 'badge_number', 'value': 'NaN'})
+        self.assertEqual(resp.data['data']['evidence'], [])
+
+    def test_search_by_prefix_and_key_exists(self):
+        resp = self.client.get('/api/v1/documents/attributes/', {'key': 'national_id', 'prefix': '98'})
+        self.assertEqual([item['id'] for item in resp.data['data']['evidence']], [self.doc_c.id])
+        resp = self.client.get('/api/v1/documents/attributes/', {'key': 'issue_date'})
+        self.assertEqual([item['id'] for item in resp.data['data']['evidence']], [self.doc_a.id])
+
+    def test_key_required(self):
+        resp = self.client.get('/api/v1/documents/attributes/')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
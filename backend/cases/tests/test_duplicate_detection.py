@@ -0,0 +1,156 @@
+"""
+Near-duplicate complaints and testimonies: MinHash signatures, the LSH index kept up to
+date on create, and the possible-duplicates / related endpoints.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, Complaint, WitnessTestimony, TextFingerprint, LshBucket
+from cases.similarity import BANDS, minhash, estimated_similarity
+from accounts.models import Role
+
+User = get_user_model()
+
+ROBBERY = (
+    'Two men in black masks robbed the jewelry store on Ferdowsi street at around nine in the '
+    'evening, threatened the clerk with a knife and escaped in a white sedan towards the square.'
+)
+ROBBERY_AGAIN = (
+    'Two men in black masks robbed the jewelry store on Ferdowsi street at around nine in the '
+    'evening, threatened the clerk with a knife and escaped in a white car towards the square.'
+)
+UNRELATED = 'My neighbour keeps parking his truck in front of my garage every single morning.'
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % (10**12)
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class MinHashTestCase(TestCase):
+
+    def test_signature_is_stable_and_estimates_similarity(self):
+        first = minhash(ROBBERY)
+        self.assertTrue((first == minhash(ROBBERY)).all())
+        near = estimated_similarity(first, minhash(ROBBERY_AGAIN)[None, :])[0]
+        far = estimated_similarity(first, minhash(UNRELATED)[None, :])[0]
+        self.assertGreater(near, 0.6)
+        self.assertLess(far, 0.2)
+
+    def test_case_and_punctuation_do_not_matter(self):
+        self.assertTrue((minhash('A white sedan, near the SQUARE!') == minhash('a white sedan near the square')).all())
+
+
+class DuplicateDetectionTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.complainant = make_user('complainant_dup')
+        self.cadet = make_user('cadet_dup')
+        self.cadet.roles.add(Role.objects.get_or_create(name='Cadet', defaults={'is_active': True})[0])
+        self.officer = make_user('officer_dup')
+        self.officer.roles.add(Role.objects.get_or_create(name='Police Officer', defaults={'is_active': True})[0])
+
+    def _file_complaint(self, description, title='Robbery'):
+        self.client.force_authenticate(user=self.complainant)
+        resp = self.client.post('/api/v1/complaints/', {
+            'title': title,
+            'description': description,
+            'incident_date': timezone.now().isoformat(),
+            'incident_location': 'Ferdowsi St',
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        return resp.data['data']
+
+    def _add_testimony(self, case_id, text):
+        self.client.force_authenticate(user=self.officer)
+        resp = self.client.post(f'/api/v1/cases/{case_id}/witness-testimonies/', {
+            'description': 'Statement', 'location': 'Station', 'witness_name': 'Witness',
+            'testimony_date': timezone.now().isoformat(), 'testimony_text': text,
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        return resp.data['data']
+
+    def test_complaints_are_indexed_on_create(self):
+        complaint = self._file_complaint(ROBBERY)
+        fingerprint = TextFingerprint.objects.get(object_id=complaint['id'], case_id=complaint['case'])
+        self.assertEqual(LshBucket.objects.filter(fingerprint=fingerprint).count(), BANDS)
+
+    def test_cadet_sees_possible_duplicate_complaints(self):
+        first = self._file_complaint(ROBBERY)
+        second = self._file_complaint(ROBBERY_AGAIN)
+        self._file_complaint(UNRELATED, title='Parking')
+
+        self.client.force_authenticate(user=self.cadet)
+        resp = self.client.get(f"/api/v1/complaints/{second['id']}/possible-duplicates/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        matches = resp.data['data']
+        self.assertEqual([(m['source'], m['id']) for m in matches], [('complaint', first['id'])])
+        self.assertEqual(matches[0]['case'], first['case'])
+        self.assertGreaterEqual(matches[0]['similarity'], 0.5)
+
+    def test_complainant_cannot_list_duplicates(self):
+        complaint = self._file_complaint(ROBBERY)
+        resp = self.client.get(f"/api/v1/complaints/{complaint['id']}/possible-duplicates/")
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_testimony_related_across_cases(self):
+        complaint = self._file_complaint(ROBBERY)
+        other_case = Case.objects.create(
+            title='Other', description='D', incident_date=timezone.now(),
+            incident_location='L', status=CaseStatus.UNDER_INVESTIGATION,
+        )
+        testimony = self._add_testimony(other_case.id, ROBBERY_AGAIN)
+        self._add_testimony(other_case.id, UNRELATED)
+
+        resp = self.client.get(f"/api/v1/cases/{other_case.id}/witness-testimonies/{testimony['id']}/related/")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual([(m['source'], m['id']) for m in resp.data['data']], [('complaint', complaint['id'])])
+
+    def test_invalid_threshold_is_rejected(self):
+        complaint = self._file_complaint(ROBBERY)
+        self.client.force_authenticate(user=self.cadet)
+        resp = self.client.get(f"/api/v1/complaints/{complaint['id']}/possible-duplicates/?min_similarity=2")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_resubmitted_complaint_is_reindexed(self):
+        complaint = self._file_complaint(UNRELATED, title='Parking')
+        Complaint.objects.filter(pk=complaint['id']).update(status='RETURNED_TO_COMPLAINANT')
+        resp = self.client.patch(f"/api/v1/complaints/{complaint['id']}/", {'description': ROBBERY}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        other = self._file_complaint(ROBBERY)
+
+        self.client.force_authenticate(user=self.cadet)
+        resp = self.client.get(f"/api/v1/complaints/{other['id']}/possible-duplicates/")
+        self.assertEqual([m['id'] for m in resp.data['data']], [complaint['id']])
+
+    def test_backfill_command(self):
+        case = Case.objects.create(
+            title='Old', description='D', incident_date=timezone.now(),
+            incident_location='L', status=CaseStatus.UNDER_INVESTIGATION,
+        )
+        WitnessTestimony.objects.create(
+            case=case, description='D', location='L', collected_date=timezone.now(),
+            evidence_type='WITNESS', witness_name='W', testimony_date=timezone.now(), testimony_text=ROBBERY,
+        )
+        TextFingerprint.objects.all().delete()
+        out = StringIO()
+        call_command('build_text_fingerprints', stdout=out)
+        self.assertEqual(TextFingerprint.objects.count(), 1)
+        self.assertIn('Completed!', out.getvalue())
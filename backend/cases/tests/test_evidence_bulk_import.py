@@ -0,0 +1,172 @@
+"""
+Bulk crime-scene evidence import: one manifest (CSV or JSONL) with mixed evidence types,
+validated up front, written all-or-nothing, one digest notification for the detective.
+"""
+import io
+import json
+import zipfile
+from unittest import mock
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import (
+    Case,
+    CaseStatus,
+    WitnessTestimony,
+    VehicleEvidence,
+    OtherEvidence,
+    DocumentEvidence,
+)
+from investigation.models import Notification
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % (10**12)
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class EvidenceBulkImportTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        role_officer = Role.objects.get_or_create(name='Police Officer', defaults={'is_active': True})[0]
+        self.officer = make_user('officer_bulk')
+        self.officer.roles.add(role_officer)
+        self.detective = make_user('detective_bulk')
+        self.case = Case.objects.create(
+            title='Scene',
+            description='Crime scene',
+            incident_date=timezone.now(),
+            incident_location='Dock 4',
+            status=CaseStatus.UNDER_INVESTIGATION,
+            assigned_detective=self.detective,
+        )
+        self.url = f'/api/v1/cases/{self.case.id}/evidence/bulk/'
+        self.client.force_authenticate(user=self.officer)
+
+    def _jsonl(self, rows):
+        content = '\n'.join(json.dumps(row) for row in rows).encode('utf-8')
+        return SimpleUploadedFile('manifest.jsonl', content, content_type='application/x-ndjson')
+
+    def test_jsonl_manifest_with_mixed_types_creates_all_rows(self):
+        rows = [
+            {
+                'evidence_type': 'WITNESS', 'description': 'Saw the car', 'location': 'Dock 4',
+                'witness_name': 'Ann Lee', 'testimony_date': timezone.now().isoformat(),
+                'testimony_text': 'A red car left quickly.',
+            },
+            {
+                'evidence_type': 'VEHICLE', 'description': 'Abandoned car', 'location': 'Dock 5',
+                'vehicle_type': 'Car', 'license_plate': '12A345',
+            },
+            {
+                'evidence_type': 'DOCUMENT', 'description': 'ID card', 'location': 'Dock 4',
+                'document_type': 'National ID', 'document_attributes': {'national_id': '1234567890'},
+            },
+            {
+                'evidence_type': 'other', 'description': 'Knife', 'location': 'Dock 4',
+                'item_name': 'Knife', 'item_category': 'Weapon',
+                'physical_description': 'Steel blade', 'condition': 'Used',
+            },
+        ]
+        resp = self.client.post(self.url, {'manifest': self._jsonl(rows)}, format='multipart')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(resp.data['data']['created'], {'WITNESS': 1, 'VEHICLE': 1, 'DOCUMENT': 1, 'OTHER': 1})
+        self.assertEqual(WitnessTestimony.objects.filter(case=self.case).count(), 1)
+        vehicle = VehicleEvidence.objects.get(case=self.case)
+        self.assertEqual(vehicle.collected_by, self.officer)
+        self.assertTrue(vehicle.evidence_number.startswith('EV-'))
+        self.assertEqual(DocumentEvidence.objects.get(case=self.case).document_attributes['national_id'], '1234567890')
+        self.assertEqual(OtherEvidence.objects.get(case=self.case).title, 'Knife')
+        notifications = Notification.objects.filter(case=self.case, recipient=self.detective)
+        self.assertEqual(notifications.count(), 1)
+        self.assertIn('4 evidence items', notifications.first().message)
+
+    def test_csv_manifest(self):
+        content = (
+            'evidence_type,description,location,item_name,item_category,physical_description,condition\n'
+            'OTHER,Glove,Alley,Glove,Clothing,Leather glove,Torn\n'
+            'OTHER,Phone,Alley,Phone,Electronics,Cracked phone,Broken\n'
+        ).encode('utf-8')
+        manifest = SimpleUploadedFile('manifest.csv', content, content_type='text/csv')
+        resp = self.client.post(self.url, {'manifest': manifest}, format='multipart')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(OtherEvidence.objects.filter(case=self.case).count(), 2)
+
+    def test_invalid_row_reports_errors_and_commits_nothing(self):
+        rows = [
+            {
+                'evidence_type': 'OTHER', 'description': 'Glove', 'location': 'Alley',
+                'item_name': 'Glove', 'item_category': 'Clothing',
+                'physical_description': 'Leather glove', 'condition': 'Torn',
+            },
+            {
+                'evidence_type': 'VEHICLE', 'description': 'Car', 'location': 'Alley',
+                'vehicle_type': 'Car', 'license_plate': '12A345', 'vin_number': '1HGCM82633A004352',
+            },
+            {'evidence_type': 'SPACESHIP', 'description': 'Unknown'},
+        ]
+        resp = self.client.post(self.url, {'manifest': self._jsonl(rows)}, format='multipart')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['row'] for error in resp.data['errors']], [2, 3])
+        self.assertEqual(OtherEvidence.objects.filter(case=self.case).count(), 0)
+        self.assertFalse(Notification.objects.filter(case=self.case).exists())
+
+    def test_media_zip_is_attached_to_file_fields(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('audio/statement.mp3', b'ID3fake-audio')
+        archive.seek(0)
+        rows = [{
+            'evidence_type': 'WITNESS', 'description': 'Recorded', 'location': 'Dock 4',
+            'witness_name': 'Bob Ray', 'testimony_date': timezone.now().isoformat(),
+            'testimony_text': 'Heard shots.', 'audio_recording': 'audio/statement.mp3',
+        }]
+        media = SimpleUploadedFile('media.zip', archive.read(), content_type='application/zip')
+        resp = self.client.post(self.url, {'manifest': self._jsonl(rows), 'media': media}, format='multipart')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        testimony = WitnessTestimony.objects.get(case=self.case)
+        self.assertTrue(testimony.audio_recording.name.endswith('.mp3'))
+        testimony.audio_recording.delete(save=False)
+
+    def test_missing_media_reference_is_a_row_error(self):
+        rows = [{
+            'evidence_type': 'WITNESS', 'description': 'Recorded', 'location': 'Dock 4',
+            'witness_name': 'Bob Ray', 'testimony_date': timezone.now().isoformat(),
+            'testimony_text': 'Heard shots.', 'audio_recording': 'audio/missing.mp3',
+        }]
+        resp = self.client.post(self.url, {'manifest': self._jsonl(rows)}, format='multipart')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('audio_recording', resp.data['errors'][0]['errors'])
+
+    def test_exhausted_evidence_numbers_are_a_bad_request(self):
+        rows = [{
+            'evidence_type': 'OTHER', 'description': 'Glove', 'location': 'Alley',
+            'item_name': 'Glove', 'item_category': 'Clothing',
+            'physical_description': 'Leather glove', 'condition': 'Torn',
+        }]
+        error = ValidationError('Could not allocate 1 unique evidence numbers.')
+        with mock.patch('cases.models.OtherEvidence.allocate_evidence_numbers', side_effect=error):
+            resp = self.client.post(self.url, {'manifest': self._jsonl(rows)}, format='multipart')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data['message'], 'Could not allocate 1 unique evidence numbers.')
+        self.assertEqual(OtherEvidence.objects.filter(case=self.case).count(), 0)
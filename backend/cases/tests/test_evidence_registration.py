@@ -250,8 +250,9 @@ class EvidenceRegistrationTestCase(TestCase):
         resp = self.client.post(f'{self.case_url}/document-evidence/', payload, format='json')
         self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
         doc = DocumentEvidence.objects.get(case=self.case)
-        self.assertEqual(doc.document_attributes['Passport_No'], 'P123')
-        self.assertEqual(doc.document_attributes['Issue_Date'], '2020-01-01')
+        self.assertEqual(doc.document_attributes['passport_number'], 'P123')
+        self.assertEqual(doc.document_attributes['issue_date'], '2020-01-01')
+        self.assertEqual(doc.get_attribute('Passport_No'), 'P123')
         self.assertEqual(len(doc.document_attributes), 3)
 
     def test_other_evidence_title_description_record(self):
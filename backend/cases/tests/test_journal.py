@@ -0,0 +1,135 @@
+"""
+Append-only journal for case notes and evidence chain of custody.
+"""
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, OtherEvidence
+from core.models import JournalEntry, JournalKind
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % (10**12)
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class JournalTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.sergeant = make_user('sergeant_journal')
+        self.sergeant.roles.add(Role.objects.get_or_create(name='Sergeant', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=self.sergeant)
+        self.case = Case.objects.create(
+            title='Scene',
+            description='D',
+            incident_date=timezone.now(),
+            incident_location='Here',
+            status=CaseStatus.OPEN,
+            notes='Initial notes',
+        )
+        self.evidence = OtherEvidence.objects.create(
+            case=self.case,
+            description='Knife',
+            location='Kitchen',
+            collected_date=timezone.now(),
+            evidence_type='OTHER',
+            item_name='Knife',
+            item_category='Weapon',
+            physical_description='Steel',
+            condition='Used',
+        )
+
+    def test_approval_note_goes_to_journal_and_renders_in_notes(self):
+        resp = self.client.post(
+            f'/api/v1/cases/{self.case.id}/approvals/', {'action': 'approve', 'message': 'Looks valid'}, format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.case.refresh_from_db()
+        self.assertEqual(self.case.notes, 'Initial notes')
+        self.assertEqual(self.case.notes_text, 'Initial notes\n\nApproval note: Looks valid')
+        self.assertEqual(resp.data['data']['notes'], self.case.notes_text)
+
+    def test_case_journal_is_paginated_and_appendable(self):
+        for i in range(3):
+            JournalEntry.objects.append(self.case, JournalKind.NOTE, f'note {i}', author=self.sergeant)
+        resp = self.client.post(f'/api/v1/cases/{self.case.id}/journal/', {'body': 'note 3'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        resp = self.client.get(f'/api/v1/cases/{self.case.id}/journal/')
+        self.assertEqual(resp.data['count'], 4)
+        self.assertEqual([entry['body'] for entry in resp.data['results']], ['note 0', 'note 1', 'note 2', 'note 3'])
+
+    def test_custody_entries_form_a_verifiable_hash_chain(self):
+        url = f'/api/v1/cases/{self.case.id}/other-evidence/{self.evidence.id}/custody/'
+        for body in ['Collected at scene', 'Handed to lab']:
+            resp = self.client.post(url, {'body': body}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        resp = self.client.get(url)
+        first, second = resp.data['results']
+        self.assertEqual(first['prev_hash'], '')
+        self.assertEqual(second['prev_hash'], first['entry_hash'])
+        self.assertIsNone(JournalEntry.objects.verify_custody(self.evidence))
+        self.assertEqual(self.evidence.chain_of_custody, 'Collected at scene\nHanded to lab')
+
+    def test_custody_text_cannot_be_patched(self):
+        url = f'/api/v1/cases/{self.case.id}/other-evidence/{self.evidence.id}/'
+        resp = self.client.patch(url, {'chain_of_custody': 'Rewritten', 'notes': 'N'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('chain_of_custody', resp.data)
+        resp = self.client.patch(url, {'notes': 'N'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_deleting_an_author_keeps_entries_and_the_chain(self):
+        officer = make_user('officer_journal')
+        entry = JournalEntry.objects.append(self.evidence, JournalKind.CUSTODY, 'Collected', author=officer)
+        JournalEntry.objects.append(self.evidence, JournalKind.CUSTODY, 'Handed to lab', author=self.sergeant)
+        officer.delete()
+        entry = JournalEntry.objects.get(pk=entry.pk)
+        self.assertIsNone(entry.author_id)
+        self.assertIsNotNone(entry.author_ref)
+        self.assertIsNone(JournalEntry.objects.verify_custody(self.evidence))
+
+    def test_entries_are_insert_only(self):
+        entry = JournalEntry.objects.append(self.evidence, JournalKind.CUSTODY, 'Collected')
+        entry.body = 'Tampered'
+        with self.assertRaises(ValidationError):
+            entry.save()
+        with self.assertRaises(ValidationError):
+            JournalEntry.objects.for_entity(self.evidence).update(body='Tampered')
+        with self.assertRaises(ValidationError):
+            entry.delete()
+
+    def test_deleting_a_case_keeps_its_journal(self):
+        JournalEntry.objects.append(self.case, JournalKind.NOTE, 'Lead followed')
+        JournalEntry.objects.append(self.evidence, JournalKind.CUSTODY, 'Collected')
+        self.case.delete()
+        self.assertEqual(JournalEntry.objects.count(), 2)
+
+    def test_evidence_list_loads_custody_in_one_query(self):
+        other = OtherEvidence.objects.create(
+            case=self.case, description='Rope', location='Hall', collected_date=timezone.now(),
+            evidence_type='OTHER', item_name='Rope', item_category='Tool',
+            physical_description='Hemp', condition='Cut',
+        )
+        JournalEntry.objects.append(self.evidence, JournalKind.CUSTODY, 'Collected')
+        JournalEntry.objects.append(other, JournalKind.CUSTODY, 'Bagged')
+        evidence = list(OtherEvidence.objects.filter(case=self.case).with_journal().order_by('id'))
+        with self.assertNumQueries(0):
+            self.assertEqual([item.chain_of_custody for item in evidence], ['Collected', 'Bagged'])
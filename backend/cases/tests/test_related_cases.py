@@ -0,0 +1,137 @@
+"""
+Related-case recommender: hashed TF-IDF index built in memory or from an .npz snapshot,
+new cases appended incrementally, and the /cases/{id}/related/ endpoint.
+"""
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, OtherEvidence
+from cases.services import RelatedCaseIndex, get_related_index, reset_related_index
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % (10**12)
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+def make_case(title, description, location='Downtown'):
+    return Case.objects.create(
+        title=title,
+        description=description,
+        incident_date=timezone.now(),
+        incident_location=location,
+        status=CaseStatus.UNDER_INVESTIGATION,
+    )
+
+
+class RelatedCaseIndexTestCase(TestCase):
+
+    def test_cosine_ranking(self):
+        index = RelatedCaseIndex.build([
+            (1, 'burglary through the rear window at night, safe cracked with a drill'),
+            (2, 'rear window forced at night and the safe drilled open'),
+            (3, 'hit and run on the highway, red pickup truck fled'),
+        ])
+        ranked = index.related(1, 'burglary through the rear window at night, safe cracked with a drill')
+        self.assertEqual(ranked[0][0], 2)
+        self.assertLessEqual(ranked[0][1], 1.0)
+        self.assertTrue(all(score < ranked[0][1] / 2 for _, score in ranked[1:]))
+
+    def test_snapshot_round_trip(self):
+        index = RelatedCaseIndex.build([(1, 'stolen red bicycle'), (2, 'red bicycle stolen from garage')])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'related.npz')
+            index.save(path)
+            loaded = RelatedCaseIndex.load(path)
+        self.assertEqual(loaded.related(1, 'stolen red bicycle'), index.related(1, 'stolen red bicycle'))
+
+
+class RelatedCasesEndpointTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'related.npz')
+        override = override_settings(RELATED_CASES_INDEX_PATH=self.path)
+        override.enable()
+        self.addCleanup(override.disable)
+        reset_related_index()
+        self.addCleanup(reset_related_index)
+
+        self.client = APIClient()
+        self.detective = make_user('detective_related')
+        self.detective.roles.add(Role.objects.get_or_create(name='Detective', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=self.detective)
+
+        self.poisoning = make_case('Poisoned tea', 'Victim poisoned with arsenic in afternoon tea', 'Hollywood')
+        self.older = make_case('Arsenic case', 'Arsenic found in the tea cup of the victim', 'Hollywood')
+        OtherEvidence.objects.create(
+            case=self.older, title='Tea cup', description='Porcelain tea cup with arsenic residue',
+            location='Kitchen', collected_date=timezone.now(), evidence_type='OTHER',
+        )
+        make_case('Bank robbery', 'Armed men robbed the bank vault', 'Downtown')
+
+    def test_related_cases_ranked_by_similarity(self):
+        resp = self.client.get(f'/api/v1/cases/{self.poisoning.id}/related/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        data = resp.data['data']
+        self.assertEqual(data[0]['id'], self.older.id)
+        self.assertEqual(data[0]['case_number'], self.older.case_number)
+        self.assertNotIn(self.poisoning.id, [row['id'] for row in data])
+
+    def test_new_cases_are_added_after_snapshot(self):
+        out = StringIO()
+        call_command('build_related_cases_index', stdout=out)
+        self.assertIn('Completed!', out.getvalue())
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(len(get_related_index()), 3)
+
+        newer = make_case('Tea poisoning again', 'Another victim poisoned with arsenic tea', 'Hollywood')
+        resp = self.client.get(f'/api/v1/cases/{self.poisoning.id}/related/?limit=2')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertIn(newer.id, [row['id'] for row in resp.data['data']])
+        self.assertEqual(len(get_related_index()), 4)
+
+    def test_edits_and_deleted_evidence_are_followed_after_snapshot(self):
+        call_command('build_related_cases_index', stdout=StringIO())
+        related = [pk for pk, _ in get_related_index().related(self.poisoning.id, 'arsenic tea cup')]
+        self.assertEqual(related[0], self.older.id)
+
+        self.older.otherevidence_set.all().delete()
+        self.older.title, self.older.description = 'Vault case', 'Robbers emptied the vault'
+        self.older.save()
+        index = get_related_index()
+        self.assertEqual(len(index), 3)
+        self.assertNotIn(self.older.id, [pk for pk, _ in index.related(self.poisoning.id, 'arsenic tea cup')])
+
+    def test_cadet_cannot_query(self):
+        cadet = make_user('cadet_related')
+        cadet.roles.add(Role.objects.get_or_create(name='Cadet', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=cadet)
+        resp = self.client.get(f'/api/v1/cases/{self.poisoning.id}/related/')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_limit(self):
+        resp = self.client.get(f'/api/v1/cases/{self.poisoning.id}/related/?limit=x')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
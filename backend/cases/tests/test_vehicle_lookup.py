@@ -0,0 +1,123 @@
+"""
+Cross-case vehicle lookup on normalized plate/VIN keys: formatting variations, Persian digits,
+OCR confusions and wildcard partial plates.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, VehicleEvidence
+from cases.plates import normalize_plate, normalize_vin, plate_pattern
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % (10**12)
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+def make_case(title):
+    return Case.objects.create(
+        title=title,
+        description='Description',
+        incident_date=timezone.now(),
+        incident_location='Somewhere',
+        status=CaseStatus.UNDER_INVESTIGATION,
+    )
+
+
+def make_vehicle(case, **kwargs):
+    defaults = dict(
+        case=case,
+        description='Car',
+        location='Street',
+        collected_date=timezone.now(),
+        evidence_type='VEHICLE',
+        vehicle_type='Car',
+    )
+    defaults.update(kwargs)
+    return VehicleEvidence.objects.create(**defaults)
+
+
+class PlateNormalizationTestCase(TestCase):
+
+    def test_separators_case_and_persian_digits(self):
+        self.assertEqual(normalize_plate('12 b-345 ۶۷'), '12B34567')
+        self.assertEqual(normalize_plate('۱۲ب۳۴۵'), normalize_plate('12ب345'))
+
+    def test_vin_letters_never_used_in_vins(self):
+        self.assertEqual(normalize_vin('1hg-cm8263 3a0O4352'), '1HGCM82633A004352')
+
+    def test_wildcard_pattern(self):
+        prefix, regex = plate_pattern('12b*5?')
+        self.assertEqual(prefix, '128')
+        self.assertEqual(regex, '^128.*5.$')
+
+
+class VehicleLookupTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        role = Role.objects.get_or_create(name='Police Officer', defaults={'is_active': True})[0]
+        self.officer = make_user('officer_vehicle')
+        self.officer.roles.add(role)
+        self.client.force_authenticate(user=self.officer)
+        self.case_a = make_case('Robbery')
+        self.case_b = make_case('Hit and run')
+        self.vehicle_a = make_vehicle(self.case_a, license_plate='12 B 345-67')
+        self.vehicle_b = make_vehicle(self.case_b, license_plate='12B34567')
+        self.vehicle_c = make_vehicle(self.case_b, vin_number='1HGCM82633A004352')
+
+    def test_keys_populated_on_save(self):
+        self.assertEqual(self.vehicle_a.plate_key, '12B34567')
+        self.assertEqual(self.vehicle_a.plate_ocr_key, '12834567')
+
+    def test_lookup_returns_every_case_with_the_plate(self):
+        resp = self.client.get('/api/v1/vehicles/lookup/', {'plate': '12-b-345 67'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        case_ids = {item['id'] for item in resp.data['data']['cases']}
+        self.assertEqual(case_ids, {self.case_a.id, self.case_b.id})
+        self.assertTrue(all(item['match'] == 'exact' for item in resp.data['data']['evidence']))
+
+    def test_ocr_confusion_matches_as_fuzzy(self):
+        resp = self.client.get('/api/v1/vehicles/lookup/', {'plate': '1Z8 34S67'})
+        evidence = resp.data['data']['evidence']
+        self.assertEqual(len(evidence), 2)
+        self.assertTrue(all(item['match'] == 'ocr' for item in evidence))
+
+    def test_wildcard_partial_plate(self):
+        resp = self.client.get('/api/v1/vehicles/lookup/', {'plate': '12B*67'})
+        self.assertEqual(len(resp.data['data']['evidence']), 2)
+        resp = self.client.get('/api/v1/vehicles/lookup/', {'plate': '99*'})
+        self.assertEqual(resp.data['data']['evidence'], [])
+
+    def test_vin_lookup(self):
+        resp = self.client.get('/api/v1/vehicles/lookup/', {'vin': '1hgcm82633a0O4352'})
+        self.assertEqual([item['id'] for item in resp.data['data']['evidence']], [self.vehicle_c.id])
+
+    def test_query_required(self):
+        resp = self.client.get('/api/v1/vehicles/lookup/')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_backfill_command_normalizes_existing_rows(self):
+        VehicleEvidence.objects.filter(pk=self.vehicle_a.pk).update(plate_key='', plate_ocr_key='')
+        call_command('backfill_vehicle_keys', batch_size=1, stdout=StringIO())
+        self.vehicle_a.refresh_from_db()
+        self.assertEqual(self.vehicle_a.plate_key, '12B34567')
@@ -3,28 +3,31 @@ from rest_framework.routers import DefaultRouter
 
 from .views.case import CaseViewSet
 from .views.complaint import ComplaintViewSet
+from .views.lookup import VehicleLookupViewSet, DocumentAttributeSearchViewSet
 from .views.evidence import (
     WitnessTestimonyViewSet,
     BiologicalEvidenceViewSet,
     VehicleEvidenceViewSet,
     DocumentEvidenceViewSet,
     OtherEvidenceViewSet,
+    EvidenceBulkImportView,
 )
 
 # Reusable action maps for nested case evidence view sets (same CRUD surface each)
 LIST_CREATE = {'get': 'list', 'post': 'create'}
 DETAIL = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+CUSTODY = ('custody/', {'get': 'custody', 'post': 'custody'})
 
 
 def case_evidence_paths(prefix, viewset, list_name, detail_name=None, extra_actions=None):
-    """Build list+detail paths for evidence nested under a case. Optionally add extra action paths."""
+    """Build list+detail+custody paths for evidence nested under a case. Optionally add extra action paths."""
     detail_name = detail_name or f'{list_name.rstrip("s")}-detail'  # e.g. case-witness-testimonies -> case-witness-testimony-detail
     base = f'cases/<int:case_pk>/{prefix}'
     paths = [
         path(f'{base}/', viewset.as_view(LIST_CREATE), name=list_name),
         path(f'{base}/<int:pk>/', viewset.as_view(DETAIL), name=detail_name),
     ]
-    for action_path, method_action in (extra_actions or []):
+    for action_path, method_action in [CUSTODY, *(extra_actions or [])]:
         name = f'{detail_name.replace("-detail", "")}-{action_path.rstrip("/")}'
         paths.append(path(f'{base}/<int:pk>/{action_path}', viewset.as_view(method_action), name=name))
     return paths
@@ -33,21 +36,33 @@ def case_evidence_paths(prefix, viewset, list_name, detail_name=None, extra_acti
 router = DefaultRouter()
 router.register(r'cases', CaseViewSet, basename='case')
 router.register(r'complaints', ComplaintViewSet, basename='complaint')
+router.register(r'vehicles', VehicleLookupViewSet, basename='vehicle')
+router.register(r'documents', DocumentAttributeSearchViewSet, basename='document')
 
 app_name = 'cases'
 
 urlpatterns = [
-    *case_evidence_paths('witness-testimonies', WitnessTestimonyViewSet, 'case-witness-testimonies', 'case-witness-testimony-detail'),
+    *case_evidence_paths(
+        'witness-testimonies',
+        WitnessTestimonyViewSet,
+        'case-witness-testimonies',
+        'case-witness-testimony-detail',
+        extra_actions=[('related/', {'get': 'related'})],
+    ),
     *case_evidence_paths(
         'biological-evidence',
         BiologicalEvidenceViewSet,
         'case-biological-evidence',
         'case-biological-evidence-detail',
-        extra_actions=[('coroner-approvals/', {'post': 'coroner_approvals'})],
+        extra_actions=[
+            ('coroner-approvals/', {'post': 'coroner_approvals'}),
+            ('profiles/', {'get': 'profiles', 'post': 'profiles'}),
+        ],
     ),
     *case_evidence_paths('vehicle-evidence', VehicleEvidenceViewSet, 'case-vehicle-evidence', 'case-vehicle-evidence-detail'),
     *case_evidence_paths('document-evidence', DocumentEvidenceViewSet, 'case-document-evidence', 'case-document-evidence-detail'),
     *case_evidence_paths('other-evidence', OtherEvidenceViewSet, 'case-other-evidence', 'case-other-evidence-detail'),
+    path('cases/<int:case_pk>/evidence/bulk/', EvidenceBulkImportView.as_view(), name='case-evidence-bulk'),
     path('cases/<int:case_pk>/investigation/', include('investigation.case_urls')),
     path('', include(router.urls)),
 ]
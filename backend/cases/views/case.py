@@ -10,7 +10,12 @@ from django.utils import timezone
 
 from cases.models import Case, CaseStatus
 from investigation.models import SuspectCaseLink, DetectiveReport
-from core.models import UserProfile
+from core.models import UserProfile, JournalEntry, JournalKind, PaymentPurpose
+from core.services.ledger import PaymentFailed, charge, record_collection
+from core.serializers import JournalEntrySerializer, JournalAppendSerializer
+from cases.services import TimelineCursorError, case_timeline, encode_cursor, decode_cursor, visible_cases
+from cases.services.timeline import DEFAULT_TIMELINE_LIMIT, MAX_TIMELINE_LIMIT
+from cases.services.related_cases import DEFAULT_RELATED_LIMIT, MAX_RELATED_LIMIT, related_cases
 from cases.serializers.case import (
     CaseListSerializer,
     CaseDetailSerializer,
@@ -27,6 +32,8 @@ from cases.serializers.evidence import (
     DocumentEvidenceSerializer,
     OtherEvidenceSerializer,
 )
+from core.fieldsets import SparseFieldsetMixin
+from core.streaming import STREAM_CHUNK_SIZE, stream_json, wants_stream
 from accounts.permissions import (
     IsPoliceRankExceptCadet,
     IsPoliceChief,
@@ -41,7 +48,7 @@ from accounts.permissions import (
 )
 
 
-class CaseViewSet(viewsets.ModelViewSet):
+class CaseViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Case.objects.select_related(
         'assigned_detective'
     ).prefetch_related(
@@ -75,6 +82,14 @@ class CaseViewSet(viewsets.ModelViewSet):
             return [IsDetectiveOrSergeantOrChief()]
         if self.action == 'approve':
             return [IsPoliceRankExceptCadet()]
+        if self.action == 'timeline':
+            return [IsCadetOrOfficer()]
+        if self.action == 'related':
+            return [IsDetectiveOrSergeantOrChief()]
+        if self.action == 'journal':
+            if self.request.method == 'POST':
+                return [IsDetectiveOrSergeantOrChief()]
+            return [IsCadetOrOfficer()]
         if self.action == 'assign_detective':
             return [IsSergeantOrCaptainOrChief()]
         if self.action == 'statistics':
@@ -82,25 +97,7 @@ class CaseViewSet(viewsets.ModelViewSet):
         return [IsAuthenticated()]
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = self.queryset
-
-        if user.has_role('Detective'):
-            queryset = queryset.filter(
-                Q(assigned_detective=user)
-                | Q(team_members=user)
-                | Q(status__in=[CaseStatus.OPEN, CaseStatus.UNDER_INVESTIGATION])
-            ).distinct()
-        elif user.has_role('Cadet'):
-            queryset = queryset.filter(status=CaseStatus.OPEN)
-        elif user.has_any_role(['Police Officer', 'Sergeant', 'Captain', 'Police Chief']):
-            pass
-        elif user.is_superuser or user.has_role('System Administrator'):
-            pass
-        elif user.has_role('Judge'):
-            queryset = queryset.filter(trial__isnull=False)  # only cases with trials
-        else:
-            queryset = queryset.none()
+        queryset = visible_cases(self.request.user, self.queryset)
 
         without_trial = self.request.query_params.get('without_trial')
         if without_trial:
@@ -182,9 +179,9 @@ class CaseViewSet(viewsets.ModelViewSet):
         with transaction.atomic():
             if action_type == 'approve':
                 case.status = CaseStatus.UNDER_INVESTIGATION
-                if message:
-                    case.notes += f"\n\nApproval note: {message}"
                 case.save()
+                if message:
+                    JournalEntry.objects.append(case, JournalKind.APPROVAL, message, author=request.user)
 
                 return Response({
                     'status': 'success',
@@ -194,9 +191,9 @@ class CaseViewSet(viewsets.ModelViewSet):
 
             else:
                 case.status = CaseStatus.CLOSED
-                if message:
-                    case.notes += f"\n\nRejection note: {message}"
                 case.save()
+                if message:
+                    JournalEntry.objects.append(case, JournalKind.REJECTION, message, author=request.user)
 
                 return Response({
                     'status': 'success',
@@ -204,6 +201,79 @@ class CaseViewSet(viewsets.ModelViewSet):
                     'message': 'Case rejected'
                 })
 
+    @action(detail=True, methods=['get', 'post'], url_path='journal')
+    def journal(self, request, pk=None):
+        """Paginated case journal (oldest first); POST appends a note."""
+        case = self.get_object()
+        if request.method == 'POST':
+            serializer = JournalAppendSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            entry = JournalEntry.objects.append(
+                case, JournalKind.NOTE, serializer.validated_data['body'], author=request.user
+            )
+            return Response(
+                {'status': 'success', 'data': JournalEntrySerializer(entry).data},
+                status=status.HTTP_201_CREATED
+            )
+        entries = JournalEntry.objects.for_entity(case).select_related('author').order_by('id')
+        page = self.paginate_queryset(entries)
+        return self.get_paginated_response(JournalEntrySerializer(page, many=True).data)
+
+    @action(detail=True, methods=['get'], url_path='related')
+    def related(self, request, pk=None):
+        """Earlier cases with the most similar text (TF-IDF cosine), best first; ?limit= up to 50."""
+        case = self.get_object()
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_RELATED_LIMIT)), 1), MAX_RELATED_LIMIT)
+        except ValueError:
+            return Response(
+                {'status': 'error', 'message': 'limit must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({'status': 'success', 'data': related_cases(case, limit=limit)})
+
+    @action(detail=True, methods=['get'], url_path='timeline')
+    def timeline(self, request, pk=None):
+        """Newest-first activity feed; page with ?before=<cursor> or ?after=<cursor>."""
+        case = self.get_object()
+        before = request.query_params.get('before')
+        after = request.query_params.get('after')
+        if before and after:
+            return Response(
+                {'status': 'error', 'message': 'Use either before or after, not both.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_TIMELINE_LIMIT)), 1), MAX_TIMELINE_LIMIT)
+        except ValueError:
+            return Response(
+                {'status': 'error', 'message': 'limit must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            events, has_more = case_timeline(
+                case,
+                limit=limit,
+                before=decode_cursor(before) if before else None,
+                after=decode_cursor(after) if after else None,
+            )
+        except TimelineCursorError as exc:
+            return Response(
+                {'status': 'error', 'message': str(exc)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        for event in events:
+            event['cursor'] = encode_cursor(event)
+        return Response({
+            'status': 'success',
+            'data': {
+                'events': events,
+                'has_more': has_more,
+                'before': events[-1]['cursor'] if events else None,
+                'after': events[0]['cursor'] if events else None,
+            },
+        })
+
     @action(detail=True, methods=['put'], url_path='assigned-detective')
     def assign_detective(self, request, pk=None):
         case = get_object_or_404(Case, pk=pk)
@@ -352,6 +422,8 @@ class CaseViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='all-names')
     def all_names(self, request):
         rows = Case.objects.order_by('-created_at').values('id', 'case_number', 'title')
+        if wants_stream(request):
+            return stream_json(rows.iterator(chunk_size=STREAM_CHUNK_SIZE))
         return Response({'status': 'success', 'data': list(rows)})
 
     @action(detail=True, methods=['get'], url_path='suspects/names')
@@ -381,10 +453,11 @@ class CaseViewSet(viewsets.ModelViewSet):
         else:
             queryset = queryset.none()
 
-        serializer = CaseListSerializer(queryset, many=True)
+        if wants_stream(request):
+            return stream_json(self.iter_list(queryset))
         return Response({
             'status': 'success',
-            'data': serializer.data
+            'data': self.serialize_list(queryset)
         })
 
     @action(detail=True, methods=['get'], url_path='report')
@@ -512,7 +585,7 @@ class CaseViewSet(viewsets.ModelViewSet):
             return Response({"error": "Sergeant approval is required for release."}, status=status.HTTP_400_BAD_REQUEST)
         
         # Process the payment (this is where payment gateway logic is triggered)
-        payment_successful = self.process_payment(case.bail_amount or case.fine_amount)
+        payment_successful = self.process_payment(case, case.bail_amount or case.fine_amount)
         
         if payment_successful:
             # Update the case status to "RELEASED"
@@ -522,7 +595,15 @@ class CaseViewSet(viewsets.ModelViewSet):
         else:
             return Response({"error": "Payment failed."}, status=status.HTTP_400_BAD_REQUEST)
 
-    def process_payment(self, amount):
-        # Implement your payment gateway integration here (e.g., Stripe)
-        # For this example, we simulate payment success
-        return True  # Simulating a successful payment
\ No newline at end of file
+    def process_payment(self, case, amount):
+        """Charge the case's bail or fine through the payment gateway and post it to the ledger."""
+        if not amount:
+            return False
+        purpose = PaymentPurpose.BAIL if case.bail_amount else PaymentPurpose.FINE
+        key = f'case-release:{case.pk}'
+        try:
+            reference = charge(key, purpose, amount, source=case)
+        except PaymentFailed:
+            return False
+        record_collection(key, purpose, amount, case, reference)
+        return True
\ No newline at end of file
@@ -14,10 +14,32 @@ from cases.serializers.complaint import (
     CadetReviewSerializer,
     OfficerReviewSerializer
 )
-from accounts.permissions import IsComplainant, IsCadet, IsOfficer
+from cases.services import DEFAULT_DUPLICATES_LIMIT, MAX_DUPLICATES_LIMIT, find_similar
+from cases.models.similarity import DEFAULT_MIN_SIMILARITY
+from core.fieldsets import SparseFieldsetMixin
+from accounts.permissions import IsComplainant, IsCadet, IsOfficer, IsCadetOrOfficer
+
+
+def similar_texts_response(obj, query_params):
+    """Response listing indexed complaints/testimonies similar to `obj` (?min_similarity=, ?limit=)."""
+    try:
+        limit = min(max(int(query_params.get('limit', DEFAULT_DUPLICATES_LIMIT)), 1), MAX_DUPLICATES_LIMIT)
+        min_similarity = float(query_params.get('min_similarity', DEFAULT_MIN_SIMILARITY))
+    except ValueError:
+        return Response(
+            {'status': 'error', 'message': 'limit must be an integer and min_similarity a number.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not 0 < min_similarity <= 1:
+        return Response(
+            {'status': 'error', 'message': 'min_similarity must be in (0, 1].'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    matches = find_similar(obj, min_similarity=min_similarity, limit=limit)
+    return Response({'status': 'success', 'data': matches})
 
 
-class ComplaintViewSet(viewsets.ModelViewSet):
+class ComplaintViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Complaint.objects.select_related(
         'complainant',
         'reviewed_by_cadet',
@@ -41,6 +63,8 @@ class ComplaintViewSet(viewsets.ModelViewSet):
             return [IsCadet()]
         if self.action == 'officer_review':
             return [IsOfficer()]
+        if self.action == 'possible_duplicates':
+            return [IsCadetOrOfficer()]
         if self.action == 'list':
             return [IsAuthenticated()]
         return [IsAuthenticated()]
@@ -166,4 +190,8 @@ class ComplaintViewSet(viewsets.ModelViewSet):
                     'message': 'Complaint returned to cadet for re-review'
                 })
 
-
+    @action(detail=True, methods=['get'], url_path='possible-duplicates')
+    def possible_duplicates(self, request, pk=None):
+        """Complaints and witness testimonies whose text nearly matches this complaint."""
+        complaint = get_object_or_404(Complaint, pk=pk)
+        return similar_texts_response(complaint, request.query_params)
@@ -1,8 +1,11 @@
 from django.utils import timezone
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
 from django.contrib.contenttypes.models import ContentType
 
@@ -13,8 +16,13 @@ from cases.models import (
     VehicleEvidence,
     DocumentEvidence,
     OtherEvidence,
+    TextFingerprint,
 )
 from investigation.models import Notification
+from investigation.serializers.profile import BiologicalProfileCreateSerializer, BiologicalProfileSerializer
+from investigation.services.profile_matching import create_profile
+from core.models import JournalEntry, JournalKind
+from core.serializers import JournalEntrySerializer, JournalAppendSerializer
 from cases.serializers.evidence import (
     WitnessTestimonyCreateSerializer,
     WitnessTestimonySerializer,
@@ -28,6 +36,15 @@ from cases.serializers.evidence import (
     OtherEvidenceCreateSerializer,
     OtherEvidenceSerializer,
 )
+from cases.views.complaint import similar_texts_response
+from cases.services import (
+    ManifestError,
+    parse_manifest,
+    open_media_archive,
+    validate_rows,
+    bulk_create_evidence,
+)
+from core.fieldsets import SparseFieldsetMixin
 from accounts.permissions import IsCadetOrOfficer, IsDetective, IsDetectiveOrSergeantOrChief, IsCoroner
 
 
@@ -43,24 +60,60 @@ def notify_detective_new_evidence(case, content_object, message=''):
     )
 
 
+def notify_detective_evidence_digest(case, count):
+    """One notification summarising a batch of evidence added to the case."""
+    if not case.assigned_detective or not count:
+        return
+    Notification.objects.create(
+        case=case,
+        recipient=case.assigned_detective,
+        content_type=ContentType.objects.get_for_model(Case),
+        object_id=case.pk,
+        message=f'{count} evidence items added to case {case.case_number}',
+    )
+
+
 class CaseEvidenceMixin:
     def get_case(self):
         return get_object_or_404(Case, pk=self.kwargs['case_pk'])
 
+    @action(detail=True, methods=['get', 'post'], url_path='custody')
+    def custody(self, request, case_pk=None, pk=None):
+        """Paginated chain of custody (oldest first); POST appends a hash-chained entry."""
+        evidence = self.get_object()
+        if request.method == 'POST':
+            serializer = JournalAppendSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            entry = JournalEntry.objects.append(
+                evidence, JournalKind.CUSTODY, serializer.validated_data['body'], author=request.user
+            )
+            return Response(
+                {'status': 'success', 'data': JournalEntrySerializer(entry).data},
+                status=status.HTTP_201_CREATED
+            )
+        entries = (
+            JournalEntry.objects.for_entity(evidence)
+            .filter(kind=JournalKind.CUSTODY)
+            .select_related('author')
+            .order_by('id')
+        )
+        page = self.paginate_queryset(entries)
+        return self.get_paginated_response(JournalEntrySerializer(page, many=True).data)
+
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsCadetOrOfficer()]
         return [IsCadetOrOfficer()]
 
 
-class WitnessTestimonyViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
+class WitnessTestimonyViewSet(CaseEvidenceMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = WitnessTestimonySerializer
     permission_classes = [IsCadetOrOfficer]
 
     def get_queryset(self):
         return WitnessTestimony.objects.filter(
             case_id=self.kwargs['case_pk']
-        ).select_related('collected_by').order_by('-collected_date')
+        ).select_related('collected_by').with_journal().order_by('-collected_date')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -72,6 +125,10 @@ class WitnessTestimonyViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
         instance = serializer.save()
         notify_detective_new_evidence(case, instance)
 
+    def perform_update(self, serializer):
+        instance = serializer.save()
+        TextFingerprint.objects.index([instance])
+
     def create(self, request, *args, **kwargs):
         case = self.get_case()
         serializer = self.get_serializer(data=request.data, context={'request': request, 'case': case})
@@ -82,8 +139,13 @@ class WitnessTestimonyViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
 
+    @action(detail=True, methods=['get'], url_path='related')
+    def related(self, request, case_pk=None, pk=None):
+        """Testimonies and complaints, in any case, whose text nearly matches this testimony."""
+        return similar_texts_response(self.get_object(), request.query_params)
 
-class BiologicalEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
+
+class BiologicalEvidenceViewSet(CaseEvidenceMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = BiologicalEvidenceSerializer
     permission_classes = [IsCadetOrOfficer]
 
@@ -95,7 +157,7 @@ class BiologicalEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
     def get_queryset(self):
         return BiologicalEvidence.objects.filter(
             case_id=self.kwargs['case_pk']
-        ).select_related('collected_by', 'coroner_approved_by').order_by('-collected_date')
+        ).select_related('collected_by', 'coroner_approved_by').with_journal().order_by('-collected_date')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -117,6 +179,25 @@ class BiologicalEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
             status=status.HTTP_201_CREATED
         )
 
+    @action(detail=True, methods=['get', 'post'], url_path='profiles')
+    def profiles(self, request, case_pk=None, pk=None):
+        """STR / minutiae profiles of this sample; POST stores one and matches it against the database."""
+        evidence = self.get_object()
+        if request.method == 'POST':
+            serializer = BiologicalProfileCreateSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            profile, matches = create_profile(evidence=evidence, **serializer.validated_data)
+            return Response(
+                {
+                    'status': 'success',
+                    'data': BiologicalProfileSerializer(profile).data,
+                    'message': f'{len(matches)} candidate match(es) found.',
+                },
+                status=status.HTTP_201_CREATED
+            )
+        profiles = evidence.profiles.prefetch_related('matches__candidate')
+        return Response({'status': 'success', 'data': BiologicalProfileSerializer(profiles, many=True).data})
+
     @action(detail=True, methods=['post'], url_path='coroner-approvals')
     def coroner_approvals(self, request, case_pk=None, pk=None):
         evidence = get_object_or_404(BiologicalEvidence, case_id=case_pk, pk=pk)
@@ -139,14 +220,14 @@ class BiologicalEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
         })
 
 
-class VehicleEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
+class VehicleEvidenceViewSet(CaseEvidenceMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = VehicleEvidenceSerializer
     permission_classes = [IsCadetOrOfficer]
 
     def get_queryset(self):
         return VehicleEvidence.objects.filter(
             case_id=self.kwargs['case_pk']
-        ).select_related('collected_by').order_by('-collected_date')
+        ).select_related('collected_by').with_journal().order_by('-collected_date')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -169,14 +250,14 @@ class VehicleEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
         )
 
 
-class DocumentEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
+class DocumentEvidenceViewSet(CaseEvidenceMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = DocumentEvidenceSerializer
     permission_classes = [IsCadetOrOfficer]
 
     def get_queryset(self):
         return DocumentEvidence.objects.filter(
             case_id=self.kwargs['case_pk']
-        ).select_related('collected_by').order_by('-collected_date')
+        ).select_related('collected_by').with_journal().order_by('-collected_date')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -199,14 +280,14 @@ class DocumentEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
         )
 
 
-class OtherEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
+class OtherEvidenceViewSet(CaseEvidenceMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = OtherEvidenceSerializer
     permission_classes = [IsCadetOrOfficer]
 
     def get_queryset(self):
         return OtherEvidence.objects.filter(
             case_id=self.kwargs['case_pk']
-        ).select_related('collected_by').order_by('-collected_date')
+        ).select_related('collected_by').with_journal().order_by('-collected_date')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -227,3 +308,62 @@ class OtherEvidenceViewSet(CaseEvidenceMixin, viewsets.ModelViewSet):
             {'status': 'success', 'data': OtherEvidenceSerializer(instance=serializer.instance).data},
             status=status.HTTP_201_CREATED
         )
+
+
+class EvidenceBulkImportView(APIView):
+    """
+    Register a whole crime scene at once: `manifest` (CSV or JSONL, one evidence item per row
+    with an `evidence_type` column) plus an optional `media` zip referenced by file fields.
+    Either every row is created or none is.
+    """
+    permission_classes = [IsCadetOrOfficer]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, case_pk=None):
+        case = get_object_or_404(Case.objects.select_related('assigned_detective'), pk=case_pk)
+        manifest = request.FILES.get('manifest')
+        if manifest is None:
+            return Response(
+                {'status': 'error', 'message': 'manifest file is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            rows = parse_manifest(manifest, request.data.get('format'))
+            media = open_media_archive(request.FILES.get('media'))
+        except ManifestError as exc:
+            return Response({'status': 'error', 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        validated, errors = validate_rows(case, rows, request, media)
+        if errors:
+            return Response(
+                {
+                    'status': 'error',
+                    'message': f'{len(errors)} of {len(rows)} rows are invalid; nothing was imported.',
+                    'errors': errors,
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            created = bulk_create_evidence(validated)
+        except DjangoValidationError as exc:
+            return Response(
+                {'status': 'error', 'message': ' '.join(exc.messages)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        total = sum(len(items) for items in created.values())
+        notify_detective_evidence_digest(case, total)
+        return Response(
+            {
+                'status': 'success',
+                'data': {
+                    'created': {evidence_type: len(items) for evidence_type, items in created.items()},
+                    'evidence_numbers': {
+                        evidence_type: [item.evidence_number for item in items]
+                        for evidence_type, items in created.items()
+                    },
+                },
+                'message': f'{total} evidence items imported.',
+            },
+            status=status.HTTP_201_CREATED
+        )
@@ -0,0 +1,150 @@
+from django.db.models import Q
+from django.db.models.fields.json import KeyTextTransform
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from cases.models import VehicleEvidence, DocumentEvidence
+from cases.attributes import attribute_value_candidates, normalize_attribute_key
+from cases.plates import normalize_plate, normalize_vin, ocr_fold, has_wildcards, plate_pattern
+from accounts.permissions import IsCadetOrOfficer
+
+MAX_LOOKUP_RESULTS = 200
+MIN_PATTERN_CHARACTERS = 2
+
+
+def _vehicle_payload(vehicle, match):
+    return {
+        'id': vehicle.id,
+        'evidence_number': vehicle.evidence_number,
+        'case': vehicle.case_id,
+        'case_number': vehicle.case.case_number,
+        'vehicle_type': vehicle.vehicle_type,
+        'make': vehicle.make,
+        'model': vehicle.model,
+        'color': vehicle.color,
+        'license_plate': vehicle.license_plate,
+        'vin_number': vehicle.vin_number,
+        'match': match,
+    }
+
+
+def _match_kind(vehicle, vin, exact_key):
+    if exact_key is None:
+        return 'partial'
+    if vin or vehicle.plate_key == exact_key:
+        return 'exact'
+    return 'ocr'
+
+
+class VehicleLookupViewSet(viewsets.ViewSet):
+    """Cross-case vehicle search on normalized plate/VIN keys."""
+    permission_classes = [IsCadetOrOfficer]
+
+    @action(detail=False, methods=['get'], url_path='lookup')
+    def lookup(self, request):
+        plate = request.query_params.get('plate', '').strip()
+        vin = request.query_params.get('vin', '').strip()
+        if not plate and not vin:
+            return Response(
+                {'status': 'error', 'message': 'plate or vin is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = VehicleEvidence.objects.select_related('case').order_by('-collected_date')
+        exact_key = None
+        if vin:
+            exact_key = normalize_vin(vin)
+            queryset = queryset.filter(vin_key=exact_key)
+        elif has_wildcards(plate):
+            if len(normalize_plate(plate)) < MIN_PATTERN_CHARACTERS:
+                return Response(
+                    {
+                        'status': 'error',
+                        'message': f'Partial plates need at least {MIN_PATTERN_CHARACTERS} known characters.',
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            prefix, regex = plate_pattern(plate)
+            if prefix:
+                queryset = queryset.filter(plate_ocr_key__startswith=prefix)
+            queryset = queryset.filter(plate_ocr_key__regex=regex)
+        else:
+            exact_key = normalize_plate(plate)
+            queryset = queryset.filter(Q(plate_key=exact_key) | Q(plate_ocr_key=ocr_fold(exact_key)))
+        if exact_key == '':
+            return Response(
+                {'status': 'error', 'message': 'plate or vin has no letters or digits.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        vehicles = list(queryset[:MAX_LOOKUP_RESULTS])
+        cases = {}
+        for vehicle in vehicles:
+            cases.setdefault(vehicle.case_id, {
+                'id': vehicle.case_id,
+                'case_number': vehicle.case.case_number,
+                'title': vehicle.case.title,
+                'status': vehicle.case.status,
+            })
+        return Response({
+            'status': 'success',
+            'data': {
+                'cases': list(cases.values()),
+                'evidence': [_vehicle_payload(vehicle, _match_kind(vehicle, vin, exact_key)) for vehicle in vehicles],
+            },
+        })
+
+
+class DocumentAttributeSearchViewSet(viewsets.ViewSet):
+    """
+    Cross-case search on `document_attributes`: `?key=national_id&value=123` (exact, matching
+    the string "123" or the number 123),
+    `?key=national_id&prefix=12` or just `?key=national_id` (documents carrying the key).
+    """
+    permission_classes = [IsCadetOrOfficer]
+
+    @action(detail=False, methods=['get'], url_path='attributes')
+    def attributes(self, request):
+        raw_key = request.query_params.get('key', '').strip()
+        key = normalize_attribute_key(raw_key) if raw_key else ''
+        if not key:
+            return Response(
+                {'status': 'error', 'message': 'key is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        value = request.query_params.get('value')
+        prefix = request.query_params.get('prefix')
+
+        queryset = DocumentEvidence.objects.select_related('case').order_by('-collected_date')
+        if value is not None:
+            matches = Q()
+            for candidate in attribute_value_candidates(value):
+                matches |= Q(document_attributes__contains={key: candidate})
+            queryset = queryset.filter(matches)
+        elif prefix:
+            queryset = queryset.annotate(
+                attribute_text=KeyTextTransform(key, 'document_attributes')
+            ).filter(attribute_text__startswith=prefix)
+        else:
+            queryset = queryset.filter(document_attributes__has_key=key)
+
+        documents = list(queryset[:MAX_LOOKUP_RESULTS])
+        return Response({
+            'status': 'success',
+            'data': {
+                'key': key,
+                'evidence': [
+                    {
+                        'id': document.id,
+                        'evidence_number': document.evidence_number,
+                        'case': document.case_id,
+                        'case_number': document.case.case_number,
+                        'document_type': document.document_type,
+                        'owner_full_name': document.owner_full_name,
+                        'value': document.document_attributes.get(key),
+                    }
+                    for document in documents
+                ],
+            },
+        })
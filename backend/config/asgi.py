@@ -6,3 +6,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
 
+from core.services.indexes import warm_indexes  # noqa: E402  (needs the app registry)
+
+warm_indexes()
+
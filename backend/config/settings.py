@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
     'rest_framework_simplejwt',
@@ -100,6 +101,44 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = 'static/'
+RELATED_CASES_INDEX_PATH = os.environ.get('RELATED_CASES_INDEX_PATH', str(BASE_DIR / 'var' / 'related_cases.npz'))
+# In-memory indexes built in the background when the WSGI/ASGI application starts.
+WARM_INDEXES = [
+    path for path in os.environ.get('WARM_INDEXES', ','.join([
+        'cases.services.related_cases.LiveRelatedCaseIndex',
+        'investigation.services.suspect_network.SuspectNetworkIndex',
+        'investigation.services.wanted_watchlist.WantedWatchlist',
+    ])).split(',') if path
+]
+PAYMENT_GATEWAY = {
+    'BACKEND': os.environ.get('PAYMENT_GATEWAY_BACKEND', 'core.services.gateway.SimulatedGateway'),
+    'OPTIONS': {
+        'latency': float(os.environ.get('PAYMENT_GATEWAY_LATENCY', '0.05')),
+        'failure_rate': float(os.environ.get('PAYMENT_GATEWAY_FAILURE_RATE', '0')),
+        'error_rate': float(os.environ.get('PAYMENT_GATEWAY_ERROR_RATE', '0')),
+    },
+    'MAX_CONCURRENCY': int(os.environ.get('PAYMENT_GATEWAY_MAX_CONCURRENCY', '10')),
+    'TIMEOUT': float(os.environ.get('PAYMENT_GATEWAY_TIMEOUT', '10')),
+    'CALLBACK_SECRET': os.environ.get('PAYMENT_GATEWAY_CALLBACK_SECRET', ''),
+}
+# Counters and cached lookups must be shared by every worker: Redis when REDIS_URL is set,
+# otherwise a per-process memory cache (development and tests).
+REDIS_URL = os.environ.get('REDIS_URL', '')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+# Rows a ?stream=true list sends at most (core.streaming).
+STREAM_MAX_ROWS = int(os.environ.get('STREAM_MAX_ROWS', '100000'))
+REWARD_LOOKUP = {
+    'CACHE_TIMEOUT': int(os.environ.get('REWARD_LOOKUP_CACHE_TIMEOUT', '60')),
+    'MAX_FAILURES': int(os.environ.get('REWARD_LOOKUP_MAX_FAILURES', '20')),
+    'FAILURE_WINDOW': int(os.environ.get('REWARD_LOOKUP_FAILURE_WINDOW', '300')),
+}
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
@@ -110,6 +149,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
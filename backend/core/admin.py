@@ -4,6 +4,13 @@ from .models import (
     Document,
     Payment,
     Bail,
+    LedgerAccount,
+    LedgerTransaction,
+    Posting,
+    SettlementBatch,
+    ExportJob,
+    ChangeRecord,
+    ChangeConsumer,
 )
 
 
@@ -14,9 +21,50 @@ class DocumentAdmin(admin.ModelAdmin):
 
 @admin.register(Payment)
 class PaymentAdmin(admin.ModelAdmin):
-    pass
+    list_display = ['idempotency_key', 'purpose', 'direction', 'channel', 'amount', 'status', 'created_at']
+    list_filter = ['status', 'purpose', 'channel']
+    search_fields = ['idempotency_key', 'gateway_reference']
 
 
 @admin.register(Bail)
 class BailAdmin(admin.ModelAdmin):
     pass
+
+
+@admin.register(LedgerAccount)
+class LedgerAccountAdmin(admin.ModelAdmin):
+    list_display = ['code', 'name', 'kind']
+
+
+class PostingInline(admin.TabularInline):
+    model = Posting
+    extra = 0
+
+
+@admin.register(LedgerTransaction)
+class LedgerTransactionAdmin(admin.ModelAdmin):
+    list_display = ['idempotency_key', 'kind', 'created_at']
+    search_fields = ['idempotency_key']
+    inlines = [PostingInline]
+
+
+@admin.register(SettlementBatch)
+class SettlementBatchAdmin(admin.ModelAdmin):
+    list_display = ['id', 'status', 'payment_count', 'net_amount', 'settled_at']
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'dataset', 'output', 'requested_by', 'status', 'row_count', 'created_at', 'finished_at']
+    list_filter = ['status', 'dataset']
+
+
+@admin.register(ChangeRecord)
+class ChangeRecordAdmin(admin.ModelAdmin):
+    list_display = ['id', 'txid', 'entity', 'object_id', 'op', 'version']
+    list_filter = ['op', 'entity']
+
+
+@admin.register(ChangeConsumer)
+class ChangeConsumerAdmin(admin.ModelAdmin):
+    list_display = ['name', 'txid', 'record_id', 'updated_at']
@@ -1,7 +1,23 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import m2m_changed, post_delete
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
 
+    def ready(self):
+        from core.models import ChangeTrackedModel
+        from core.signals import TRACKED_M2M, record_delete, record_m2m_change
+        # Per model, so deletes of untracked models keep Django's fast path.
+        for model in apps.get_models():
+            if issubclass(model, ChangeTrackedModel):
+                post_delete.connect(record_delete, sender=model,
+                                    dispatch_uid=f'core.record_delete.{model._meta.label_lower}')
+        for model in apps.get_models():
+            for field in model._meta.local_many_to_many:
+                if issubclass(field.model, ChangeTrackedModel) or issubclass(field.related_model, ChangeTrackedModel):
+                    through = field.remote_field.through
+                    TRACKED_M2M[through] = field
+                    m2m_changed.connect(record_m2m_change, sender=through,
+                                        dispatch_uid=f'core.record_m2m_change.{through._meta.label_lower}')
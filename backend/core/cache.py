@@ -0,0 +1,26 @@
+"""
+Version-checked caching for assembled read models (dossiers, dockets).
+
+The caller computes a cheap version for the data (typically the latest `updated_at` and row
+counts of everything the value is built from, in one query) and `get_or_build` returns the
+cached value only if it was built from that same version. A change anywhere in the
+underlying rows changes the version, so nothing has to remember to invalidate the entry;
+stale entries are simply overwritten or expire.
+"""
+from django.core.cache import cache
+
+DEFAULT_TIMEOUT = 600
+
+
+def cache_key(namespace, *parts):
+    return ':'.join([namespace, *(str(part) for part in parts)])
+
+
+def get_or_build(key, version, build, timeout=DEFAULT_TIMEOUT):
+    """The value cached under `key` for `version`, else `build()` stored for that version."""
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    value = build()
+    cache.set(key, (version, value), timeout)
+    return value
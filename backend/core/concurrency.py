@@ -0,0 +1,60 @@
+"""
+A small shared thread pool for running independent database reads side by side.
+
+`run_concurrently` takes {name: callable} and returns {name: result}. Each task runs on a
+pool thread with its own database connection, so the reads overlap instead of queueing on
+the request's connection. Inside a transaction (including the one every TestCase runs in)
+other connections cannot see uncommitted rows, so the tasks then run one after another on
+the calling thread instead. They also run inline when the caller is itself a pool task (a
+dashboard built inside a batched GET): waiting there for other pool threads could leave
+every worker waiting and the pool stuck.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, connection
+
+DEFAULT_MAX_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+_pool_thread = threading.local()
+
+
+def _mark_pool_thread():
+    _pool_thread.active = True
+
+
+def get_executor(max_workers=DEFAULT_MAX_WORKERS):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix='db-reads', initializer=_mark_pool_thread,
+            )
+        return _executor
+
+
+def reset_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _run(task):
+    close_old_connections()
+    try:
+        return task()
+    finally:
+        close_old_connections()
+
+
+def run_concurrently(tasks, max_workers=DEFAULT_MAX_WORKERS):
+    """{name: callable} -> {name: result}; exceptions propagate from the first failing task."""
+    if len(tasks) < 2 or connection.in_atomic_block or getattr(_pool_thread, 'active', False):
+        return {name: task() for name, task in tasks.items()}
+    executor = get_executor(max_workers)
+    futures = {name: executor.submit(_run, task) for name, task in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,236 @@
+"""
+Sparse fieldsets for list endpoints, and a projection fast path for read-only lists.
+
+`?fields=a,b` keeps only the named fields of each list item and `?exclude=a,b` drops them;
+naming a field the serializer does not have is a 400.
+
+A serializer can opt into the projection path by declaring `Meta.projection`. Its selected
+fields are then compiled once into a `Projection`: the queryset is narrowed with `.values()`
+to exactly the columns those fields read (a field sourced from `case.case_number` becomes
+the joined column `case__case_number` rather than a related object), and each row dict is
+turned into output by one precompiled function per field, skipping DRF's per-field
+machinery. Fields sourced from a column, or from a chain of foreign keys ending in one, are
+mapped automatically. Computed fields (properties, methods) are declared in
+`Meta.projection` as {name: (paths, fn)}: `fn` receives the values of `paths` and returns
+the field's value, or SKIP to leave the field out of that item. If any selected field can't
+be projected, the list is serialized by DRF as before, still limited to the selected fields.
+
+`SparseFieldsetMixin` wires this into a viewset's `list`; views with their own list
+responses use `serialize_list`, or `iter_list` with core.streaming for streamed lists.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.streaming import STREAM_CHUNK_SIZE, stream_json, wants_stream
+
+SKIP = object()
+
+# Field types whose to_representation returns a column value unchanged.
+PASSTHROUGH = frozenset({
+    serializers.CharField,
+    serializers.EmailField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+    serializers.PrimaryKeyRelatedField,
+})
+# Field types that need more than the column value (a request, a storage, other rows).
+UNPROJECTABLE = (
+    serializers.BaseSerializer,
+    serializers.ManyRelatedField,
+    serializers.SerializerMethodField,
+    serializers.FileField,
+    serializers.HyperlinkedRelatedField,
+)
+
+
+def full_name(first_name, last_name):
+    """`get_full_name()` from the two columns; None when the related user is missing."""
+    if first_name is None and last_name is None:
+        return None
+    return f'{first_name} {last_name}'.strip()
+
+
+def _names(value):
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def readable_fields(serializer):
+    return [field.field_name for field in serializer._readable_fields]
+
+
+def requested_fields(request, available):
+    """The names in `available` kept by ?fields= and ?exclude=, or None if neither is given."""
+    fields = _names(request.query_params.get('fields'))
+    exclude = _names(request.query_params.get('exclude'))
+    if fields is None and exclude is None:
+        return None
+    unknown = ((fields or set()) | (exclude or set())) - set(available)
+    if unknown:
+        raise ValidationError({
+            'status': 'error',
+            'message': f'Unknown fields: {", ".join(sorted(unknown))}. '
+                       f'Available fields: {", ".join(available)}.',
+        })
+    return [
+        name for name in available
+        if (fields is None or name in fields) and name not in (exclude or ())
+    ]
+
+
+def prune_fields(serializer, names):
+    for name in set(serializer.fields) - set(names):
+        serializer.fields.pop(name)
+
+
+def _column_path(model, field):
+    """The values() path for `field`'s source if it is a column reached through foreign keys."""
+    attrs = field.source_attrs
+    for index, attr in enumerate(attrs):
+        try:
+            model_field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        last = index == len(attrs) - 1
+        if model_field.is_relation:
+            if last and not isinstance(field, serializers.PrimaryKeyRelatedField):
+                return None
+            model = model_field.related_model
+        elif not last:
+            return None
+    return '__'.join(attrs)
+
+
+def _converter(field, joined):
+    """fn(value) for an automatically mapped field, matching what DRF would output."""
+    passthrough = type(field) in PASSTHROUGH
+    to_representation = field.to_representation
+    # DRF leaves a field out when a related object on its source path is missing, unless the
+    # field allows null.
+    missing = SKIP if joined and not field.allow_null else None
+
+    def convert(value):
+        if value is None:
+            return missing
+        return value if passthrough else to_representation(value)
+    return convert
+
+
+class Projection:
+    """Precompiled output for a fixed set of serializer fields over `values()` rows."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.paths = list(dict.fromkeys(path for _, paths, _ in entries for path in paths))
+        self._getters = [
+            (name, paths[0] if len(paths) == 1 else paths, fn) for name, paths, fn in entries
+        ]
+
+    def narrow(self, queryset):
+        return queryset.prefetch_related(None).values(*self.paths)
+
+    def render(self, row):
+        item = {}
+        for name, paths, fn in self._getters:
+            if isinstance(paths, str):
+                value = fn(row[paths])
+            else:
+                value = fn(*[row[path] for path in paths])
+            if value is not SKIP:
+                item[name] = value
+        return item
+
+    def render_many(self, rows):
+        render = self.render
+        return [render(row) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def compile_projection(serializer_class, names):
+    """The Projection of `names` on `serializer_class`, or None if one can't be built."""
+    spec = getattr(getattr(serializer_class, 'Meta', None), 'projection', None)
+    if spec is None:
+        return None
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    entries = []
+    for name in names:
+        if name in spec:
+            paths, fn = spec[name]
+            entries.append((name, tuple(paths), fn))
+            continue
+        field = serializer.fields[name]
+        if isinstance(field, UNPROJECTABLE) or field.source == '*':
+            return None
+        path = _column_path(model, field)
+        if path is None:
+            return None
+        entries.append((name, (path,), _converter(field, len(field.source_attrs) > 1)))
+    return Projection(entries)
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields= / ?exclude= on a viewset's list, through the projection path where possible;
+    ?stream=true streams the list, up to settings.STREAM_MAX_ROWS rows, instead of a page (core.streaming).
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.action == 'list':
+            self.select_fields(serializer)
+        return serializer
+
+    def select_fields(self, serializer):
+        child = getattr(serializer, 'child', serializer)
+        names = requested_fields(self.request, readable_fields(child))
+        if names is not None:
+            prune_fields(child, names)
+        return serializer
+
+    def get_projection(self):
+        serializer_class = self.get_serializer_class()
+        if getattr(getattr(serializer_class, 'Meta', None), 'projection', None) is None:
+            return None
+        available = readable_fields(serializer_class())
+        names = requested_fields(self.request, available)
+        if names is None:
+            names = available
+        return compile_projection(serializer_class, tuple(names))
+
+    def serialize_list(self, queryset):
+        """List data for `queryset`: projected rows when possible, else the serializer's."""
+        projection = self.get_projection()
+        if projection is not None:
+            return projection.render_many(projection.narrow(queryset))
+        return self.select_fields(self.get_serializer(queryset, many=True)).data
+
+    def iter_list(self, queryset, chunk_size=STREAM_CHUNK_SIZE):
+        """serialize_list's items one at a time, read from `queryset` in chunks."""
+        projection = self.get_projection()
+        if projection is not None:
+            render = projection.render
+            return (render(row) for row in projection.narrow(queryset).iterator(chunk_size=chunk_size))
+        serializer = self.select_fields(self.get_serializer())
+        return (serializer.to_representation(obj) for obj in queryset.iterator(chunk_size=chunk_size))
+
+    def list(self, request, *args, **kwargs):
+        if wants_stream(request):
+            return stream_json(self.iter_list(self.filter_queryset(self.get_queryset())))
+        projection = self.get_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+        rows = projection.narrow(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(projection.render_many(page))
+        return Response(projection.render_many(rows))
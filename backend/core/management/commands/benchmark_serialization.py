@@ -0,0 +1,127 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.fieldsets import compile_projection, readable_fields
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Time list serialization of generated rows through DRF and through the projection path; '
+        'the rows are created in a transaction that is rolled back'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Rows generated per list')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per path; the fastest is reported')
+        parser.add_argument('--fields', default='', help='Comma-separated fields to project (default: all)')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                for name, serializer_class, queryset in self.seed(options['rows']):
+                    self.report(name, serializer_class, queryset, options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def report(self, name, serializer_class, queryset, options):
+        names = [field for field in options['fields'].split(',') if field]
+        available = readable_fields(serializer_class())
+        names = tuple(field for field in available if not names or field in names)
+        projection = compile_projection(serializer_class, names)
+
+        def drf():
+            serializer = serializer_class(queryset.all(), many=True)
+            for field in set(available) - set(names):
+                serializer.child.fields.pop(field)
+            return serializer.data
+
+        before = self.fastest(drf, options['repeat'])
+        after = self.fastest(lambda: projection.render_many(projection.narrow(queryset.all())), options['repeat'])
+        self.stdout.write(
+            f"{name}: {options['rows']} rows, {len(names)} fields: "
+            f"DRF {before * 1000:.0f}ms, projection {after * 1000:.0f}ms ({before / after:.1f}x)"
+        )
+
+    @staticmethod
+    def fastest(run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def seed(self, rows):
+        from cases.models import Case, CasePriority, CaseStatus
+        from cases.serializers.case import CaseListSerializer
+        from cases.views.case import CaseViewSet
+        from investigation.models import Notification, Suspect, SuspectCaseLink
+        from investigation.serializers.case_resolution import NotificationSerializer
+        from investigation.serializers.suspect import SuspectCaseLinkSerializer
+        from rewards.models import Reward, RewardStatus
+        from rewards.serializers.reward import RewardListSerializer
+        from rewards.views.reward import RewardViewSet
+
+        User = get_user_model()
+        now = timezone.now()
+        detective = User.objects.create(
+            username='benchmark_detective', email='benchmark@example.com', first_name='Cole',
+            last_name='Phelps', phone_number='09000000000', national_id='0000000000',
+        )
+        cases = Case.objects.bulk_create(
+            Case(
+                case_number=f'BENCH-{i:06d}', title=f'Case {i}', description='Generated', incident_date=now,
+                incident_location='Los Angeles', status=CaseStatus.UNDER_INVESTIGATION,
+                priority=CasePriority.CRITICAL if i % 10 == 0 else CasePriority.LEVEL2,
+                assigned_detective=detective if i % 2 else None,
+            )
+            for i in range(rows)
+        )
+        yield 'cases', CaseListSerializer, CaseViewSet.queryset
+
+        codes = Reward.generate_reward_codes(rows)
+        Reward.objects.bulk_create(
+            Reward(
+                recipient=detective, recipient_national_id=detective.national_id, case=case,
+                reward_code=code, information_submitted='Tip', is_civilian_reward=True, amount=1000,
+                status=RewardStatus.PAID if i % 2 else RewardStatus.PENDING,
+            )
+            for i, (case, code) in enumerate(zip(cases, codes))
+        )
+        yield 'rewards', RewardListSerializer, RewardViewSet.queryset
+
+        suspects = Suspect.objects.bulk_create(
+            Suspect(first_name='Suspect', last_name=str(i), national_id=f'{i:010d}') for i in range(rows)
+        )
+        SuspectCaseLink.objects.bulk_create(
+            SuspectCaseLink(
+                suspect=suspect, case=case, detective_guilt_score=i % 10 + 1,
+                captain=detective if i % 3 == 0 else None,
+            )
+            for i, (suspect, case) in enumerate(zip(suspects, cases))
+        )
+        yield 'suspect links', SuspectCaseLinkSerializer, SuspectCaseLink.objects.select_related(
+            'suspect', 'case', 'captain', 'chief'
+        ).order_by('-created_at')
+
+        content_type = ContentType.objects.get_for_model(Case)
+        Notification.objects.bulk_create(
+            Notification(
+                case=case, recipient=detective, content_type=content_type, object_id=case.pk,
+                message=f'New evidence added to case {case.case_number}',
+            )
+            for case in cases
+        )
+        yield 'notifications', NotificationSerializer, Notification.objects.select_related(
+            'case', 'content_type'
+        ).order_by('-created_at')
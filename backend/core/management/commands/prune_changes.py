@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.services.changes import PRUNE_BATCH_SIZE, prune
+
+
+class Command(BaseCommand):
+    help = 'Delete the change records every registered consumer has committed past'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PRUNE_BATCH_SIZE, help='Records deleted per statement')
+
+    def handle(self, *args, **options):
+        deleted = prune(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} change records.'))
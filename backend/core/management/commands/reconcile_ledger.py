@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.settlement import RECONCILE_CHUNK_SIZE, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Check that every ledger transaction balances and gateway clearing matches unsettled payments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=RECONCILE_CHUNK_SIZE, help='Rows fetched per round trip')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = reconcile(options['chunk_size'])
+        self.stdout.write(
+            f"Read {result.postings} postings in {result.transactions} transactions "
+            f"in {time.perf_counter() - started:.1f}s."
+        )
+        for code, balance in sorted(result.balances.items()):
+            self.stdout.write(f"  {code}: {balance}")
+        problems = []
+        if result.unbalanced:
+            problems.append(f"unbalanced transactions: {', '.join(map(str, result.unbalanced))}")
+        if result.unposted_payments:
+            problems.append(f"{result.unposted_payments} captured payments without a ledger transaction")
+        if result.clearing_actual != result.clearing_expected:
+            problems.append(
+                f"gateway clearing is {result.clearing_actual}, unsettled payments total {result.clearing_expected}"
+            )
+        if problems:
+            raise CommandError('Ledger does not reconcile: ' + '; '.join(problems))
+        self.stdout.write(self.style.SUCCESS('Ledger reconciles.'))
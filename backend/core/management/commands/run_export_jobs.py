@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.models import ExportStatus
+from core.services.exports import EXPORT_CHUNK_SIZE, run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = 'Write queued background exports to storage, oldest first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Stop after this many jobs')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE, help='Rows fetched per round trip')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        jobs = run_pending_jobs(options['limit'], options['chunk_size'])
+        for job in jobs:
+            if job.status == ExportStatus.DONE:
+                self.stdout.write(f"  #{job.pk} {job.dataset}: {job.row_count} rows -> {job.file.name}")
+            else:
+                self.stdout.write(self.style.ERROR(f"  #{job.pk} {job.dataset} failed: {job.error}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Ran {len(jobs)} export jobs in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.settlement import SETTLEMENT_BATCH_SIZE, settle
+
+
+class Command(BaseCommand):
+    help = 'Settle captured gateway payments into the bank account in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=SETTLEMENT_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        batches = settle(options['batch_size'], options['max_batches'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Settled {sum(batch.payment_count for batch in batches)} payments in {len(batches)} batches "
+            f"({sum(batch.net_amount for batch in batches)} net) in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.renderers import dumps
+from core.services.changes import (
+    FEED_PAGE_SIZE,
+    ChangeFeedError,
+    commit,
+    consumer_cursor,
+    parse_cursor,
+    prune,
+    read,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the change feed to stdout as NDJSON, committing the consumer's cursor after "
+        "each batch is written (at-least-once)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--consumer', required=True, help='Consumer whose cursor is resumed and committed')
+        parser.add_argument('--since', default=None, help="Start after this cursor instead of the consumer's")
+        parser.add_argument('--batch-size', type=int, default=FEED_PAGE_SIZE, help='Records read per round trip')
+        parser.add_argument('--follow', action='store_true', help='Keep polling for new records')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls with --follow')
+        parser.add_argument('--prune', action='store_true', help='Delete records every consumer has committed')
+
+    def handle(self, *args, **options):
+        consumer = options['consumer']
+        try:
+            cursor = parse_cursor(options['since']) if options['since'] else consumer_cursor(consumer)
+        except ChangeFeedError as exc:
+            raise CommandError(str(exc))
+        batch_size = options['batch_size']
+        while True:
+            page = read(cursor, batch_size)
+            for record in page:
+                self.stdout.write(dumps(record).decode())
+            if page:
+                self.stdout.flush()
+                cursor = parse_cursor(page[-1]['cursor'])
+                commit(consumer, cursor)
+                if options['prune']:
+                    prune()
+            if len(page) < batch_size:
+                if not options['follow']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0007_use_accounts_role'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveIntegerField()),
+                ('kind', models.CharField(choices=[('NOTE', 'Note'), ('APPROVAL', 'Approval note'), ('REJECTION', 'Rejection note'), ('WITNESSES', 'Witnesses'), ('CUSTODY', 'Chain of custody')], default='NOTE', max_length=20, verbose_name='Kind')),
+                ('body', models.TextField(verbose_name='Body')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created At')),
+                ('prev_hash', models.CharField(blank=True, max_length=64, verbose_name='Previous Hash')),
+                ('entry_hash', models.CharField(blank=True, max_length=64, verbose_name='Entry Hash')),
+                ('author', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='journal_entries', to=settings.AUTH_USER_MODEL, verbose_name='Author')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Journal Entry',
+                'verbose_name_plural': 'Journal Entries',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['content_type', 'object_id', 'kind', 'id'], name='core_journa_content_04aa70_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,190 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0008_journal_entry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerAccount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('code', models.CharField(max_length=50, unique=True, verbose_name='Code')),
+                ('name', models.CharField(max_length=200, verbose_name='Name')),
+                ('kind', models.CharField(choices=[('ASSET', 'Asset'), ('LIABILITY', 'Liability'), ('INCOME', 'Income'), ('EXPENSE', 'Expense')], max_length=20, verbose_name='Kind')),
+            ],
+            options={
+                'verbose_name': 'Ledger Account',
+                'verbose_name_plural': 'Ledger Accounts',
+                'ordering': ['code'],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(max_length=200, unique=True, verbose_name='Idempotency Key')),
+                ('kind', models.CharField(max_length=30, verbose_name='Kind')),
+                ('description', models.CharField(blank=True, max_length=255, verbose_name='Description')),
+                ('object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Ledger Transaction',
+                'verbose_name_plural': 'Ledger Transactions',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Posting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Amount')),
+            ],
+            options={
+                'verbose_name': 'Posting',
+                'verbose_name_plural': 'Postings',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SettlementBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('SETTLED', 'Settled')], default='OPEN', max_length=20, verbose_name='Status')),
+                ('payment_count', models.PositiveIntegerField(default=0, verbose_name='Payment Count')),
+                ('net_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Net Amount')),
+                ('settled_at', models.DateTimeField(blank=True, null=True, verbose_name='Settled At')),
+            ],
+            options={
+                'verbose_name': 'Settlement Batch',
+                'verbose_name_plural': 'Settlement Batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AlterModelOptions(
+            name='payment',
+            options={'ordering': ['-created_at'], 'verbose_name': 'Payment', 'verbose_name_plural': 'Payments'},
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Amount'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='captured_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Captured At'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='channel',
+            field=models.CharField(choices=[('GATEWAY', 'Payment Gateway'), ('STATION', 'Cash at Station')], default='GATEWAY', max_length=10, verbose_name='Channel'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='direction',
+            field=models.CharField(choices=[('IN', 'Incoming'), ('OUT', 'Outgoing')], default='IN', max_length=3, verbose_name='Direction'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='failure_reason',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Failure Reason'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='gateway_reference',
+            field=models.CharField(blank=True, max_length=255, verbose_name='Gateway Reference'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='idempotency_key',
+            field=models.CharField(default='', max_length=200, unique=True, verbose_name='Idempotency Key'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='object_id',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='purpose',
+            field=models.CharField(choices=[('BAIL', 'Bail'), ('FINE', 'Fine'), ('REWARD', 'Reward')], default='BAIL', max_length=10, verbose_name='Purpose'),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('CAPTURED', 'Captured'), ('FAILED', 'Failed'), ('SETTLED', 'Settled')], default='PENDING', max_length=10, verbose_name='Status'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(condition=models.Q(('channel', 'GATEWAY'), ('status', 'CAPTURED')), fields=['id'], name='payment_unsettled_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['content_type', 'object_id'], name='core_paymen_content_4f0d41_idx'),
+        ),
+        migrations.AddField(
+            model_name='settlementbatch',
+            name='transaction',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='settlement_batch', to='core.ledgertransaction', verbose_name='Transaction'),
+        ),
+        migrations.AddField(
+            model_name='posting',
+            name='account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='postings', to='core.ledgeraccount', verbose_name='Account'),
+        ),
+        migrations.AddField(
+            model_name='posting',
+            name='transaction',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='postings', to='core.ledgertransaction', verbose_name='Transaction'),
+        ),
+        migrations.AddField(
+            model_name='ledgertransaction',
+            name='content_type',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='contenttypes.contenttype'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='settlement_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='payments', to='core.settlementbatch', verbose_name='Settlement Batch'),
+        ),
+        migrations.AddField(
+            model_name='payment',
+            name='transaction',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='payment', to='core.ledgertransaction', verbose_name='Ledger Transaction'),
+        ),
+        migrations.AddIndex(
+            model_name='posting',
+            index=models.Index(fields=['account', 'id'], name='core_postin_account_9780b2_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='posting',
+            constraint=models.CheckConstraint(check=models.Q(('amount', 0), _negated=True), name='posting_amount_nonzero'),
+        ),
+        migrations.AddIndex(
+            model_name='ledgertransaction',
+            index=models.Index(fields=['content_type', 'object_id'], name='core_ledger_content_8f3a7a_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:41
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dataset', models.CharField(max_length=20, verbose_name='Dataset')),
+                ('output', models.CharField(choices=[('csv', 'CSV'), ('ndjson', 'NDJSON')], max_length=10, verbose_name='Format')),
+                ('gzip', models.BooleanField(default=False, verbose_name='Gzip')),
+                ('filters', models.JSONField(blank=True, default=dict, verbose_name='Filters')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='PENDING', max_length=20, verbose_name='Status')),
+                ('file', models.FileField(blank=True, upload_to='exports/', verbose_name='File')),
+                ('row_count', models.PositiveIntegerField(default=0, verbose_name='Rows Written')),
+                ('checkpoint', models.CharField(blank=True, help_text='Resume cursor of the last row written', max_length=100, verbose_name='Checkpoint')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('requested_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Requested By')),
+            ],
+            options={
+                'verbose_name': 'Export Job',
+                'verbose_name_plural': 'Export Jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='core_export_status_2ad959_idx')],
+            },
+        ),
+    ]
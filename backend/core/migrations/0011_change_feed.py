@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_export_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeConsumer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Name')),
+                ('txid', models.BigIntegerField(default=0, verbose_name='Cursor Transaction ID')),
+                ('record_id', models.BigIntegerField(default=0, verbose_name='Cursor Record ID')),
+            ],
+            options={
+                'verbose_name': 'Change Consumer',
+                'verbose_name_plural': 'Change Consumers',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('txid', models.BigIntegerField(verbose_name='Transaction ID')),
+                ('entity', models.CharField(help_text='Model label, e.g. cases.case', max_length=60, verbose_name='Entity')),
+                ('object_id', models.BigIntegerField(verbose_name='Object ID')),
+                ('op', models.CharField(choices=[('INSERT', 'Insert'), ('UPDATE', 'Update'), ('DELETE', 'Delete')], max_length=6, verbose_name='Operation')),
+                ('version', models.BigIntegerField(help_text='Write time in microseconds since the epoch', verbose_name='Version')),
+                ('fields', models.JSONField(blank=True, default=list, verbose_name='Changed Fields')),
+            ],
+            options={
+                'verbose_name': 'Change Record',
+                'verbose_name_plural': 'Change Records',
+                'ordering': ['txid', 'id'],
+                'indexes': [models.Index(fields=['txid', 'id'], name='core_change_txid_e7cd44_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_change_feed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payment',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Gateway Attempts'),
+        ),
+        migrations.AlterField(
+            model_name='payment',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('PROCESSING', 'Processing'), ('CAPTURED', 'Captured'), ('FAILED', 'Failed'), ('SETTLED', 'Settled')], default='PENDING', max_length=10, verbose_name='Status'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copy_author_ids(apps, schema_editor):
+    """Entries were hashed with their author's id; keep it for when the author is deleted."""
+    JournalEntry = apps.get_model('core', 'JournalEntry')
+    JournalEntry.objects.filter(author__isnull=False).update(author_ref=models.F('author_id'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_payment_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='journalentry',
+            name='author_ref',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, verbose_name='Author ID'),
+        ),
+        migrations.RunPython(copy_author_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='journalentry',
+            name='author',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='journal_entries', to=settings.AUTH_USER_MODEL, verbose_name='Author'),
+        ),
+    ]
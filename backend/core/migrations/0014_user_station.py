@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_journal_author_set_null'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='station',
+            field=models.CharField(blank=True, help_text='Police station the user works at', max_length=100, verbose_name='Station'),
+        ),
+    ]
@@ -1,12 +1,36 @@
 from .base import BaseModel
 from .user import UserProfile
 from .document import Document
-from .payment import Payment, Bail
+from .payment import Payment, PaymentDirection, PaymentChannel, PaymentPurpose, PaymentStatus, Bail
+from .ledger import AccountKind, LedgerAccount, LedgerTransaction, Posting, SettlementStatus, SettlementBatch
+from .journal import JournalEntry, JournalKind, JournaledQuerySet, render_journal
+from .export import ExportFormat, ExportStatus, ExportJob
+from .change import ChangeOp, ChangeRecord, ChangeConsumer, ChangeTrackedModel
 
 __all__ = [
     'BaseModel',
     'UserProfile',
     'Document',
     'Payment',
+    'PaymentDirection',
+    'PaymentChannel',
+    'PaymentPurpose',
+    'PaymentStatus',
     'Bail',
+    'AccountKind',
+    'LedgerAccount',
+    'LedgerTransaction',
+    'Posting',
+    'SettlementStatus',
+    'SettlementBatch',
+    'JournalEntry',
+    'JournalKind',
+    'render_journal',
+    'ExportFormat',
+    'ExportStatus',
+    'ExportJob',
+    'ChangeOp',
+    'ChangeRecord',
+    'ChangeConsumer',
+    'ChangeTrackedModel',
 ]
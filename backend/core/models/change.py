@@ -0,0 +1,113 @@
+import copy
+
+from django.db import models, transaction
+
+from .base import BaseModel
+
+
+class ChangeOp(models.TextChoices):
+    INSERT = 'INSERT', 'Insert'
+    UPDATE = 'UPDATE', 'Update'
+    DELETE = 'DELETE', 'Delete'
+
+
+class ChangeRecord(models.Model):
+    """
+    One write to a tracked row, appended in the writing transaction (see
+    core.services.changes). Only the fact of the change is kept, not the row's data.
+    """
+    txid = models.BigIntegerField(verbose_name="Transaction ID")
+    entity = models.CharField(max_length=60, verbose_name="Entity", help_text="Model label, e.g. cases.case")
+    object_id = models.BigIntegerField(verbose_name="Object ID")
+    op = models.CharField(max_length=6, choices=ChangeOp.choices, verbose_name="Operation")
+    version = models.BigIntegerField(verbose_name="Version", help_text="Write time in microseconds since the epoch")
+    fields = models.JSONField(default=list, blank=True, verbose_name="Changed Fields")
+
+    class Meta:
+        verbose_name = "Change Record"
+        verbose_name_plural = "Change Records"
+        ordering = ['txid', 'id']
+        indexes = [
+            models.Index(fields=['txid', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.op} {self.entity}#{self.object_id}"
+
+
+class ChangeConsumer(BaseModel):
+    """A named reader of the change feed and the cursor it has consumed up to."""
+    name = models.CharField(max_length=100, unique=True, verbose_name="Name")
+    txid = models.BigIntegerField(default=0, verbose_name="Cursor Transaction ID")
+    record_id = models.BigIntegerField(default=0, verbose_name="Cursor Record ID")
+
+    class Meta:
+        verbose_name = "Change Consumer"
+        verbose_name_plural = "Change Consumers"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} @ {self.txid}-{self.record_id}"
+
+
+def _snapshot_value(value):
+    # JSON fields load as dicts and lists that callers may mutate in place.
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+class ChangeTrackedModel(models.Model):
+    """
+    Appends a ChangeRecord for every save(), in the same transaction: INSERT, or UPDATE with
+    the fields that differ from the values loaded from the database (no record when nothing
+    did). JSON values are snapshotted as copies, so changes made in place are noticed. Deletes
+    and many-to-many changes are recorded by receivers (core.signals) that run inside the
+    writing transaction, cascades included.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {name: _snapshot_value(value) for name, value in zip(field_names, values)}
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._snapshot(fields)
+
+    def save(self, *args, **kwargs):
+        from core.services.changes import record_change
+        op = ChangeOp.INSERT if self._state.adding else ChangeOp.UPDATE
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            fields = self.changed_fields(kwargs.get('update_fields')) if op == ChangeOp.UPDATE else []
+            super().save(*args, **kwargs)
+            if op == ChangeOp.INSERT or fields:
+                record_change(self, op, fields)
+        self._snapshot(kwargs.get('update_fields'))
+
+    def changed_fields(self, update_fields=None):
+        """Names of the concrete fields a save() would change, `updated_at` aside."""
+        loaded = getattr(self, '_loaded_values', None)
+        deferred = self.get_deferred_fields()
+        names = []
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.name == 'updated_at' or field.attname in deferred:
+                continue
+            if update_fields is not None and field.name not in update_fields and field.attname not in update_fields:
+                continue
+            if loaded is None or field.attname not in loaded or loaded[field.attname] != getattr(self, field.attname):
+                names.append(field.name)
+        return names
+
+    def _snapshot(self, fields=None):
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            loaded = self._loaded_values = {}
+        deferred = self.get_deferred_fields()
+        for field in self._meta.concrete_fields:
+            if field.attname in deferred:
+                continue
+            if fields is None or field.name in fields or field.attname in fields:
+                loaded[field.attname] = _snapshot_value(getattr(self, field.attname))
@@ -0,0 +1,61 @@
+from django.conf import settings
+from django.db import models
+
+from .base import BaseModel
+
+
+class ExportFormat(models.TextChoices):
+    CSV = 'csv', 'CSV'
+    NDJSON = 'ndjson', 'NDJSON'
+
+
+class ExportStatus(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    RUNNING = 'RUNNING', 'Running'
+    DONE = 'DONE', 'Done'
+    FAILED = 'FAILED', 'Failed'
+
+
+class ExportJob(BaseModel):
+    """
+    A bulk export written to storage in the background (see core.services.exports), for
+    download once it is DONE. The rows are those `requested_by` could see when the job ran.
+    """
+    dataset = models.CharField(max_length=20, verbose_name="Dataset")
+    output = models.CharField(max_length=10, choices=ExportFormat.choices, verbose_name="Format")
+    gzip = models.BooleanField(default=False, verbose_name="Gzip")
+    filters = models.JSONField(default=dict, blank=True, verbose_name="Filters")
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='export_jobs',
+        verbose_name="Requested By"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=ExportStatus.choices,
+        default=ExportStatus.PENDING,
+        verbose_name="Status"
+    )
+    file = models.FileField(upload_to='exports/', blank=True, verbose_name="File")
+    row_count = models.PositiveIntegerField(default=0, verbose_name="Rows Written")
+    checkpoint = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name="Checkpoint",
+        help_text="Resume cursor of the last row written"
+    )
+    error = models.TextField(blank=True, verbose_name="Error")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Started At")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finished At")
+
+    class Meta:
+        verbose_name = "Export Job"
+        verbose_name_plural = "Export Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.dataset} export #{self.pk} ({self.status})"
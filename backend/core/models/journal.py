@@ -0,0 +1,203 @@
+import hashlib
+
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.utils import timezone
+
+
+def journal_hash(prev_hash, content_type_id, object_id, author_id, created_at, kind, body):
+    payload = '\x1f'.join([
+        prev_hash,
+        f'{content_type_id}:{object_id}',
+        str(author_id or ''),
+        created_at.isoformat(),
+        kind,
+        body,
+    ])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class JournalKind(models.TextChoices):
+    NOTE = 'NOTE', 'Note'
+    APPROVAL = 'APPROVAL', 'Approval note'
+    REJECTION = 'REJECTION', 'Rejection note'
+    WITNESSES = 'WITNESSES', 'Witnesses'
+    CUSTODY = 'CUSTODY', 'Chain of custody'
+
+
+class JournalQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        raise ValidationError('Journal entries are append-only.')
+
+    def delete(self):
+        raise ValidationError('Journal entries are append-only.')
+
+    def for_entity(self, entity):
+        return self.filter(
+            content_type=ContentType.objects.get_for_model(entity),
+            object_id=entity.pk,
+        )
+
+
+class JournalManager(models.Manager.from_queryset(JournalQuerySet)):
+    def append(self, entity, kind, body, author=None):
+        """
+        Insert one entry for `entity`. Plain notes are a single INSERT; custody entries also
+        lock the entity row so concurrent appends extend the hash chain one at a time.
+        """
+        entry = self.model(
+            content_type=ContentType.objects.get_for_model(entity),
+            object_id=entity.pk,
+            kind=kind,
+            body=body,
+            author=author,
+            author_ref=author.pk if author is not None else None,
+            created_at=timezone.now(),
+        )
+        if kind != JournalKind.CUSTODY:
+            entry.save()
+        else:
+            with transaction.atomic():
+                list(type(entity)._default_manager.select_for_update().filter(pk=entity.pk).values_list('pk'))
+                previous = (
+                    self.for_entity(entity).filter(kind=JournalKind.CUSTODY)
+                    .order_by('-id').values_list('entry_hash', flat=True).first()
+                )
+                entry.prev_hash = previous or ''
+                entry.entry_hash = entry.compute_hash()
+                entry.save()
+        cached = getattr(entity, '_journal_cache', None)
+        if cached is not None:
+            cached.append(entry)
+        return entry
+
+    def entries(self, entity):
+        """The entity's entries, oldest first; read from the cache `attach` fills when present."""
+        cached = getattr(entity, '_journal_cache', None)
+        if cached is not None:
+            return cached
+        return list(self.for_entity(entity).order_by('id'))
+
+    def attach(self, entities):
+        """Load the entries of every entity (all of one model) in one query and cache them on it."""
+        by_pk = {entity.pk: entity for entity in entities if entity.pk is not None}
+        if not by_pk:
+            return
+        for entity in by_pk.values():
+            entity._journal_cache = []
+        content_type = ContentType.objects.get_for_model(next(iter(by_pk.values())))
+        for entry in self.filter(content_type=content_type, object_id__in=by_pk).order_by('id'):
+            by_pk[entry.object_id]._journal_cache.append(entry)
+
+    def verify_custody(self, entity):
+        """Return the first custody entry whose hash does not match its content or predecessor, or None."""
+        previous = ''
+        for entry in self.for_entity(entity).filter(kind=JournalKind.CUSTODY).order_by('id'):
+            if entry.prev_hash != previous or entry.entry_hash != entry.compute_hash():
+                return entry
+            previous = entry.entry_hash
+        return None
+
+
+class JournaledQuerySet(models.QuerySet):
+    """
+    QuerySet for models that keep a journal. There is no GenericRelation to prefetch through,
+    since deleting the entity would cascade to its append-only entries; `with_journal()` loads
+    them with `JournalEntry.objects.attach` instead.
+    """
+    _with_journal = False
+
+    def with_journal(self):
+        clone = self._chain()
+        clone._with_journal = True
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._with_journal = self._with_journal
+        return clone
+
+    def _fetch_all(self):
+        fetched = self._result_cache is None
+        super()._fetch_all()
+        if fetched and self._with_journal and self._iterable_class is models.query.ModelIterable:
+            JournalEntry.objects.attach(self._result_cache)
+
+
+class JournalEntry(models.Model):
+    """
+    Append-only journal of notes and chain-of-custody events for cases and evidence.
+    Rows are inserted and never updated, so concurrent appends cannot overwrite each other.
+    Deleting a user clears `author` but keeps `author_ref`, the id the entry was hashed with.
+    """
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveIntegerField()
+    entity = GenericForeignKey('content_type', 'object_id')
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='journal_entries',
+        verbose_name="Author"
+    )
+    author_ref = models.BigIntegerField(null=True, blank=True, editable=False, verbose_name="Author ID")
+    kind = models.CharField(
+        max_length=20,
+        choices=JournalKind.choices,
+        default=JournalKind.NOTE,
+        verbose_name="Kind"
+    )
+    body = models.TextField(verbose_name="Body")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Created At")
+    prev_hash = models.CharField(max_length=64, blank=True, verbose_name="Previous Hash")
+    entry_hash = models.CharField(max_length=64, blank=True, verbose_name="Entry Hash")
+
+    objects = JournalManager()
+
+    class Meta:
+        verbose_name = "Journal Entry"
+        verbose_name_plural = "Journal Entries"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'kind', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} on {self.content_type_id}:{self.object_id}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError('Journal entries are append-only.')
+        if self.author_ref is None:
+            self.author_ref = self.author_id
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError('Journal entries are append-only.')
+
+    def compute_hash(self):
+        return journal_hash(
+            self.prev_hash, self.content_type_id, self.object_id,
+            self.author_ref, self.created_at, self.kind, self.body,
+        )
+
+    def render(self):
+        """The entry as it used to appear inside a notes text blob."""
+        if self.kind in (JournalKind.APPROVAL, JournalKind.REJECTION):
+            return f"{self.get_kind_display()}: {self.body}"
+        return self.body
+
+
+def render_journal(base_text, entries):
+    """Rebuild the old `notes`-style text: the base text followed by each entry."""
+    parts = [base_text] if base_text else []
+    parts.extend(entry.render() for entry in entries)
+    return '\n\n'.join(parts)
@@ -0,0 +1,130 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from .base import BaseModel
+
+
+class AccountKind(models.TextChoices):
+    ASSET = 'ASSET', 'Asset'
+    LIABILITY = 'LIABILITY', 'Liability'
+    INCOME = 'INCOME', 'Income'
+    EXPENSE = 'EXPENSE', 'Expense'
+
+
+class LedgerAccount(BaseModel):
+    """An account postings are made to, identified by a stable code (see core.services.ledger)."""
+    code = models.CharField(max_length=50, unique=True, verbose_name="Code")
+    name = models.CharField(max_length=200, verbose_name="Name")
+    kind = models.CharField(max_length=20, choices=AccountKind.choices, verbose_name="Kind")
+
+    class Meta:
+        verbose_name = "Ledger Account"
+        verbose_name_plural = "Ledger Accounts"
+        ordering = ['code']
+
+    def __str__(self):
+        return self.code
+
+
+class LedgerTransaction(models.Model):
+    """
+    One balanced set of postings. The idempotency key is unique, so posting the same
+    business event twice (a retried request, a re-run job) returns the first transaction
+    instead of moving the money again. Transactions are never updated; corrections are new
+    transactions.
+    """
+    idempotency_key = models.CharField(max_length=200, unique=True, verbose_name="Idempotency Key")
+    kind = models.CharField(max_length=30, verbose_name="Kind")
+    description = models.CharField(max_length=255, blank=True, verbose_name="Description")
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    source = GenericForeignKey('content_type', 'object_id')
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Created At")
+
+    class Meta:
+        verbose_name = "Ledger Transaction"
+        verbose_name_plural = "Ledger Transactions"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['content_type', 'object_id']),
+        ]
+
+    def __str__(self):
+        return self.idempotency_key
+
+
+class Posting(models.Model):
+    """
+    One leg of a transaction: a signed amount on one account, debits positive and credits
+    negative. The legs of a transaction sum to zero.
+    """
+    transaction = models.ForeignKey(
+        LedgerTransaction,
+        on_delete=models.PROTECT,
+        related_name='postings',
+        verbose_name="Transaction"
+    )
+    account = models.ForeignKey(
+        LedgerAccount,
+        on_delete=models.PROTECT,
+        related_name='postings',
+        verbose_name="Account"
+    )
+    amount = models.DecimalField(max_digits=14, decimal_places=2, verbose_name="Amount")
+
+    class Meta:
+        verbose_name = "Posting"
+        verbose_name_plural = "Postings"
+        ordering = ['id']
+        constraints = [
+            models.CheckConstraint(check=~Q(amount=0), name='posting_amount_nonzero'),
+        ]
+        indexes = [
+            models.Index(fields=['account', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.account_id} {self.amount:+}"
+
+
+class SettlementStatus(models.TextChoices):
+    OPEN = 'OPEN', 'Open'
+    SETTLED = 'SETTLED', 'Settled'
+
+
+class SettlementBatch(BaseModel):
+    """A run that moved captured gateway payments from gateway clearing into the bank account."""
+    status = models.CharField(
+        max_length=20,
+        choices=SettlementStatus.choices,
+        default=SettlementStatus.OPEN,
+        verbose_name="Status"
+    )
+    payment_count = models.PositiveIntegerField(default=0, verbose_name="Payment Count")
+    net_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Net Amount")
+    transaction = models.OneToOneField(
+        LedgerTransaction,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='settlement_batch',
+        verbose_name="Transaction"
+    )
+    settled_at = models.DateTimeField(null=True, blank=True, verbose_name="Settled At")
+
+    class Meta:
+        verbose_name = "Settlement Batch"
+        verbose_name_plural = "Settlement Batches"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Settlement {self.pk} ({self.payment_count} payments, {self.net_amount})"
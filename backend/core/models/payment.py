@@ -1,11 +1,102 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
+
 from .base import BaseModel
 
 
+class PaymentDirection(models.TextChoices):
+    IN = 'IN', 'Incoming'
+    OUT = 'OUT', 'Outgoing'
+
+
+class PaymentChannel(models.TextChoices):
+    GATEWAY = 'GATEWAY', 'Payment Gateway'
+    STATION = 'STATION', 'Cash at Station'
+
+
+class PaymentPurpose(models.TextChoices):
+    BAIL = 'BAIL', 'Bail'
+    FINE = 'FINE', 'Fine'
+    REWARD = 'REWARD', 'Reward'
+
+
+class PaymentStatus(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    PROCESSING = 'PROCESSING', 'Processing'
+    CAPTURED = 'CAPTURED', 'Captured'
+    FAILED = 'FAILED', 'Failed'
+    SETTLED = 'SETTLED', 'Settled'
+
+
 class Payment(BaseModel):
-    pass
+    """
+    Money moving in (bail, fines) or out (rewards), through the gateway or in cash at a
+    station. A payment is keyed by the business event it pays for, so retries find the same
+    row. Once captured it has a ledger transaction; gateway payments are later grouped into
+    a settlement batch.
+    """
+    idempotency_key = models.CharField(max_length=200, unique=True, verbose_name="Idempotency Key")
+    direction = models.CharField(max_length=3, choices=PaymentDirection.choices, verbose_name="Direction")
+    channel = models.CharField(
+        max_length=10,
+        choices=PaymentChannel.choices,
+        default=PaymentChannel.GATEWAY,
+        verbose_name="Channel"
+    )
+    purpose = models.CharField(max_length=10, choices=PaymentPurpose.choices, verbose_name="Purpose")
+    amount = models.DecimalField(max_digits=14, decimal_places=2, verbose_name="Amount")
+    status = models.CharField(
+        max_length=10,
+        choices=PaymentStatus.choices,
+        default=PaymentStatus.PENDING,
+        verbose_name="Status"
+    )
+    gateway_reference = models.CharField(max_length=255, blank=True, verbose_name="Gateway Reference")
+    failure_reason = models.CharField(max_length=255, blank=True, verbose_name="Failure Reason")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Gateway Attempts")
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    source = GenericForeignKey('content_type', 'object_id')
+    transaction = models.OneToOneField(
+        'core.LedgerTransaction',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='payment',
+        verbose_name="Ledger Transaction"
+    )
+    settlement_batch = models.ForeignKey(
+        'core.SettlementBatch',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='payments',
+        verbose_name="Settlement Batch"
+    )
+    captured_at = models.DateTimeField(null=True, blank=True, verbose_name="Captured At")
+
+    class Meta:
+        verbose_name = "Payment"
+        verbose_name_plural = "Payments"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['id'], name='payment_unsettled_idx',
+                condition=models.Q(status='CAPTURED', channel='GATEWAY'),
+            ),
+            models.Index(fields=['content_type', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_purpose_display()} {self.get_direction_display().lower()} {self.amount} ({self.status})"
 
 
 class Bail(BaseModel):
     pass
-
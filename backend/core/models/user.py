@@ -17,6 +17,7 @@ class UserProfile(AbstractUser):
         blank=True,
     )
     is_verified = models.BooleanField(default=False)
+    station = models.CharField(max_length=100, blank=True, verbose_name="Station", help_text="Police station the user works at")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -29,10 +30,17 @@ class UserProfile(AbstractUser):
     def __str__(self):
         return f"{self.get_full_name()} ({self.username})"
     
+    # Active role names, when already resolved for this request (core.services.roles).
+    active_role_names = None
+
     def has_role(self, role_name):
+        if self.active_role_names is not None:
+            return role_name in self.active_role_names
         return self.roles.filter(name=role_name, is_active=True).exists()
     
     def has_any_role(self, role_names):
+        if self.active_role_names is not None:
+            return not self.active_role_names.isdisjoint(role_names)
         return self.roles.filter(name__in=role_names, is_active=True).exists()
 
     def is_system_administrator(self):
@@ -0,0 +1,42 @@
+"""
+Fixed-window failure counters in the default cache, for throttling brute-force probing.
+The counters hold across workers only with a shared cache (Redis, see config.settings.CACHES);
+the per-process fallback counts each worker on its own.
+
+A `FailureLimiter` counts failures per identity (a station, a user) in windows of `window`
+seconds and reports an identity as blocked once it reached `limit` failures in the current
+window. Successful requests are not counted, so legitimate traffic is never slowed down.
+"""
+import time
+
+from django.core.cache import cache
+
+from core.cache import cache_key
+
+
+class FailureLimiter:
+
+    def __init__(self, namespace, limit, window):
+        self.namespace = namespace
+        self.limit = limit
+        self.window = window
+
+    def _keys(self, identities):
+        current = int(time.time() // self.window)
+        return [cache_key(self.namespace, identity, current) for identity in identities]
+
+    def blocked(self, identities):
+        """True if any of `identities` used up its failures for this window."""
+        return any(count >= self.limit for count in cache.get_many(self._keys(identities)).values())
+
+    def fail(self, identities):
+        for key in self._keys(identities):
+            cache.add(key, 0, self.window)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, self.window)
+
+    def retry_after(self):
+        """Seconds until the current window ends."""
+        return int(self.window - time.time() % self.window) + 1
@@ -0,0 +1,61 @@
+"""
+JSON rendering through orjson when it is installed.
+
+`FastJSONRenderer` is the project's default JSON renderer. When orjson is available it
+encodes responses natively, which is several times faster than the stdlib `json` module
+DRF uses. When orjson is missing, or for output orjson can't produce (indented output,
+integers wider than 64 bits), it renders exactly as DRF's `JSONRenderer` does. Both paths
+produce the same bytes. Types orjson doesn't know, such as Decimal, lazy translation
+strings and querysets, go through DRF's own encoder, so Decimals are still numbers. orjson
+encodes datetimes (with UTC as 'Z'), dates and UUIDs natively in the same formats.
+
+`dumps` is the same encoding as a function, for streamed responses (core.streaming).
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+_default = JSONEncoder().default
+_json_renderer = JSONRenderer()
+
+
+def _escape_separators(content):
+    # Like DRF, escape U+2028/U+2029 so the output is also valid JavaScript.
+    if b'\xe2\x80\xa8' in content or b'\xe2\x80\xa9' in content:
+        content = content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return content
+
+
+def _orjson_dumps(data):
+    """orjson's encoding of `data`, or None if orjson is missing or can't encode it."""
+    if orjson is None:
+        return None
+    try:
+        content = orjson.dumps(
+            data, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+    except orjson.JSONEncodeError:
+        return None
+    return _escape_separators(content)
+
+
+def dumps(data):
+    """`data` as compact UTF-8 JSON bytes, as FastJSONRenderer renders it."""
+    content = _orjson_dumps(data) if _json_renderer.compact and not _json_renderer.ensure_ascii else None
+    return _json_renderer.render(data) if content is None else content
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.compact and not self.ensure_ascii and self.get_indent(accepted_media_type, renderer_context or {}) is None:
+            content = _orjson_dumps(data)
+            if content is not None:
+                return content
+        return super().render(data, accepted_media_type, renderer_context)
@@ -0,0 +1,75 @@
+from rest_framework import serializers
+
+from core.models import ExportJob, JournalEntry
+
+
+class JournalEntrySerializer(serializers.ModelSerializer):
+    author_name = serializers.CharField(source='author.get_full_name', read_only=True, allow_null=True)
+
+    class Meta:
+        model = JournalEntry
+        fields = ['id', 'kind', 'body', 'author', 'author_name', 'created_at', 'prev_hash', 'entry_hash']
+        read_only_fields = fields
+
+
+class JournalAppendSerializer(serializers.Serializer):
+    body = serializers.CharField()
+
+
+class SubRequestSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=100)
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'], default='GET')
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False, allow_null=True)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and isinstance(data.get('method'), str):
+            data = {**data, 'method': data['method'].upper()}
+        return super().to_internal_value(data)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = SubRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, value):
+        from core.services.batch import max_sub_requests
+        if len(value) > max_sub_requests():
+            raise serializers.ValidationError(f'At most {max_sub_requests()} sub-requests per batch.')
+        return value
+
+
+class ExportJobSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = ExportJob
+        fields = [
+            'id', 'dataset', 'output', 'gzip', 'filters', 'status', 'row_count', 'checkpoint',
+            'error', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+        projection = {}
+
+
+class ExportParamsSerializer(serializers.Serializer):
+    """The body of a queued export; its filters are those of the dataset in the context."""
+    output = serializers.ChoiceField(choices=['csv', 'ndjson'], required=False)
+    gzip = serializers.BooleanField(required=False)
+    after = serializers.CharField(required=False, allow_blank=True, max_length=100)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.context['dataset'].filters:
+            fields[name] = serializers.CharField(required=False, allow_blank=True, max_length=100)
+        return fields
+
+
+class ChangeAckSerializer(serializers.Serializer):
+    consumer = serializers.CharField(max_length=100)
+    cursor = serializers.CharField(max_length=50)
+
+    def validate_cursor(self, value):
+        from core.services.changes import ChangeFeedError, parse_cursor
+        try:
+            return parse_cursor(value)
+        except ChangeFeedError as exc:
+            raise serializers.ValidationError(str(exc))
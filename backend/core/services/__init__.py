@@ -0,0 +1,20 @@
+from .gateway import GatewayClient, PaymentGateway, SimulatedGateway, get_gateway_client, reset_gateway_client
+from .ledger import PaymentFailed, charge, pay_out, post, post_many, record_payment, record_payments
+from .settlement import reconcile, settle
+
+__all__ = [
+    'GatewayClient',
+    'PaymentGateway',
+    'SimulatedGateway',
+    'get_gateway_client',
+    'reset_gateway_client',
+    'PaymentFailed',
+    'charge',
+    'pay_out',
+    'post',
+    'post_many',
+    'record_payment',
+    'record_payments',
+    'reconcile',
+    'settle',
+]
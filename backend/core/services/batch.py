@@ -0,0 +1,99 @@
+"""
+In-process dispatch of API sub-requests for the /batch/ endpoint.
+
+Each sub-request ({method, path, body}) is resolved against the project URL conf and run
+through its view as a normal DRF request, authenticated as the batch caller without
+re-running authentication. The caller's role names are resolved once and attached to the
+shared user object (core.services.roles), so role checks in the sub-requests cost nothing.
+
+Sub-requests run in order, except that consecutive GETs run concurrently on the shared read
+pool (core.concurrency): a write is a barrier, so a GET listed after a POST sees its effect.
+Every sub-request gets its own entry {id, status, body}; one failing does not affect the
+others. Streamed responses (exports, ?stream=true lists, the change feed) are not batched:
+their body would have to be held in memory, so the sub-request gets a 400 instead.
+"""
+import json
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.concurrency import run_concurrently
+
+logger = logging.getLogger(__name__)
+
+MAX_SUB_REQUESTS = 20
+API_PREFIX = '/api/v1/'
+BATCH_PATH = '/api/v1/batch/'
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+_factory = APIRequestFactory()
+
+
+def _error(status_code, message):
+    return status_code, {'status': 'error', 'message': message}
+
+
+def run_one(request, method, path, body=None):
+    """(status_code, body) of one sub-request made as `request.user`."""
+    url = urlsplit(path)
+    if not url.path.startswith(API_PREFIX) or url.path.rstrip('/') == BATCH_PATH.rstrip('/'):
+        return _error(400, f'Only {API_PREFIX} paths other than the batch endpoint can be batched.')
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return _error(404, f'No endpoint at {url.path}.')
+    data = json.dumps(body) if body is not None else None
+    sub = _factory.generic(
+        method, path, data or '', content_type='application/json',
+        HTTP_ACCEPT='application/json', SERVER_NAME=request.get_host().split(':')[0],
+    )
+    force_authenticate(sub, user=request.user, token=request.auth)
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Exception:
+        logger.exception('Batched %s %s failed', method, path)
+        return _error(500, 'Internal server error.')
+    if response.streaming:
+        # Not read, so its query never runs. response.close() would also signal the end of
+        # the request, which closes the caller's database connection.
+        return _error(400, 'Streamed responses cannot be batched; request them directly.')
+    if hasattr(response, 'data'):
+        return response.status_code, response.data
+    if hasattr(response, 'render'):
+        response.render()
+    content = response.content
+    try:
+        return response.status_code, json.loads(content or b'null')
+    except ValueError:
+        return response.status_code, content.decode(response.charset or 'utf-8', 'replace')
+
+
+def dispatch(request, sub_requests):
+    """[{id, status, body}] for validated sub-requests [{method, path, body, id}], in order."""
+    results = [None] * len(sub_requests)
+
+    def run(index):
+        sub = sub_requests[index]
+        status_code, body = run_one(request, sub['method'], sub['path'], sub.get('body'))
+        return {'id': sub.get('id', index), 'status': status_code, 'body': body}
+
+    reads = []
+    for index, sub in enumerate(sub_requests + [None]):
+        if sub is not None and sub['method'] == 'GET':
+            reads.append(index)
+            continue
+        if reads:
+            results_by_index = run_concurrently({i: (lambda i=i: run(i)) for i in reads})
+            for i in reads:
+                results[i] = results_by_index[i]
+            reads = []
+        if sub is not None:
+            results[index] = run(index)
+    return results
+
+
+def max_sub_requests():
+    return getattr(settings, 'BATCH_MAX_SUB_REQUESTS', MAX_SUB_REQUESTS)
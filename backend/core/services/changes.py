@@ -0,0 +1,221 @@
+"""
+Change data capture: the transactional outbox behind the /changes/ feed.
+
+Every write to a tracked model (core.models.ChangeTrackedModel: cases, evidence, suspects,
+suspect-case links, biological profiles, trials and rewards) appends a `ChangeRecord` in the same transaction: the entity (the
+model's label), the row id, INSERT/UPDATE/DELETE, a version and the names of the changed
+fields; a many-to-many change is an UPDATE naming the relation. The row's data is not
+copied; a consumer reads the row if it needs more than the fact that it changed. Writes
+that bypass `save()` (`QuerySet.update()`, `bulk_create`, `bulk_update`) call
+`record_changes` next to the write.
+
+Order. Record ids are drawn when a record is inserted, not when its transaction commits, so
+a reader paging by id alone could step past a record whose transaction was still open and
+never see it. Each record also stores its transaction id (`txid_current()`), and the feed
+is read in (txid, id) order and only below the oldest transaction still running
+(`txid_snapshot_xmin`): under that line the outbox no longer changes, so a cursor never
+passes a record that is yet to appear. A transaction that waited on another's row lock may
+still carry the lower txid, so two changes to one row can arrive out of commit order;
+`version` (the write time, in microseconds) orders them, and consumers keep the highest
+version they have seen per (entity, id).
+
+Delivery is at-least-once: a consumer's cursor moves only when it acknowledges what it has
+processed (`commit`, via POST /changes/ack/ or stream_changes after each written batch), so a
+crash in between delivers those records again. Reading never moves it. `prune` deletes the
+records every registered consumer is past.
+
+In-process indexes follow the feed too (core.services.indexes), reading only the entities
+they watch with `changes_since` and checking with `pruned_past` that nothing they still
+needed was pruned.
+"""
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import models
+from django.db.models import Func, Q
+from django.utils import timezone
+
+from core.models import ChangeConsumer, ChangeOp, ChangeRecord
+
+FEED_PAGE_SIZE = 500
+MAX_FEED_PAGE_SIZE = 5000
+PRUNE_BATCH_SIZE = 10000
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+Cursor = namedtuple('Cursor', ['txid', 'id'])
+START = Cursor(0, 0)
+
+
+class ChangeFeedError(ValueError):
+    pass
+
+
+class CurrentTxid(Func):
+    template = 'txid_current()'
+    output_field = models.BigIntegerField()
+
+
+class AssignedTxid(Func):
+    template = 'txid_current_if_assigned()'
+    output_field = models.BigIntegerField()
+
+
+class SnapshotXmin(Func):
+    template = 'txid_snapshot_xmin(txid_current_snapshot())'
+    output_field = models.BigIntegerField()
+
+
+def version_of(moment):
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def format_cursor(cursor):
+    return f'{cursor.txid}-{cursor.id}'
+
+
+def parse_cursor(value):
+    """A Cursor from its `<txid>-<id>` form; START for an empty value."""
+    if not value:
+        return START
+    txid, _, record_id = str(value).partition('-')
+    try:
+        cursor = Cursor(int(txid), int(record_id))
+    except ValueError:
+        raise ChangeFeedError(f'Invalid cursor {value!r}.') from None
+    if cursor.txid < 0 or cursor.id < 0:
+        raise ChangeFeedError(f'Invalid cursor {value!r}.')
+    return cursor
+
+
+def _record(model, object_id, op, fields, version):
+    return ChangeRecord(
+        txid=CurrentTxid(),
+        entity=model._meta.label_lower,
+        object_id=object_id,
+        op=op,
+        version=version,
+        fields=list(fields),
+    )
+
+
+def record_change(instance, op, fields=()):
+    """Append the record of one saved or deleted instance to the current transaction."""
+    moment = getattr(instance, 'updated_at', None) if op != ChangeOp.DELETE else None
+    _record(type(instance), instance.pk, op, fields, version_of(moment or timezone.now())).save()
+
+
+def record_changes(model, ids, op, fields=()):
+    """Append one record per id, for a bulk write to `model` in the current transaction."""
+    version = version_of(timezone.now())
+    ChangeRecord.objects.bulk_create([_record(model, pk, op, fields, version) for pk in ids])
+
+
+def _after(cursor):
+    return Q(txid__gt=cursor.txid) | Q(txid=cursor.txid, id__gt=cursor.id)
+
+
+def settled():
+    """Records no running transaction can still add to: those below the snapshot's xmin, and our own."""
+    return ChangeRecord.objects.filter(Q(txid__lt=SnapshotXmin()) | Q(txid=AssignedTxid()))
+
+
+def read(cursor=START, limit=FEED_PAGE_SIZE):
+    """Up to `limit` settled records after `cursor`, in feed order, as dicts."""
+    rows = settled().filter(_after(cursor)).order_by('txid', 'id').values_list(
+        'txid', 'id', 'entity', 'object_id', 'op', 'version', 'fields'
+    )[:limit]
+    return [
+        {
+            'cursor': format_cursor(Cursor(txid, record_id)),
+            'entity': entity,
+            'id': object_id,
+            'op': op,
+            'version': version,
+            'fields': fields,
+        }
+        for txid, record_id, entity, object_id, op, version, fields in rows
+    ]
+
+
+def _passable():
+    # Records a cursor may move past. Those of the reader's own open transaction (settled
+    # for it) stay ahead while an older transaction runs: that one's records, with a lower
+    # txid, would otherwise land behind the cursor when it commits.
+    return settled().filter(txid__lte=SnapshotXmin())
+
+
+def head():
+    """The cursor past every record a reader can take now, and at least the pruning floor."""
+    last = _passable().order_by('-txid', '-id').values_list('txid', 'id').first()
+    floor = ChangeConsumer.objects.order_by('txid', 'record_id').values_list('txid', 'record_id').first()
+    return max(Cursor(*last) if last else START, Cursor(*floor) if floor else START)
+
+
+def changes_since(cursor, entities, chunk_size=FEED_PAGE_SIZE):
+    """
+    The settled records of `entities` (model labels) after `cursor`, in feed order, as
+    (entity, id, op) tuples, and the cursor to resume from: past them, except past those of
+    the reader's own open transaction while an older one runs.
+    """
+    records = []
+    resume = cursor
+    while True:
+        rows = list(
+            settled().filter(_after(cursor), entity__in=list(entities)).annotate(xmin=SnapshotXmin())
+            .order_by('txid', 'id').values_list('txid', 'id', 'entity', 'object_id', 'op', 'xmin')[:chunk_size]
+        )
+        for txid, record_id, entity, object_id, op, xmin in rows:
+            records.append((entity, object_id, op))
+            if txid <= xmin:
+                resume = Cursor(txid, record_id)
+        if len(rows) < chunk_size:
+            return records, resume
+        cursor = Cursor(*rows[-1][:2])
+
+
+def pruned_past(cursor):
+    """Whether `prune` may have deleted records after `cursor` that a reader there has not seen."""
+    floor = ChangeConsumer.objects.order_by('txid', 'record_id').values_list('txid', 'record_id').first()
+    if floor is None or Cursor(*floor) <= cursor:
+        return False
+    # prune deletes a prefix of the feed: while the record at the cursor is there, nothing after it went.
+    return not ChangeRecord.objects.filter(txid=cursor.txid, id=cursor.id).exists()
+
+
+def iter_changes(cursor=START, chunk_size=FEED_PAGE_SIZE):
+    """Every settled record after `cursor`, read a page at a time."""
+    while True:
+        page = read(cursor, chunk_size)
+        yield from page
+        if len(page) < chunk_size:
+            return
+        cursor = parse_cursor(page[-1]['cursor'])
+
+
+def consumer_cursor(name):
+    """The cursor consumer `name` has committed; START for a consumer that never committed."""
+    consumer = ChangeConsumer.objects.filter(name=name).first()
+    return Cursor(consumer.txid, consumer.record_id) if consumer else START
+
+
+def commit(name, cursor):
+    """Move consumer `name` forward to `cursor`; a cursor behind its current one is ignored."""
+    ChangeConsumer.objects.get_or_create(name=name)
+    ChangeConsumer.objects.filter(name=name).filter(
+        Q(txid__lt=cursor.txid) | Q(txid=cursor.txid, record_id__lt=cursor.id)
+    ).update(txid=cursor.txid, record_id=cursor.id, updated_at=timezone.now())
+
+
+def prune(batch_size=PRUNE_BATCH_SIZE):
+    """Delete the records every consumer has committed past; returns how many went."""
+    floor = ChangeConsumer.objects.order_by('txid', 'record_id').first()
+    if floor is None:
+        return 0
+    consumed = ChangeRecord.objects.filter(Q(txid__lt=floor.txid) | Q(txid=floor.txid, id__lte=floor.record_id))
+    deleted = 0
+    while True:
+        ids = list(consumed.order_by('txid', 'id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += ChangeRecord.objects.filter(id__in=ids).delete()[0]
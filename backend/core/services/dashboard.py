@@ -0,0 +1,178 @@
+"""
+The post-login dashboard: every widget relevant to the caller in one response.
+
+The caller's active role names are resolved once (see core.services.roles) and decide which
+widgets apply.
+Each widget is built from one or two aggregate queries and cached per user for its own short
+TTL; the cache is read for all widgets at once, and the missing ones are built concurrently
+on the shared read pool (core.concurrency).
+
+Widgets:
+- cases: case counts by status, for police ranks and judges
+- my_cases: counts and the latest cases the detective is assigned to or on the team of
+- notifications: unread count and the latest unread notifications
+- complaints: complaints waiting for the caller's review, and the caller's own returned ones
+- rewards: civilian reward tips waiting for officer or detective review
+- schedule: the caller's upcoming trials (judges) or interrogations (detectives, sergeants)
+- intensive_pursuit: suspects under pursuit for more than a month
+"""
+from collections import namedtuple
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from accounts.permissions import (
+    CADET,
+    CADET_OR_OFFICER_ROLES,
+    DETECTIVE,
+    JUDGE,
+    OFFICER_ROLES,
+    SERGEANT,
+)
+from core.cache import cache_key
+from core.concurrency import run_concurrently
+from core.services.roles import role_names
+
+LATEST = 5
+
+Widget = namedtuple('Widget', ['name', 'roles', 'timeout', 'build'])
+
+
+def resolve_roles(user):
+    """The user's active role names; superusers get '*', which matches every widget."""
+    if user.is_superuser:
+        return frozenset({'*'})
+    return role_names(user)
+
+
+def _cases(user):
+    from cases.models import Case, CaseStatus
+    counts = Case.objects.aggregate(
+        total=Count('id'),
+        open=Count('id', filter=Q(status=CaseStatus.OPEN)),
+        under_investigation=Count('id', filter=Q(status=CaseStatus.UNDER_INVESTIGATION)),
+        solved=Count('id', filter=Q(status=CaseStatus.SOLVED)),
+        closed=Count('id', filter=Q(status=CaseStatus.CLOSED)),
+    )
+    counts['active'] = counts['open'] + counts['under_investigation']
+    return counts
+
+
+def _my_cases(user):
+    from cases.models import Case
+    ids = Case.objects.filter(Q(assigned_detective=user) | Q(team_members=user)).values('id')
+    cases = Case.objects.filter(id__in=ids)
+    by_status = dict(cases.values_list('status').annotate(count=Count('id')).order_by())
+    latest = list(
+        cases.order_by('-updated_at').values('id', 'case_number', 'title', 'status', 'priority')[:LATEST]
+    )
+    return {'total': sum(by_status.values()), 'by_status': by_status, 'latest': latest}
+
+
+def _notifications(user):
+    from investigation.models import Notification
+    unread = Notification.objects.filter(recipient=user, read_at__isnull=True)
+    latest = list(unread.order_by('-created_at').values('id', 'case_id', 'message', 'created_at')[:LATEST])
+    return {'unread': unread.count(), 'latest': latest}
+
+
+def _complaints(user, roles):
+    from cases.models import Complaint, ComplaintStatus
+    counts = {
+        'returned_to_me': Count('id', filter=Q(complainant=user, status=ComplaintStatus.RETURNED_TO_COMPLAINANT)),
+    }
+    waiting = []
+    if roles & {CADET, '*'}:
+        waiting += [ComplaintStatus.PENDING_CADET, ComplaintStatus.RETURNED_TO_CADET]
+    if roles & {*OFFICER_ROLES, '*'}:
+        waiting.append(ComplaintStatus.PENDING_OFFICER)
+    if waiting:
+        counts['pending_review'] = Count('id', filter=Q(status__in=waiting))
+    return Complaint.objects.aggregate(**counts)
+
+
+def _rewards(user, roles):
+    from rewards.models import Reward, RewardStatus
+    counts = {}
+    if roles & {*OFFICER_ROLES, '*'} - {DETECTIVE}:
+        counts['pending_officer_review'] = Count('id', filter=Q(status=RewardStatus.PENDING))
+    if roles & {DETECTIVE, '*'}:
+        counts['pending_detective_review'] = Count(
+            'id', filter=Q(status=RewardStatus.PENDING_DETECTIVE, case__assigned_detective=user),
+        )
+    return Reward.objects.filter(is_civilian_reward=True).aggregate(**counts)
+
+
+def _schedule(user, roles):
+    from investigation.models import Interrogation, InterrogationStatus, Trial, TrialStatus
+    now = timezone.now()
+    data = {}
+    if roles & {JUDGE, '*'}:
+        data['trials'] = list(
+            Trial.objects.filter(judge=user, status=TrialStatus.SCHEDULED, scheduled_date__gte=now)
+            .order_by('scheduled_date')
+            .values('id', 'case_id', 'case__case_number', 'scheduled_date', 'courtroom')[:LATEST]
+        )
+    if roles & {DETECTIVE, SERGEANT, '*'}:
+        data['interrogations'] = list(
+            Interrogation.objects.filter(
+                Q(detective=user) | Q(sergeant=user),
+                status=InterrogationStatus.SCHEDULED, scheduled_date__gte=now,
+            )
+            .order_by('scheduled_date')
+            .values('id', 'interrogation_number', 'suspect_case_link__suspect_id', 'scheduled_date', 'location')[:LATEST]
+        )
+    return data
+
+
+def _intensive_pursuit(user):
+    from investigation.models import Suspect
+    threshold = timezone.now() - timedelta(days=30)
+    return {'count': Suspect.objects.filter(
+        is_wanted=True,
+        pursuit_start_date__lte=threshold,
+        case_links__case__status__in=['OPEN', 'UNDER_INVESTIGATION'],
+    ).values('id').distinct().count()}
+
+
+POLICE_AND_JUDGES = frozenset({*CADET_OR_OFFICER_ROLES, JUDGE})
+
+WIDGETS = [
+    Widget('cases', POLICE_AND_JUDGES, 60, lambda user, roles: _cases(user)),
+    Widget('my_cases', frozenset({DETECTIVE}), 30, lambda user, roles: _my_cases(user)),
+    Widget('notifications', None, 15, lambda user, roles: _notifications(user)),
+    Widget('complaints', None, 30, _complaints),
+    Widget('rewards', frozenset(OFFICER_ROLES), 30, _rewards),
+    Widget('schedule', frozenset({JUDGE, DETECTIVE, SERGEANT}), 60, _schedule),
+    Widget('intensive_pursuit', None, 300, lambda user, roles: _intensive_pursuit(user)),
+]
+
+
+def widgets_for(roles):
+    return [widget for widget in WIDGETS if widget.roles is None or '*' in roles or widget.roles & roles]
+
+
+def widget_key(user_id, name):
+    return cache_key('dashboard', user_id, name)
+
+
+def build_dashboard(user, roles=None):
+    """{'roles': [...], 'widgets': {name: data}} for the widgets relevant to `user`."""
+    roles = resolve_roles(user) if roles is None else roles
+    widgets = widgets_for(roles)
+    keys = {widget.name: widget_key(user.pk, widget.name) for widget in widgets}
+    cached = cache.get_many(list(keys.values()))
+    data = {widget.name: cached[keys[widget.name]] for widget in widgets if keys[widget.name] in cached}
+    missing = [widget for widget in widgets if widget.name not in data]
+    built = run_concurrently({
+        widget.name: (lambda widget=widget: widget.build(user, roles)) for widget in missing
+    })
+    for widget in missing:
+        cache.set(keys[widget.name], built[widget.name], widget.timeout)
+    data.update(built)
+    return {
+        'roles': sorted(roles - {'*'}),
+        'widgets': {widget.name: data[widget.name] for widget in widgets},
+    }
@@ -0,0 +1,386 @@
+"""
+Bulk exports of cases, evidence and suspects as CSV or NDJSON, optionally gzipped.
+
+Rows are read through server-side cursors (`.iterator(chunk_size=...)` on PostgreSQL) with
+`.values()` over just the exported columns, and encoded a chunk at a time. Whether the
+export is streamed to the client or written to a file, it never holds more than one chunk
+in memory. CSV text starting with a formula character is prefixed with a quote, so
+spreadsheets show it instead of running it.
+
+Each dataset lists the roles that may export it. Rows are limited to the cases the caller
+can see in the case list (cases.services.visible_cases): evidence of those cases, and
+suspects linked to them.
+
+Rows are exported in keyset order: by id within each source table, and the evidence
+export reads its five tables one after another. Every row has a cursor, which is its id,
+or `<evidence_type>:<id>` for evidence. An export started with `after=<cursor>` continues
+right after that row, so an interrupted download resumes from the last row received.
+
+In background mode the export is queued as an ExportJob. `manage.py run_export_jobs` then
+writes it to storage and records its progress as it goes: the row count and the cursor
+of the last row written.
+"""
+import csv
+import io
+import logging
+import tempfile
+import zlib
+from collections import namedtuple
+from datetime import date, datetime, time
+
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from accounts.permissions import (
+    CADET_OR_OFFICER_ROLES,
+    CAPTAIN,
+    DETECTIVE_SERGEANT_CHIEF_ROLES,
+    JUDGE,
+    SYSTEM_ADMIN,
+)
+from core.fieldsets import full_name
+from core.renderers import dumps
+from core.services.roles import role_names
+
+logger = logging.getLogger(__name__)
+
+EXPORT_CHUNK_SIZE = 2000
+TRUE_VALUES = ('1', 'true', 'yes')
+# Spreadsheets evaluate a cell starting with one of these as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+Column = namedtuple('Column', ['name', 'paths', 'fn'])
+# `sources(user)` returns [(key, queryset)] in export order; `keys` are those keys.
+Dataset = namedtuple('Dataset', ['name', 'roles', 'columns', 'filters', 'keys', 'sources'])
+ExportRequest = namedtuple('ExportRequest', ['dataset', 'output', 'gzip', 'filters', 'after'])
+
+
+class ExportError(ValueError):
+    pass
+
+
+def _column(name, path=None):
+    return Column(name, (path or name,), None)
+
+
+def _name_column(name, user_path):
+    return Column(name, (f'{user_path}__first_name', f'{user_path}__last_name'), full_name)
+
+
+def _moment(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def _flag(value):
+    return value.lower() in TRUE_VALUES
+
+
+def _case_sources(user):
+    from cases.services import visible_cases
+    return [('case', visible_cases(user))]
+
+
+def _evidence_sources(user):
+    from cases.models import (
+        BiologicalEvidence,
+        DocumentEvidence,
+        EvidenceType,
+        OtherEvidence,
+        VehicleEvidence,
+        WitnessTestimony,
+    )
+    from cases.services import visible_cases
+    cases = visible_cases(user).values('pk')
+    models = [
+        (EvidenceType.WITNESS, WitnessTestimony),
+        (EvidenceType.BIOLOGICAL, BiologicalEvidence),
+        (EvidenceType.VEHICLE, VehicleEvidence),
+        (EvidenceType.DOCUMENT, DocumentEvidence),
+        (EvidenceType.OTHER, OtherEvidence),
+    ]
+    return [(str(kind), model.objects.filter(case__in=cases)) for kind, model in models]
+
+
+def _suspect_sources(user):
+    from cases.services import visible_cases
+    from investigation.models import Suspect, SuspectCaseLink
+    links = SuspectCaseLink.objects.filter(case__in=visible_cases(user).values('pk'))
+    return [('suspect', Suspect.objects.filter(pk__in=links.values('suspect_id')))]
+
+
+DATASETS = {dataset.name: dataset for dataset in [
+    Dataset(
+        'cases',
+        frozenset({*CADET_OR_OFFICER_ROLES, JUDGE, SYSTEM_ADMIN}),
+        [
+            _column('id'), _column('case_number'), _column('title'), _column('status'), _column('priority'),
+            _column('incident_date'), _column('incident_location'),
+            _column('assigned_detective', 'assigned_detective_id'),
+            _name_column('detective_name', 'assigned_detective'),
+            _column('solved_date'), _column('closed_date'), _column('created_at'),
+        ],
+        {
+            'status': ('status', str),
+            'priority': ('priority', str),
+            'detective': ('assigned_detective_id', int),
+            'created_after': ('created_at__gte', _moment),
+            'created_before': ('created_at__lt', _moment),
+        },
+        ('case',),
+        _case_sources,
+    ),
+    Dataset(
+        'evidence',
+        frozenset({*CADET_OR_OFFICER_ROLES, JUDGE, SYSTEM_ADMIN}),
+        [
+            _column('evidence_type'), _column('id'), _column('evidence_number'),
+            _column('case', 'case_id'), _column('case_number', 'case__case_number'),
+            _column('title'), _column('description'), _column('status'),
+            _column('collected_by', 'collected_by_id'), _name_column('collected_by_name', 'collected_by'),
+            _column('collected_date'), _column('location'), _column('created_at'),
+        ],
+        {
+            'case': ('case_id', int),
+            'type': ('evidence_type', str),
+            'status': ('status', str),
+            'collected_after': ('collected_date__gte', _moment),
+            'collected_before': ('collected_date__lt', _moment),
+        },
+        ('WITNESS', 'BIOLOGICAL', 'VEHICLE', 'DOCUMENT', 'OTHER'),
+        _evidence_sources,
+    ),
+    Dataset(
+        'suspects',
+        frozenset({*DETECTIVE_SERGEANT_CHIEF_ROLES, CAPTAIN, JUDGE, SYSTEM_ADMIN}),
+        [
+            _column('id'), _column('national_id'), _column('first_name'), _column('last_name'),
+            _column('date_of_birth'), _column('status'), _column('is_wanted'),
+            _column('pursuit_start_date'), _column('created_at'),
+        ],
+        {
+            'status': ('status', str),
+            'is_wanted': ('is_wanted', _flag),
+            'case': ('case_links__case_id', int),
+        },
+        ('suspect',),
+        _suspect_sources,
+    ),
+]}
+
+
+def get_dataset(name):
+    return DATASETS.get(name)
+
+
+def can_export(user, dataset):
+    return user.is_superuser or bool(role_names(user) & dataset.roles)
+
+
+def parse_request(dataset, params):
+    """The ExportRequest for `params` (query params or a job's stored ones); raises ExportError."""
+    output = params.get('output') or 'csv'
+    if output not in CONTENT_TYPES:
+        raise ExportError(f'output must be one of: {", ".join(CONTENT_TYPES)}.')
+    filters = {}
+    for name, (lookup, parse) in dataset.filters.items():
+        value = params.get(name)
+        if value in (None, ''):
+            continue
+        try:
+            filters[lookup] = parse(str(value))
+        except ValueError:
+            raise ExportError(f'Invalid value for {name}: {value!r}.')
+    after = params.get('after') or None
+    if after is not None:
+        after = parse_cursor(dataset, after)
+    return ExportRequest(dataset, output, _flag(str(params.get('gzip') or '')), filters, after)
+
+
+def stored_params(request_params, dataset):
+    """The subset of `request_params` an ExportJob keeps to re-create its ExportRequest."""
+    names = ['output', 'gzip', 'after', *dataset.filters]
+    return {name: request_params.get(name) for name in names if request_params.get(name) not in (None, '')}
+
+
+def parse_cursor(dataset, value):
+    """(source key, id) for a cursor; a bare id means the dataset's first source."""
+    key, _, pk = value.rpartition(':')
+    if key and key not in dataset.keys or not pk.isdigit():
+        raise ExportError(f'Invalid cursor: {value!r}.')
+    return key or None, int(pk)
+
+
+def iter_rows(user, request, chunk_size=EXPORT_CHUNK_SIZE):
+    """(cursor, values row) for every row of the export, in keyset order."""
+    dataset = request.dataset
+    paths = list(dict.fromkeys(['id', *(path for column in dataset.columns for path in column.paths)]))
+    sources = dataset.sources(user)
+    single = len(dataset.keys) == 1
+    start_key, start_pk = request.after or (None, None)
+    started = request.after is None
+    for key, queryset in sources:
+        queryset = queryset.filter(**request.filters)
+        if not started:
+            if start_key not in (None, key):
+                continue
+            started = True
+            queryset = queryset.filter(pk__gt=start_pk)
+        rows = queryset.order_by('pk').values(*paths).iterator(chunk_size=chunk_size)
+        for row in rows:
+            yield (str(row['id']) if single else f"{key}:{row['id']}"), row
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def _values(columns, row):
+    for column in columns:
+        if column.fn is None:
+            yield column.name, row[column.paths[0]]
+        else:
+            yield column.name, column.fn(*[row[path] for path in column.paths])
+
+
+def encode(dataset, output, rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """The export file for `rows` ((cursor, row) pairs), as a sequence of byte chunks."""
+    columns = dataset.columns
+    if output == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([column.name for column in columns])
+        count = 0
+        for _, row in rows:
+            writer.writerow([_csv_value(value) for _, value in _values(columns, row)])
+            count += 1
+            if count % chunk_size == 0:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode()
+        return
+    batch = []
+    for _, row in rows:
+        batch.append(dumps(dict(_values(columns, row))))
+        if len(batch) >= chunk_size:
+            yield b'\n'.join(batch) + b'\n'
+            batch = []
+    if batch:
+        yield b'\n'.join(batch) + b'\n'
+
+
+def gzipped(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_chunks(user, request, chunk_size=EXPORT_CHUNK_SIZE):
+    chunks = encode(request.dataset, request.output, iter_rows(user, request, chunk_size), chunk_size)
+    return gzipped(chunks) if request.gzip else chunks
+
+
+def content_type(request):
+    return 'application/gzip' if request.gzip else CONTENT_TYPES[request.output]
+
+
+def filename(request, suffix=None):
+    name = f"{request.dataset.name}-{suffix or timezone.localdate().strftime('%Y%m%d')}.{request.output}"
+    return f'{name}.gz' if request.gzip else name
+
+
+def create_job(user, dataset, params):
+    """Queue a background export of `dataset` with `params`, validated as for a streamed one."""
+    from core.models import ExportJob
+    request = parse_request(dataset, params)
+    return ExportJob.objects.create(
+        dataset=dataset.name, output=request.output, gzip=request.gzip,
+        filters=stored_params(params, dataset), requested_by=user,
+    )
+
+
+def run_job(job, chunk_size=EXPORT_CHUNK_SIZE):
+    """Write a claimed (RUNNING) job's export to storage; it ends DONE or FAILED."""
+    from core.models import ExportJob, ExportStatus
+    progress = {'rows': 0, 'cursor': ''}
+
+    def tracked(rows):
+        for cursor, row in rows:
+            progress['rows'] += 1
+            progress['cursor'] = cursor
+            if progress['rows'] % chunk_size == 0:
+                ExportJob.objects.filter(pk=job.pk).update(row_count=progress['rows'], checkpoint=cursor)
+            yield cursor, row
+
+    try:
+        user = job.requested_by
+        request = parse_request(get_dataset(job.dataset), job.filters)
+        chunks = encode(request.dataset, request.output, tracked(iter_rows(user, request, chunk_size)), chunk_size)
+        with tempfile.TemporaryFile() as file:
+            for chunk in gzipped(chunks) if request.gzip else chunks:
+                file.write(chunk)
+            file.seek(0)
+            job.file.save(filename(request, job.pk), File(file), save=False)
+    except Exception as exc:
+        logger.exception('Export job %s failed', job.pk)
+        job.status = ExportStatus.FAILED
+        job.error = str(exc)
+    else:
+        job.status = ExportStatus.DONE
+    job.row_count = progress['rows']
+    job.checkpoint = progress['cursor']
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'file', 'row_count', 'checkpoint', 'finished_at', 'updated_at'])
+    return job
+
+
+def claim_job():
+    """The oldest PENDING job, marked RUNNING, or None; concurrent runners skip each other's."""
+    from core.models import ExportJob, ExportStatus
+    with transaction.atomic():
+        job = (
+            ExportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ExportStatus.PENDING)
+            .order_by('created_at', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ExportStatus.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=['status', 'started_at', 'updated_at'])
+    return job
+
+
+def run_pending_jobs(limit=None, chunk_size=EXPORT_CHUNK_SIZE):
+    jobs = []
+    while limit is None or len(jobs) < limit:
+        job = claim_job()
+        if job is None:
+            break
+        jobs.append(run_job(job, chunk_size))
+    return jobs
@@ -0,0 +1,174 @@
+"""
+Payment gateway interface, a local simulator, and the pooled async client every gateway
+call goes through.
+
+A gateway is a `PaymentGateway` subclass with two coroutines, `charge` and `payout`, each
+taking an amount and an idempotency key and returning a `GatewayResult`. Declines are
+results (`ok=False`); transient trouble (timeouts, 5xx) is a raised `GatewayError` that the
+client retries. `SimulatedGateway` stands in for a real provider locally and in tests, with
+configurable latency, decline rate and transient error rate.
+
+`GatewayClient` runs all calls on one background event loop so a real gateway can keep its
+HTTP connections pooled across requests, and lets at most `max_concurrency` calls be in
+flight at once. Synchronous callers block on one call (`charge`, `payout`) or submit many
+and wait for all of them (`call_many`). The process-wide client is built from
+settings.PAYMENT_GATEWAY by `get_gateway_client`.
+"""
+import asyncio
+import random
+import threading
+import uuid
+from collections import namedtuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+GatewayResult = namedtuple('GatewayResult', ['ok', 'reference', 'error'])
+
+DEFAULT_GATEWAY = {
+    'BACKEND': 'core.services.gateway.SimulatedGateway',
+    'OPTIONS': {},
+    'MAX_CONCURRENCY': 10,
+    'TIMEOUT': 10.0,
+    'RETRIES': 2,
+    'CALLBACK_SECRET': '',
+}
+
+
+class GatewayError(Exception):
+    """A transient gateway failure; the call may succeed if retried."""
+
+
+class PaymentGateway:
+    """Interface for payment providers. Calls with an idempotency key already seen must not move money twice."""
+
+    async def charge(self, amount, idempotency_key):
+        raise NotImplementedError
+
+    async def payout(self, amount, idempotency_key):
+        raise NotImplementedError
+
+
+class SimulatedGateway(PaymentGateway):
+    """
+    Local stand-in for a payment provider. Each call sleeps `latency` seconds (plus or minus
+    `jitter`), then raises GatewayError with probability `error_rate`, is declined with
+    probability `failure_rate`, and otherwise succeeds with a fresh reference. Successful
+    results are remembered per idempotency key and returned again without delay.
+    """
+
+    def __init__(self, latency=0.05, jitter=0.0, failure_rate=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._results = {}
+
+    async def _call(self, operation, amount, idempotency_key):
+        if idempotency_key in self._results:
+            return self._results[idempotency_key]
+        await asyncio.sleep(max(self.latency + self._random.uniform(-self.jitter, self.jitter), 0))
+        roll = self._random.random()
+        if roll < self.error_rate:
+            raise GatewayError('Simulated gateway timeout.')
+        if roll < self.error_rate + self.failure_rate:
+            return GatewayResult(False, '', 'Declined by simulated gateway.')
+        result = GatewayResult(True, f'SIM-{operation.upper()}-{uuid.uuid4().hex[:16]}', '')
+        self._results[idempotency_key] = result
+        return result
+
+    async def charge(self, amount, idempotency_key):
+        return await self._call('charge', amount, idempotency_key)
+
+    async def payout(self, amount, idempotency_key):
+        return await self._call('payout', amount, idempotency_key)
+
+
+class GatewayClient:
+    """Runs gateway calls on a background event loop, `max_concurrency` at a time, with a timeout and retries."""
+
+    def __init__(self, gateway, max_concurrency=10, timeout=10.0, retries=2, backoff=0.05):
+        self.gateway = gateway
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._semaphore = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+    async def _new_semaphore(self):
+        return asyncio.Semaphore(self.max_concurrency)
+
+    def _ensure_loop(self):
+        """(loop, semaphore); the semaphore is made on the running loop, which it then belongs to."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='payment-gateway', daemon=True).start()
+                self._semaphore = asyncio.run_coroutine_threadsafe(self._new_semaphore(), loop).result()
+                self._loop = loop
+            return self._loop, self._semaphore
+
+    async def _call(self, semaphore, operation, amount, idempotency_key):
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    return await asyncio.wait_for(
+                        getattr(self.gateway, operation)(amount, idempotency_key), self.timeout
+                    )
+                except (GatewayError, asyncio.TimeoutError) as exc:
+                    error = str(exc) or 'Gateway timed out.'
+                if attempt < self.retries:
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+            return GatewayResult(False, '', f'Gateway unavailable: {error}')
+
+    def submit(self, operation, amount, idempotency_key):
+        """Start one call and return a concurrent.futures.Future for its GatewayResult."""
+        loop, semaphore = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._call(semaphore, operation, amount, idempotency_key), loop)
+
+    def call_many(self, calls):
+        """Run (operation, amount, idempotency_key) calls concurrently; results in the same order."""
+        futures = [self.submit(*call) for call in calls]
+        return [future.result() for future in futures]
+
+    def charge(self, amount, idempotency_key):
+        return self.submit('charge', amount, idempotency_key).result()
+
+    def payout(self, amount, idempotency_key):
+        return self.submit('payout', amount, idempotency_key).result()
+
+    def close(self):
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._loop = None
+                self._semaphore = None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_gateway_client():
+    """The process-wide gateway client, built from settings.PAYMENT_GATEWAY on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            config = {**DEFAULT_GATEWAY, **getattr(settings, 'PAYMENT_GATEWAY', {})}
+            gateway = import_string(config['BACKEND'])(**config['OPTIONS'])
+            _client = GatewayClient(
+                gateway, config['MAX_CONCURRENCY'], config['TIMEOUT'], config['RETRIES']
+            )
+        return _client
+
+
+def reset_gateway_client(client=None):
+    """Close the current client; the next get_gateway_client() uses `client` or rebuilds from settings."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = client
@@ -0,0 +1,162 @@
+"""
+In-memory indexes kept current from the change feed.
+
+A `LiveIndex` holds a state built from the database (`build`) and follows the change feed
+(core.services.changes) for the models it `watches`: `refresh` reads the records after its
+cursor and hands the ids written and deleted to `update`, which returns the next state.
+The feed is read in commit-safe order and records updates, deletes (cascades included)
+and bulk writes, so nothing is missed and there is no periodic full reload; the state is
+rebuilt only on first use, when `prune` may have removed records the index had not read,
+or on request.
+
+A published state is never changed: `update` builds a new one, which replaces the old with
+a single assignment, so readers on other threads work on whichever whole state they picked
+up, without a lock. One thread refreshes at a time; `maybe_refresh` lets the others carry
+on with the current state and waits only while there is none. `warm` builds the first
+state on a background thread; `warm_indexes` does that at startup (config.wsgi and
+config.asgi) for the indexes named in settings.WARM_INDEXES, so the first requests do not
+pay for the build.
+"""
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from core.models import ChangeOp
+from core.services.changes import START, changes_since, head, pruned_past
+
+
+class FeedChanges:
+    """The ids written and deleted per watched model, from a run of change records."""
+
+    def __init__(self, records=()):
+        self._written = defaultdict(set)
+        self._deleted = defaultdict(set)
+        for entity, object_id, op in records:
+            if op == ChangeOp.DELETE:
+                self._written[entity].discard(object_id)
+                self._deleted[entity].add(object_id)
+            else:
+                self._written[entity].add(object_id)
+
+    def __len__(self):
+        return sum(map(len, self._written.values())) + sum(map(len, self._deleted.values()))
+
+    def written(self, model):
+        """Ids of `model` rows inserted or updated (and still there)."""
+        return self._written.get(model._meta.label_lower, set())
+
+    def deleted(self, model):
+        return self._deleted.get(model._meta.label_lower, set())
+
+    def touched(self, model):
+        return self.written(model) | self.deleted(model)
+
+
+class LiveIndex:
+    watches = ()
+    refresh_interval = 0.0
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, refresh_interval=None, clock=time.monotonic):
+        if refresh_interval is not None:
+            self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.state = None
+        self.cursor = START
+        self.checked_at = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, *args):
+        """The process-wide instance for `args`."""
+        with LiveIndex._shared_lock:
+            index = LiveIndex._shared.get((cls, args))
+            if index is None:
+                index = LiveIndex._shared[(cls, args)] = cls(*args)
+            return index
+
+    @classmethod
+    def reset_shared(cls):
+        with LiveIndex._shared_lock:
+            for key in [key for key in LiveIndex._shared if key[0] is cls]:
+                del LiveIndex._shared[key]
+
+    def build(self):
+        """A fresh state read from the database."""
+        raise NotImplementedError
+
+    def update(self, state, changes):
+        """The state after `changes` (FeedChanges); `state` itself must not be modified."""
+        return self.build()
+
+    def load(self):
+        """(state, cursor): a fresh state and the feed position it is current to."""
+        cursor = head()
+        return self.build(), cursor
+
+    def stale(self):
+        """Whether the state must be rebuilt whatever the feed says."""
+        return False
+
+    def current(self):
+        """The state, refreshed first when `refresh_interval` has passed."""
+        self.maybe_refresh()
+        return self.state
+
+    def refresh(self, force_full=False):
+        """Bring the state up to date; returns the number of rows re-read (all of them on a rebuild)."""
+        with self._lock:
+            return self._refresh(force_full)
+
+    def maybe_refresh(self):
+        """Refresh if `refresh_interval` has passed, unless another thread already is."""
+        if self.checked_at is not None and self.clock() - self.checked_at < self.refresh_interval:
+            return
+        if not self._lock.acquire(blocking=self.state is None):
+            return
+        try:
+            self._refresh(False)
+        finally:
+            self._lock.release()
+
+    def warm(self):
+        """Build the first state on a background thread; returns the thread."""
+        thread = threading.Thread(target=self._warm, name=f'warm-{type(self).__name__}', daemon=True)
+        thread.start()
+        return thread
+
+    def _warm(self):
+        try:
+            self.maybe_refresh()
+        finally:
+            connection.close()
+
+    def _refresh(self, force_full):
+        if force_full or self.state is None or self.stale():
+            return self._rebuild()
+        cursor = head()
+        records, resume = changes_since(self.cursor, [model._meta.label_lower for model in self.watches])
+        if pruned_past(self.cursor):
+            return self._rebuild()
+        changes = FeedChanges(records)
+        if len(changes):
+            self.state = self.update(self.state, changes)
+        self.cursor = max(cursor, resume)
+        self.checked_at = self.clock()
+        return len(changes)
+
+    def _rebuild(self):
+        self.state, self.cursor = self.load()
+        self.checked_at = self.clock()
+        return len(self.state)
+
+
+def warm_indexes():
+    """Start building the shared instance of every LiveIndex class named in settings.WARM_INDEXES."""
+    return [import_string(path).shared().warm() for path in getattr(settings, 'WARM_INDEXES', ())]
@@ -0,0 +1,330 @@
+"""
+Double-entry ledger behind bail and fine collections and reward payouts.
+
+Every money movement is a `LedgerTransaction` whose `Posting` rows sum to zero (debits
+positive, credits negative). Transactions are keyed by the business event ("bail:12",
+"reward:40"), so posting an event again returns the existing transaction. The accounts:
+
+- gateway-clearing: money captured or paid out by the gateway and not yet settled
+- bank: settled funds (see core.services.settlement)
+- station-cash: cash paid out at police stations
+- bail-held: bail owed back to suspects
+- fine-income: fines collected
+- rewards-payable: rewards accrued but not yet paid
+- reward-expense: rewards granted
+
+A `Payment` records the gateway or cash side of a posting. `charge` and `pay_out` call the
+gateway first and leave a PENDING or FAILED payment; the `record_*` functions, called from
+the model methods once the money has moved, capture it and post its transaction.
+"""
+from collections import namedtuple
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from core.models import (
+    AccountKind,
+    LedgerAccount,
+    LedgerTransaction,
+    Posting,
+    Payment,
+    PaymentChannel,
+    PaymentDirection,
+    PaymentPurpose,
+    PaymentStatus,
+)
+from core.services.gateway import get_gateway_client
+
+GATEWAY_CLEARING = 'gateway-clearing'
+BANK = 'bank'
+STATION_CASH = 'station-cash'
+BAIL_HELD = 'bail-held'
+FINE_INCOME = 'fine-income'
+REWARDS_PAYABLE = 'rewards-payable'
+REWARD_EXPENSE = 'reward-expense'
+
+ACCOUNTS = {
+    GATEWAY_CLEARING: ('Gateway clearing', AccountKind.ASSET),
+    BANK: ('Bank', AccountKind.ASSET),
+    STATION_CASH: ('Station cash', AccountKind.ASSET),
+    BAIL_HELD: ('Bail held', AccountKind.LIABILITY),
+    FINE_INCOME: ('Fine income', AccountKind.INCOME),
+    REWARDS_PAYABLE: ('Rewards payable', AccountKind.LIABILITY),
+    REWARD_EXPENSE: ('Reward expense', AccountKind.EXPENSE),
+}
+
+COLLECTION_ACCOUNTS = {
+    PaymentPurpose.BAIL: BAIL_HELD,
+    PaymentPurpose.FINE: FINE_INCOME,
+}
+
+CHANNEL_ACCOUNTS = {
+    PaymentChannel.GATEWAY: GATEWAY_CLEARING,
+    PaymentChannel.STATION: STATION_CASH,
+}
+
+
+PaymentRecord = namedtuple('PaymentRecord', [
+    'idempotency_key', 'direction', 'purpose', 'amount', 'entries', 'source', 'channel', 'reference',
+], defaults=[None, PaymentChannel.GATEWAY, ''])
+
+
+class PaymentFailed(Exception):
+    """The gateway declined the payment or could not be reached."""
+
+
+def account_ids(codes):
+    """{code: id} for the given account codes, creating well-known accounts on first use."""
+    ids = dict(LedgerAccount.objects.filter(code__in=codes).values_list('code', 'id'))
+    for code in set(codes) - set(ids):
+        name, kind = ACCOUNTS[code]
+        ids[code] = LedgerAccount.objects.get_or_create(code=code, defaults={'name': name, 'kind': kind})[0].id
+    return ids
+
+
+def post(idempotency_key, kind, entries, source=None, description=''):
+    """
+    Post [(account_code, amount), ...] as one transaction, or return the transaction already
+    posted under `idempotency_key`. Zero amounts are dropped; the rest must sum to zero.
+    """
+    entries = [(code, Decimal(amount)) for code, amount in entries if amount]
+    if sum(amount for _, amount in entries) != 0:
+        raise ValidationError('Ledger postings must balance.')
+    existing = LedgerTransaction.objects.filter(idempotency_key=idempotency_key).first()
+    if existing is not None:
+        return existing
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                txn = LedgerTransaction.objects.create(
+                    idempotency_key=idempotency_key, kind=kind, description=description[:255], source=source,
+                )
+        except IntegrityError:
+            return LedgerTransaction.objects.get(idempotency_key=idempotency_key)
+        ids = account_ids([code for code, _ in entries])
+        Posting.objects.bulk_create([
+            Posting(transaction=txn, account_id=ids[code], amount=amount) for code, amount in entries
+        ])
+    return txn
+
+
+def record_payment(idempotency_key, direction, purpose, amount, entries, source=None,
+                   channel=PaymentChannel.GATEWAY, reference=''):
+    """Capture the payment keyed `idempotency_key` (creating it if needed) and post its transaction once."""
+    with transaction.atomic():
+        payment, _ = Payment.objects.select_for_update().get_or_create(
+            idempotency_key=idempotency_key,
+            defaults={
+                'direction': direction, 'channel': channel, 'purpose': purpose,
+                'amount': amount, 'source': source,
+            },
+        )
+        if payment.transaction_id:
+            return payment
+        payment.transaction = post(
+            idempotency_key, f'{purpose.lower()}_{direction.lower()}', entries, source,
+            f'{payment.get_purpose_display()} {payment.get_direction_display().lower()}',
+        )
+        payment.amount = amount
+        payment.channel = channel
+        payment.status = PaymentStatus.CAPTURED
+        payment.gateway_reference = reference or payment.gateway_reference
+        payment.failure_reason = ''
+        payment.captured_at = timezone.now()
+        payment.save()
+    return payment
+
+
+def record_collection(idempotency_key, purpose, amount, source=None, reference=''):
+    """Bail or fine money received through the gateway."""
+    return record_payment(
+        idempotency_key, PaymentDirection.IN, purpose, amount,
+        [(GATEWAY_CLEARING, amount), (COLLECTION_ACCOUNTS[purpose], -amount)],
+        source, reference=reference,
+    )
+
+
+def post_many(postings):
+    """
+    `post` for many [(idempotency_key, kind, entries, source, description)] in a constant
+    number of queries. Returns {idempotency_key: transaction}, including ones posted before.
+    """
+    todo = {}
+    for key, kind, entries, source, description in postings:
+        entries = [(code, Decimal(amount)) for code, amount in entries if amount]
+        if sum(amount for _, amount in entries) != 0:
+            raise ValidationError('Ledger postings must balance.')
+        todo.setdefault(key, (kind, entries, source, description))
+    with transaction.atomic():
+        txns = LedgerTransaction.objects.in_bulk(list(todo), field_name='idempotency_key')
+        new = [(key, *posting) for key, posting in todo.items() if key not in txns]
+        if not new:
+            return txns
+        ids = account_ids(list({code for _, _, entries, _, _ in new for code, _ in entries}))
+        created = LedgerTransaction.objects.bulk_create([
+            LedgerTransaction(idempotency_key=key, kind=kind, description=description[:255], source=source)
+            for key, kind, _, source, description in new
+        ])
+        Posting.objects.bulk_create([
+            Posting(transaction=txn, account_id=ids[code], amount=amount)
+            for txn, (_, _, entries, _, _) in zip(created, new)
+            for code, amount in entries
+        ])
+        txns.update((txn.idempotency_key, txn) for txn in created)
+    return txns
+
+
+def record_payments(records):
+    """
+    `record_payment` for many `PaymentRecord`s in a constant number of queries. Keys already
+    posted are skipped; returns the keys posted now.
+    """
+    todo = {}
+    for record in records:
+        todo.setdefault(record.idempotency_key, record)
+    with transaction.atomic():
+        payments = {
+            payment.idempotency_key: payment
+            for payment in Payment.objects.select_for_update().filter(idempotency_key__in=list(todo)).order_by()
+        }
+        todo = [r for key, r in todo.items() if key not in payments or not payments[key].transaction_id]
+        if not todo:
+            return []
+        txns = post_many([
+            (
+                r.idempotency_key, f'{r.purpose.lower()}_{r.direction.lower()}', r.entries, r.source,
+                f'{PaymentPurpose(r.purpose).label} {PaymentDirection(r.direction).label.lower()}',
+            )
+            for r in todo
+        ])
+        now = timezone.now()
+        created, updated = [], []
+        for r in todo:
+            payment = payments.get(r.idempotency_key) or Payment(
+                idempotency_key=r.idempotency_key, direction=r.direction, purpose=r.purpose, source=r.source,
+            )
+            payment.transaction = txns[r.idempotency_key]
+            payment.amount = r.amount
+            payment.channel = r.channel
+            payment.status = PaymentStatus.CAPTURED
+            payment.gateway_reference = r.reference or payment.gateway_reference
+            payment.failure_reason = ''
+            payment.captured_at = now
+            payment.updated_at = now
+            (updated if payment.pk else created).append(payment)
+        Payment.objects.bulk_create(created)
+        Payment.objects.bulk_update(updated, [
+            'transaction', 'amount', 'channel', 'status', 'gateway_reference', 'failure_reason',
+            'captured_at', 'updated_at',
+        ])
+    return [r.idempotency_key for r in todo]
+
+
+def record_collections(collections):
+    """`record_collection` for many [(idempotency_key, purpose, amount, source, reference)]."""
+    return record_payments([
+        PaymentRecord(
+            key, PaymentDirection.IN, purpose, amount,
+            [(GATEWAY_CLEARING, amount), (COLLECTION_ACCOUNTS[purpose], -amount)],
+            source, reference=reference,
+        )
+        for key, purpose, amount, source, reference in collections
+    ])
+
+
+def record_bail(bail_fine, amount, reference=''):
+    return record_collection(f'bail:{bail_fine.pk}', PaymentPurpose.BAIL, amount, bail_fine, reference)
+
+
+def record_fine(bail_fine, amount, reference=''):
+    return record_collection(f'fine:{bail_fine.pk}', PaymentPurpose.FINE, amount, bail_fine, reference)
+
+
+def accrual_key(reward):
+    return f'reward-accrual:{reward.pk}'
+
+
+def record_reward_accrual(reward):
+    """A reward granted now and paid later (team distributions): expense it and owe it."""
+    return post(
+        accrual_key(reward), 'reward_accrual',
+        [(REWARD_EXPENSE, reward.amount), (REWARDS_PAYABLE, -reward.amount)],
+        reward, f'Reward {reward.reward_code} accrued',
+    )
+
+
+def record_reward_accruals(rewards):
+    """`record_reward_accrual` for many rewards in a constant number of queries."""
+    return post_many([
+        (
+            accrual_key(reward), 'reward_accrual',
+            [(REWARD_EXPENSE, reward.amount), (REWARDS_PAYABLE, -reward.amount)],
+            reward, f'Reward {reward.reward_code} accrued',
+        )
+        for reward in rewards
+    ])
+
+
+def _payout_record(reward, accrued, channel, reference):
+    return PaymentRecord(
+        f'reward:{reward.pk}', PaymentDirection.OUT, PaymentPurpose.REWARD, reward.amount,
+        [(REWARDS_PAYABLE if accrued else REWARD_EXPENSE, reward.amount), (CHANNEL_ACCOUNTS[channel], -reward.amount)],
+        reward, channel, reference,
+    )
+
+
+def record_reward_payout(reward, channel=PaymentChannel.GATEWAY, reference=''):
+    """A reward paid out; settles the accrual if there was one, otherwise expensed directly."""
+    accrued = LedgerTransaction.objects.filter(idempotency_key=accrual_key(reward)).exists()
+    return record_payment(*_payout_record(reward, accrued, channel, reference))
+
+
+def record_reward_payouts(rewards, references, channel=PaymentChannel.GATEWAY):
+    """`record_reward_payout` for many rewards; `references` maps reward id to gateway reference."""
+    accrued = set(
+        LedgerTransaction.objects.filter(idempotency_key__in=[accrual_key(reward) for reward in rewards])
+        .values_list('idempotency_key', flat=True)
+    )
+    return record_payments([
+        _payout_record(reward, accrual_key(reward) in accrued, channel, references.get(reward.pk, ''))
+        for reward in rewards
+    ])
+
+
+def _through_gateway(operation, idempotency_key, direction, purpose, amount, source):
+    payment, _ = Payment.objects.get_or_create(
+        idempotency_key=idempotency_key,
+        defaults={'direction': direction, 'purpose': purpose, 'amount': amount, 'source': source},
+    )
+    if payment.status in (PaymentStatus.CAPTURED, PaymentStatus.SETTLED):
+        return payment.gateway_reference
+    result = getattr(get_gateway_client(), operation)(amount, idempotency_key)
+    if not result.ok:
+        payment.status = PaymentStatus.FAILED
+        payment.failure_reason = result.error[:255]
+        payment.save(update_fields=['status', 'failure_reason', 'updated_at'])
+        raise PaymentFailed(result.error)
+    payment.gateway_reference = result.reference
+    payment.save(update_fields=['gateway_reference', 'updated_at'])
+    return result.reference
+
+
+def charge(idempotency_key, purpose, amount, source=None):
+    """Collect `amount` through the gateway; returns its reference or raises PaymentFailed."""
+    return _through_gateway('charge', idempotency_key, PaymentDirection.IN, purpose, amount, source)
+
+
+def pay_out(idempotency_key, purpose, amount, source=None):
+    """Send `amount` through the gateway; returns its reference or raises PaymentFailed."""
+    return _through_gateway('payout', idempotency_key, PaymentDirection.OUT, purpose, amount, source)
+
+
+def balances():
+    """{account_code: balance} from the postings table."""
+    return {
+        row['account__code']: row['total']
+        for row in Posting.objects.values('account__code').annotate(total=Sum('amount')).order_by()
+    }
@@ -0,0 +1,30 @@
+"""
+Active role names, resolved once per request.
+
+Role checks (`UserProfile.has_role`, the role permission classes) each cost a query. Request
+handlers that make many of them, such as the dashboard and batch endpoints, resolve the
+names once inside `resolved_roles(user)`, which attaches them to the user object so checks
+on it are answered from memory until the block ends. Nothing is kept across requests: a role
+granted, revoked or deactivated applies to the very next request.
+"""
+from contextlib import contextmanager
+
+
+def role_names(user):
+    """The user's active role names: the ones attached for this request, else one query."""
+    if user.active_role_names is not None:
+        return user.active_role_names
+    return frozenset(user.roles.filter(is_active=True).values_list('name', flat=True))
+
+
+@contextmanager
+def resolved_roles(user):
+    """Answer `user`'s role checks from one query for the duration of the block."""
+    attached = user.active_role_names is None
+    if attached:
+        user.active_role_names = role_names(user)
+    try:
+        yield user.active_role_names
+    finally:
+        if attached:
+            user.active_role_names = None
@@ -0,0 +1,114 @@
+"""
+Batch settlement of gateway payments and streaming reconciliation of the ledger.
+
+`settle` takes captured, unsettled gateway payments in id order, a batch at a time, and for
+each batch posts one transaction moving the batch's net (collections minus payouts) from
+gateway clearing into the bank, then marks the payments SETTLED. Each batch locks its rows
+with SKIP LOCKED, so two settlement runs never take the same payment.
+
+`reconcile` reads the postings table once through a server-side cursor, grouped by
+transaction, so memory stays flat however many postings there are. It reports transactions
+whose postings do not sum to zero, account balances, captured payments without a
+transaction, and whether gateway clearing equals the payments still awaiting settlement.
+"""
+from collections import defaultdict, namedtuple
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from core.models import (
+    LedgerAccount,
+    Payment,
+    PaymentChannel,
+    PaymentDirection,
+    PaymentStatus,
+    Posting,
+    SettlementBatch,
+    SettlementStatus,
+)
+from core.services.ledger import BANK, GATEWAY_CLEARING, post
+
+SETTLEMENT_BATCH_SIZE = 1000
+RECONCILE_CHUNK_SIZE = 10000
+MAX_REPORTED = 100
+
+Reconciliation = namedtuple('Reconciliation', [
+    'transactions', 'postings', 'unbalanced', 'balances', 'unposted_payments',
+    'clearing_expected', 'clearing_actual',
+])
+
+
+def settle_batch(batch_size=SETTLEMENT_BATCH_SIZE):
+    """Settle up to `batch_size` captured gateway payments; None when there is nothing to settle."""
+    with transaction.atomic():
+        rows = list(
+            Payment.objects.select_for_update(skip_locked=True)
+            .filter(status=PaymentStatus.CAPTURED, channel=PaymentChannel.GATEWAY)
+            .order_by('id').values_list('id', 'direction', 'amount')[:batch_size]
+        )
+        if not rows:
+            return None
+        net = sum((amount if direction == PaymentDirection.IN else -amount for _, direction, amount in rows), Decimal(0))
+        batch = SettlementBatch.objects.create(payment_count=len(rows), net_amount=net)
+        txn = post(f'settlement:{batch.pk}', 'settlement', [(BANK, net), (GATEWAY_CLEARING, -net)], batch)
+        now = timezone.now()
+        Payment.objects.filter(pk__in=[row[0] for row in rows]).update(
+            status=PaymentStatus.SETTLED, settlement_batch=batch, updated_at=now,
+        )
+        batch.transaction = txn
+        batch.status = SettlementStatus.SETTLED
+        batch.settled_at = now
+        batch.save()
+    return batch
+
+
+def settle(batch_size=SETTLEMENT_BATCH_SIZE, max_batches=None):
+    """Settle batches until nothing is left (or `max_batches` ran); returns the batches."""
+    batches = []
+    while max_batches is None or len(batches) < max_batches:
+        batch = settle_batch(batch_size)
+        if batch is None:
+            break
+        batches.append(batch)
+    return batches
+
+
+def reconcile(chunk_size=RECONCILE_CHUNK_SIZE):
+    """One streaming pass over the postings plus one aggregate over payments; see the module docstring."""
+    codes = dict(LedgerAccount.objects.values_list('id', 'code'))
+    balances = defaultdict(Decimal)
+    unbalanced = []
+    transactions = postings = 0
+    current, total = None, Decimal(0)
+    rows = Posting.objects.order_by('transaction_id').values_list('transaction_id', 'account_id', 'amount')
+    for transaction_id, account_id, amount in rows.iterator(chunk_size=chunk_size):
+        if transaction_id != current:
+            if total and len(unbalanced) < MAX_REPORTED:
+                unbalanced.append(current)
+            current, total = transaction_id, Decimal(0)
+            transactions += 1
+        total += amount
+        balances[account_id] += amount
+        postings += 1
+    if total and len(unbalanced) < MAX_REPORTED:
+        unbalanced.append(current)
+
+    captured = Payment.objects.filter(status__in=[PaymentStatus.CAPTURED, PaymentStatus.SETTLED])
+    unsettled = Q(status=PaymentStatus.CAPTURED, channel=PaymentChannel.GATEWAY)
+    totals = captured.aggregate(
+        unposted=Count('pk', filter=Q(transaction__isnull=True)),
+        incoming=Sum('amount', filter=unsettled & Q(direction=PaymentDirection.IN)),
+        outgoing=Sum('amount', filter=unsettled & Q(direction=PaymentDirection.OUT)),
+    )
+    by_code = {codes[account_id]: balance for account_id, balance in balances.items()}
+    return Reconciliation(
+        transactions=transactions,
+        postings=postings,
+        unbalanced=unbalanced,
+        balances=by_code,
+        unposted_payments=totals['unposted'] or 0,
+        clearing_expected=(totals['incoming'] or Decimal(0)) - (totals['outgoing'] or Decimal(0)),
+        clearing_actual=by_code.get(GATEWAY_CLEARING, Decimal(0)),
+    )
@@ -0,0 +1,26 @@
+def record_delete(sender, instance, **kwargs):
+    """Append the DELETE change record of a tracked row (sent inside the deleting transaction)."""
+    from core.models import ChangeOp
+    from core.services.changes import record_change
+    record_change(instance, ChangeOp.DELETE)
+
+
+# {through model: many-to-many field} for the relations with a tracked model on either side.
+TRACKED_M2M = {}
+
+
+def record_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Append UPDATE records for the tracked rows on both sides of a many-to-many change."""
+    from core.models import ChangeOp, ChangeTrackedModel
+    from core.services.changes import record_changes
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    field = TRACKED_M2M[sender]
+    accessor = field.remote_field.get_accessor_name()
+    if action == 'pre_clear':
+        pk_set = getattr(instance, accessor if reverse else field.name).values_list('pk', flat=True)
+    owners, related = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    if issubclass(field.model, ChangeTrackedModel):
+        record_changes(field.model, owners, ChangeOp.UPDATE, [field.name])
+    if issubclass(field.related_model, ChangeTrackedModel):
+        record_changes(field.related_model, related, ChangeOp.UPDATE, [accessor])
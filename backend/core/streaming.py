@@ -0,0 +1,63 @@
+"""
+Streamed JSON lists for endpoints that can return very many rows.
+
+`stream_json(items)` returns a StreamingHttpResponse whose body is the usual
+{"status": "success", "data": [...]} document, written out while `items` is consumed. Rows
+are encoded a batch at a time with the project's JSON encoding (core.renderers.dumps), so
+the response never holds more than one batch. Fed from `queryset.iterator(chunk_size=...)`,
+which reads through a server-side cursor on PostgreSQL, peak memory stays flat however many
+rows there are.
+
+List endpoints opt in with `?stream=true` (see `wants_stream`). A stream stops after
+settings.STREAM_MAX_ROWS rows and then ends with "truncated": true; complete dumps of large
+tables go through the bulk exports (core.services.exports), which are limited by role.
+"""
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from core.renderers import dumps
+
+STREAM_CHUNK_SIZE = 1000
+STREAM_MAX_ROWS = 100000
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def wants_stream(request):
+    return request.query_params.get('stream', '').lower() in TRUE_VALUES
+
+
+def max_stream_rows():
+    return getattr(settings, 'STREAM_MAX_ROWS', STREAM_MAX_ROWS)
+
+
+def iter_json_list(items, envelope=None, batch_size=STREAM_CHUNK_SIZE, max_rows=None):
+    """
+    The JSON bytes of `envelope` with `items` as its "data" list, in pieces. With `max_rows`,
+    the list stops there and, if items were left, the document ends with "truncated": true.
+    """
+    envelope = {'status': 'success'} if envelope is None else envelope
+    yield dumps(envelope)[:-1] + (b',"data":[' if envelope else b'"data":[')
+    batch = []
+    first = True
+    count = 0
+    for item in items:
+        if max_rows is not None and count >= max_rows:
+            if batch:
+                yield (b'' if first else b',') + b','.join(batch)
+            yield b'],"truncated":true}'
+            return
+        count += 1
+        batch.append(dumps(item))
+        if len(batch) >= batch_size:
+            yield (b'' if first else b',') + b','.join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield (b'' if first else b',') + b','.join(batch)
+    yield b']}'
+
+
+def stream_json(items, envelope=None, batch_size=STREAM_CHUNK_SIZE, status=200):
+    return StreamingHttpResponse(
+        iter_json_list(items, envelope, batch_size, max_stream_rows()), content_type='application/json', status=status,
+    )
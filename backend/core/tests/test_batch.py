@@ -0,0 +1,149 @@
+"""
+Batch endpoint: in-process dispatch of sub-requests with shared authentication and role
+lookups, per-sub-request status codes, and writes ordered before the reads that follow them.
+"""
+import threading
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Role
+from cases.models import Case, CaseStatus
+
+User = get_user_model()
+
+BATCH_URL = '/api/v1/batch/'
+
+
+def make_user(username, *roles, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    user = User.objects.create_user(**defaults)
+    user.roles.add(*(Role.objects.get_or_create(name=role)[0] for role in roles))
+    return user
+
+
+class BatchTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.detective = make_user('detective_batch', 'Detective')
+        self.case = Case.objects.create(
+            title='Batch case', description='D', incident_date=timezone.now(), incident_location='L',
+            status=CaseStatus.UNDER_INVESTIGATION, assigned_detective=self.detective,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.detective)
+
+    def batch(self, *requests):
+        return self.client.post(BATCH_URL, {'requests': list(requests)}, format='json')
+
+    def test_each_sub_request_gets_its_own_status(self):
+        resp = self.batch(
+            {'id': 'case', 'path': f'/api/v1/cases/{self.case.pk}/'},
+            {'id': 'stats', 'path': '/api/v1/cases/statistics/'},
+            {'id': 'missing', 'path': '/api/v1/nowhere/'},
+            {'id': 'detectives', 'path': '/api/v1/cases/detectives/'},
+            {'id': 'outside', 'path': '/admin/'},
+            {'id': 'nested', 'method': 'post', 'path': BATCH_URL, 'body': {'requests': []}},
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        results = {result['id']: result for result in resp.data['data']}
+        self.assertEqual(list(results), ['case', 'stats', 'missing', 'detectives', 'outside', 'nested'])
+        self.assertEqual(results['case']['status'], 200)
+        body = results['case']['body']
+        self.assertEqual(body.get('data', body)['case_number'], self.case.case_number)
+        self.assertEqual(results['stats']['body']['data']['total_cases'], 1)
+        self.assertEqual(results['missing']['status'], 404)
+        self.assertEqual(results['detectives']['status'], 403)
+        self.assertEqual(results['outside']['status'], 400)
+        self.assertEqual(results['nested']['status'], 400)
+
+    def test_writes_are_applied_before_later_reads(self):
+        journal = f'/api/v1/cases/{self.case.pk}/journal/'
+        resp = self.batch(
+            {'path': journal},
+            {'method': 'POST', 'path': journal, 'body': {'body': 'Batched note'}},
+            {'path': journal},
+        )
+        before, created, after = resp.data['data']
+        self.assertEqual(created['status'], 201)
+        self.assertEqual(after['body']['count'], before['body']['count'] + 1)
+        self.assertEqual(after['body']['results'][-1]['body'], 'Batched note')
+
+    def test_roles_are_resolved_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.batch(*({'path': f'/api/v1/cases/{self.case.pk}/'} for _ in range(5)))
+        self.assertTrue(all(result['status'] == 200 for result in resp.data['data']))
+        self.assertEqual(sum('accounts_role' in query['sql'] for query in ctx.captured_queries), 1)
+
+    def test_deactivated_role_applies_to_the_next_batch(self):
+        path = f'/api/v1/cases/{self.case.pk}/'
+        self.assertEqual(self.batch({'path': path}).data['data'][0]['status'], 200)
+        self.assertIsNone(self.detective.active_role_names)
+        Role.objects.filter(name='Detective').update(is_active=False)
+        self.assertEqual(self.batch({'path': path}).data['data'][0]['status'], 403)
+
+    @override_settings(BATCH_MAX_SUB_REQUESTS=2)
+    def test_validation(self):
+        self.assertEqual(self.batch(*({'path': '/api/v1/cases/'} for _ in range(3))).status_code, 400)
+        self.assertEqual(self.batch().status_code, 400)
+        self.client.force_authenticate(user=None)
+        resp = self.batch({'path': '/api/v1/cases/'})
+        self.assertIn(resp.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_streamed_responses_are_not_batched(self):
+        resp = self.batch(
+            {'id': 'export', 'path': '/api/v1/exports/cases/'},
+            {'id': 'stream', 'path': '/api/v1/cases/?stream=true'},
+            {'id': 'page', 'path': '/api/v1/cases/'},
+        )
+        self.assertEqual([result['status'] for result in resp.data['data']], [400, 400, 200])
+
+
+class ConcurrentBatchTestCase(TransactionTestCase):
+    """Outside a transaction the GETs really run on the shared read pool."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.detective = make_user('detective_pool_batch', 'Detective')
+
+    def test_dashboards_batched_on_the_pool_finish(self):
+        responses = []
+
+        def post():
+            client = APIClient()
+            client.force_authenticate(user=self.detective)
+            try:
+                responses.append(client.post(
+                    BATCH_URL, {'requests': [{'path': '/api/v1/dashboard/'} for _ in range(6)]}, format='json',
+                ))
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=post) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+        self.assertFalse(any(worker.is_alive() for worker in workers), 'batched dashboards deadlocked the pool')
+        self.assertEqual(len(responses), 2)
+        for resp in responses:
+            self.assertEqual([result['status'] for result in resp.data['data']], [200] * 6)
@@ -0,0 +1,203 @@
+"""
+Change data capture: records appended with each write, the /changes/ feed in commit-safe
+order, consumer cursors and pruning, and the stream_changes command.
+"""
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import Role
+from cases.models import Case, CaseStatus, DocumentEvidence, WitnessTestimony
+from core.models import ChangeConsumer, ChangeRecord
+from core.services.changes import commit, parse_cursor, prune, read
+from rewards.models import Reward
+
+User = get_user_model()
+
+CHANGES_URL = '/api/v1/changes/'
+
+
+def make_user(username, *roles, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    user = User.objects.create_user(**defaults)
+    user.roles.add(*(Role.objects.get_or_create(name=role)[0] for role in roles))
+    return user
+
+
+def summary(records):
+    return [(record['entity'], record['id'], record['op'], record['fields']) for record in records]
+
+
+class ChangeCaptureTestCase(TestCase):
+
+    def setUp(self):
+        self.case = Case.objects.create(
+            title='Case', description='D', incident_date=timezone.now(), incident_location='L',
+        )
+        ChangeRecord.objects.all().delete()
+
+    def test_saves_record_inserts_and_changed_fields(self):
+        self.case.title = 'Renamed'
+        self.case.save()
+        self.case.save()
+        case = Case.objects.get(pk=self.case.pk)
+        case.status = CaseStatus.UNDER_INVESTIGATION
+        case.description = 'Not saved'
+        case.save(update_fields=['status'])
+        witness = WitnessTestimony.objects.create(
+            case=case, title='Wit', description='D', location='L', witness_name='W',
+            testimony_date=timezone.now(), testimony_text='T', evidence_type='WITNESS', status='COLLECTED',
+            collected_date=timezone.now(),
+        )
+        self.assertEqual(summary(read()), [
+            ('cases.case', case.pk, 'UPDATE', ['title']),
+            ('cases.case', case.pk, 'UPDATE', ['status']),
+            ('cases.witnesstestimony', witness.pk, 'INSERT', []),
+        ])
+        versions = [record['version'] for record in read()]
+        self.assertEqual(versions, sorted(versions))
+
+    def test_deletes_and_bulk_writes_are_recorded(self):
+        officer = make_user('officer_changes', national_id='1111111111')
+        reward = Reward.objects.create(
+            recipient=officer, case=self.case, information_submitted='Tip', is_civilian_reward=True, amount=100,
+        )
+        document = DocumentEvidence.objects.create(
+            case=self.case, description='Card', location='L', collected_date=timezone.now(),
+            evidence_type='DOCUMENT', document_type='ID Card',
+        )
+        ChangeRecord.objects.all().delete()
+
+        document.add_attribute('Serial', 'X1')
+        officer.national_id = '2222222222'
+        officer.save()
+        case_id = self.case.pk
+        self.case.delete()
+        records = summary(read())
+        self.assertEqual(records[:2], [
+            ('cases.documentevidence', document.pk, 'UPDATE', ['document_attributes']),
+            ('rewards.reward', reward.pk, 'UPDATE', ['recipient_national_id']),
+        ])
+        # The cascade is recorded too, in the order the collector deletes.
+        self.assertCountEqual(records[2:], [
+            ('cases.documentevidence', document.pk, 'DELETE', []),
+            ('rewards.reward', reward.pk, 'DELETE', []),
+            ('cases.case', case_id, 'DELETE', []),
+        ])
+
+    def test_in_place_json_and_many_to_many_changes_are_recorded(self):
+        document = DocumentEvidence.objects.create(
+            case=self.case, description='Card', location='L', collected_date=timezone.now(),
+            evidence_type='DOCUMENT', document_type='ID Card',
+        )
+        document = DocumentEvidence.objects.get(pk=document.pk)
+        officer = make_user('member_changes')
+        ChangeRecord.objects.all().delete()
+
+        document.additional_images.append('back.jpg')
+        document.save()
+        self.case.team_members.add(officer)
+        officer.team_cases.clear()
+        self.assertEqual(summary(read()), [
+            ('cases.documentevidence', document.pk, 'UPDATE', ['additional_images']),
+            ('cases.case', self.case.pk, 'UPDATE', ['team_members']),
+            ('cases.case', self.case.pk, 'UPDATE', ['team_members']),
+        ])
+
+    def test_feed_holds_back_transactions_that_may_still_be_running(self):
+        ChangeRecord.objects.bulk_create([
+            ChangeRecord(txid=2**62, entity='cases.case', object_id=1, op='UPDATE', version=0),
+            ChangeRecord(txid=1, entity='cases.case', object_id=2, op='UPDATE', version=0),
+        ])
+        self.case.save(update_fields=['title'])
+        self.case.title = 'Again'
+        self.case.save()
+        self.assertEqual([record['id'] for record in read()], [2, self.case.pk])
+
+    def test_consumers_commit_forward_and_prune_what_all_have_taken(self):
+        for title in ('A', 'B', 'C'):
+            self.case.title = title
+            self.case.save()
+        records = read()
+        self.assertEqual(prune(), 0)
+        commit('search', parse_cursor(records[1]['cursor']))
+        commit('search', parse_cursor(records[0]['cursor']))
+        commit('warehouse', parse_cursor(records[2]['cursor']))
+        self.assertEqual(prune(batch_size=1), 2)
+        self.assertEqual(read(), records[2:])
+
+
+class ChangeFeedViewTestCase(TestCase):
+
+    def setUp(self):
+        self.admin = make_user('admin_changes', 'System Administrator')
+        self.detective = make_user('detective_changes', 'Detective')
+        self.cases = [
+            Case.objects.create(title=f'Case {index}', description='D', incident_date=timezone.now(),
+                                incident_location='L')
+            for index in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_pages_resume_from_the_acknowledged_cursor(self):
+        first = self.client.get(CHANGES_URL, {'limit': 2, 'consumer': 'search'}).data['data']
+        self.assertEqual([record['id'] for record in first['changes']], [case.pk for case in self.cases[:2]])
+        self.assertTrue(first['has_more'])
+        # Reading moves nothing.
+        self.assertFalse(ChangeConsumer.objects.exists())
+        self.assertEqual(self.client.get(CHANGES_URL, {'consumer': 'search'}).data['data']['changes'][:2],
+                         first['changes'])
+
+        second = self.client.get(CHANGES_URL, {'since': first['next']}).data['data']
+        self.assertEqual([record['id'] for record in second['changes']], [self.cases[2].pk])
+        self.assertFalse(second['has_more'])
+
+        resp = self.client.post(f'{CHANGES_URL}ack/', {'consumer': 'search', 'cursor': first['next']}, format='json')
+        self.assertEqual(resp.data['data'], {'consumer': 'search', 'cursor': first['next']})
+        again = self.client.get(CHANGES_URL, {'consumer': 'search'}).data['data']
+        self.assertEqual(again['changes'], second['changes'])
+
+        streamed = self.client.get(CHANGES_URL, {'stream': 'true', 'limit': 1})
+        self.assertEqual(
+            json.loads(b''.join(streamed.streaming_content))['data'],
+            first['changes'] + second['changes'],
+        )
+
+    def test_validation_and_access(self):
+        self.assertEqual(self.client.get(CHANGES_URL, {'since': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(CHANGES_URL, {'limit': 0}).status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post(f'{CHANGES_URL}ack/', {'consumer': 'search', 'cursor': 'x'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.detective)
+        self.assertEqual(self.client.get(CHANGES_URL).status_code, status.HTTP_403_FORBIDDEN)
+        resp = self.client.post(f'{CHANGES_URL}ack/', {'consumer': 'search', 'cursor': '1-1'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_stream_changes_command_commits_after_writing(self):
+        out = io.StringIO()
+        call_command('stream_changes', consumer='warehouse', batch_size=2, prune=True, stdout=out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([(line['op'], line['id']) for line in lines], [('INSERT', case.pk) for case in self.cases])
+        self.assertEqual(ChangeConsumer.objects.get(name='warehouse').record_id, parse_cursor(lines[-1]['cursor']).id)
+        self.assertEqual(ChangeRecord.objects.count(), 0)
+
+        out = io.StringIO()
+        call_command('stream_changes', consumer='warehouse', stdout=out)
+        self.assertEqual(out.getvalue(), '')
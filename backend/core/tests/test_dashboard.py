@@ -0,0 +1,132 @@
+"""
+Dashboard endpoint: role-selected widgets, the per-user widget cache, and the
+shared read pool the widgets are built on.
+"""
+import threading
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Role
+from cases.models import Case, CaseStatus, Complaint, ComplaintStatus
+from core.concurrency import run_concurrently
+from investigation.models import Notification, Trial
+from rewards.models import Reward, RewardStatus
+
+User = get_user_model()
+
+DASHBOARD_URL = '/api/v1/dashboard/'
+
+
+def make_user(username, *roles, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    user = User.objects.create_user(**defaults)
+    user.roles.add(*(Role.objects.get_or_create(name=role)[0] for role in roles))
+    return user
+
+
+class DashboardTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.detective = make_user('detective_dashboard', 'Detective')
+        self.judge = make_user('judge_dashboard', 'Judge')
+        self.civilian = make_user('civilian_dashboard')
+        self.case = Case.objects.create(
+            title='Dashboard case', description='D', incident_date=timezone.now(), incident_location='L',
+            status=CaseStatus.UNDER_INVESTIGATION, assigned_detective=self.detective,
+        )
+        Notification.objects.create(
+            case=self.case, recipient=self.detective, content_type_id=1, object_id=1, message='New evidence',
+        )
+        Reward.objects.create(
+            recipient=self.civilian, case=self.case, information_submitted='Tip', is_civilian_reward=True,
+            amount=100, status=RewardStatus.PENDING_DETECTIVE,
+        )
+        Complaint.objects.create(
+            complainant=self.civilian, title='C', description='D', incident_date=timezone.now(),
+            incident_location='L', status=ComplaintStatus.RETURNED_TO_COMPLAINANT,
+        )
+        Trial.objects.create(case=self.case, judge=self.judge, scheduled_date=timezone.now() + timedelta(days=1))
+        self.client = APIClient()
+
+    def get(self, user):
+        self.client.force_authenticate(user=user)
+        resp = self.client.get(DASHBOARD_URL)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data['data']
+
+    def test_widgets_follow_roles(self):
+        data = self.get(self.detective)
+        self.assertEqual(data['roles'], ['Detective'])
+        widgets = data['widgets']
+        self.assertEqual(set(widgets), {
+            'cases', 'my_cases', 'notifications', 'complaints', 'rewards', 'schedule', 'intensive_pursuit',
+        })
+        self.assertEqual(widgets['my_cases']['total'], 1)
+        self.assertEqual(widgets['my_cases']['latest'][0]['case_number'], self.case.case_number)
+        self.assertEqual(widgets['notifications']['unread'], 1)
+        self.assertEqual(widgets['rewards'], {'pending_detective_review': 1})
+        self.assertEqual(widgets['schedule'], {'interrogations': []})
+
+        widgets = self.get(self.judge)['widgets']
+        self.assertEqual([t['case_id'] for t in widgets['schedule']['trials']], [self.case.pk])
+        self.assertNotIn('my_cases', widgets)
+
+        widgets = self.get(self.civilian)['widgets']
+        self.assertEqual(set(widgets), {'notifications', 'complaints', 'intensive_pursuit'})
+        self.assertEqual(widgets['complaints'], {'returned_to_me': 1})
+
+    def test_widgets_are_cached_per_user_and_roles_resolved_per_request(self):
+        self.get(self.detective)
+        with self.assertNumQueries(1):
+            self.get(self.detective)
+        self.assertEqual(self.get(self.civilian)['widgets']['notifications']['unread'], 0)
+
+        self.detective.roles.add(Role.objects.get_or_create(name='Sergeant')[0])
+        self.assertEqual(self.get(self.detective)['roles'], ['Detective', 'Sergeant'])
+        Role.objects.filter(name='Sergeant').update(is_active=False)
+        self.assertEqual(self.get(self.detective)['roles'], ['Detective'])
+
+    def test_superuser_sees_every_widget(self):
+        admin = make_user('admin_dashboard', is_superuser=True)
+        self.assertEqual(len(self.get(admin)['widgets']), 7)
+
+
+class ConcurrencyTestCase(TransactionTestCase):
+
+    def test_tasks_run_on_pool_threads_outside_transactions(self):
+        make_user('pool_user')
+        results = run_concurrently({
+            name: (lambda: (threading.current_thread().name, User.objects.count())) for name in 'abc'
+        })
+        self.assertEqual({count for _, count in results.values()}, {1})
+        self.assertTrue(all(thread.startswith('db-reads') for thread, _ in results.values()))
+
+    def test_tasks_started_from_pool_tasks_run_inline(self):
+        def outer():
+            inner = run_concurrently({name: threading.current_thread for name in 'xy'})
+            return {thread.name for thread in inner.values()} == {threading.current_thread().name}
+
+        done = []
+        worker = threading.Thread(target=lambda: done.append(run_concurrently({name: outer for name in 'abcdef'})))
+        worker.start()
+        worker.join(timeout=30)
+        self.assertFalse(worker.is_alive(), 'nested run_concurrently deadlocked the pool')
+        self.assertTrue(all(done[0].values()))
@@ -0,0 +1,174 @@
+"""
+Bulk exports: CSV/NDJSON/gzip streams limited to the caller's visible cases, keyset resume,
+and background jobs written to storage for download.
+"""
+import csv
+import gzip
+import io
+import json
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Role
+from cases.models import Case, CaseStatus, OtherEvidence, WitnessTestimony
+from core.models import ExportJob, ExportStatus
+from core.services.exports import run_pending_jobs
+from investigation.models import Suspect, SuspectCaseLink
+
+User = get_user_model()
+
+EXPORTS_URL = '/api/v1/exports/'
+
+
+def make_user(username, *roles, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    user = User.objects.create_user(**defaults)
+    user.roles.add(*(Role.objects.get_or_create(name=role)[0] for role in roles))
+    return user
+
+
+def content(response):
+    return b''.join(response.streaming_content) if response.streaming else response.content
+
+
+class ExportTestCase(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        self.detective = make_user('detective_export', 'Detective', first_name='Cole', last_name='Phelps')
+        self.cadet = make_user('cadet_export', 'Cadet')
+        self.civilian = make_user('civilian_export')
+        now = timezone.now()
+        self.cases = [
+            Case.objects.create(
+                title=f'Case {index}', description='D', incident_date=now, incident_location='L',
+                status=CaseStatus.OPEN if index < 3 else CaseStatus.CLOSED,
+                assigned_detective=self.detective if index % 2 == 0 else None,
+            )
+            for index in range(5)
+        ]
+        # Detectives see their own cases and every open one: all but case 3.
+        self.visible = [case for index, case in enumerate(self.cases) if index != 3]
+        self.witness = WitnessTestimony.objects.create(
+            case=self.cases[0], title='Wit', description='D', location='L', witness_name='W',
+            testimony_date=now, testimony_text='T', evidence_type='WITNESS', status='COLLECTED',
+            collected_date=now, collected_by=self.detective,
+        )
+        self.others = [
+            OtherEvidence.objects.create(
+                case=case, title='Knife', description='D', location='Scene', item_name='Knife',
+                item_category='Weapon', physical_description='Steel', condition='Used', evidence_type='OTHER',
+                status='COLLECTED', collected_date=now,
+            )
+            for case in (self.cases[1], self.cases[3])
+        ]
+        for index, case in enumerate(self.cases[2:4]):
+            suspect = Suspect.objects.create(first_name='Roy', last_name=str(index), national_id=f'555000000{index}')
+            SuspectCaseLink.objects.create(suspect=suspect, case=case)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.detective)
+
+    def export(self, dataset, **params):
+        return self.client.get(f'{EXPORTS_URL}{dataset}/', params)
+
+    def test_csv_stream_is_limited_to_visible_cases(self):
+        resp = self.export('cases')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        self.assertEqual(resp['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="cases-', resp['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(content(resp).decode())))
+        self.assertEqual([int(row['id']) for row in rows], [case.pk for case in self.visible])
+        self.assertEqual(rows[0]['detective_name'], 'Cole Phelps')
+        self.assertEqual(rows[1]['detective_name'], '')
+
+        rows = list(csv.DictReader(io.StringIO(content(self.export('cases', status='CLOSED')).decode())))
+        self.assertEqual([int(row['id']) for row in rows], [self.cases[4].pk])
+
+        self.client.force_authenticate(user=self.cadet)
+        rows = list(csv.DictReader(io.StringIO(content(self.export('cases')).decode())))
+        self.assertEqual(len(rows), 3)
+
+    def test_gzipped_ndjson_resumes_after_a_cursor(self):
+        resp = self.export('evidence', output='ndjson', gzip='true')
+        self.assertEqual(resp['Content-Type'], 'application/gzip')
+        rows = [json.loads(line) for line in gzip.decompress(content(resp)).splitlines()]
+        self.assertEqual(
+            [(row['evidence_type'], row['id']) for row in rows],
+            [('WITNESS', self.witness.pk), ('OTHER', self.others[0].pk)],
+        )
+        self.assertEqual(rows[0]['collected_by_name'], 'Cole Phelps')
+        self.assertEqual(rows[1]['case_number'], self.cases[1].case_number)
+
+        resp = self.export('evidence', output='ndjson', after=f'WITNESS:{self.witness.pk}')
+        self.assertEqual([json.loads(line)['id'] for line in content(resp).splitlines()], [self.others[0].pk])
+
+        resp = self.export('cases', output='ndjson', after=self.visible[1].pk)
+        self.assertEqual([json.loads(line)['id'] for line in content(resp).splitlines()], [
+            case.pk for case in self.visible[2:]
+        ])
+
+    def test_csv_cells_that_would_run_as_formulas_are_escaped(self):
+        self.cases[0].title = '=HYPERLINK("http://x.test","Open")'
+        self.cases[0].incident_location = '-2+3'
+        self.cases[0].save()
+        rows = list(csv.DictReader(io.StringIO(content(self.export('cases')).decode())))
+        self.assertEqual(rows[0]['title'], '\'=HYPERLINK("http://x.test","Open")')
+        self.assertEqual(rows[0]['incident_location'], "'-2+3")
+        self.assertEqual(rows[1]['title'], 'Case 1')
+
+    def test_access_and_validation(self):
+        suspects = list(csv.DictReader(io.StringIO(content(self.export('suspects')).decode())))
+        self.assertEqual([row['last_name'] for row in suspects], ['0'])
+        self.assertEqual(self.export('weapons').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.export('cases', output='xml').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.export('cases', created_after='yesterday').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.export('evidence', after='BLOOD:1').status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post(f'{EXPORTS_URL}cases/', ['output', 'csv'], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post(f'{EXPORTS_URL}cases/', {'output': 'xml'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ExportJob.objects.exists())
+
+        self.client.force_authenticate(user=self.cadet)
+        self.assertEqual(self.export('suspects').status_code, status.HTTP_403_FORBIDDEN)
+        self.client.force_authenticate(user=self.civilian)
+        self.assertEqual(self.export('cases').status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_background_job_is_written_for_download(self):
+        with override_settings(MEDIA_ROOT=self.media):
+            resp = self.client.post(f'{EXPORTS_URL}cases/', {'output': 'ndjson', 'gzip': True}, format='json')
+            self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED)
+            job_url = f"{EXPORTS_URL}jobs/{resp.data['data']['id']}/"
+            self.assertEqual(self.client.get(f'{job_url}download/').status_code, status.HTTP_409_CONFLICT)
+
+            jobs = run_pending_jobs(chunk_size=2)
+            self.assertEqual([job.status for job in jobs], [ExportStatus.DONE])
+            data = self.client.get(job_url).data
+            self.assertEqual((data['row_count'], data['checkpoint']), (4, str(self.visible[-1].pk)))
+
+            download = self.client.get(f'{job_url}download/')
+            self.assertEqual(download.status_code, status.HTTP_200_OK)
+            streamed = self.export('cases', output='ndjson')
+            self.assertEqual(gzip.decompress(content(download)), content(streamed))
+
+            self.client.force_authenticate(user=self.cadet)
+            self.assertEqual(self.client.get(job_url).status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(ExportJob.objects.count(), 1)
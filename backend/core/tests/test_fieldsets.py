@@ -0,0 +1,144 @@
+"""
+Sparse fieldsets on list endpoints, and the projection path matching DRF's output for the
+serializers that opt into it.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Role
+from cases.models import Case, CasePriority, CaseStatus, Complaint
+from cases.serializers.case import CaseListSerializer
+from core.fieldsets import compile_projection, readable_fields
+from investigation.models import Notification, Suspect, SuspectCaseLink
+from investigation.serializers.case_resolution import NotificationSerializer
+from investigation.serializers.suspect import SuspectCaseLinkSerializer
+from rewards.models import Reward, RewardStatus
+from rewards.serializers.reward import RewardListSerializer
+
+User = get_user_model()
+
+CASES_URL = '/api/v1/cases/'
+
+
+def make_user(username, *roles, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    user = User.objects.create_user(**defaults)
+    user.roles.add(*(Role.objects.get_or_create(name=role)[0] for role in roles))
+    return user
+
+
+def project(serializer_class, queryset):
+    projection = compile_projection(serializer_class, tuple(readable_fields(serializer_class())))
+    return projection.render_many(projection.narrow(queryset))
+
+
+class FieldsetTestCase(TestCase):
+
+    def setUp(self):
+        self.captain = make_user('captain_fields', 'Captain', first_name='Hank', last_name='Merrill')
+        self.detective = make_user('detective_fields', 'Detective', first_name='Cole', last_name='Phelps')
+        self.civilian = make_user('civilian_fields')
+        now = timezone.now()
+        self.open_case = Case.objects.create(
+            title='Open', description='D', incident_date=now, incident_location='L',
+            status=CaseStatus.UNDER_INVESTIGATION, priority=CasePriority.CRITICAL,
+            assigned_detective=self.detective,
+        )
+        self.solved_case = Case.objects.create(
+            title='Solved', description='D', incident_date=now, incident_location='L',
+            status=CaseStatus.SOLVED, solved_date=now + timedelta(days=3),
+        )
+        suspect = Suspect.objects.create(first_name='Roy', last_name='Earle', national_id='1234567890')
+        SuspectCaseLink.objects.create(
+            suspect=suspect, case=self.open_case, detective_guilt_score=7, captain=self.captain,
+        )
+        SuspectCaseLink.objects.create(
+            suspect=Suspect.objects.create(first_name='Jack', last_name='Kelso', national_id='1234567891'),
+            case=self.open_case,
+        )
+        for reward_status in (RewardStatus.PENDING, RewardStatus.READY_FOR_PAYMENT):
+            Reward.objects.create(
+                recipient=self.civilian, case=self.open_case, information_submitted='Tip',
+                is_civilian_reward=True, amount=100, status=reward_status,
+            )
+        Notification.objects.create(
+            case=self.open_case, recipient=self.detective, content_type=ContentType.objects.get_for_model(Case),
+            object_id=self.open_case.pk, message='New evidence',
+        )
+        self.client = APIClient()
+
+    def test_projection_matches_serializer_output(self):
+        for serializer_class, queryset in [
+            (CaseListSerializer, Case.objects.select_related('assigned_detective')),
+            (RewardListSerializer, Reward.objects.select_related('case', 'recipient')),
+            (SuspectCaseLinkSerializer, SuspectCaseLink.objects.select_related('suspect', 'case', 'captain', 'chief')),
+            (NotificationSerializer, Notification.objects.select_related('case', 'content_type')),
+        ]:
+            with self.subTest(serializer_class.__name__):
+                expected = [dict(item) for item in serializer_class(queryset, many=True).data]
+                self.assertEqual(project(serializer_class, queryset), expected)
+
+    def test_fields_and_exclude_narrow_the_list_and_query(self):
+        self.client.force_authenticate(user=self.captain)
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(CASES_URL, {'fields': 'case_number,detective_name,is_active'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        by_number = {item['case_number']: item for item in resp.data['results']}
+        self.assertEqual(by_number[self.open_case.case_number], {
+            'case_number': self.open_case.case_number, 'detective_name': 'Cole Phelps', 'is_active': True,
+        })
+        self.assertIsNone(by_number[self.solved_case.case_number]['detective_name'])
+        listing = [query['sql'] for query in ctx.captured_queries if 'cases_case' in query['sql']][-1]
+        self.assertNotIn('description', listing)
+        self.assertFalse(any('team_members' in query['sql'] for query in ctx.captured_queries))
+
+        resp = self.client.get(CASES_URL, {'exclude': 'days_open,created_at'})
+        self.assertEqual(set(resp.data['results'][0]), set(CaseListSerializer.Meta.fields) - {'days_open', 'created_at'})
+
+        resp = self.client.get(CASES_URL, {'fields': 'case_number,motive'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('motive', resp.data['message'])
+
+    def test_reward_code_stays_hidden_without_status(self):
+        self.client.force_authenticate(user=self.civilian)
+        resp = self.client.get('/api/v1/rewards/', {'fields': 'id,reward_code'})
+        items = sorted(resp.data['data'], key=lambda item: item['id'])
+        self.assertEqual([set(item) for item in items], [{'id'}, {'id', 'reward_code'}])
+
+    def test_suspect_links_and_serializer_fallback(self):
+        self.client.force_authenticate(user=self.detective)
+        resp = self.client.get(
+            f'/api/v1/cases/{self.open_case.pk}/investigation/suspect-links/',
+            {'fields': 'suspect_name,captain_name,average_guilt_score'},
+        )
+        self.assertEqual(sorted(resp.data['data'], key=lambda item: item['suspect_name']), [
+            {'suspect_name': 'Jack Kelso', 'captain_name': None, 'average_guilt_score': None},
+            {'suspect_name': 'Roy Earle', 'captain_name': 'Hank Merrill', 'average_guilt_score': 7.0},
+        ])
+
+        Complaint.objects.create(
+            complainant=self.civilian, title='C', description='D', incident_date=timezone.now(), incident_location='L',
+        )
+        self.client.force_authenticate(user=self.civilian)
+        resp = self.client.get('/api/v1/complaints/', {'fields': 'id,title'})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        items = resp.data['results'] if 'results' in resp.data else resp.data['data']
+        self.assertEqual([set(item) for item in items], [{'id', 'title'}])
@@ -0,0 +1,70 @@
+"""
+Live indexes: incremental updates from the change feed, swapped states, and rebuilds when
+the feed was pruned past the index's cursor.
+"""
+from django.test import TestCase
+from django.utils import timezone
+
+from cases.models import Case
+from core.models import ChangeRecord
+from core.services.changes import commit, head, prune
+from core.services.indexes import LiveIndex
+
+
+class CaseTitles(LiveIndex):
+    watches = (Case,)
+
+    def __init__(self):
+        super().__init__()
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return dict(Case.objects.values_list('pk', 'title'))
+
+    def update(self, titles, changes):
+        titles = {pk: title for pk, title in titles.items() if pk not in changes.touched(Case)}
+        titles.update(Case.objects.filter(pk__in=changes.written(Case)).values_list('pk', 'title'))
+        return titles
+
+
+def make_case(title):
+    return Case.objects.create(title=title, description='D', incident_date=timezone.now(), incident_location='L')
+
+
+class LiveIndexTestCase(TestCase):
+
+    def setUp(self):
+        self.first = make_case('First')
+        self.index = CaseTitles()
+        self.index.refresh()
+
+    def test_updates_and_deletes_build_a_new_state(self):
+        old = self.index.state
+        second = make_case('Second')
+        self.first.title = 'Renamed'
+        self.first.save()
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self.index.state, {self.first.pk: 'Renamed', second.pk: 'Second'})
+        self.assertEqual(old, {self.first.pk: 'First'})
+
+        second.delete()
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.index.state, {self.first.pk: 'Renamed'})
+        self.assertEqual(self.index.refresh(), 0)
+        self.assertEqual(self.index.builds, 1)
+
+    def test_rebuilds_when_records_it_needed_were_pruned(self):
+        make_case('Second')
+        commit('warehouse', head())
+        prune()
+        self.assertFalse(ChangeRecord.objects.exists())
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self.index.builds, 2)
+        self.assertEqual(len(self.index.state), 2)
+
+    def test_warm_builds_on_a_background_thread(self):
+        index = CaseTitles()
+        index.warm().join(timeout=30)
+        self.assertEqual(index.builds, 1)
+        self.assertIsNotNone(index.state)
@@ -0,0 +1,121 @@
+"""
+JSON rendering: the orjson renderer producing DRF's bytes, its fallback, and streamed lists
+matching their buffered responses.
+"""
+import json
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from accounts.models import Role
+from cases.models import Case, CaseStatus
+from core.renderers import FastJSONRenderer, dumps
+from core.streaming import iter_json_list
+from rewards.models import Reward, RewardStatus
+
+User = get_user_model()
+
+
+def make_user(username, *roles, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    user = User.objects.create_user(**defaults)
+    user.roles.add(*(Role.objects.get_or_create(name=role)[0] for role in roles))
+    return user
+
+
+DATA = {
+    'amount': Decimal('1250.50'),
+    'at': datetime(2024, 3, 1, 8, 30, 15, 250000, tzinfo=dt_timezone.utc),
+    'naive': datetime(2024, 3, 1, 8, 30),
+    'on': date(2024, 3, 1),
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'label': gettext_lazy('Open'),
+    'text': 'Ünïcode   line',
+    'rows': [{'n': 1, 'tags': ('a', 'b')}, None, True, 1.5],
+    7: 'int key',
+}
+
+
+class RendererTestCase(SimpleTestCase):
+
+    def test_same_bytes_as_drf(self):
+        expected = JSONRenderer().render(DATA)
+        self.assertEqual(FastJSONRenderer().render(DATA), expected)
+        self.assertEqual(dumps(DATA), expected)
+        self.assertEqual(json.loads(expected)['at'], '2024-03-01T08:30:15.250000Z')
+
+    def test_falls_back_without_orjson_and_for_wide_integers(self):
+        with mock.patch('core.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(DATA), JSONRenderer().render(DATA))
+        self.assertEqual(FastJSONRenderer().render({'n': 2**70}), b'{"n":1180591620717411303424}')
+        indented = FastJSONRenderer().render({'n': 1}, 'application/json; indent=2')
+        self.assertEqual(indented, b'{\n  "n": 1\n}')
+
+    def test_streamed_list_is_one_document(self):
+        items = [{'n': n} for n in range(5)]
+        for batch_size in (1, 2, 10):
+            content = b''.join(iter_json_list(iter(items), batch_size=batch_size))
+            self.assertEqual(json.loads(content), {'status': 'success', 'data': items})
+        self.assertEqual(json.loads(b''.join(iter_json_list(iter([])))), {'status': 'success', 'data': []})
+        content = b''.join(iter_json_list(iter(items), batch_size=2, max_rows=3))
+        self.assertEqual(json.loads(content), {'status': 'success', 'data': items[:3], 'truncated': True})
+        content = b''.join(iter_json_list(iter(items), max_rows=5))
+        self.assertEqual(json.loads(content), {'status': 'success', 'data': items})
+
+
+class StreamingEndpointTestCase(TestCase):
+
+    def setUp(self):
+        self.civilian = make_user('civilian_stream')
+        self.detective = make_user('detective_stream', 'Detective')
+        for index in range(3):
+            case = Case.objects.create(
+                title=f'Case {index}', description='D', incident_date=timezone.now(), incident_location='L',
+                status=CaseStatus.UNDER_INVESTIGATION, assigned_detective=self.detective,
+            )
+            Reward.objects.create(
+                recipient=self.civilian, case=case, information_submitted='Tip', is_civilian_reward=True,
+                amount=100, status=RewardStatus.PAID if index else RewardStatus.PENDING,
+            )
+        self.client = APIClient()
+
+    def assertStreamsSameData(self, url, params=None):
+        buffered = self.client.get(url, params)
+        streamed = self.client.get(url, {**(params or {}), 'stream': 'true'})
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(streamed['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(b''.join(streamed.streaming_content)), json.loads(buffered.content))
+
+    def test_lists_stream_the_same_data(self):
+        self.client.force_authenticate(user=self.civilian)
+        self.assertStreamsSameData('/api/v1/rewards/')
+        self.assertStreamsSameData('/api/v1/rewards/', {'fields': 'id,reward_code'})
+        self.client.force_authenticate(user=self.detective)
+        self.assertStreamsSameData('/api/v1/cases/my-cases/')
+        self.assertStreamsSameData('/api/v1/cases/all-names/')
+
+    @override_settings(STREAM_MAX_ROWS=2)
+    def test_streams_stop_at_the_row_cap(self):
+        self.client.force_authenticate(user=self.civilian)
+        streamed = self.client.get('/api/v1/rewards/', {'stream': 'true'})
+        data = json.loads(b''.join(streamed.streaming_content))
+        self.assertEqual(len(data['data']), 2)
+        self.assertTrue(data['truncated'])
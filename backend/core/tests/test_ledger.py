@@ -0,0 +1,227 @@
+"""
+Payment ledger: balanced idempotent postings, ledger entries behind bail/fine and reward
+payments, the pooled gateway client and simulator, batch settlement and reconciliation.
+"""
+import asyncio
+import time
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from cases.models import Case, CaseStatus, CasePriority
+from core.models import LedgerTransaction, Payment, PaymentPurpose, PaymentStatus, Posting, SettlementBatch
+from core.services.gateway import GatewayClient, PaymentGateway, SimulatedGateway, GatewayResult, reset_gateway_client
+from core.services.ledger import (
+    BAIL_HELD,
+    BANK,
+    FINE_INCOME,
+    GATEWAY_CLEARING,
+    REWARD_EXPENSE,
+    REWARDS_PAYABLE,
+    STATION_CASH,
+    PaymentFailed,
+    account_ids,
+    balances,
+    charge,
+    post,
+    record_collection,
+)
+from core.services.settlement import reconcile, settle
+from investigation.models import Suspect, SuspectStatus, BailFine
+from rewards.models import Reward, RewardStatus, TeamReward
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+def make_case(title='Ledger case'):
+    return Case.objects.create(
+        title=title, description='D', incident_date=timezone.now(), incident_location='L',
+        status=CaseStatus.SOLVED, priority=CasePriority.LEVEL2,
+    )
+
+
+class LedgerPostingTestCase(TestCase):
+
+    def test_postings_must_balance(self):
+        with self.assertRaises(ValidationError):
+            post('bad', 'test', [(BANK, Decimal('10')), (GATEWAY_CLEARING, Decimal('-9'))])
+        self.assertFalse(LedgerTransaction.objects.exists())
+
+    def test_posting_is_idempotent(self):
+        first = post('event:1', 'test', [(BANK, Decimal('10')), (GATEWAY_CLEARING, Decimal('-10'))])
+        again = post('event:1', 'test', [(BANK, Decimal('10')), (GATEWAY_CLEARING, Decimal('-10'))])
+        self.assertEqual(first.pk, again.pk)
+        self.assertEqual(Posting.objects.count(), 2)
+        self.assertEqual(balances(), {BANK: Decimal('10'), GATEWAY_CLEARING: Decimal('-10')})
+
+
+class LedgerHooksTestCase(TestCase):
+
+    def setUp(self):
+        self.suspect = Suspect.objects.create(
+            first_name='Jane', last_name='Doe', national_id='3333333333', status=SuspectStatus.DETAINED,
+        )
+        self.bail_fine = BailFine.objects.create(
+            suspect=self.suspect, bail_amount=Decimal('1000'), fine_amount=Decimal('200'),
+        )
+        self.case = make_case()
+        self.approver = make_user('captain_ledger')
+
+    def test_bail_and_fine_payments_are_posted_once(self):
+        self.bail_fine.record_bail_payment(Decimal('1000'), 'gw-1')
+        self.bail_fine.record_bail_payment(Decimal('1000'), 'gw-1')
+        self.bail_fine.record_fine_payment(Decimal('200'), 'gw-2')
+        self.assertEqual(balances(), {
+            GATEWAY_CLEARING: Decimal('1200'), BAIL_HELD: Decimal('-1000'), FINE_INCOME: Decimal('-200'),
+        })
+        payment = Payment.objects.get(idempotency_key=f'bail:{self.bail_fine.pk}')
+        self.assertEqual((payment.status, payment.gateway_reference), (PaymentStatus.CAPTURED, 'gw-1'))
+        self.assertEqual(payment.source, self.bail_fine)
+
+    def test_team_distribution_accrues_and_payout_settles_accrual(self):
+        self.case.assigned_detective = make_user('detective_ledger')
+        self.case.save()
+        team_reward = TeamReward.objects.create(
+            case=self.case, total_amount=Decimal('300'), status=RewardStatus.APPROVED, approved_by=self.approver,
+        )
+        team_reward.distribute_to_team()
+        self.assertEqual(balances(), {REWARD_EXPENSE: Decimal('300'), REWARDS_PAYABLE: Decimal('-300')})
+
+        Reward.objects.get(case=self.case).mark_as_paid(payment_reference='gw-out-1')
+        self.assertEqual(balances(), {
+            REWARD_EXPENSE: Decimal('300'), REWARDS_PAYABLE: Decimal('0'), GATEWAY_CLEARING: Decimal('-300'),
+        })
+
+    def test_civilian_claim_is_paid_from_station_cash(self):
+        reward = Reward.objects.create(
+            recipient=make_user('civilian_ledger'), amount=Decimal('50'), is_civilian_reward=True,
+            status=RewardStatus.READY_FOR_PAYMENT, approved_by=self.approver,
+        )
+        reward.claim_by_civilian('Central Station')
+        self.assertEqual(balances(), {REWARD_EXPENSE: Decimal('50'), STATION_CASH: Decimal('-50')})
+
+
+class RecordingGateway(PaymentGateway):
+    """Counts how many calls are in flight at once."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.in_flight = self.peak = 0
+
+    async def charge(self, amount, idempotency_key):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.latency)
+        self.in_flight -= 1
+        return GatewayResult(True, f'REF-{idempotency_key}', '')
+
+
+class GatewayTestCase(TestCase):
+
+    def tearDown(self):
+        reset_gateway_client()
+
+    def test_client_runs_calls_concurrently_within_pool_limit(self):
+        gateway = RecordingGateway(latency=0.05)
+        client = GatewayClient(gateway, max_concurrency=10)
+        started = time.perf_counter()
+        results = client.call_many([('charge', Decimal('1'), f'k{i}') for i in range(40)])
+        elapsed = time.perf_counter() - started
+        client.close()
+        self.assertEqual([r.reference for r in results], [f'REF-k{i}' for i in range(40)])
+        self.assertEqual(gateway.peak, 10)
+        self.assertLess(elapsed, 1.0)
+
+    def test_closed_client_starts_a_new_loop_with_its_own_limit(self):
+        gateway = RecordingGateway(latency=0.01)
+        client = GatewayClient(gateway, max_concurrency=3)
+        client.call_many([('charge', Decimal('1'), f'a{i}') for i in range(6)])
+        client.close()
+        results = client.call_many([('charge', Decimal('1'), f'b{i}') for i in range(6)])
+        client.close()
+        self.assertEqual([r.reference for r in results], [f'REF-b{i}' for i in range(6)])
+        self.assertEqual(gateway.peak, 3)
+
+    def test_declined_charge_marks_payment_failed(self):
+        reset_gateway_client(GatewayClient(SimulatedGateway(latency=0, failure_rate=1.0)))
+        with self.assertRaises(PaymentFailed):
+            charge('case-release:1', PaymentPurpose.FINE, Decimal('10'))
+        payment = Payment.objects.get(idempotency_key='case-release:1')
+        self.assertEqual(payment.status, PaymentStatus.FAILED)
+        self.assertFalse(LedgerTransaction.objects.exists())
+
+    def test_transient_errors_are_retried_then_reported(self):
+        client = GatewayClient(SimulatedGateway(latency=0, error_rate=1.0), retries=2, backoff=0)
+        result = client.charge(Decimal('10'), 'k')
+        client.close()
+        self.assertFalse(result.ok)
+        self.assertIn('unavailable', result.error)
+
+    def test_charge_then_record(self):
+        reset_gateway_client(GatewayClient(SimulatedGateway(latency=0, seed=1)))
+        case = make_case()
+        reference = charge('case-release:9', PaymentPurpose.BAIL, Decimal('75'), case)
+        self.assertTrue(reference.startswith('SIM-CHARGE-'))
+        self.assertEqual(charge('case-release:9', PaymentPurpose.BAIL, Decimal('75'), case), reference)
+        payment = record_collection('case-release:9', PaymentPurpose.BAIL, Decimal('75'), case, reference)
+        self.assertEqual((payment.status, payment.gateway_reference), (PaymentStatus.CAPTURED, reference))
+        self.assertEqual(balances()[BAIL_HELD], Decimal('-75'))
+
+
+class SettlementTestCase(TestCase):
+
+    def setUp(self):
+        for i in range(3):
+            record_collection(f'collection:{i}', PaymentPurpose.FINE, Decimal('100'))
+        reward = Reward.objects.create(
+            recipient=make_user('officer_settle'), amount=Decimal('40'),
+            status=RewardStatus.APPROVED, approved_by=make_user('chief_settle'),
+        )
+        reward.mark_as_paid(payment_reference='gw-out')
+
+    def test_settle_moves_clearing_to_bank_in_batches(self):
+        batches = settle(batch_size=2)
+        self.assertEqual([b.payment_count for b in batches], [2, 2])
+        self.assertEqual(sum(b.net_amount for b in batches), Decimal('260'))
+        self.assertFalse(Payment.objects.filter(status=PaymentStatus.CAPTURED).exists())
+        self.assertEqual(balances()[BANK], Decimal('260'))
+        self.assertEqual(balances()[GATEWAY_CLEARING], Decimal('0'))
+        self.assertEqual(settle(), [])
+        self.assertEqual(SettlementBatch.objects.count(), 2)
+
+    def test_reconcile(self):
+        settle(max_batches=1, batch_size=1)
+        result = reconcile(chunk_size=2)
+        self.assertEqual(result.unbalanced, [])
+        self.assertEqual(result.unposted_payments, 0)
+        self.assertEqual(result.clearing_actual, result.clearing_expected)
+        self.assertEqual(result.clearing_actual, Decimal('160'))
+        call_command('reconcile_ledger', stdout=StringIO())
+
+        txn = LedgerTransaction.objects.create(idempotency_key='broken', kind='test')
+        Posting.objects.create(transaction=txn, account_id=account_ids([BANK])[BANK], amount=Decimal('5'))
+        result = reconcile(chunk_size=2)
+        self.assertEqual(result.unbalanced, [txn.pk])
+        with self.assertRaises(CommandError):
+            call_command('reconcile_ledger', stdout=StringIO())
@@ -1,10 +1,18 @@
 from django.urls import path, include
-from core.views import public_statistics
+from core.views import BatchView, ChangeAckView, ChangesView, DashboardView, ExportJobViewSet, ExportView, public_statistics
 
 app_name = 'core'
 
 urlpatterns = [
     path('public/statistics/', public_statistics, name='public-statistics'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('batch/', BatchView.as_view(), name='batch'),
+    path('exports/jobs/', ExportJobViewSet.as_view({'get': 'list'}), name='export-jobs'),
+    path('exports/jobs/<int:pk>/', ExportJobViewSet.as_view({'get': 'retrieve'}), name='export-job-detail'),
+    path('exports/jobs/<int:pk>/download/', ExportJobViewSet.as_view({'get': 'download'}), name='export-job-download'),
+    path('exports/<str:dataset>/', ExportView.as_view(), name='export'),
+    path('changes/', ChangesView.as_view(), name='changes'),
+    path('changes/ack/', ChangeAckView.as_view(), name='changes-ack'),
     path('', include('cases.urls')),
     path('investigation/', include('investigation.urls')),
     path('', include('rewards.urls')),
@@ -0,0 +1,15 @@
+from .statistics import public_statistics
+from .dashboard import DashboardView
+from .batch import BatchView
+from .exports import ExportJobViewSet, ExportView
+from .changes import ChangeAckView, ChangesView
+
+__all__ = [
+    'public_statistics',
+    'DashboardView',
+    'BatchView',
+    'ExportJobViewSet',
+    'ExportView',
+    'ChangesView',
+    'ChangeAckView',
+]
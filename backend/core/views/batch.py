@@ -0,0 +1,23 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.serializers import BatchSerializer
+from core.services.batch import dispatch
+from core.services.roles import resolved_roles
+
+
+class BatchView(APIView):
+    """
+    Several API calls in one round trip. POST {"requests": [{"id", "method", "path", "body"}]};
+    the response lists {"id", "status", "body"} per sub-request, in order. See
+    core.services.batch for how sub-requests are run.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ser = BatchSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        with resolved_roles(request.user):
+            results = dispatch(request, ser.validated_data['requests'])
+        return Response({'status': 'success', 'data': results})
@@ -0,0 +1,74 @@
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsSystemAdmin
+from core.serializers import ChangeAckSerializer
+from core.services.changes import (
+    FEED_PAGE_SIZE,
+    MAX_FEED_PAGE_SIZE,
+    ChangeFeedError,
+    commit,
+    consumer_cursor,
+    format_cursor,
+    iter_changes,
+    parse_cursor,
+    read,
+)
+from core.streaming import stream_json, wants_stream
+
+
+class ChangesView(APIView):
+    """
+    The change feed of cases, evidence, suspects, trials and rewards (see core.services.changes).
+
+    GET ?since=<cursor>&limit=N returns the records after `since` in feed order and `next`, the
+    `since` of the following call; without `since`, ?consumer=<name> starts after that
+    consumer's committed cursor. ?stream=true streams every record after the cursor instead
+    of one page. Reading never moves a cursor: consumers acknowledge what they have processed
+    with POST /changes/ack/.
+    """
+    permission_classes = [IsSystemAdmin]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            cursor = parse_cursor(params.get('since', ''))
+        except ChangeFeedError as exc:
+            return Response({'status': 'error', 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        limit = params.get('limit', str(FEED_PAGE_SIZE))
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_FEED_PAGE_SIZE:
+            return Response(
+                {'status': 'error', 'message': f'limit must be between 1 and {MAX_FEED_PAGE_SIZE}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = int(limit)
+        consumer = params.get('consumer', '').strip()
+        if consumer and 'since' not in params:
+            cursor = consumer_cursor(consumer)
+        if wants_stream(request):
+            return stream_json(iter_changes(cursor, limit))
+        changes = read(cursor, limit)
+        return Response({
+            'status': 'success',
+            'data': {
+                'changes': changes,
+                'next': changes[-1]['cursor'] if changes else format_cursor(cursor),
+                'has_more': len(changes) == limit,
+            }
+        })
+
+
+class ChangeAckView(APIView):
+    """POST {"consumer", "cursor"}: the consumer has processed every record up to `cursor`."""
+    permission_classes = [IsSystemAdmin]
+
+    def post(self, request):
+        ser = ChangeAckSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        consumer = ser.validated_data['consumer']
+        commit(consumer, ser.validated_data['cursor'])
+        return Response({
+            'status': 'success',
+            'data': {'consumer': consumer, 'cursor': format_cursor(consumer_cursor(consumer))},
+        })
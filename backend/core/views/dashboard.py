@@ -0,0 +1,20 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.services.dashboard import build_dashboard
+from core.services.roles import resolved_roles
+
+
+class DashboardView(APIView):
+    """
+    Everything the SPA shows after login, in one request: the caller's roles and the widgets
+    relevant to them (see core.services.dashboard). Widgets are cached per user for a few
+    seconds to a few minutes each.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        with resolved_roles(request.user):
+            data = build_dashboard(request.user)
+        return Response({'status': 'success', 'data': data})
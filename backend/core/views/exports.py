@@ -0,0 +1,102 @@
+import os
+
+from django.http import FileResponse, StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.fieldsets import SparseFieldsetMixin
+from core.models import ExportJob, ExportStatus
+from core.serializers import ExportJobSerializer, ExportParamsSerializer
+from core.services.exports import (
+    ExportError,
+    can_export,
+    content_type,
+    create_job,
+    export_chunks,
+    filename,
+    get_dataset,
+    parse_request,
+)
+
+
+class ExportView(APIView):
+    """
+    Bulk export of cases, evidence or suspects (see core.services.exports).
+
+    GET streams the export: ?output=csv|ndjson, ?gzip=true, the dataset's filters, and
+    ?after=<cursor> to resume after a row. POST takes the same parameters and queues the
+    export as a background job, to be downloaded from /exports/jobs/<id>/download/.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def perform_content_negotiation(self, request, force=False):
+        # The export body isn't rendered by DRF, so Accept: text/csv must not be a 406.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get_dataset(self, request, dataset):
+        found = get_dataset(dataset)
+        if found is None:
+            return None, Response(
+                {'status': 'error', 'message': f'No export named {dataset!r}.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if not can_export(request.user, found):
+            return None, Response(
+                {'status': 'error', 'message': f'Not allowed to export {dataset}.'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return found, None
+
+    def get(self, request, dataset):
+        dataset, error = self.get_dataset(request, dataset)
+        if error:
+            return error
+        try:
+            export = parse_request(dataset, request.query_params)
+        except ExportError as exc:
+            return Response({'status': 'error', 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        response = StreamingHttpResponse(export_chunks(request.user, export), content_type=content_type(export))
+        response['Content-Disposition'] = f'attachment; filename="{filename(export)}"'
+        return response
+
+    def post(self, request, dataset):
+        dataset, error = self.get_dataset(request, dataset)
+        if error:
+            return error
+        ser = ExportParamsSerializer(data=request.data, context={'dataset': dataset})
+        ser.is_valid(raise_exception=True)
+        params = {**request.query_params.dict(), **ser.validated_data}
+        try:
+            job = create_job(request.user, dataset, params)
+        except ExportError as exc:
+            return Response({'status': 'error', 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {
+                'status': 'success',
+                'data': ExportJobSerializer(job).data,
+                'message': 'Export queued.',
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class ExportJobViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+    """The caller's background exports, and their files once done."""
+    serializer_class = ExportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return ExportJob.objects.filter(requested_by=self.request.user).order_by('-created_at')
+
+    @action(detail=True, methods=['get'], url_path='download')
+    def download(self, request, pk=None):
+        job = self.get_object()
+        if job.status != ExportStatus.DONE or not job.file:
+            return Response(
+                {'status': 'error', 'message': f'Export is {job.status.lower()}, not ready for download.'},
+                status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=os.path.basename(job.file.name))
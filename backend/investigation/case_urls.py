@@ -24,6 +24,8 @@ urlpatterns = [
     path('suspect-links/<int:pk>/chief-approval/', SuspectCaseLinkViewSet.as_view({'post': 'chief_approval'}), name='suspect-link-chief-approval'),
     path('suspect-links/<int:pk>/mark-as-wanted/', SuspectCaseLinkViewSet.as_view({'post': 'mark_as_wanted'}), name='suspect-link-mark-as-wanted'),
     path('suspect-links/<int:pk>/mark-as-captured/', SuspectCaseLinkViewSet.as_view({'post': 'mark_as_captured'}), name='suspect-link-mark-as-captured'),
+    path('suspect-links/<int:pk>/interrogations/', SuspectCaseLinkViewSet.as_view({'post': 'interrogations'}), name='suspect-link-interrogations'),
+    path('suspect-links/<int:pk>/profile/', SuspectCaseLinkViewSet.as_view({'post': 'profile'}), name='suspect-link-profile'),
     path('trial/', TrialViewSet.as_view({'get': 'retrieve', 'post': 'create'}), name='trial'),
     path('trial/record-verdict/', TrialViewSet.as_view({'post': 'record_verdict'}), name='trial-record-verdict'),
 ]
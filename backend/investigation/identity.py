@@ -0,0 +1,101 @@
+"""
+Normalized identity keys for entity resolution.
+
+- National ids and phone numbers keep digits only (Persian/Arabic-Indic digits mapped to
+  ASCII). Phones drop the +98 / 0098 / 0 prefix so every spelling of a number agrees.
+- `name_key` is the name lower-cased, stripped of accents and punctuation, with tokens
+  sorted ("Phelps, Cole" == "cole phelps").
+- `phonetic_key` codes every token by sound: Latin tokens with a Soundex-like consonant
+  code, Persian/Arabic tokens by folding letters that share a sound and dropping vowel
+  letters. Tokens are sorted, so name order does not matter.
+"""
+import re
+import unicodedata
+
+from cases.plates import DIGIT_TRANSLATION
+
+PLACEHOLDER_TOKENS = {'unknown', 'suspect', 'na', 'none'}
+
+LATIN_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+ARABIC_FOLD = str.maketrans({
+    'ث': 'س', 'ص': 'س',
+    'ذ': 'ز', 'ض': 'ز', 'ظ': 'ز',
+    'ط': 'ت',
+    'ح': 'ه', 'ة': 'ه',
+    'ق': 'غ',
+    'ك': 'ک', 'ي': 'ی', 'ى': 'ی',
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا',
+})
+ARABIC_VOWELS = set('اویء')
+
+TOKEN_RE = re.compile(r'[^\W\d_]+', re.UNICODE)
+
+
+def digits(value):
+    return ''.join(ch for ch in str(value or '').translate(DIGIT_TRANSLATION) if ch.isdigit())
+
+
+def normalize_national_id(value):
+    value = digits(value)
+    return value if len(value) == 10 else ''
+
+
+def normalize_phone(value):
+    value = digits(value)
+    if value.startswith('0098'):
+        value = value[4:]
+    elif value.startswith('98') and len(value) == 12:
+        value = value[2:]
+    value = value.lstrip('0')
+    return value if len(value) >= 7 else ''
+
+
+def name_tokens(name):
+    text = unicodedata.normalize('NFKD', str(name or ''))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return TOKEN_RE.findall(text)
+
+
+def name_key(name):
+    tokens = name_tokens(name)
+    if set(tokens) <= PLACEHOLDER_TOKENS:
+        return ''
+    return ' '.join(sorted(tokens))
+
+
+def _latin_code(token):
+    codes = []
+    previous = None
+    for ch in token:
+        code = LATIN_CODES.get(ch)
+        if code and code != previous:
+            codes.append(code)
+        if ch not in 'hw':
+            previous = code
+    prefix = '' if token[0] in LATIN_CODES else '0'
+    return prefix + ''.join(codes)[:5]
+
+
+def _arabic_code(token):
+    folded = token.translate(ARABIC_FOLD)
+    consonants = [ch for i, ch in enumerate(folded) if i == 0 or ch not in ARABIC_VOWELS]
+    collapsed = [ch for i, ch in enumerate(consonants) if i == 0 or ch != consonants[i - 1]]
+    return ''.join(collapsed)
+
+
+def phonetic_key(name):
+    if not name_key(name):
+        return ''
+    codes = [
+        _latin_code(token) if token.isascii() else _arabic_code(token)
+        for token in name_tokens(name)
+    ]
+    return ' '.join(sorted(code for code in codes if code))
@@ -0,0 +1,66 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from investigation.models import ProfileKind
+from investigation.services.profile_matching import (
+    ProfileIndex,
+    STR_LOCI,
+    STR_MISSING,
+    MINUTIAE_DIMENSIONS,
+)
+
+
+def synthetic_str(rng, count):
+    """Random allele pairs (alleles 5.0-35.9 in tenths) with about 10% of loci untyped."""
+    alleles = rng.integers(50, 360, size=(count, len(STR_LOCI), 2), dtype=np.int32)
+    alleles.sort(axis=2)
+    matrix = alleles[:, :, 0] * 10000 + alleles[:, :, 1]
+    matrix[rng.random(matrix.shape) < 0.1] = STR_MISSING
+    return matrix
+
+
+def synthetic_minutiae(rng, count):
+    matrix = rng.standard_normal((count, MINUTIAE_DIMENSIONS), dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix
+
+
+class Command(BaseCommand):
+    help = 'Benchmark vectorized profile matching on synthetic in-memory profiles (nothing is written)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=1_000_000)
+        parser.add_argument('--queries', type=int, default=20)
+        parser.add_argument('--kind', choices=[kind.value for kind in ProfileKind], default=ProfileKind.STR)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        count = options['profiles']
+        if count < 1 or options['queries'] < 1:
+            raise CommandError('--profiles and --queries must be positive.')
+        kind = options['kind']
+        rng = np.random.default_rng(options['seed'])
+
+        started = time.perf_counter()
+        generate = synthetic_str if kind == ProfileKind.STR else synthetic_minutiae
+        index = ProfileIndex(kind, ids=np.arange(1, count + 1), matrix=generate(rng, count))
+        build_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f'Built {kind} index: {count:,} profiles, {index.matrix.nbytes / 2**20:,.1f} MiB in {build_seconds:.2f}s'
+        )
+
+        # Query with stored profiles so every query has at least one true match.
+        rows = rng.integers(0, count, size=options['queries'])
+        timings = []
+        hits = 0
+        for row in rows:
+            started = time.perf_counter()
+            hits += len(index.candidates(index.matrix[row]))
+            timings.append((time.perf_counter() - started) * 1000)
+        timings = np.array(timings)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(timings)} queries: mean {timings.mean():.1f} ms, p50 {np.percentile(timings, 50):.1f} ms, '
+            f'p95 {np.percentile(timings, 95):.1f} ms, {hits} candidates'
+        ))
@@ -0,0 +1,112 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.services.indexes import LiveIndex
+from investigation.services import wanted_watchlist
+from investigation.services.wanted_watchlist import MAX_BATCH_CHECKS, WantedWatchlist
+from investigation.views.watchlist import WantedCheckView
+
+
+def synthetic_entries(rng, count):
+    return {
+        pk: (f'{rng.randrange(10**9, 10**10)}', f'9{rng.randrange(10**8, 10**9)}')
+        for pk in range(1, count + 1)
+    }
+
+
+def synthetic_checks(rng, entries, count, hit_rate):
+    """National ids to check, about `hit_rate` of them wanted, in mixed spellings."""
+    wanted = [national_id for national_id, _ in entries.values()]
+    return [
+        rng.choice(wanted) if rng.random() < hit_rate else f'{rng.randrange(10**9, 10**10)}'
+        for _ in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark wanted-watchlist checks on a synthetic in-memory watchlist (nothing is read or written)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wanted', type=int, default=100_000, help='Wanted suspects in the watchlist')
+        parser.add_argument('--checks', type=int, default=200_000)
+        parser.add_argument('--hit-rate', type=float, default=0.01)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--bloom', action='store_true', help='Put a Bloom filter in front of the lookups')
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Requests sent through WantedCheckView (authentication excluded); 0 to skip')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        if options['wanted'] < 1 or options['checks'] < 1:
+            raise CommandError('--wanted and --checks must be positive.')
+        if not 1 <= options['batch_size'] <= MAX_BATCH_CHECKS:
+            raise CommandError(f'--batch-size must be between 1 and {MAX_BATCH_CHECKS}.')
+        rng = random.Random(options['seed'])
+
+        watchlist = WantedWatchlist(bloom=options['bloom'], refresh_interval=float('inf'))
+        started = time.perf_counter()
+        entries = synthetic_entries(rng, options['wanted'])
+        watchlist.replace(entries)
+        self.stdout.write(
+            f'Built watchlist: {len(watchlist):,} wanted suspects in {time.perf_counter() - started:.2f}s'
+            f'{" (with Bloom filter)" if options["bloom"] else ""}'
+        )
+        checks = synthetic_checks(rng, entries, options['checks'], options['hit_rate'])
+
+        started = time.perf_counter()
+        hits = sum(1 for national_id in checks if watchlist.check(national_id))
+        self._report('Single checks', len(checks), time.perf_counter() - started, hits)
+
+        size = options['batch_size']
+        started = time.perf_counter()
+        hits = 0
+        for offset in range(0, len(checks), size):
+            hits += len(watchlist.check_many(national_ids=checks[offset:offset + size]))
+        self._report(f'Batch checks ({size}/batch)', len(checks), time.perf_counter() - started, hits)
+
+        if options['requests'] > 0:
+            self._benchmark_view(watchlist, checks, options['requests'], size)
+
+    def _benchmark_view(self, watchlist, checks, count, size):
+        # The view reads the process-wide watchlist; point it at the synthetic one. An unsaved
+        # superuser passes the role check without a query, so only the view itself is timed.
+        watchlist.checked_at = time.monotonic()
+        LiveIndex._shared[(WantedWatchlist, ())] = watchlist
+        user = get_user_model()(username='benchmark', is_superuser=True)
+        factory = APIRequestFactory()
+        view = WantedCheckView.as_view()
+        try:
+            started = time.perf_counter()
+            for i in range(count):
+                request = factory.get('/api/v1/investigation/watchlist/check/', {'national_id': checks[i % len(checks)]})
+                force_authenticate(request, user=user)
+                view(request).render()
+            self._report('GET requests', count, time.perf_counter() - started)
+
+            started = time.perf_counter()
+            for i in range(count):
+                offset = (i * size) % len(checks)
+                request = factory.post(
+                    '/api/v1/investigation/watchlist/check/',
+                    {'national_ids': checks[offset:offset + size]},
+                    format='json',
+                )
+                force_authenticate(request, user=user)
+                view(request).render()
+            elapsed = time.perf_counter() - started
+            self._report(f'POST requests ({size}/batch)', count, elapsed, per_item=count * size / elapsed)
+        finally:
+            wanted_watchlist.reset_wanted_watchlist()
+
+    def _report(self, label, count, elapsed, hits=None, per_item=None):
+        rate = count / elapsed if elapsed else 0.0
+        line = f'{label}: {count:,} in {elapsed:.3f}s, {rate:,.0f}/sec'
+        if per_item is not None:
+            line += f' ({per_item:,.0f} checks/sec)'
+        if hits is not None:
+            line += f', {hits:,} hits'
+        self.stdout.write(self.style.SUCCESS(line))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from investigation.services.payment_callbacks import PROCESS_BATCH_SIZE, process_batch
+
+
+class Command(BaseCommand):
+    help = 'Apply queued bail/fine payment callbacks in micro-batches and release eligible suspects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PROCESS_BATCH_SIZE)
+        parser.add_argument('--once', action='store_true', help='Drain the queue and exit instead of polling')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        while True:
+            started = time.perf_counter()
+            result = process_batch(options['batch_size'])
+            if result is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            self.stdout.write(
+                f'{result.applied} applied, {result.ignored} ignored, {result.rejected} rejected, '
+                f'{result.released} released in {time.perf_counter() - started:.3f}s'
+            )
@@ -0,0 +1,108 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cases.models import Case, CaseStatus, CasePriority
+from investigation.models import BailFine, Suspect, SuspectCaseLink, SuspectStatus
+from investigation.services.payment_callbacks import MAX_INGEST_BATCH, PROCESS_BATCH_SIZE, process_pending
+from investigation.views.payment_callback import PaymentCallbackView
+
+BAIL = Decimal('1000.00')
+
+
+def synthetic_bail_fines(count, rng):
+    """Detained level-2 suspects with bail set, one case each."""
+    tag = f'{rng.randrange(16 ** 6):06x}'
+    case = Case.objects.create(
+        title=f'Callback replay {tag}', description='Synthetic', incident_date=timezone.now(),
+        incident_location='Replay', status=CaseStatus.UNDER_INVESTIGATION, priority=CasePriority.LEVEL2,
+    )
+    first = rng.randrange(10 ** 9, 9 * 10 ** 9)
+    suspects = Suspect.objects.bulk_create([
+        Suspect(first_name='Replay', last_name=f'{tag}-{i}', national_id=f'{first + i:010d}'[-10:],
+                status=SuspectStatus.DETAINED)
+        for i in range(count)
+    ])
+    SuspectCaseLink.objects.bulk_create([SuspectCaseLink(suspect=suspect, case=case) for suspect in suspects])
+    return BailFine.objects.bulk_create([BailFine(suspect=suspect, bail_amount=BAIL) for suspect in suspects])
+
+
+def synthetic_callbacks(bail_fines, rng, duplicate_rate, failure_rate):
+    """One successful callback per record, some failed attempts before it, and retried duplicates."""
+    callbacks = []
+    for bail_fine in bail_fines:
+        if rng.random() < failure_rate:
+            callbacks.append({'reference': f'REPLAY-{bail_fine.pk}-F', 'payment_key': f'bail:{bail_fine.pk}',
+                              'amount': str(BAIL), 'succeeded': False})
+        callbacks.append({'reference': f'REPLAY-{bail_fine.pk}', 'payment_key': f'bail:{bail_fine.pk}',
+                          'amount': str(BAIL), 'succeeded': True})
+    duplicates = [rng.choice(callbacks) for _ in range(int(len(callbacks) * duplicate_rate))]
+    callbacks.extend(duplicates)
+    rng.shuffle(callbacks)
+    return callbacks
+
+
+class Command(BaseCommand):
+    help = ('Replay synthetic gateway callbacks through the ingestion endpoint, then process them; '
+            'everything is rolled back unless --keep')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--payments', type=int, default=5000, help='Bail records paid by the replay')
+        parser.add_argument('--duplicate-rate', type=float, default=0.2, help='Extra retried callbacks, per payment')
+        parser.add_argument('--failure-rate', type=float, default=0.05, help='Payments with a failed attempt first')
+        parser.add_argument('--request-size', type=int, default=500, help='Callbacks per ingestion request')
+        parser.add_argument('--batch-size', type=int, default=PROCESS_BATCH_SIZE, help='Callbacks per processing batch')
+        parser.add_argument('--keep', action='store_true', help='Commit the synthetic data and results')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        if options['payments'] < 1:
+            raise CommandError('--payments must be positive.')
+        if not 1 <= options['request_size'] <= MAX_INGEST_BATCH:
+            raise CommandError(f'--request-size must be between 1 and {MAX_INGEST_BATCH}.')
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            bail_fines = synthetic_bail_fines(options['payments'], rng)
+            callbacks = synthetic_callbacks(bail_fines, rng, options['duplicate_rate'], options['failure_rate'])
+            self._replay(callbacks, options['request_size'])
+
+            started = time.perf_counter()
+            result = process_pending(options['batch_size'])
+            elapsed = time.perf_counter() - started
+            processed = result.applied + result.ignored + result.rejected
+            self.stdout.write(self.style.SUCCESS(
+                f'Processed {processed:,} callbacks in {elapsed:.2f}s ({processed / elapsed:,.0f}/sec): '
+                f'{result.applied:,} applied, {result.ignored:,} ignored, {result.rejected:,} rejected, '
+                f'{result.released:,} suspects released'
+            ))
+            if result.applied != len(bail_fines) or result.released != len(bail_fines):
+                raise CommandError('Replay did not apply and release every payment exactly once.')
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def _replay(self, callbacks, size):
+        # An unsaved superuser passes the signature check without a query.
+        user = get_user_model()(username='replay', is_superuser=True)
+        factory = APIRequestFactory()
+        view = PaymentCallbackView.as_view()
+        queued = duplicates = 0
+        started = time.perf_counter()
+        for offset in range(0, len(callbacks), size):
+            request = factory.post('/api/v1/investigation/payment-callbacks/', callbacks[offset:offset + size], format='json')
+            force_authenticate(request, user=user)
+            response = view(request)
+            if response.status_code != 202:
+                raise CommandError(f'Ingestion failed: {response.data}')
+            queued += response.data['data']['queued']
+            duplicates += response.data['data']['duplicates']
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Ingested {len(callbacks):,} callbacks in {elapsed:.2f}s ({len(callbacks) / elapsed:,.0f}/sec): '
+            f'{queued:,} queued, {duplicates:,} duplicates'
+        ))
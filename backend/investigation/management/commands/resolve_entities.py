@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from investigation.services.entity_resolution import resolve
+
+
+class Command(BaseCommand):
+    help = 'Resolve suspects, users, witnesses and document owners into person clusters and merge suggestions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only re-read source rows updated since the last finished run',
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        run = resolve(incremental=options['incremental'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Completed {'incremental' if run.incremental else 'full'} run in {time.perf_counter() - started:.1f}s: "
+            f"{run.records_changed} records changed, {run.pairs_scored} pairs scored, "
+            f"{run.records_linked} records linked, {run.suggestions_created} merge suggestions."
+        ))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigation', '0004_merge_20260226_1235'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='detectivereport',
+            index=models.Index(fields=['case', '-submitted_at', '-id'], name='investigati_case_id_39ab5b_idx'),
+        ),
+    ]
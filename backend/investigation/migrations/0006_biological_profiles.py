@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0007_timeline_indexes'),
+        ('investigation', '0005_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BiologicalProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('STR', 'STR Loci'), ('MINUTIAE', 'Fingerprint Minutiae')], max_length=10, verbose_name='Kind')),
+                ('data', models.JSONField(default=dict, help_text="STR: {'D8S1179': [13, 14], ...}; MINUTIAE: {'features': [0.12, ...]}", verbose_name='Profile Data')),
+                ('vector', models.BinaryField(verbose_name='Encoded Vector')),
+                ('evidence', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='profiles', to='cases.biologicalevidence', verbose_name='Biological Evidence')),
+                ('suspect', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='biological_profiles', to='investigation.suspect', verbose_name='Suspect')),
+            ],
+            options={
+                'verbose_name': 'Biological Profile',
+                'verbose_name_plural': 'Biological Profiles',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfileMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matched_by', to='investigation.biologicalprofile', verbose_name='Candidate')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='investigation.biologicalprofile', verbose_name='Profile')),
+            ],
+            options={
+                'verbose_name': 'Profile Match',
+                'verbose_name_plural': 'Profile Matches',
+                'ordering': ['-score'],
+                'unique_together': {('profile', 'candidate')},
+            },
+        ),
+        migrations.AddIndex(
+            model_name='biologicalprofile',
+            index=models.Index(fields=['kind', 'id'], name='investigati_kind_8dbda5_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='biologicalprofile',
+            constraint=models.CheckConstraint(check=models.Q(('evidence__isnull', False), ('suspect__isnull', False), _connector='OR'), name='profile_has_source'),
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('investigation', '0006_biological_profiles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('display_name', models.CharField(blank=True, max_length=255, verbose_name='Display Name')),
+                ('national_id', models.CharField(blank=True, max_length=10, verbose_name='National ID')),
+                ('record_count', models.PositiveIntegerField(default=0, verbose_name='Record Count')),
+            ],
+            options={
+                'verbose_name': 'Person Cluster',
+                'verbose_name_plural': 'Person Clusters',
+                'ordering': ['-record_count', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResolutionRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('incremental', models.BooleanField(default=False, verbose_name='Incremental')),
+                ('started_at', models.DateTimeField(verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('records_changed', models.PositiveIntegerField(default=0, verbose_name='Records Changed')),
+                ('pairs_scored', models.PositiveIntegerField(default=0, verbose_name='Pairs Scored')),
+                ('records_linked', models.PositiveIntegerField(default=0, verbose_name='Records Linked')),
+                ('suggestions_created', models.PositiveIntegerField(default=0, verbose_name='Suggestions Created')),
+            ],
+            options={
+                'verbose_name': 'Resolution Run',
+                'verbose_name_plural': 'Resolution Runs',
+                'ordering': ['-started_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='suspect',
+            name='national_id_is_synthetic',
+            field=models.BooleanField(default=False, help_text='Set when no national id was known and a placeholder was generated', verbose_name='Synthetic National ID'),
+        ),
+        migrations.CreateModel(
+            name='PersonRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('source', models.CharField(choices=[('SUSPECT', 'Suspect'), ('USER', 'User'), ('WITNESS', 'Witness Testimony'), ('DOCUMENT_OWNER', 'Document Owner')], max_length=20, verbose_name='Source')),
+                ('object_id', models.PositiveIntegerField()),
+                ('full_name', models.CharField(blank=True, max_length=255, verbose_name='Full Name')),
+                ('name_key', models.CharField(blank=True, max_length=255, verbose_name='Name Key')),
+                ('phonetic_key', models.CharField(blank=True, max_length=255, verbose_name='Phonetic Key')),
+                ('national_id', models.CharField(blank=True, max_length=10, verbose_name='National ID')),
+                ('phone', models.CharField(blank=True, max_length=15, verbose_name='Phone')),
+                ('cluster', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='records', to='investigation.personcluster', verbose_name='Cluster')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Person Record',
+                'verbose_name_plural': 'Person Records',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MergeSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('reasons', models.JSONField(default=list, verbose_name='Reasons')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('ACCEPTED', 'Accepted'), ('REJECTED', 'Rejected')], default='PENDING', max_length=10, verbose_name='Status')),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True, verbose_name='Reviewed At')),
+                ('left', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='investigation.personrecord', verbose_name='Left Record')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_merge_suggestions', to=settings.AUTH_USER_MODEL, verbose_name='Reviewed By')),
+                ('right', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='investigation.personrecord', verbose_name='Right Record')),
+            ],
+            options={
+                'verbose_name': 'Merge Suggestion',
+                'verbose_name_plural': 'Merge Suggestions',
+                'ordering': ['-score', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='personrecord',
+            index=models.Index(fields=['national_id'], name='investigati_nationa_c95b08_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personrecord',
+            index=models.Index(fields=['phone'], name='investigati_phone_45746d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personrecord',
+            index=models.Index(fields=['phonetic_key'], name='investigati_phoneti_040f43_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='personrecord',
+            index=models.Index(fields=['cluster'], name='investigati_cluster_25cfb0_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='personrecord',
+            unique_together={('content_type', 'object_id')},
+        ),
+        migrations.AddIndex(
+            model_name='mergesuggestion',
+            index=models.Index(fields=['status', '-score'], name='investigati_status_3ffbee_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='mergesuggestion',
+            unique_together={('left', 'right')},
+        ),
+    ]
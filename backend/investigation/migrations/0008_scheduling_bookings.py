@@ -0,0 +1,101 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:44
+
+from datetime import timedelta
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.db import migrations, models
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+import django.db.models.deletion
+
+# Durations used for rows that predate bookings (as in investigation.services.scheduling).
+TRIAL_MINUTES = 120
+INTERROGATION_MINUTES = 60
+
+
+def backfill_bookings(apps, schema_editor):
+    """Book existing scheduled trials and interrogations; rows that already overlap are skipped."""
+    ScheduleResource = apps.get_model('investigation', 'ScheduleResource')
+    Booking = apps.get_model('investigation', 'Booking')
+    Trial = apps.get_model('investigation', 'Trial')
+    Interrogation = apps.get_model('investigation', 'Interrogation')
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    trial_type, _ = ContentType.objects.get_or_create(app_label='investigation', model='trial')
+    interrogation_type, _ = ContentType.objects.get_or_create(app_label='investigation', model='interrogation')
+
+    def book(kind, key, start, end, content_type, object_id):
+        if not key:
+            return
+        resource, _ = ScheduleResource.objects.get_or_create(kind=kind, key=key)
+        Booking.objects.bulk_create([Booking(
+            resource=resource, during=DateTimeTZRange(start, end), content_type=content_type, object_id=object_id,
+        )], ignore_conflicts=True)
+
+    for trial in Trial.objects.filter(status__in=['SCHEDULED', 'IN_PROGRESS']).iterator():
+        end = trial.scheduled_date + timedelta(minutes=TRIAL_MINUTES)
+        book('JUDGE', str(trial.judge_id), trial.scheduled_date, end, trial_type, trial.pk)
+    for interrogation in Interrogation.objects.filter(status__in=['SCHEDULED', 'IN_PROGRESS']).iterator():
+        start = interrogation.scheduled_date
+        end = interrogation.end_time if interrogation.end_time and interrogation.end_time > start else (
+            start + timedelta(minutes=INTERROGATION_MINUTES)
+        )
+        for kind, key in (
+            ('DETECTIVE', str(interrogation.detective_id)),
+            ('SERGEANT', str(interrogation.sergeant_id)),
+            ('INTERROGATION_ROOM', ' '.join(interrogation.location.lower().split())),
+        ):
+            book(kind, key, start, end, interrogation_type, interrogation.pk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('investigation', '0007_entity_resolution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trial',
+            name='courtroom',
+            field=models.CharField(blank=True, max_length=100, verbose_name='Courtroom'),
+        ),
+        migrations.CreateModel(
+            name='ScheduleResource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('DETECTIVE', 'Detective'), ('SERGEANT', 'Sergeant'), ('JUDGE', 'Judge'), ('INTERROGATION_ROOM', 'Interrogation Room'), ('COURTROOM', 'Courtroom')], max_length=20, verbose_name='Kind')),
+                ('key', models.CharField(max_length=200, verbose_name='Key')),
+            ],
+            options={
+                'verbose_name': 'Schedule Resource',
+                'verbose_name_plural': 'Schedule Resources',
+                'unique_together': {('kind', 'key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Booking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('during', django.contrib.postgres.fields.ranges.DateTimeRangeField(verbose_name='During')),
+                ('object_id', models.PositiveIntegerField()),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+                ('resource', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='investigation.scheduleresource', verbose_name='Resource')),
+            ],
+            options={
+                'verbose_name': 'Booking',
+                'verbose_name_plural': 'Bookings',
+                'ordering': ['during'],
+                'indexes': [models.Index(fields=['content_type', 'object_id'], name='investigati_content_4eab53_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(expressions=[(models.Func(models.F('resource'), models.F('resource'), models.Value('[]'), function='int8range'), '='), ('during', '&&')], name='booking_no_overlap'),
+        ),
+        migrations.RunPython(backfill_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigation', '0008_scheduling_bookings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentCallback',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('gateway_reference', models.CharField(max_length=255, unique=True, verbose_name='Gateway Reference')),
+                ('payment_key', models.CharField(help_text='Idempotency key the payment was charged under, e.g. bail:12 or fine:12', max_length=200, verbose_name='Payment Key')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Amount')),
+                ('succeeded', models.BooleanField(default=True, verbose_name='Succeeded')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('APPLIED', 'Applied'), ('IGNORED', 'Ignored'), ('REJECTED', 'Rejected')], default='PENDING', max_length=10, verbose_name='Status')),
+                ('error', models.CharField(blank=True, max_length=255, verbose_name='Error')),
+                ('processed_at', models.DateTimeField(blank=True, null=True, verbose_name='Processed At')),
+            ],
+            options={
+                'verbose_name': 'Payment Callback',
+                'verbose_name_plural': 'Payment Callbacks',
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('status', 'PENDING')), fields=['id'], name='callback_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+FINISHED = {
+    'interrogation': ('COMPLETED', 'CANCELLED'),
+    'trial': ('COMPLETED', 'POSTPONED'),
+}
+
+
+def release_finished_bookings(apps, schema_editor):
+    """Delete bookings held by finished interrogations and trials, or by owners that no longer exist."""
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    Booking = apps.get_model('investigation', 'Booking')
+    for model_name, finished in FINISHED.items():
+        content_type = ContentType.objects.filter(app_label='investigation', model=model_name).first()
+        if content_type is None:
+            continue
+        model = apps.get_model('investigation', model_name)
+        live = model.objects.exclude(status__in=finished).values('pk')
+        Booking.objects.filter(content_type=content_type).exclude(object_id__in=live).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('investigation', '0009_payment_callbacks'),
+    ]
+
+    operations = [
+        migrations.RunPython(release_finished_bookings, migrations.RunPython.noop),
+    ]
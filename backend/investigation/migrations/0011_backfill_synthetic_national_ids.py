@@ -0,0 +1,53 @@
+import hashlib
+
+from django.db import migrations
+
+# investigation.views.case_resolution._generate_unique_national_id: a hash of the seed,
+# moved forward past ids already taken, at most this many times.
+PROBES = 10 ** 4
+
+
+def _placeholder_base(seed):
+    return int(hashlib.sha256(seed.encode('utf-8')).hexdigest(), 16) % (10 ** 10)
+
+
+def mark_synthetic_national_ids(apps, schema_editor):
+    """
+    Flag the suspects created from a reported suspect with a generated placeholder id. For
+    each reported suspect, the first suspect of its case whose id lies in the placeholder's
+    probe window is the one it created. Placeholders from the time-based fallback (after
+    10,000 collisions) cannot be told apart from real ids and stay unflagged.
+    """
+    ReportedSuspect = apps.get_model('investigation', 'ReportedSuspect')
+    Suspect = apps.get_model('investigation', 'Suspect')
+    synthetic = set()
+    reported = ReportedSuspect.objects.values_list('report__case_id', 'report_id', 'content_type_id', 'object_id')
+    for case_id, report_id, content_type_id, object_id in reported.iterator(chunk_size=500):
+        base = _placeholder_base(f"{case_id}:{report_id}:{content_type_id}:{object_id}")
+        if base + PROBES >= 10 ** 10:
+            # The window wraps past 9999999999; such seeds are too rare to be worth the second range.
+            continue
+        match = (
+            Suspect.objects.filter(
+                case_links__case_id=case_id,
+                national_id__gte=f'{base:010d}',
+                national_id__lt=f'{base + PROBES:010d}',
+            )
+            .order_by('national_id')
+            .values_list('pk', flat=True)
+            .first()
+        )
+        if match is not None:
+            synthetic.add(match)
+    Suspect.objects.filter(pk__in=synthetic).update(national_id_is_synthetic=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigation', '0010_release_finished_bookings'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_synthetic_national_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-19 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigation', '0011_backfill_synthetic_national_ids'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='detectivereport',
+            index=models.Index(condition=models.Q(('reviewed_at__isnull', False)), fields=['case', '-reviewed_at', '-id'], name='report_reviewed_idx'),
+        ),
+    ]
@@ -5,9 +5,19 @@ from .case_resolution import (
     ReportedSuspect,
     Notification,
 )
-from .bail_fine import BailFine
+from .bail_fine import BailFine, CallbackStatus, PaymentCallback
 from .suspect import Suspect, Interrogation, SuspectStatus, SuspectCaseLink, InterrogationStatus
 from .trial import Trial, TrialStatus, TrialVerdict
+from .profile import BiologicalProfile, ProfileMatch, ProfileKind
+from .identity import (
+    PersonSource,
+    PersonCluster,
+    PersonRecord,
+    MergeSuggestion,
+    MergeSuggestionStatus,
+    ResolutionRun,
+)
+from .scheduling import ResourceKind, ScheduleResource, Booking
 
 __all__ = [
     'EvidenceLink',
@@ -16,6 +26,8 @@ __all__ = [
     'ReportedSuspect',
     'Notification',
     'BailFine',
+    'CallbackStatus',
+    'PaymentCallback',
     'Suspect',
     'SuspectStatus',
     'SuspectCaseLink',
@@ -24,4 +36,16 @@ __all__ = [
     'Trial',
     'TrialStatus',
     'TrialVerdict',
+    'BiologicalProfile',
+    'ProfileMatch',
+    'ProfileKind',
+    'PersonSource',
+    'PersonCluster',
+    'PersonRecord',
+    'MergeSuggestion',
+    'MergeSuggestionStatus',
+    'ResolutionRun',
+    'ResourceKind',
+    'ScheduleResource',
+    'Booking',
 ]
@@ -1,10 +1,11 @@
 
-from django.db import models
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
 from django.conf import settings
 from django.utils import timezone
 
 from core.models import BaseModel
+from core.services.ledger import record_bail, record_fine
 
 
 class BailFine(BaseModel):
@@ -97,15 +98,28 @@ class BailFine(BaseModel):
         if self.fine_paid and not self.fine_amount:
             raise ValidationError({'fine_amount': 'Fine amount required when fine is paid.'})
 
+    def allows_release(self, crime_level):
+        """
+        Whether this record releases a detained suspect whose highest crime level is `crime_level`:
+        level 2 or 3, bail or fine paid, and for level 3 sergeant approval.
+        """
+        if crime_level not in (2, 3):
+            return False
+        if crime_level == 3 and not self.sergeant_approval:
+            return False
+        return bool((self.bail_amount and self.bail_paid) or (self.fine_amount and self.fine_paid))
+
     def record_bail_payment(self, amount, payment_reference=''):
         if not self.bail_amount:
             raise ValidationError('No bail amount set.')
         if amount < self.bail_amount:
             raise ValidationError(f'Payment amount must be at least {self.bail_amount}')
-        self.bail_paid = True
-        self.bail_payment_date = timezone.now()
-        self.bail_payment_reference = payment_reference or self.bail_payment_reference
-        self.save()
+        with transaction.atomic():
+            self.bail_paid = True
+            self.bail_payment_date = timezone.now()
+            self.bail_payment_reference = payment_reference or self.bail_payment_reference
+            self.save()
+            record_bail(self, amount, self.bail_payment_reference)
         self.suspect._check_bail_fine_release()
 
     def record_fine_payment(self, amount, payment_reference=''):
@@ -113,8 +127,52 @@ class BailFine(BaseModel):
             raise ValidationError('No fine amount set.')
         if amount < self.fine_amount:
             raise ValidationError(f'Payment amount must be at least {self.fine_amount}')
-        self.fine_paid = True
-        self.fine_payment_date = timezone.now()
-        self.fine_payment_reference = payment_reference or self.fine_payment_reference
-        self.save()
+        with transaction.atomic():
+            self.fine_paid = True
+            self.fine_payment_date = timezone.now()
+            self.fine_payment_reference = payment_reference or self.fine_payment_reference
+            self.save()
+            record_fine(self, amount, self.fine_payment_reference)
         self.suspect._check_bail_fine_release()
+
+
+class CallbackStatus(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    APPLIED = 'APPLIED', 'Applied'
+    IGNORED = 'IGNORED', 'Ignored'
+    REJECTED = 'REJECTED', 'Rejected'
+
+
+class PaymentCallback(BaseModel):
+    """
+    A gateway notification that a bail or fine payment completed, queued until a worker
+    applies it (see investigation.services.payment_callbacks). The gateway reference is
+    unique, so a retried callback is stored once.
+    """
+    gateway_reference = models.CharField(max_length=255, unique=True, verbose_name="Gateway Reference")
+    payment_key = models.CharField(
+        max_length=200,
+        verbose_name="Payment Key",
+        help_text="Idempotency key the payment was charged under, e.g. bail:12 or fine:12",
+    )
+    amount = models.DecimalField(max_digits=14, decimal_places=2, verbose_name="Amount")
+    succeeded = models.BooleanField(default=True, verbose_name="Succeeded")
+    status = models.CharField(
+        max_length=10,
+        choices=CallbackStatus.choices,
+        default=CallbackStatus.PENDING,
+        verbose_name="Status",
+    )
+    error = models.CharField(max_length=255, blank=True, verbose_name="Error")
+    processed_at = models.DateTimeField(null=True, blank=True, verbose_name="Processed At")
+
+    class Meta:
+        verbose_name = "Payment Callback"
+        verbose_name_plural = "Payment Callbacks"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['id'], name='callback_pending_idx', condition=models.Q(status='PENDING')),
+        ]
+
+    def __str__(self):
+        return f"{self.payment_key} {self.gateway_reference} ({self.status})"
@@ -108,6 +108,12 @@ class DetectiveReport(BaseModel):
         indexes = [
             models.Index(fields=['case']),
             models.Index(fields=['status']),
+            models.Index(fields=['case', '-submitted_at', '-id']),
+            models.Index(
+                fields=['case', '-reviewed_at', '-id'],
+                name='report_reviewed_idx',
+                condition=models.Q(reviewed_at__isnull=False),
+            ),
         ]
 
     def __str__(self):
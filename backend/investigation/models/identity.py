@@ -0,0 +1,141 @@
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+
+from core.models import BaseModel
+
+
+class PersonSource(models.TextChoices):
+    SUSPECT = 'SUSPECT', 'Suspect'
+    USER = 'USER', 'User'
+    WITNESS = 'WITNESS', 'Witness Testimony'
+    DOCUMENT_OWNER = 'DOCUMENT_OWNER', 'Document Owner'
+
+
+class PersonCluster(BaseModel):
+    """One real person, as resolved from the person records assigned to it."""
+    display_name = models.CharField(max_length=255, blank=True, verbose_name="Display Name")
+    national_id = models.CharField(max_length=10, blank=True, verbose_name="National ID")
+    record_count = models.PositiveIntegerField(default=0, verbose_name="Record Count")
+
+    class Meta:
+        verbose_name = "Person Cluster"
+        verbose_name_plural = "Person Clusters"
+        ordering = ['-record_count', 'id']
+
+    def __str__(self):
+        return f"{self.display_name or 'Unnamed'} ({self.record_count} records)"
+
+
+class PersonRecord(BaseModel):
+    """
+    One mention of a person (a suspect, a user, a witness, a document owner) with the
+    normalized keys used for blocking; see investigation.identity.
+    """
+    source = models.CharField(max_length=20, choices=PersonSource.choices, verbose_name="Source")
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveIntegerField()
+    entity = GenericForeignKey('content_type', 'object_id')
+    full_name = models.CharField(max_length=255, blank=True, verbose_name="Full Name")
+    name_key = models.CharField(max_length=255, blank=True, verbose_name="Name Key")
+    phonetic_key = models.CharField(max_length=255, blank=True, verbose_name="Phonetic Key")
+    national_id = models.CharField(max_length=10, blank=True, verbose_name="National ID")
+    phone = models.CharField(max_length=15, blank=True, verbose_name="Phone")
+    cluster = models.ForeignKey(
+        PersonCluster,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='records',
+        verbose_name="Cluster"
+    )
+
+    class Meta:
+        verbose_name = "Person Record"
+        verbose_name_plural = "Person Records"
+        ordering = ['id']
+        unique_together = [['content_type', 'object_id']]
+        indexes = [
+            models.Index(fields=['national_id']),
+            models.Index(fields=['phone']),
+            models.Index(fields=['phonetic_key']),
+            models.Index(fields=['cluster']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_source_display()}: {self.full_name}"
+
+
+class MergeSuggestionStatus(models.TextChoices):
+    PENDING = 'PENDING', 'Pending'
+    ACCEPTED = 'ACCEPTED', 'Accepted'
+    REJECTED = 'REJECTED', 'Rejected'
+
+
+class MergeSuggestion(BaseModel):
+    """A scored pair of records from different clusters that may be the same person."""
+    left = models.ForeignKey(
+        PersonRecord,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Left Record"
+    )
+    right = models.ForeignKey(
+        PersonRecord,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Right Record"
+    )
+    score = models.FloatField(verbose_name="Score")
+    reasons = models.JSONField(default=list, verbose_name="Reasons")
+    status = models.CharField(
+        max_length=10,
+        choices=MergeSuggestionStatus.choices,
+        default=MergeSuggestionStatus.PENDING,
+        verbose_name="Status"
+    )
+    reviewed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='reviewed_merge_suggestions',
+        verbose_name="Reviewed By"
+    )
+    reviewed_at = models.DateTimeField(null=True, blank=True, verbose_name="Reviewed At")
+
+    class Meta:
+        verbose_name = "Merge Suggestion"
+        verbose_name_plural = "Merge Suggestions"
+        ordering = ['-score', 'id']
+        unique_together = [['left', 'right']]
+        indexes = [
+            models.Index(fields=['status', '-score']),
+        ]
+
+    def __str__(self):
+        return f"{self.left_id} ~ {self.right_id} ({self.score:.2f}, {self.status})"
+
+
+class ResolutionRun(models.Model):
+    """One entity-resolution pass; the last finished run's start is the next incremental cursor."""
+    incremental = models.BooleanField(default=False, verbose_name="Incremental")
+    started_at = models.DateTimeField(verbose_name="Started At")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finished At")
+    records_changed = models.PositiveIntegerField(default=0, verbose_name="Records Changed")
+    pairs_scored = models.PositiveIntegerField(default=0, verbose_name="Pairs Scored")
+    records_linked = models.PositiveIntegerField(default=0, verbose_name="Records Linked")
+    suggestions_created = models.PositiveIntegerField(default=0, verbose_name="Suggestions Created")
+
+    class Meta:
+        verbose_name = "Resolution Run"
+        verbose_name_plural = "Resolution Runs"
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{'Incremental' if self.incremental else 'Full'} run at {self.started_at}"
@@ -0,0 +1,91 @@
+from django.db import models
+from django.core.exceptions import ValidationError
+
+from core.models import BaseModel, ChangeTrackedModel
+
+
+class ProfileKind(models.TextChoices):
+    STR = 'STR', 'STR Loci'
+    MINUTIAE = 'MINUTIAE', 'Fingerprint Minutiae'
+
+
+class BiologicalProfile(ChangeTrackedModel, BaseModel):
+    """
+    A DNA STR profile or fingerprint feature vector taken from biological evidence or from a
+    known suspect. `data` keeps what was submitted; `vector` is the fixed-length float32
+    encoding the matcher loads into memory (see investigation.services.profile_matching).
+    """
+    kind = models.CharField(
+        max_length=10,
+        choices=ProfileKind.choices,
+        verbose_name="Kind"
+    )
+    evidence = models.ForeignKey(
+        'cases.BiologicalEvidence',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='profiles',
+        verbose_name="Biological Evidence"
+    )
+    suspect = models.ForeignKey(
+        'investigation.Suspect',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='biological_profiles',
+        verbose_name="Suspect"
+    )
+    data = models.JSONField(
+        default=dict,
+        verbose_name="Profile Data",
+        help_text="STR: {'D8S1179': [13, 14], ...}; MINUTIAE: {'features': [0.12, ...]}"
+    )
+    vector = models.BinaryField(verbose_name="Encoded Vector")
+
+    class Meta:
+        verbose_name = "Biological Profile"
+        verbose_name_plural = "Biological Profiles"
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['kind', 'id']),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(evidence__isnull=False) | models.Q(suspect__isnull=False),
+                name='profile_has_source',
+            ),
+        ]
+
+    def __str__(self):
+        source = f"evidence {self.evidence_id}" if self.evidence_id else f"suspect {self.suspect_id}"
+        return f"{self.kind} profile for {source}"
+
+    def clean(self):
+        if not self.evidence_id and not self.suspect_id:
+            raise ValidationError('A profile must belong to biological evidence or a suspect.')
+
+
+class ProfileMatch(BaseModel):
+    profile = models.ForeignKey(
+        BiologicalProfile,
+        on_delete=models.CASCADE,
+        related_name='matches',
+        verbose_name="Profile"
+    )
+    candidate = models.ForeignKey(
+        BiologicalProfile,
+        on_delete=models.CASCADE,
+        related_name='matched_by',
+        verbose_name="Candidate"
+    )
+    score = models.FloatField(verbose_name="Score")
+
+    class Meta:
+        verbose_name = "Profile Match"
+        verbose_name_plural = "Profile Matches"
+        ordering = ['-score']
+        unique_together = [['profile', 'candidate']]
+
+    def __str__(self):
+        return f"{self.profile_id} ~ {self.candidate_id} ({self.score:.2f})"
@@ -0,0 +1,76 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
+from django.db import models
+from django.db.models import F, Func, Value
+
+from core.models import BaseModel
+
+
+class ResourceKind(models.TextChoices):
+    DETECTIVE = 'DETECTIVE', 'Detective'
+    SERGEANT = 'SERGEANT', 'Sergeant'
+    JUDGE = 'JUDGE', 'Judge'
+    INTERROGATION_ROOM = 'INTERROGATION_ROOM', 'Interrogation Room'
+    COURTROOM = 'COURTROOM', 'Courtroom'
+
+
+class ScheduleResource(BaseModel):
+    """Something that can only be in one place at a time: a person (by user id) or a room (by name)."""
+    kind = models.CharField(max_length=20, choices=ResourceKind.choices, verbose_name="Kind")
+    key = models.CharField(max_length=200, verbose_name="Key")
+
+    class Meta:
+        verbose_name = "Schedule Resource"
+        verbose_name_plural = "Schedule Resources"
+        unique_together = [['kind', 'key']]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.key}"
+
+
+class Booking(BaseModel):
+    """
+    One resource held for a time range by an interrogation or a trial. The exclusion
+    constraint makes Postgres reject two bookings of the same resource whose ranges overlap,
+    and its GiST index serves the range queries. The resource id is compared as a one-point
+    range so the constraint only needs the built-in GiST range operator class.
+    """
+    resource = models.ForeignKey(
+        ScheduleResource,
+        on_delete=models.CASCADE,
+        related_name='bookings',
+        verbose_name="Resource"
+    )
+    during = DateTimeRangeField(verbose_name="During")
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    object_id = models.PositiveIntegerField()
+    owner = GenericForeignKey('content_type', 'object_id')
+
+    class Meta:
+        verbose_name = "Booking"
+        verbose_name_plural = "Bookings"
+        ordering = ['during']
+        constraints = [
+            ExclusionConstraint(
+                name='booking_no_overlap',
+                expressions=[
+                    (
+                        Func(F('resource'), F('resource'), Value('[]'), function='int8range'),
+                        RangeOperators.EQUAL,
+                    ),
+                    ('during', RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['content_type', 'object_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.resource}: {self.during.lower} - {self.during.upper}"
@@ -1,9 +1,15 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedModel
+
+
+# Case priority -> crime level; lower is more serious. A suspect's level is the lowest over their cases.
+CRIME_LEVELS = {'LEVEL3': 3, 'LEVEL2': 2, 'LEVEL1': 1, 'CRITICAL': 0}
+UNKNOWN_CRIME_LEVEL = 4
 
 
 class SuspectStatus(models.TextChoices):
@@ -17,7 +23,7 @@ class SuspectStatus(models.TextChoices):
     FUGITIVE = 'FUGITIVE', 'Fugitive'
 
 
-class Suspect(BaseModel):
+class Suspect(ChangeTrackedModel, BaseModel):
     first_name = models.CharField(max_length=100, verbose_name="First Name")
     last_name = models.CharField(max_length=100, verbose_name="Last Name")
     national_id = models.CharField(
@@ -26,6 +32,11 @@ class Suspect(BaseModel):
         verbose_name="National ID",
         help_text="10-digit national identification number"
     )
+    national_id_is_synthetic = models.BooleanField(
+        default=False,
+        verbose_name="Synthetic National ID",
+        help_text="Set when no national id was known and a placeholder was generated"
+    )
     date_of_birth = models.DateField(null=True, blank=True, verbose_name="Date of Birth")
     phone_number = models.CharField(max_length=11, blank=True, verbose_name="Phone Number")
     address = models.TextField(blank=True, verbose_name="Address")
@@ -125,9 +136,8 @@ class Suspect(BaseModel):
         case_links = self.case_links.select_related('case').all()
         if not case_links:
             return None
-        level_map = {'LEVEL3': 3, 'LEVEL2': 2, 'LEVEL1': 1, 'CRITICAL': 0}
         return min(
-            (level_map.get(link.case.priority, 4) for link in case_links),
+            (CRIME_LEVELS.get(link.case.priority, UNKNOWN_CRIME_LEVEL) for link in case_links),
             default=None
         )
 
@@ -139,15 +149,9 @@ class Suspect(BaseModel):
 
     def _check_bail_fine_release(self):
         """If eligible (level 2/3, payment made, and for level 3 sergeant approved), release from detention."""
-        if not getattr(self, 'bail_fine', None) or not self.is_level_2_or_3_crime or self.status != SuspectStatus.DETAINED:
-            return
-        bf = self.bail_fine
-        level = self.highest_crime_level
-        if level == 3 and not bf.sergeant_approval:
+        if not getattr(self, 'bail_fine', None) or self.status != SuspectStatus.DETAINED:
             return
-        has_bail = bf.bail_amount and bf.bail_paid
-        has_fine = bf.fine_amount and bf.fine_paid
-        if has_bail or has_fine:
+        if self.bail_fine.allows_release(self.highest_crime_level):
             self.release_from_detention()
 
     def _pursuit_max_days_and_degree(self):
@@ -224,7 +228,7 @@ class Suspect(BaseModel):
         self.bail_fine.record_fine_payment(amount, payment_reference)
 
 
-class SuspectCaseLink(BaseModel):
+class SuspectCaseLink(ChangeTrackedModel, BaseModel):
     suspect = models.ForeignKey(
         Suspect,
         on_delete=models.CASCADE,
@@ -323,14 +327,14 @@ class SuspectCaseLink(BaseModel):
     def __str__(self):
         return f"{self.suspect.full_name} - Case {self.case.case_number}"
 
+    @staticmethod
+    def average_of(detective_guilt_score, sergeant_guilt_score):
+        scores = [score for score in (detective_guilt_score, sergeant_guilt_score) if score]
+        return sum(scores) / len(scores) if scores else None
+
     @property
     def average_guilt_score(self):
-        scores = []
-        if self.detective_guilt_score:
-            scores.append(self.detective_guilt_score)
-        if self.sergeant_guilt_score:
-            scores.append(self.sergeant_guilt_score)
-        return sum(scores) / len(scores) if scores else None
+        return self.average_of(self.detective_guilt_score, self.sergeant_guilt_score)
 
     @property
     def has_both_assessments(self):
@@ -354,6 +358,10 @@ class InterrogationStatus(models.TextChoices):
     CANCELLED = 'CANCELLED', 'Cancelled'
 
 
+# Interrogations in these states no longer hold their detective, sergeant and room.
+INTERROGATION_FINISHED = (InterrogationStatus.COMPLETED, InterrogationStatus.CANCELLED)
+
+
 class Interrogation(BaseModel):
     suspect_case_link = models.ForeignKey(
         SuspectCaseLink,
@@ -429,6 +437,7 @@ class Interrogation(BaseModel):
     )
     transcript = models.TextField(blank=True, verbose_name="Transcript")
     summary = models.TextField(blank=True, verbose_name="Summary")
+    bookings = GenericRelation('investigation.Booking')
 
     class Meta:
         verbose_name = "Interrogation"
@@ -445,9 +454,13 @@ class Interrogation(BaseModel):
         return f"Interrogation {self.interrogation_number} - {self.suspect_case_link.suspect.full_name}"
 
     def save(self, *args, **kwargs):
+        from investigation.services.scheduling import release
         if not self.interrogation_number:
             self.interrogation_number = self.generate_interrogation_number()
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.status in INTERROGATION_FINISHED:
+                release(self)
 
     @staticmethod
     def generate_interrogation_number():
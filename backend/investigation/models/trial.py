@@ -1,7 +1,8 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.contenttypes.fields import GenericRelation
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedModel
 
 
 class TrialStatus(models.TextChoices):
@@ -16,7 +17,12 @@ class TrialVerdict(models.TextChoices):
     INNOCENT = 'INNOCENT', 'Innocent'
 
 
-class Trial(BaseModel):
+# Trials in these states no longer hold their judge and courtroom; a postponed trial is
+# booked again when it is rescheduled.
+TRIAL_FINISHED = (TrialStatus.COMPLETED, TrialStatus.POSTPONED)
+
+
+class Trial(ChangeTrackedModel, BaseModel):
     case = models.OneToOneField(
         'cases.Case',
         on_delete=models.CASCADE,
@@ -36,6 +42,7 @@ class Trial(BaseModel):
         verbose_name="Trial Status"
     )
     scheduled_date = models.DateTimeField(verbose_name="Scheduled Date")
+    courtroom = models.CharField(max_length=100, blank=True, verbose_name="Courtroom")
     verdict = models.CharField(
         max_length=10,
         choices=TrialVerdict.choices,
@@ -50,6 +57,7 @@ class Trial(BaseModel):
         verbose_name="Verdict Date"
     )
     judge_notes = models.TextField(blank=True, verbose_name="Judge Notes")
+    bookings = GenericRelation('investigation.Booking')
 
     class Meta:
         verbose_name = "Trial"
@@ -64,6 +72,13 @@ class Trial(BaseModel):
     def __str__(self):
         return f"Trial - {self.case.case_number}"
 
+    def save(self, *args, **kwargs):
+        from investigation.services.scheduling import release
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if self.status in TRIAL_FINISHED:
+                release(self)
+
     @property
     def is_completed(self):
         return self.status == TrialStatus.COMPLETED and self.verdict is not None
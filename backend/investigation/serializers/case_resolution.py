@@ -104,6 +104,12 @@ class NotificationSerializer(serializers.ModelSerializer):
             'type', 'message', 'read_at', 'created_at',
         ]
         read_only_fields = ['recipient', 'read_at']
+        projection = {
+            'type': (
+                ('content_type', 'content_type__model'),
+                lambda content_type_id, model: (model or str(content_type_id)) if content_type_id else None,
+            ),
+        }
 
     def get_type(self, obj):
         if obj.content_type_id:
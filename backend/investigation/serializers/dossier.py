@@ -0,0 +1,81 @@
+from rest_framework import serializers
+
+from investigation.models import Suspect, SuspectCaseLink, Interrogation, BailFine, Trial
+
+
+class DossierSuspectSerializer(serializers.ModelSerializer):
+    full_name = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Suspect
+        fields = [
+            'id', 'first_name', 'last_name', 'full_name', 'national_id', 'date_of_birth',
+            'phone_number', 'address', 'status', 'is_wanted', 'pursuit_start_date',
+            'capture_date', 'detention_location', 'detention_start_date', 'detention_end_date',
+            'criminal_history', 'notes',
+        ]
+
+
+class DossierBailFineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BailFine
+        fields = [
+            'bail_amount', 'bail_paid', 'bail_payment_date',
+            'fine_amount', 'fine_paid', 'fine_payment_date',
+            'sergeant_approval', 'approved_at', 'updated_at',
+        ]
+
+
+class DossierTrialSerializer(serializers.ModelSerializer):
+    judge_name = serializers.CharField(source='judge.get_full_name', read_only=True, allow_null=True)
+
+    class Meta:
+        model = Trial
+        fields = ['id', 'status', 'scheduled_date', 'judge_name', 'verdict', 'punishment', 'verdict_date']
+
+
+class DossierCaseSerializer(serializers.ModelSerializer):
+    """One linked case with this suspect's assessments, the command decisions and the trial outcome."""
+    link_id = serializers.IntegerField(source='id', read_only=True)
+    case = serializers.IntegerField(source='case_id', read_only=True)
+    case_number = serializers.CharField(source='case.case_number', read_only=True)
+    title = serializers.CharField(source='case.title', read_only=True)
+    priority = serializers.CharField(source='case.priority', read_only=True)
+    case_status = serializers.CharField(source='case.status', read_only=True)
+    incident_date = serializers.DateTimeField(source='case.incident_date', read_only=True)
+    average_guilt_score = serializers.FloatField(read_only=True)
+    captain_name = serializers.CharField(source='captain.get_full_name', read_only=True, allow_null=True)
+    chief_name = serializers.CharField(source='chief.get_full_name', read_only=True, allow_null=True)
+    interrogation_count = serializers.SerializerMethodField()
+    trial = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SuspectCaseLink
+        fields = [
+            'link_id', 'case', 'case_number', 'title', 'priority', 'case_status', 'incident_date',
+            'role_in_crime', 'detective_guilt_score', 'sergeant_guilt_score', 'average_guilt_score',
+            'captain_opinion', 'captain_name', 'captain_opinion_at',
+            'chief_approved', 'chief_name', 'chief_approval_at',
+            'interrogation_count', 'trial', 'created_at',
+        ]
+
+    def get_interrogation_count(self, obj):
+        return len(obj.interrogations.all())
+
+    def get_trial(self, obj):
+        trial = getattr(obj.case, 'trial', None)
+        return DossierTrialSerializer(trial).data if trial else None
+
+
+class DossierInterrogationSerializer(serializers.ModelSerializer):
+    case = serializers.IntegerField(source='suspect_case_link.case_id', read_only=True)
+    case_number = serializers.CharField(source='suspect_case_link.case.case_number', read_only=True)
+    detective_name = serializers.CharField(source='detective.get_full_name', read_only=True)
+    sergeant_name = serializers.CharField(source='sergeant.get_full_name', read_only=True)
+
+    class Meta:
+        model = Interrogation
+        fields = [
+            'id', 'interrogation_number', 'case', 'case_number', 'scheduled_date', 'status', 'location',
+            'detective_name', 'detective_guilt_rating', 'sergeant_name', 'sergeant_guilt_rating', 'summary',
+        ]
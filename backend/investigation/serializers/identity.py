@@ -0,0 +1,36 @@
+from rest_framework import serializers
+
+from investigation.models import PersonRecord, PersonCluster, MergeSuggestion
+
+
+class PersonRecordSerializer(serializers.ModelSerializer):
+    model = serializers.CharField(source='content_type.model', read_only=True)
+
+    class Meta:
+        model = PersonRecord
+        fields = ['id', 'source', 'model', 'object_id', 'full_name', 'national_id', 'phone', 'cluster']
+
+
+class PersonClusterSerializer(serializers.ModelSerializer):
+    records = PersonRecordSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = PersonCluster
+        fields = ['id', 'display_name', 'national_id', 'record_count', 'records', 'updated_at']
+
+
+class MergeSuggestionSerializer(serializers.ModelSerializer):
+    left = PersonRecordSerializer(read_only=True)
+    right = PersonRecordSerializer(read_only=True)
+    reviewed_by_name = serializers.CharField(source='reviewed_by.get_full_name', read_only=True, allow_null=True)
+
+    class Meta:
+        model = MergeSuggestion
+        fields = [
+            'id', 'left', 'right', 'score', 'reasons', 'status',
+            'reviewed_by', 'reviewed_by_name', 'reviewed_at', 'created_at',
+        ]
+
+
+class MergeSuggestionReviewSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=['accept', 'reject'])
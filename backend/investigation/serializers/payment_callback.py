@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+
+class PaymentCallbackSerializer(serializers.Serializer):
+    reference = serializers.CharField(max_length=255, source='gateway_reference')
+    payment_key = serializers.CharField(max_length=200, help_text='e.g. bail:12 or fine:12')
+    amount = serializers.DecimalField(max_digits=14, decimal_places=2, min_value=0)
+    succeeded = serializers.BooleanField(default=True)
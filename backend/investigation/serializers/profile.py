@@ -0,0 +1,34 @@
+from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from investigation.models import BiologicalProfile, ProfileMatch, ProfileKind
+from investigation.services.profile_matching import encode_profile
+
+
+class BiologicalProfileCreateSerializer(serializers.Serializer):
+    kind = serializers.ChoiceField(choices=ProfileKind.choices)
+    data = serializers.JSONField()
+
+    def validate(self, attrs):
+        try:
+            encode_profile(attrs['kind'], attrs['data'])
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError({'data': exc.messages})
+        return attrs
+
+
+class ProfileMatchSerializer(serializers.ModelSerializer):
+    candidate_evidence = serializers.IntegerField(source='candidate.evidence_id', read_only=True, allow_null=True)
+    candidate_suspect = serializers.IntegerField(source='candidate.suspect_id', read_only=True, allow_null=True)
+
+    class Meta:
+        model = ProfileMatch
+        fields = ['id', 'profile', 'candidate', 'candidate_evidence', 'candidate_suspect', 'score', 'created_at']
+
+
+class BiologicalProfileSerializer(serializers.ModelSerializer):
+    matches = ProfileMatchSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = BiologicalProfile
+        fields = ['id', 'kind', 'evidence', 'suspect', 'data', 'matches', 'created_at']
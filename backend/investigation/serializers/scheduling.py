@@ -0,0 +1,51 @@
+from rest_framework import serializers
+
+from investigation.models import Interrogation
+from investigation.services.scheduling import MAX_AUTO_SCHEDULE, TRIAL_MINUTES, INTERROGATION_MINUTES
+
+
+class NextFreeSlotSerializer(serializers.Serializer):
+    detective = serializers.IntegerField(required=False)
+    sergeant = serializers.IntegerField(required=False)
+    judge = serializers.IntegerField(required=False)
+    interrogation_room = serializers.CharField(max_length=200, required=False)
+    courtroom = serializers.CharField(max_length=100, required=False)
+    duration_minutes = serializers.IntegerField(min_value=15, max_value=600, default=INTERROGATION_MINUTES)
+    after = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if not set(attrs) & {'detective', 'sergeant', 'judge', 'interrogation_room', 'courtroom'}:
+            raise serializers.ValidationError('Give at least one resource.')
+        return attrs
+
+
+class AutoScheduleTrialsSerializer(serializers.Serializer):
+    case_ids = serializers.ListField(
+        child=serializers.IntegerField(), min_length=1, max_length=MAX_AUTO_SCHEDULE
+    )
+    judge_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False,
+        help_text='Judges to schedule across; all active judges when omitted'
+    )
+    courtrooms = serializers.ListField(
+        child=serializers.CharField(max_length=100), required=False, default=list
+    )
+    after = serializers.DateTimeField(required=False)
+    duration_minutes = serializers.IntegerField(min_value=15, max_value=600, default=TRIAL_MINUTES)
+
+
+class ScheduleInterrogationSerializer(serializers.Serializer):
+    detective_id = serializers.IntegerField(required=False, help_text='Defaults to the requesting user')
+    sergeant_id = serializers.IntegerField()
+    location = serializers.CharField(max_length=200)
+    scheduled_date = serializers.DateTimeField()
+    duration_minutes = serializers.IntegerField(min_value=15, max_value=600, default=INTERROGATION_MINUTES)
+
+
+class InterrogationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Interrogation
+        fields = [
+            'id', 'interrogation_number', 'suspect_case_link', 'scheduled_date', 'location',
+            'status', 'detective', 'sergeant', 'created_at',
+        ]
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.utils import timezone
 
+from cases.models import CasePriority
+from core.fieldsets import full_name
 from investigation.models import SuspectCaseLink, Suspect
 
 
@@ -53,6 +55,17 @@ class SuspectCaseLinkSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at',
         ]
         read_only_fields = ['detective_assessment_date', 'sergeant_assessment_date', 'captain_opinion_at', 'chief_approval_at']
+        projection = {
+            'suspect_name': (('suspect__first_name', 'suspect__last_name'), lambda first, last: f'{first} {last}'),
+            'average_guilt_score': (('detective_guilt_score', 'sergeant_guilt_score'), SuspectCaseLink.average_of),
+            'has_both_assessments': (
+                ('detective_guilt_score', 'sergeant_guilt_score'),
+                lambda detective, sergeant: detective is not None and sergeant is not None,
+            ),
+            'captain_name': (('captain__first_name', 'captain__last_name'), full_name),
+            'chief_name': (('chief__first_name', 'chief__last_name'), full_name),
+            'is_critical_case': (('case__priority',), lambda priority: priority == CasePriority.CRITICAL),
+        }
 
 
 class SuspectCaseLinkCreateSerializer(serializers.Serializer):
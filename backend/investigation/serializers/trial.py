@@ -12,7 +12,7 @@ class TrialSerializer(serializers.ModelSerializer):
         model = Trial
         fields = [
             'id', 'case', 'case_number', 'judge', 'judge_name', 'status',
-            'scheduled_date', 'verdict', 'punishment', 'verdict_date',
+            'scheduled_date', 'courtroom', 'verdict', 'punishment', 'verdict_date',
             'judge_notes', 'is_completed', 'created_at', 'updated_at',
         ]
         read_only_fields = ['case', 'judge', 'verdict_date']
@@ -21,6 +21,8 @@ class TrialSerializer(serializers.ModelSerializer):
 class CreateTrialSerializer(serializers.Serializer):
     judge_id = serializers.IntegerField(help_text='User ID of the judge who will preside')
     scheduled_date = serializers.DateTimeField(help_text='When the trial is scheduled')
+    courtroom = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    duration_minutes = serializers.IntegerField(min_value=15, max_value=600, required=False, default=120)
 
 
 class RecordVerdictSerializer(serializers.Serializer):
@@ -0,0 +1,23 @@
+from .plate_watch import PlateRead, PlateInterest, PlateWatchlist, PlateFeedMatcher
+from .suspect_network import SuspectNetwork, SuspectNetworkIndex, get_network, reset_network
+from .dossier import build_dossier, get_dossier
+from .docket import get_docket
+from .wanted_watchlist import BloomFilter, WantedWatchlist, get_wanted_watchlist, reset_wanted_watchlist
+
+__all__ = [
+    'PlateRead',
+    'PlateInterest',
+    'PlateWatchlist',
+    'PlateFeedMatcher',
+    'SuspectNetwork',
+    'SuspectNetworkIndex',
+    'get_network',
+    'reset_network',
+    'build_dossier',
+    'get_dossier',
+    'get_docket',
+    'BloomFilter',
+    'WantedWatchlist',
+    'get_wanted_watchlist',
+    'reset_wanted_watchlist',
+]
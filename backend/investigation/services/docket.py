@@ -0,0 +1,121 @@
+"""
+Judge docket: upcoming and ongoing trials with case headers, evidence counts and the
+individuals involved.
+
+`docket_queryset` annotates each trial with its per-type evidence counts as subqueries, so
+a page of trials is one query; `docket_entries` adds the involved individuals for the whole
+page with one more. `get_docket` serves a page from cache while `docket_version`, the
+per-judge cache version, is unchanged: it changes when any of the judge's docket trials,
+their cases or their suspect links change. Evidence counts are not part of it and can lag
+by up to DOCKET_CACHE_TIMEOUT.
+"""
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from core.cache import cache_key, get_or_build
+from cases.models import WitnessTestimony, BiologicalEvidence, VehicleEvidence, DocumentEvidence, OtherEvidence
+from investigation.models import Trial, TrialStatus, SuspectCaseLink
+
+DOCKET_STATUSES = (TrialStatus.SCHEDULED, TrialStatus.IN_PROGRESS)
+DOCKET_CACHE_TIMEOUT = 300
+
+EVIDENCE_TYPES = [
+    ('witness_testimony', WitnessTestimony),
+    ('biological', BiologicalEvidence),
+    ('vehicle', VehicleEvidence),
+    ('document', DocumentEvidence),
+    ('other', OtherEvidence),
+]
+
+
+def describe_individual(link):
+    """A suspect linked to a case, as shown to the judge."""
+    suspect = link.suspect
+    return {
+        'id': suspect.id,
+        'full_name': suspect.full_name,
+        'national_id': suspect.national_id,
+        'role': 'suspect',
+        'guilt_scores': {
+            'detective': link.detective_guilt_score,
+            'sergeant': link.sergeant_guilt_score,
+        } if (link.detective_guilt_score is not None or link.sergeant_guilt_score is not None) else None,
+    }
+
+
+def _evidence_count(model):
+    counts = model.objects.filter(case=OuterRef('case')).order_by().values('case').annotate(n=Count('pk')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def docket_queryset(judge_id, statuses=DOCKET_STATUSES):
+    return (
+        Trial.objects.filter(judge_id=judge_id, status__in=statuses)
+        .select_related('case')
+        .annotate(**{f'{name}_count': _evidence_count(model) for name, model in EVIDENCE_TYPES})
+        .order_by('scheduled_date', 'id')
+    )
+
+
+def docket_version(judge_id, statuses=DOCKET_STATUSES):
+    return tuple(
+        Trial.objects.filter(judge_id=judge_id, status__in=statuses).aggregate(
+            trials=Count('pk', distinct=True),
+            trials_updated=Max('updated_at'),
+            cases_updated=Max('case__updated_at'),
+            links=Count('case__suspect_links', distinct=True),
+            links_updated=Max('case__suspect_links__updated_at'),
+        ).values()
+    )
+
+
+def docket_entries(trials):
+    """Docket rows for trials from `docket_queryset`, with one query for all their suspect links."""
+    individuals = {}
+    links = SuspectCaseLink.objects.filter(case__in=[trial.case_id for trial in trials]).select_related('suspect')
+    for link in links.order_by('id'):
+        individuals.setdefault(link.case_id, []).append(describe_individual(link))
+    entries = []
+    for trial in trials:
+        case = trial.case
+        counts = {name: getattr(trial, f'{name}_count') for name, _ in EVIDENCE_TYPES}
+        entries.append({
+            'trial': {
+                'id': trial.id,
+                'status': trial.status,
+                'scheduled_date': trial.scheduled_date,
+                'courtroom': trial.courtroom,
+            },
+            'case': {
+                'id': case.id,
+                'case_number': case.case_number,
+                'title': case.title,
+                'priority': case.priority,
+                'status': case.status,
+                'incident_date': case.incident_date,
+                'incident_location': case.incident_location,
+            },
+            'evidence_counts': {**counts, 'total': sum(counts.values())},
+            'involved_individuals': individuals.get(case.id, []),
+        })
+    return entries
+
+
+def get_docket(judge_id, statuses=DOCKET_STATUSES, page=1, page_size=20):
+    """One page of the judge's docket: {count, page, pages, results}, from cache when nothing in it has changed."""
+    statuses = sorted(statuses)
+    version = docket_version(judge_id, statuses)
+    count = version[0]
+
+    def build():
+        start = (page - 1) * page_size
+        return {
+            'count': count,
+            'page': page,
+            'pages': max((count + page_size - 1) // page_size, 1),
+            'results': docket_entries(list(docket_queryset(judge_id, statuses)[start:start + page_size])),
+        }
+
+    return get_or_build(
+        cache_key('judge-docket', judge_id, ','.join(statuses), page, page_size), version, build, DOCKET_CACHE_TIMEOUT
+    )
@@ -0,0 +1,93 @@
+"""
+Suspect dossier: every linked case with its priority and status, the guilt scores, captain
+and chief decisions, trial outcome, all interrogations and the bail/fine state.
+
+`build_dossier` assembles it in a fixed number of queries (the suspect with its bail/fine,
+the case links with case, trial and reviewers, the interrogations) however many cases the
+suspect has. `get_dossier` caches the result under a version computed in one query from the
+latest `updated_at` and row counts of everything the dossier is built from, so any change
+to the suspect, a link, a case, a trial, an interrogation or the bail/fine is picked up on
+the next request without explicit invalidation.
+"""
+from django.db.models import Count, Max, OuterRef, Prefetch, Subquery
+
+from cases.models import CaseStatus
+from core.cache import cache_key, get_or_build
+from investigation.models import Suspect, SuspectCaseLink, Interrogation, TrialVerdict
+from investigation.serializers.dossier import (
+    DossierSuspectSerializer,
+    DossierBailFineSerializer,
+    DossierCaseSerializer,
+    DossierInterrogationSerializer,
+)
+
+DOSSIER_CACHE_TIMEOUT = 3600
+
+
+def _aggregate(queryset, group_by, expression):
+    return Subquery(queryset.order_by().values(group_by).annotate(value=expression).values('value')[:1])
+
+
+def dossier_version(suspect_id):
+    """A tuple that changes whenever anything in the suspect's dossier does; None if no such suspect."""
+    links = SuspectCaseLink.objects.filter(suspect=OuterRef('pk'))
+    interrogations = Interrogation.objects.filter(suspect_case_link__suspect=OuterRef('pk'))
+    return Suspect.objects.filter(pk=suspect_id).annotate(
+        links_updated=_aggregate(links, 'suspect', Max('updated_at')),
+        links_count=_aggregate(links, 'suspect', Count('pk')),
+        cases_updated=_aggregate(links, 'suspect', Max('case__updated_at')),
+        trials_updated=_aggregate(links, 'suspect', Max('case__trial__updated_at')),
+        trials_count=_aggregate(links, 'suspect', Count('case__trial')),
+        interrogations_updated=_aggregate(interrogations, 'suspect_case_link__suspect', Max('updated_at')),
+        interrogations_count=_aggregate(interrogations, 'suspect_case_link__suspect', Count('pk')),
+    ).values_list(
+        'updated_at', 'bail_fine__updated_at', 'links_updated', 'links_count', 'cases_updated',
+        'trials_updated', 'trials_count', 'interrogations_updated', 'interrogations_count',
+    ).first()
+
+
+def build_dossier(suspect_id):
+    links = SuspectCaseLink.objects.select_related(
+        'case', 'case__trial', 'case__trial__judge', 'captain', 'chief'
+    ).order_by('-case__incident_date', '-id')
+    interrogations = Interrogation.objects.select_related('detective', 'sergeant').order_by('-scheduled_date', '-id')
+    suspect = (
+        Suspect.objects.select_related('bail_fine')
+        .prefetch_related(
+            Prefetch('case_links', queryset=links),
+            Prefetch('case_links__interrogations', queryset=interrogations),
+        )
+        .get(pk=suspect_id)
+    )
+    links = list(suspect.case_links.all())
+    interrogations = sorted(
+        (interrogation for link in links for interrogation in link.interrogations.all()),
+        key=lambda interrogation: (interrogation.scheduled_date, interrogation.pk),
+        reverse=True,
+    )
+    bail_fine = getattr(suspect, 'bail_fine', None)
+    verdicts = [getattr(link.case, 'trial', None) for link in links]
+    verdicts = [trial.verdict for trial in verdicts if trial is not None and trial.verdict]
+    return {
+        'suspect': DossierSuspectSerializer(suspect).data,
+        'bail_fine': DossierBailFineSerializer(bail_fine).data if bail_fine else None,
+        'summary': {
+            'cases': len(links),
+            'open_cases': sum(link.case.status in (CaseStatus.OPEN, CaseStatus.UNDER_INVESTIGATION) for link in links),
+            'interrogations': len(interrogations),
+            'convictions': verdicts.count(TrialVerdict.GUILTY),
+            'acquittals': verdicts.count(TrialVerdict.INNOCENT),
+        },
+        'cases': DossierCaseSerializer(links, many=True).data,
+        'interrogations': DossierInterrogationSerializer(interrogations, many=True).data,
+    }
+
+
+def get_dossier(suspect_id):
+    """The suspect's dossier, from cache when nothing in it has changed; None if no such suspect."""
+    version = dossier_version(suspect_id)
+    if version is None:
+        return None
+    return get_or_build(
+        cache_key('suspect-dossier', suspect_id), version, lambda: build_dossier(suspect_id), DOSSIER_CACHE_TIMEOUT
+    )
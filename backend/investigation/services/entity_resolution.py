@@ -0,0 +1,299 @@
+"""
+Batch entity resolution across suspects, users, witnesses and document owners.
+
+1. Every source row becomes a `PersonRecord` with normalized keys (see investigation.identity).
+   An incremental run only re-reads rows updated since the last finished run started.
+2. Blocking: only records sharing a national id, a phone number or a phonetic name key are
+   compared, and only pairs that involve a changed record. Oversized blocks (placeholder
+   names, shared switchboard numbers) are skipped, so the job never compares all pairs.
+3. Pairs scoring at least AUTO_LINK_SCORE (same real national id, or same phone and same
+   name) are linked into one `PersonCluster`; pairs between SUGGEST_SCORE and that become
+   `MergeSuggestion`s for a human to accept or reject. Clusters only ever merge.
+
+Synthetic national ids (`Suspect.national_id_is_synthetic`) are never used as evidence.
+Deleted source rows are dropped from the records by full runs only.
+"""
+from collections import Counter, defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from cases.models import WitnessTestimony, DocumentEvidence
+from investigation.identity import normalize_national_id, normalize_phone, name_key, phonetic_key
+from investigation.models import (
+    Suspect,
+    PersonRecord,
+    PersonCluster,
+    PersonSource,
+    MergeSuggestion,
+    MergeSuggestionStatus,
+    ResolutionRun,
+)
+
+AUTO_LINK_SCORE = 0.9
+SUGGEST_SCORE = 0.5
+MAX_BLOCK_SIZE = 200
+BATCH_SIZE = 2000
+
+NATIONAL_ID_WEIGHT = 1.0
+PHONE_WEIGHT = 0.6
+NAME_WEIGHT = 0.4
+PHONETIC_NAME_WEIGHT = 0.25
+
+RECORD_FIELDS = ('full_name', 'name_key', 'phonetic_key', 'national_id', 'phone')
+
+
+def _suspect_rows(queryset):
+    for row in queryset.values('pk', 'first_name', 'last_name', 'national_id', 'national_id_is_synthetic', 'phone_number'):
+        yield row['pk'], f"{row['first_name']} {row['last_name']}", (
+            '' if row['national_id_is_synthetic'] else row['national_id']
+        ), row['phone_number']
+
+
+def _user_rows(queryset):
+    for row in queryset.values('pk', 'first_name', 'last_name', 'national_id', 'phone_number'):
+        yield row['pk'], f"{row['first_name']} {row['last_name']}", row['national_id'], row['phone_number']
+
+
+def _witness_rows(queryset):
+    for pk, name, contact in queryset.values_list('pk', 'witness_name', 'witness_contact'):
+        yield pk, name, '', contact
+
+
+def _document_rows(queryset):
+    # Attribute keys are canonical on save, so national_id is the only spelling to read.
+    queryset = queryset.filter(Q(owner_full_name__gt='') | Q(document_attributes__has_key='national_id'))
+    for pk, name, attributes in queryset.values_list('pk', 'owner_full_name', 'document_attributes'):
+        yield pk, name, (attributes or {}).get('national_id', ''), ''
+
+
+SOURCES = [
+    (PersonSource.SUSPECT, lambda: Suspect.objects.all(), _suspect_rows),
+    (PersonSource.USER, lambda: get_user_model().objects.all(), _user_rows),
+    (PersonSource.WITNESS, lambda: WitnessTestimony.objects.all(), _witness_rows),
+    (PersonSource.DOCUMENT_OWNER, lambda: DocumentEvidence.objects.all(), _document_rows),
+]
+
+
+def build_record(source, content_type, pk, full_name, national_id, phone):
+    return PersonRecord(
+        source=source,
+        content_type=content_type,
+        object_id=pk,
+        full_name=(full_name or '').strip()[:255],
+        name_key=name_key(full_name)[:255],
+        phonetic_key=phonetic_key(full_name)[:255],
+        national_id=normalize_national_id(national_id),
+        phone=normalize_phone(phone)[:15],
+    )
+
+
+def _has_keys(record):
+    return bool(record.national_id or record.phone or record.phonetic_key)
+
+
+def sync_records(since=None, full=False):
+    """Upsert person records for source rows changed since `since`; return the changed record ids."""
+    changed = []
+    for source, queryset, rows in SOURCES:
+        queryset = queryset()
+        content_type = ContentType.objects.get_for_model(queryset.model)
+        if since is not None:
+            queryset = queryset.filter(updated_at__gte=since)
+        if full:
+            PersonRecord.objects.filter(content_type=content_type).exclude(
+                object_id__in=queryset.model.objects.values('pk')
+            ).delete()
+        batch = []
+        for row in rows(queryset.order_by('pk')):
+            record = build_record(source, content_type, *row)
+            if _has_keys(record):
+                batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                changed.extend(_upsert(content_type, batch))
+                batch = []
+        changed.extend(_upsert(content_type, batch))
+    return changed
+
+
+def _upsert(content_type, records):
+    if not records:
+        return []
+    existing = dict(
+        PersonRecord.objects.filter(content_type=content_type, object_id__in=[r.object_id for r in records])
+        .values_list('object_id', 'pk')
+    )
+    updates = []
+    for record in records:
+        if record.object_id in existing:
+            record.pk = existing[record.object_id]
+            updates.append(record)
+    PersonRecord.objects.bulk_update(updates, RECORD_FIELDS)
+    created = PersonRecord.objects.bulk_create([r for r in records if r.object_id not in existing])
+    return [r.pk for r in updates] + [r.pk for r in created]
+
+
+def score_pair(a, b):
+    """(score, reasons) for two record value dicts."""
+    reasons = []
+    score = 0.0
+    if a['national_id'] and b['national_id']:
+        if a['national_id'] != b['national_id']:
+            return 0.0, ['national_id_conflict']
+        score += NATIONAL_ID_WEIGHT
+        reasons.append('national_id')
+    if a['phone'] and a['phone'] == b['phone']:
+        score += PHONE_WEIGHT
+        reasons.append('phone')
+    if a['name_key'] and a['name_key'] == b['name_key']:
+        score += NAME_WEIGHT
+        reasons.append('name')
+    elif a['phonetic_key'] and a['phonetic_key'] == b['phonetic_key']:
+        score += PHONETIC_NAME_WEIGHT
+        reasons.append('phonetic_name')
+    return min(score, 1.0), reasons
+
+
+def candidate_pairs(changed_ids=None):
+    """
+    Record values by id, plus the blocked pairs (low id, high id) involving a changed record;
+    `changed_ids=None` treats every record as changed.
+    """
+    changed = PersonRecord.objects.all() if changed_ids is None else PersonRecord.objects.filter(pk__in=changed_ids)
+    keys = {
+        field: {value for value in changed.values_list(field, flat=True) if value}
+        for field in ('national_id', 'phone', 'phonetic_key')
+    }
+    candidates = PersonRecord.objects.filter(
+        Q(national_id__in=keys['national_id']) | Q(phone__in=keys['phone']) | Q(phonetic_key__in=keys['phonetic_key'])
+    ).values('pk', 'cluster_id', *RECORD_FIELDS)
+    records = {row['pk']: row for row in candidates}
+
+    blocks = defaultdict(list)
+    for pk, row in records.items():
+        for field in keys:
+            if row[field]:
+                blocks[(field, row[field])].append(pk)
+
+    changed_set = None if changed_ids is None else set(changed_ids)
+    pairs = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        members.sort()
+        for i, left in enumerate(members):
+            for right in members[i + 1:]:
+                if changed_set is None or left in changed_set or right in changed_set:
+                    pairs.add((left, right))
+    return records, pairs
+
+
+def _find(parents, node):
+    while parents.setdefault(node, node) != node:
+        parents[node] = parents[parents[node]]
+        node = parents[node]
+    return node
+
+
+def merge_clusters(record_ids):
+    """Put the records (and everything already clustered with them) into one cluster; return its id."""
+    cluster_ids = set(
+        PersonRecord.objects.filter(pk__in=record_ids, cluster__isnull=False).values_list('cluster_id', flat=True)
+    )
+    target = min(cluster_ids) if cluster_ids else PersonCluster.objects.create().pk
+    PersonRecord.objects.filter(Q(pk__in=record_ids) | Q(cluster_id__in=cluster_ids)).update(cluster_id=target)
+    PersonCluster.objects.filter(pk__in=cluster_ids - {target}).delete()
+    return target
+
+
+def refresh_cluster_summaries(cluster_ids):
+    rows = defaultdict(list)
+    for cluster_id, source, full_name, national_id in PersonRecord.objects.filter(cluster_id__in=cluster_ids).values_list(
+        'cluster_id', 'source', 'full_name', 'national_id'
+    ):
+        rows[cluster_id].append((source, full_name, national_id))
+    clusters = list(PersonCluster.objects.filter(pk__in=cluster_ids))
+    for cluster in clusters:
+        members = rows.get(cluster.pk, [])
+        preferred = [name for source, name, _ in members if source in (PersonSource.SUSPECT, PersonSource.USER) and name]
+        names = Counter(preferred or [name for _, name, _ in members if name])
+        ids = Counter(national_id for _, _, national_id in members if national_id)
+        cluster.display_name = names.most_common(1)[0][0] if names else ''
+        cluster.national_id = ids.most_common(1)[0][0] if ids else ''
+        cluster.record_count = len(members)
+    PersonCluster.objects.bulk_update(clusters, ['display_name', 'national_id', 'record_count'])
+
+
+def _assign_singletons():
+    orphans = list(PersonRecord.objects.filter(cluster__isnull=True).values_list('pk', flat=True))
+    clusters = PersonCluster.objects.bulk_create([PersonCluster() for _ in orphans])
+    PersonRecord.objects.bulk_update(
+        [PersonRecord(pk=pk, cluster_id=cluster.pk) for pk, cluster in zip(orphans, clusters)], ['cluster']
+    )
+    return [cluster.pk for cluster in clusters]
+
+
+def resolve(incremental=True):
+    """Run one resolution pass and return its ResolutionRun."""
+    previous = ResolutionRun.objects.filter(finished_at__isnull=False).order_by('-started_at').first()
+    since = previous.started_at if incremental and previous else None
+    run = ResolutionRun.objects.create(incremental=since is not None, started_at=timezone.now())
+
+    with transaction.atomic():
+        changed = sync_records(since=since, full=since is None)
+        records, pairs = candidate_pairs(changed if since is not None else None)
+
+        parents = {}
+        suggestions = []
+        for left, right in pairs:
+            score, reasons = score_pair(records[left], records[right])
+            if score >= AUTO_LINK_SCORE:
+                parents[_find(parents, left)] = _find(parents, right)
+            elif score >= SUGGEST_SCORE:
+                suggestions.append(MergeSuggestion(left_id=left, right_id=right, score=score, reasons=reasons))
+
+        components = defaultdict(list)
+        for node in list(parents):
+            components[_find(parents, node)].append(node)
+        touched = {merge_clusters(members) for members in components.values()}
+        touched.update(_assign_singletons())
+        if since is None:
+            PersonCluster.objects.filter(records__isnull=True).delete()
+            touched = set(PersonCluster.objects.values_list('pk', flat=True))
+        else:
+            touched.update(PersonRecord.objects.filter(pk__in=changed).values_list('cluster_id', flat=True))
+        refresh_cluster_summaries(touched)
+
+        clusters = dict(PersonRecord.objects.filter(pk__in=records).values_list('pk', 'cluster_id'))
+        existing = set(
+            MergeSuggestion.objects.filter(left_id__in={s.left_id for s in suggestions})
+            .values_list('left_id', 'right_id')
+        )
+        suggestions = [
+            s for s in suggestions
+            if clusters.get(s.left_id) != clusters.get(s.right_id) and (s.left_id, s.right_id) not in existing
+        ]
+        created = MergeSuggestion.objects.bulk_create(suggestions, ignore_conflicts=True)
+
+    run.records_changed = len(changed)
+    run.pairs_scored = len(pairs)
+    run.records_linked = sum(len(members) for members in components.values())
+    run.suggestions_created = len(created)
+    run.finished_at = timezone.now()
+    run.save()
+    return run
+
+
+def review_suggestion(suggestion, accept, user):
+    """Accept (merge the two clusters) or reject a pending suggestion."""
+    with transaction.atomic():
+        suggestion.status = MergeSuggestionStatus.ACCEPTED if accept else MergeSuggestionStatus.REJECTED
+        suggestion.reviewed_by = user
+        suggestion.reviewed_at = timezone.now()
+        suggestion.save(update_fields=['status', 'reviewed_by', 'reviewed_at', 'updated_at'])
+        if accept:
+            refresh_cluster_summaries([merge_clusters([suggestion.left_id, suggestion.right_id])])
+    return suggestion
@@ -0,0 +1,197 @@
+"""
+Gateway callbacks for bail and fine payments: deduplicated ingestion and micro-batch
+processing.
+
+`ingest` stores callbacks as PENDING `PaymentCallback` rows keyed by gateway reference;
+a reference already stored (a retried or replayed callback, or one a concurrent ingest
+stored first) is counted as a duplicate and dropped. Nothing else happens on the request
+path.
+
+`process_batch` takes up to `batch_size` pending callbacks (SKIP LOCKED, so workers can run
+side by side) and applies them together: it loads every affected `BailFine` with its
+suspect in one query, marks the payments, posts them to the ledger in bulk, then evaluates
+release set-wise, one query for the crime levels of all affected suspects, before releasing
+the eligible ones and notifying the detectives on their cases. The query count per batch
+does not depend on its size.
+"""
+from collections import defaultdict, namedtuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from core.models import ChangeOp, PaymentPurpose
+from core.services.changes import record_changes
+from core.services.ledger import record_collections
+from investigation.models import (
+    BailFine,
+    CallbackStatus,
+    Notification,
+    PaymentCallback,
+    Suspect,
+    SuspectCaseLink,
+    SuspectStatus,
+)
+from investigation.models.suspect import CRIME_LEVELS, UNKNOWN_CRIME_LEVEL
+
+MAX_INGEST_BATCH = 1000
+PROCESS_BATCH_SIZE = 500
+
+PURPOSES = {'bail': PaymentPurpose.BAIL, 'fine': PaymentPurpose.FINE}
+
+BatchResult = namedtuple('BatchResult', ['applied', 'ignored', 'rejected', 'released'])
+
+
+def parse_payment_key(payment_key):
+    """('bail' or 'fine', bail_fine_id) for keys like 'bail:12'; None otherwise."""
+    prefix, _, pk = payment_key.partition(':')
+    if prefix not in PURPOSES or not pk.isdigit():
+        return None
+    return prefix, int(pk)
+
+
+def ingest(callbacks):
+    """
+    Queue validated callbacks [{gateway_reference, payment_key, amount, succeeded}].
+    Returns (queued, duplicates).
+    """
+    unique = {}
+    for callback in callbacks:
+        unique.setdefault(callback['gateway_reference'], callback)
+    seen = set(
+        PaymentCallback.objects.filter(gateway_reference__in=list(unique))
+        .values_list('gateway_reference', flat=True)
+    )
+    new = [callback for reference, callback in unique.items() if reference not in seen]
+    try:
+        with transaction.atomic():
+            PaymentCallback.objects.bulk_create([PaymentCallback(**callback) for callback in new])
+        queued = len(new)
+    except IntegrityError:
+        # A concurrent ingest stored some of them since the check above: insert one by one
+        # to count only the rows this call added.
+        queued = 0
+        for callback in new:
+            try:
+                with transaction.atomic():
+                    PaymentCallback.objects.create(**callback)
+                queued += 1
+            except IntegrityError:
+                pass
+    return queued, len(callbacks) - queued
+
+
+def _rejection(callback, parsed, bail_fine):
+    """(status, error) if the callback cannot be applied, else None."""
+    if not callback.succeeded:
+        return CallbackStatus.IGNORED, 'Gateway reported the payment as failed.'
+    if parsed is None:
+        return CallbackStatus.REJECTED, 'Unknown payment key.'
+    if bail_fine is None:
+        return CallbackStatus.REJECTED, 'No such bail/fine record.'
+    kind = parsed[0]
+    required = getattr(bail_fine, f'{kind}_amount')
+    if not required:
+        return CallbackStatus.REJECTED, f'No {kind} amount set.'
+    if callback.amount < required:
+        return CallbackStatus.REJECTED, f'Payment amount must be at least {required}'
+    if getattr(bail_fine, f'{kind}_paid'):
+        return CallbackStatus.IGNORED, f'{kind.capitalize()} already paid.'
+    return None
+
+
+def release_eligible(bail_fines, now=None):
+    """Release the detained suspects these records make eligible; returns their ids."""
+    now = now or timezone.now()
+    by_suspect = {bail_fine.suspect_id: bail_fine for bail_fine in bail_fines}
+    links = SuspectCaseLink.objects.filter(
+        suspect_id__in=list(by_suspect), suspect__status=SuspectStatus.DETAINED
+    ).order_by().values_list('suspect_id', 'case_id', 'case__priority', 'case__case_number', 'case__assigned_detective_id')
+    levels, cases = {}, defaultdict(list)
+    for suspect_id, case_id, priority, case_number, detective_id in links:
+        levels[suspect_id] = min(levels.get(suspect_id, UNKNOWN_CRIME_LEVEL), CRIME_LEVELS.get(priority, UNKNOWN_CRIME_LEVEL))
+        if detective_id:
+            cases[suspect_id].append((case_id, case_number, detective_id))
+    released = [suspect_id for suspect_id, level in levels.items() if by_suspect[suspect_id].allows_release(level)]
+    if not released:
+        return []
+    Suspect.objects.filter(pk__in=released, status=SuspectStatus.DETAINED).update(
+        status=SuspectStatus.RELEASED, detention_end_date=now, updated_at=now,
+    )
+    record_changes(Suspect, released, ChangeOp.UPDATE, ['status', 'detention_end_date'])
+    content_type = ContentType.objects.get_for_model(Suspect)
+    Notification.objects.bulk_create([
+        Notification(
+            case_id=case_id,
+            recipient_id=detective_id,
+            content_type=content_type,
+            object_id=suspect_id,
+            message=f'{by_suspect[suspect_id].suspect.full_name} released after bail/fine payment (case {case_number})',
+        )
+        for suspect_id in released
+        for case_id, case_number, detective_id in cases[suspect_id]
+    ])
+    return released
+
+
+def process_batch(batch_size=PROCESS_BATCH_SIZE):
+    """Apply up to `batch_size` pending callbacks; None when the queue is empty."""
+    with transaction.atomic():
+        callbacks = list(
+            PaymentCallback.objects.select_for_update(skip_locked=True)
+            .filter(status=CallbackStatus.PENDING).order_by('id')[:batch_size]
+        )
+        if not callbacks:
+            return None
+        parsed = {callback.pk: parse_payment_key(callback.payment_key) for callback in callbacks}
+        bail_fines = BailFine.objects.select_for_update(of=('self',)).select_related('suspect').in_bulk(
+            {key[1] for key in parsed.values() if key}
+        )
+        now = timezone.now()
+        changed, collections = {}, []
+        counts = defaultdict(int)
+        for callback in callbacks:
+            key = parsed[callback.pk]
+            bail_fine = bail_fines.get(key[1]) if key else None
+            callback.processed_at = now
+            callback.updated_at = now
+            rejection = _rejection(callback, key, bail_fine)
+            if rejection:
+                callback.status, callback.error = rejection
+                counts[callback.status] += 1
+                continue
+            kind = key[0]
+            setattr(bail_fine, f'{kind}_paid', True)
+            setattr(bail_fine, f'{kind}_payment_date', now)
+            setattr(bail_fine, f'{kind}_payment_reference', callback.gateway_reference)
+            bail_fine.updated_at = now
+            changed[bail_fine.pk] = bail_fine
+            collections.append(
+                (callback.payment_key, PURPOSES[kind], callback.amount, bail_fine, callback.gateway_reference)
+            )
+            callback.status = CallbackStatus.APPLIED
+            counts[callback.status] += 1
+
+        record_collections(collections)
+        BailFine.objects.bulk_update(changed.values(), [
+            'bail_paid', 'bail_payment_date', 'bail_payment_reference',
+            'fine_paid', 'fine_payment_date', 'fine_payment_reference', 'updated_at',
+        ])
+        released = release_eligible(changed.values(), now)
+        PaymentCallback.objects.bulk_update(callbacks, ['status', 'error', 'processed_at', 'updated_at'])
+    return BatchResult(
+        counts[CallbackStatus.APPLIED], counts[CallbackStatus.IGNORED], counts[CallbackStatus.REJECTED], len(released),
+    )
+
+
+def process_pending(batch_size=PROCESS_BATCH_SIZE, max_batches=None):
+    """Process batches until the queue is empty (or `max_batches` ran); returns the summed BatchResult."""
+    total = BatchResult(0, 0, 0, 0)
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        result = process_batch(batch_size)
+        if result is None:
+            break
+        total = BatchResult(*(a + b for a, b in zip(total, result)))
+        batches += 1
+    return total
@@ -0,0 +1,193 @@
+"""
+Matching road-camera plate reads against vehicles of interest.
+
+A vehicle is of interest when its evidence belongs to an open case or to a case linked to a
+wanted suspect. `PlateWatchlist` keeps those vehicles in a dict keyed by `plate_ocr_key`, so
+matching a read is one normalization and one dict lookup. The watchlist is a `LiveIndex`
+(core.services.indexes): cases touched since the last refresh (their own row, their vehicle
+evidence, their suspect links or a linked suspect was written or deleted) are dropped and
+reloaded into a new snapshot.
+"""
+import time
+from collections import namedtuple
+
+from django.contrib.contenttypes.models import ContentType
+
+from cases.models import Case, CaseStatus, VehicleEvidence
+from cases.plates import normalize_plate, ocr_fold
+from core.services.indexes import LiveIndex
+from investigation.models import Notification, Suspect, SuspectCaseLink
+
+OPEN_STATUSES = (CaseStatus.OPEN, CaseStatus.UNDER_INVESTIGATION)
+
+PlateRead = namedtuple('PlateRead', ['plate', 'camera', 'seen_at'])
+PlateInterest = namedtuple(
+    'PlateInterest',
+    ['vehicle_id', 'plate_key', 'case_id', 'case_number', 'detective_id', 'reason'],
+)
+
+
+class PlateSnapshot:
+    __slots__ = ('by_plate', 'plates_by_case')
+
+    def __init__(self, by_plate, plates_by_case):
+        self.by_plate = by_plate
+        self.plates_by_case = plates_by_case
+
+    def __len__(self):
+        return len(self.by_plate)
+
+
+EMPTY_SNAPSHOT = PlateSnapshot({}, {})
+
+
+class PlateWatchlist(LiveIndex):
+    watches = (Case, VehicleEvidence, SuspectCaseLink, Suspect)
+
+    def __len__(self):
+        return len(self.snapshot)
+
+    def __contains__(self, plate_ocr_key):
+        return plate_ocr_key in self.snapshot.by_plate
+
+    @property
+    def snapshot(self):
+        return EMPTY_SNAPSHOT if self.state is None else self.state
+
+    @property
+    def by_plate(self):
+        return self.snapshot.by_plate
+
+    def get(self, plate_ocr_key):
+        return self.snapshot.by_plate.get(plate_ocr_key, ())
+
+    def build(self):
+        case_ids = set(VehicleEvidence.objects.exclude(plate_ocr_key='').values_list('case_id', flat=True).distinct())
+        return _load_cases(EMPTY_SNAPSHOT, case_ids)
+
+    def update(self, snapshot, changes):
+        return _load_cases(snapshot, _changed_case_ids(snapshot, changes))
+
+
+def _changed_case_ids(snapshot, changes):
+    case_ids = set(changes.touched(Case))
+    case_ids.update(
+        VehicleEvidence.objects.filter(pk__in=changes.written(VehicleEvidence)).values_list('case_id', flat=True)
+    )
+    case_ids.update(
+        SuspectCaseLink.objects.filter(suspect_id__in=changes.written(Suspect)).values_list('case_id', flat=True)
+    )
+    case_ids.update(
+        SuspectCaseLink.objects.filter(pk__in=changes.written(SuspectCaseLink)).values_list('case_id', flat=True)
+    )
+    vehicles = changes.touched(VehicleEvidence)
+    links_touched = bool(changes.touched(SuspectCaseLink))
+    if vehicles or links_touched:
+        # A vehicle's old case, and a case a link left, are no longer in the database: find
+        # them among the interests held. A link gone can only take a wanted suspect away.
+        for interests in snapshot.by_plate.values():
+            for interest in interests:
+                if interest.vehicle_id in vehicles or (links_touched and interest.reason == 'wanted_suspect'):
+                    case_ids.add(interest.case_id)
+    return case_ids
+
+
+def _load_cases(snapshot, case_ids):
+    """A snapshot with the interests of `case_ids` read again; `snapshot` is left as it was."""
+    if not case_ids:
+        return snapshot
+    by_plate = dict(snapshot.by_plate)
+    plates_by_case = dict(snapshot.plates_by_case)
+    for case_id in case_ids:
+        for plate in plates_by_case.pop(case_id, ()):
+            remaining = tuple(interest for interest in by_plate.get(plate, ()) if interest.case_id != case_id)
+            if remaining:
+                by_plate[plate] = remaining
+            else:
+                by_plate.pop(plate, None)
+    wanted_case_ids = set(
+        SuspectCaseLink.objects.filter(case_id__in=case_ids, suspect__is_wanted=True)
+        .values_list('case_id', flat=True)
+    )
+    rows = (
+        VehicleEvidence.objects.filter(case_id__in=case_ids)
+        .exclude(plate_ocr_key='')
+        .values_list(
+            'id', 'plate_key', 'plate_ocr_key', 'case_id',
+            'case__case_number', 'case__assigned_detective_id', 'case__status',
+        )
+    )
+    for vehicle_id, plate_key, plate_ocr_key, case_id, case_number, detective_id, case_status in rows:
+        if case_id in wanted_case_ids:
+            reason = 'wanted_suspect'
+        elif case_status in OPEN_STATUSES:
+            reason = 'open_case'
+        else:
+            continue
+        interest = PlateInterest(vehicle_id, plate_key, case_id, case_number, detective_id, reason)
+        by_plate[plate_ocr_key] = by_plate.get(plate_ocr_key, ()) + (interest,)
+        plates_by_case[case_id] = plates_by_case.get(case_id, frozenset()) | {plate_ocr_key}
+    return PlateSnapshot(by_plate, plates_by_case)
+
+
+class PlateFeedMatcher:
+    """
+    Matches batches of reads against a `PlateWatchlist` and writes one `Notification` per hit to
+    the case's assigned detective. A vehicle alerts at most once per `cooldown` seconds so a car
+    passing a row of cameras does not flood the detective.
+    """
+
+    def __init__(self, watchlist, cooldown=600, clock=time.monotonic):
+        self.watchlist = watchlist
+        self.cooldown = cooldown
+        self.clock = clock
+        self.last_alert = {}
+        self.reads = 0
+        self.hits = 0
+        self._content_type = None
+
+    def match(self, reads):
+        """Return [(read, interest)] for every read matching a vehicle of interest."""
+        by_plate = self.watchlist.by_plate
+        matches = []
+        for read in reads:
+            interests = by_plate.get(ocr_fold(normalize_plate(read.plate)))
+            if interests:
+                matches.extend((read, interest) for interest in interests)
+        self.reads += len(reads)
+        return matches
+
+    def process(self, reads, notify=True):
+        """Match a batch and notify; return the notifications created (or that would be)."""
+        now = self.clock()
+        notifications = []
+        for read, interest in self.match(reads):
+            if interest.detective_id is None:
+                continue
+            last = self.last_alert.get(interest.vehicle_id)
+            if last is not None and now - last < self.cooldown:
+                continue
+            self.last_alert[interest.vehicle_id] = now
+            notifications.append(self._notification(read, interest))
+        self.hits += len(notifications)
+        if notify and notifications:
+            Notification.objects.bulk_create(notifications)
+        return notifications
+
+    def _notification(self, read, interest):
+        if self._content_type is None:
+            self._content_type = ContentType.objects.get_for_model(VehicleEvidence)
+        reason = 'linked to a wanted suspect' if interest.reason == 'wanted_suspect' else 'on an open case'
+        camera = f' by camera {read.camera}' if read.camera else ''
+        seen_at = f' at {read.seen_at}' if read.seen_at else ''
+        return Notification(
+            case_id=interest.case_id,
+            recipient_id=interest.detective_id,
+            content_type=self._content_type,
+            object_id=interest.vehicle_id,
+            message=(
+                f'Plate {interest.plate_key} ({reason}, case {interest.case_number}) '
+                f'sighted{camera}{seen_at}'
+            )[:500],
+        )
+
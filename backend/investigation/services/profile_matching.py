@@ -0,0 +1,269 @@
+"""
+Vectorized matching of biological profiles.
+
+Every profile is encoded to a fixed-length vector when it is stored:
+
+- STR: one int32 per core locus, the allele pair packed as `low * 10000 + high` with alleles
+  in tenths (9.3 -> 93); -1 where the locus was not typed. Two profiles are compared only on
+  loci typed in both, and the score is the fraction of those loci with identical pairs.
+- MINUTIAE: an L2-normalized float32 feature vector; the score is cosine similarity.
+
+`ProfileIndex` keeps all vectors of one kind in a single NumPy matrix, so scoring a sample
+against the whole database is one vectorized pass per typed locus (STR) or one
+matrix-vector product (minutiae). Each kind's per-process index is a `LiveIndex`
+(core.services.indexes): profiles stored, changed or deleted since its last use are
+replaced in a new `ProfileIndex`.
+"""
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from cases.models import BiologicalEvidence
+from core.models import ChangeOp
+from core.services.changes import record_changes
+from core.services.indexes import LiveIndex
+from investigation.models import BiologicalProfile, ProfileMatch, ProfileKind
+
+STR_LOCI = (
+    'CSF1PO', 'D3S1358', 'D5S818', 'D7S820', 'D8S1179', 'D13S317', 'D16S539', 'D18S51',
+    'D21S11', 'FGA', 'TH01', 'TPOX', 'VWA', 'D1S1656', 'D2S441', 'D2S1338', 'D10S1248',
+    'D12S391', 'D19S433', 'D22S1045',
+)
+STR_MISSING = -1
+MIN_COMPARED_LOCI = 8
+MINUTIAE_DIMENSIONS = 64
+
+MATCH_THRESHOLDS = {
+    ProfileKind.STR: 0.8,
+    ProfileKind.MINUTIAE: 0.95,
+}
+MAX_CANDIDATES = 20
+
+DTYPES = {
+    ProfileKind.STR: np.int32,
+    ProfileKind.MINUTIAE: np.float32,
+}
+WIDTHS = {
+    ProfileKind.STR: len(STR_LOCI),
+    ProfileKind.MINUTIAE: MINUTIAE_DIMENSIONS,
+}
+
+
+def _allele_tenths(value):
+    try:
+        allele = round(float(value) * 10)
+    except (TypeError, ValueError):
+        raise ValidationError(f'Allele "{value}" is not a number.')
+    if not 0 < allele < 10000:
+        raise ValidationError(f'Allele "{value}" is out of range.')
+    return allele
+
+
+def encode_str(data):
+    loci = {str(key).upper(): value for key, value in (data or {}).items()}
+    unknown = sorted(set(loci) - set(STR_LOCI))
+    if unknown:
+        raise ValidationError(f'Unknown STR loci: {", ".join(unknown)}.')
+    vector = np.full(len(STR_LOCI), STR_MISSING, dtype=np.int32)
+    for position, locus in enumerate(STR_LOCI):
+        alleles = loci.get(locus)
+        if alleles in (None, '', []):
+            continue
+        if not isinstance(alleles, (list, tuple)):
+            alleles = [alleles]
+        if len(alleles) > 2:
+            raise ValidationError(f'Locus {locus} has more than two alleles.')
+        low, high = sorted(_allele_tenths(allele) for allele in alleles * (2 // len(alleles)))
+        vector[position] = low * 10000 + high
+    if (vector != STR_MISSING).sum() < MIN_COMPARED_LOCI:
+        raise ValidationError(f'An STR profile needs at least {MIN_COMPARED_LOCI} typed loci.')
+    return vector
+
+
+def encode_minutiae(data):
+    features = (data or {}).get('features')
+    try:
+        vector = np.asarray(features, dtype=np.float32)
+    except (TypeError, ValueError):
+        raise ValidationError('features must be a list of numbers.')
+    if vector.shape != (MINUTIAE_DIMENSIONS,):
+        raise ValidationError(f'features must have exactly {MINUTIAE_DIMENSIONS} values.')
+    norm = float(np.linalg.norm(vector))
+    if not np.isfinite(norm) or norm == 0:
+        raise ValidationError('features must be finite and not all zero.')
+    return vector / norm
+
+
+ENCODERS = {
+    ProfileKind.STR: encode_str,
+    ProfileKind.MINUTIAE: encode_minutiae,
+}
+
+
+def encode_profile(kind, data):
+    if kind not in ENCODERS:
+        raise ValidationError(f'Unknown profile kind "{kind}".')
+    return ENCODERS[kind](data)
+
+
+def decode_vector(kind, raw):
+    return np.frombuffer(bytes(raw), dtype=DTYPES[kind])
+
+
+class ProfileIndex:
+    def __init__(self, kind, ids=None, matrix=None):
+        self.kind = kind
+        self.ids = np.asarray(ids if ids is not None else [], dtype=np.int64)
+        if matrix is None:
+            matrix = np.empty((0, WIDTHS[kind]), dtype=DTYPES[kind])
+        self._set_matrix(matrix)
+
+    def _set_matrix(self, matrix):
+        if self.kind == ProfileKind.STR:
+            # Column-major so each locus is one contiguous array; `typed` marks typed loci.
+            self.matrix = np.asfortranarray(matrix, dtype=np.int32)
+            self.typed = self.matrix != STR_MISSING
+        else:
+            self.matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def replaced(self, drop_ids, ids, rows):
+        """A new index without the profiles `drop_ids`, plus `ids` with their vector `rows`."""
+        keep = ~np.isin(self.ids, list(drop_ids))
+        return ProfileIndex(
+            self.kind,
+            np.concatenate([self.ids[keep], np.asarray(ids, dtype=np.int64)]),
+            np.concatenate([self.matrix[keep], np.asarray(rows, dtype=DTYPES[self.kind]).reshape(-1, WIDTHS[self.kind])]),
+        )
+
+    def score(self, vector):
+        """Score `vector` against every stored profile; returns one float per row of `ids`."""
+        if self.kind == ProfileKind.MINUTIAE:
+            return self.matrix @ vector
+        # One pass per typed locus over a contiguous column, counting into uint8 accumulators.
+        matched = np.zeros(len(self.ids), dtype=np.uint8)
+        compared = np.zeros(len(self.ids), dtype=np.uint8)
+        for locus in np.flatnonzero(vector != STR_MISSING):
+            np.add(matched, self.matrix[:, locus] == vector[locus], out=matched, casting='unsafe')
+            np.add(compared, self.typed[:, locus], out=compared, casting='unsafe')
+        scores = matched / np.maximum(compared, 1).astype(np.float32)
+        scores[compared < MIN_COMPARED_LOCI] = 0.0
+        return scores
+
+    def candidates(self, vector, threshold=None, limit=MAX_CANDIDATES, exclude_id=None):
+        """Best-scoring profiles at or above the threshold, as [(profile_id, score)] best first."""
+        if not len(self.ids):
+            return []
+        threshold = MATCH_THRESHOLDS[self.kind] if threshold is None else threshold
+        scores = self.score(vector)
+        if exclude_id is not None:
+            scores = np.where(self.ids == exclude_id, -1.0, scores)
+        hits = np.flatnonzero(scores >= threshold)
+        if len(hits) > limit:
+            hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+        hits = hits[np.argsort(-scores[hits], kind='stable')]
+        return [(int(self.ids[i]), float(scores[i])) for i in hits]
+
+
+def _vectors(kind, queryset, batch_size=10000):
+    """(ids, rows) of the profiles of `kind` in `queryset`, read `batch_size` at a time."""
+    ids, rows = [], []
+    last_id = 0
+    while True:
+        batch = list(
+            queryset.filter(kind=kind, id__gt=last_id).order_by('id').values_list('id', 'vector')[:batch_size]
+        )
+        ids.extend(pk for pk, _ in batch)
+        rows.extend(decode_vector(kind, raw) for _, raw in batch)
+        if len(batch) < batch_size:
+            return ids, rows
+        last_id = batch[-1][0]
+
+
+class LiveProfileIndex(LiveIndex):
+    """The `ProfileIndex` of one kind, following stored, changed and deleted profiles."""
+    watches = (BiologicalProfile,)
+
+    def __init__(self, kind):
+        super().__init__()
+        self.kind = kind
+
+    def build(self):
+        return ProfileIndex(self.kind).replaced((), *_vectors(self.kind, BiologicalProfile.objects.all()))
+
+    def update(self, index, changes):
+        written = BiologicalProfile.objects.filter(pk__in=changes.written(BiologicalProfile))
+        return index.replaced(changes.touched(BiologicalProfile), *_vectors(self.kind, written))
+
+
+def get_index(kind):
+    return LiveProfileIndex.shared(kind).current()
+
+
+def reset_indexes():
+    LiveProfileIndex.reset_shared()
+
+
+def _describe(profile, score):
+    if profile.suspect_id:
+        suspect = profile.suspect
+        return f"Suspect {suspect.full_name} ({suspect.national_id}) - {profile.kind} score {score:.2f}"
+    evidence = profile.evidence
+    return f"Evidence {evidence.evidence_number} (case {evidence.case.case_number}) - {profile.kind} score {score:.2f}"
+
+
+def refresh_evidence_matches(evidence_ids):
+    """Recompute `match_found`/`match_details` on evidence from the stored profile matches."""
+    for evidence_id in set(evidence_ids):
+        matches = ProfileMatch.objects.filter(
+            Q(profile__evidence_id=evidence_id) | Q(candidate__evidence_id=evidence_id)
+        ).select_related(
+            'profile__suspect', 'profile__evidence__case',
+            'candidate__suspect', 'candidate__evidence__case',
+        ).order_by('-score')
+        lines = []
+        for match in matches:
+            other = match.candidate if match.profile.evidence_id == evidence_id else match.profile
+            lines.append(_describe(other, match.score))
+        if lines:
+            updated = BiologicalEvidence.objects.filter(pk=evidence_id).update(
+                match_found=True,
+                match_details='\n'.join(lines),
+                updated_at=timezone.now(),
+            )
+            if updated:
+                record_changes(BiologicalEvidence, [evidence_id], ChangeOp.UPDATE, ['match_found', 'match_details'])
+
+
+def match_profile(profile):
+    """Score `profile` against its kind's index, store the candidate matches and flag evidence."""
+    index = get_index(profile.kind)
+    found = dict(index.candidates(decode_vector(profile.kind, profile.vector), exclude_id=profile.id))
+    if not found:
+        return []
+    candidates = BiologicalProfile.objects.filter(id__in=found).only('id', 'evidence_id', 'suspect_id')
+    matches = [ProfileMatch(profile=profile, candidate=candidate, score=found[candidate.id]) for candidate in candidates]
+    with transaction.atomic():
+        ProfileMatch.objects.bulk_create(matches, ignore_conflicts=True)
+        evidence_ids = [candidate.evidence_id for candidate in candidates if candidate.evidence_id]
+        if profile.evidence_id:
+            evidence_ids.append(profile.evidence_id)
+        refresh_evidence_matches(evidence_ids)
+    return sorted(matches, key=lambda match: -match.score)
+
+
+def create_profile(kind, data, evidence=None, suspect=None):
+    """Validate, encode and store a profile, then match it; returns (profile, matches)."""
+    vector = encode_profile(kind, data)
+    profile = BiologicalProfile.objects.create(
+        kind=kind,
+        data=data,
+        evidence=evidence,
+        suspect=suspect,
+        vector=vector.tobytes(),
+    )
+    return profile, match_profile(profile)
@@ -0,0 +1,321 @@
+"""
+Scheduling interrogations and trials against per-resource interval indexes.
+
+Every scheduled interrogation books its detective, sergeant and room, and every trial
+books its judge and (when set) courtroom, as `Booking` rows. Postgres rejects overlapping
+bookings of one resource through the exclusion constraint on `Booking`, so two requests
+racing for the same slot cannot both succeed; `book` turns that rejection into
+`ScheduleConflict`. Completed or cancelled interrogations and completed or postponed trials
+`release` their bookings, and deleting the owner deletes them too.
+
+Free-slot search loads the bookings of the requested resources inside the search horizon
+with one range query (served by the constraint's GiST index) into an `IntervalIndex` per
+resource, then walks forward from the requested start to the first working-hours gap that
+is free on every resource. Auto-scheduling trials keeps those indexes in memory while it
+places the whole batch, giving each trial to the least loaded judge that can take it
+earliest.
+"""
+from bisect import bisect_right, insort
+from collections import namedtuple
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from cases.models import CasePriority
+from investigation.models import (
+    Booking,
+    ResourceKind,
+    ScheduleResource,
+    Trial,
+    TrialStatus,
+    Interrogation,
+    InterrogationStatus,
+)
+
+TRIAL_MINUTES = 120
+INTERROGATION_MINUTES = 60
+WORKDAY_START_HOUR = 8
+WORKDAY_END_HOUR = 18
+SLOT_MINUTES = 15
+SEARCH_HORIZON_DAYS = 60
+MAX_AUTO_SCHEDULE = 200
+
+PRIORITY_ORDER = {
+    CasePriority.CRITICAL: 0,
+    CasePriority.LEVEL1: 1,
+    CasePriority.LEVEL2: 2,
+    CasePriority.LEVEL3: 3,
+}
+
+Resource = namedtuple('Resource', ['kind', 'key'])
+
+
+class ScheduleConflict(Exception):
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__('Requested time overlaps existing bookings.')
+
+
+def room_key(name):
+    return ' '.join((name or '').lower().split())
+
+
+def person(kind, user_id):
+    return Resource(kind, str(user_id))
+
+
+def room(kind, name):
+    return Resource(kind, room_key(name))
+
+
+def trial_resources(judge_id, courtroom=''):
+    resources = [person(ResourceKind.JUDGE, judge_id)]
+    if room_key(courtroom):
+        resources.append(room(ResourceKind.COURTROOM, courtroom))
+    return resources
+
+
+def interrogation_resources(detective_id, sergeant_id, location):
+    resources = [person(ResourceKind.DETECTIVE, detective_id), person(ResourceKind.SERGEANT, sergeant_id)]
+    if room_key(location):
+        resources.append(room(ResourceKind.INTERROGATION_ROOM, location))
+    return resources
+
+
+def resource_ids(resources, create=False):
+    """{Resource: ScheduleResource id} for the resources that exist (all of them with create=True)."""
+    if not resources:
+        return {}
+    query = Q()
+    for resource in resources:
+        query |= Q(kind=resource.kind, key=resource.key)
+    rows = ScheduleResource.objects.filter(query).values_list('kind', 'key', 'pk')
+    ids = {Resource(kind, key): pk for kind, key, pk in rows}
+    if create and len(ids) < len(set(resources)):
+        ScheduleResource.objects.bulk_create(
+            [ScheduleResource(kind=r.kind, key=r.key) for r in set(resources) if r not in ids],
+            ignore_conflicts=True,
+        )
+        return resource_ids(resources)
+    return ids
+
+
+def conflicts(resources, start, end, exclude_owner=None):
+    """Existing bookings of any of the resources overlapping [start, end)."""
+    bookings = Booking.objects.filter(
+        resource__in=resource_ids(resources).values(), during__overlap=DateTimeTZRange(start, end)
+    ).select_related('resource', 'content_type')
+    if exclude_owner is not None:
+        bookings = bookings.exclude(
+            content_type=ContentType.objects.get_for_model(exclude_owner), object_id=exclude_owner.pk
+        )
+    return list(bookings.order_by('during'))
+
+
+def describe_conflicts(bookings):
+    return [
+        {
+            'resource_kind': booking.resource.kind,
+            'resource_key': booking.resource.key,
+            'start': booking.during.lower,
+            'end': booking.during.upper,
+            'owner': booking.content_type.model,
+            'owner_id': booking.object_id,
+        }
+        for booking in bookings
+    ]
+
+
+def book(owner, resources, start, end):
+    """Replace the owner's bookings with [start, end) on every resource, or raise ScheduleConflict."""
+    content_type = ContentType.objects.get_for_model(owner)
+    ids = resource_ids(resources, create=True)
+    try:
+        with transaction.atomic():
+            Booking.objects.filter(content_type=content_type, object_id=owner.pk).delete()
+            Booking.objects.bulk_create([
+                Booking(
+                    resource_id=ids[resource],
+                    during=DateTimeTZRange(start, end),
+                    content_type=content_type,
+                    object_id=owner.pk,
+                )
+                for resource in resources
+            ])
+    except IntegrityError:
+        raise ScheduleConflict(conflicts(resources, start, end, exclude_owner=owner))
+
+
+def release(owner):
+    """Free the owner's bookings; interrogations and trials call this when they finish (see their save())."""
+    Booking.objects.filter(content_type=ContentType.objects.get_for_model(owner), object_id=owner.pk).delete()
+
+
+class IntervalIndex:
+    """Busy intervals of one resource, sorted by start; bookings never overlap, so ends are sorted too."""
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+
+    def __len__(self):
+        return len(self.intervals)
+
+    def add(self, start, end):
+        insort(self.intervals, (start, end))
+
+    def busy_until(self, start, end):
+        """End of the latest interval overlapping [start, end), or None if the range is free."""
+        position = bisect_right(self.intervals, (end,))
+        latest = None
+        while position > 0:
+            position -= 1
+            busy_start, busy_end = self.intervals[position]
+            if busy_end <= start:
+                break
+            if busy_start < end:
+                latest = busy_end if latest is None else max(latest, busy_end)
+        return latest
+
+
+def load_indexes(resources, start, end):
+    """One IntervalIndex per resource holding its bookings that overlap [start, end)."""
+    indexes = {resource: IntervalIndex() for resource in resources}
+    by_id = {pk: indexes[resource] for resource, pk in resource_ids(resources).items()}
+    if not by_id:
+        return indexes
+    rows = Booking.objects.filter(
+        resource__in=by_id, during__overlap=DateTimeTZRange(start, end)
+    ).values_list('resource', 'during')
+    for resource_id, during in rows:
+        by_id[resource_id].intervals.append((during.lower, during.upper))
+    for index in indexes.values():
+        index.intervals.sort()
+    return indexes
+
+
+def _align(moment):
+    """The first slot boundary at or after `moment` that starts inside working hours."""
+    moment = timezone.localtime(moment).replace(second=0, microsecond=0)
+    remainder = moment.minute % SLOT_MINUTES
+    if remainder:
+        moment += timedelta(minutes=SLOT_MINUTES - remainder)
+    if moment.hour < WORKDAY_START_HOUR:
+        moment = moment.replace(hour=WORKDAY_START_HOUR, minute=0)
+    elif moment.hour >= WORKDAY_END_HOUR:
+        moment = (moment + timedelta(days=1)).replace(hour=WORKDAY_START_HOUR, minute=0)
+    return moment
+
+
+def _fits_workday(start, duration):
+    end = start + duration
+    day_end = start.replace(hour=WORKDAY_END_HOUR, minute=0)
+    return end <= day_end
+
+
+def find_free_slot(indexes, duration, after, until):
+    """Earliest working-hours start >= after at which every index is free for `duration`, or None."""
+    start = _align(after)
+    while start + duration <= until:
+        if not _fits_workday(start, duration):
+            start = _align(start.replace(hour=WORKDAY_END_HOUR, minute=0))
+            continue
+        end = start + duration
+        blocked = None
+        for index in indexes:
+            busy = index.busy_until(start, end)
+            if busy is not None and (blocked is None or busy > blocked):
+                blocked = busy
+        if blocked is None:
+            return start
+        start = _align(blocked)
+    return None
+
+
+def next_free_slot(resources, duration, after=None, horizon_days=SEARCH_HORIZON_DAYS):
+    """(start, end) of the earliest slot free on every resource, or None within the horizon."""
+    after = after or timezone.now()
+    until = after + timedelta(days=horizon_days)
+    indexes = load_indexes(resources, after, until)
+    start = find_free_slot(list(indexes.values()), duration, after, until)
+    return (start, start + duration) if start else None
+
+
+def schedule_trial(case, judge, scheduled_date, courtroom='', duration=timedelta(minutes=TRIAL_MINUTES)):
+    """Create the case's trial and book its judge and courtroom, or raise ScheduleConflict."""
+    with transaction.atomic():
+        trial = Trial.objects.create(
+            case=case, judge=judge, scheduled_date=scheduled_date, courtroom=courtroom, status=TrialStatus.SCHEDULED,
+        )
+        book(trial, trial_resources(judge.pk, courtroom), scheduled_date, scheduled_date + duration)
+    return trial
+
+
+def schedule_interrogation(link, detective, sergeant, location, scheduled_date,
+                           duration=timedelta(minutes=INTERROGATION_MINUTES)):
+    """Create an interrogation and book its detective, sergeant and room, or raise ScheduleConflict."""
+    with transaction.atomic():
+        interrogation = Interrogation.objects.create(
+            suspect_case_link=link, detective=detective, sergeant=sergeant, location=location,
+            scheduled_date=scheduled_date, status=InterrogationStatus.SCHEDULED,
+        )
+        book(
+            interrogation, interrogation_resources(detective.pk, sergeant.pk, location),
+            scheduled_date, scheduled_date + duration,
+        )
+    return interrogation
+
+
+def auto_schedule_trials(cases, judges, courtrooms=(), after=None, duration=timedelta(minutes=TRIAL_MINUTES),
+                         horizon_days=SEARCH_HORIZON_DAYS):
+    """
+    Schedule a trial for every case (most urgent priority first) and return (trials, unscheduled cases).
+
+    Each case goes to the judge with the fewest scheduled trials, ties broken by the earliest
+    slot where that judge and one of the courtrooms are both free; indexes are updated in
+    memory as trials are placed, so the batch needs one query to load them.
+    """
+    after = after or timezone.now()
+    until = after + timedelta(days=horizon_days)
+    judge_resources = {judge.pk: person(ResourceKind.JUDGE, judge.pk) for judge in judges}
+    room_names = {room(ResourceKind.COURTROOM, name): name for name in courtrooms if room_key(name)}
+    indexes = load_indexes(list(judge_resources.values()) + list(room_names), after, until)
+    load = dict(
+        Trial.objects.filter(judge__in=judge_resources, status=TrialStatus.SCHEDULED)
+        .values('judge').annotate(count=Count('pk')).values_list('judge', 'count')
+    )
+    by_id = {judge.pk: judge for judge in judges}
+    cases = sorted(cases, key=lambda case: (PRIORITY_ORDER.get(case.priority, len(PRIORITY_ORDER)), case.pk))
+
+    trials, unscheduled = [], []
+    for case in cases:
+        best = None
+        for judge_id, judge_resource in judge_resources.items():
+            for courtroom in list(room_names) or [None]:
+                resources = [indexes[judge_resource]] + ([indexes[courtroom]] if courtroom else [])
+                start = find_free_slot(resources, duration, after, until)
+                if start is None:
+                    continue
+                candidate = (load.get(judge_id, 0), start, judge_id, courtroom.key if courtroom else '')
+                if best is None or candidate < best:
+                    best = candidate
+        if best is None:
+            unscheduled.append(case)
+            continue
+        _, start, judge_id, courtroom = best
+        courtroom = Resource(ResourceKind.COURTROOM, courtroom) if courtroom else None
+        try:
+            trial = schedule_trial(case, by_id[judge_id], start, room_names.get(courtroom, ''), duration)
+        except ScheduleConflict:
+            # Booked by someone else since the indexes were loaded.
+            unscheduled.append(case)
+            continue
+        indexes[judge_resources[judge_id]].add(start, start + duration)
+        if courtroom:
+            indexes[courtroom].add(start, start + duration)
+        load[judge_id] = load.get(judge_id, 0) + 1
+        trials.append(trial)
+    return trials, unscheduled
@@ -0,0 +1,195 @@
+"""
+Co-offender network over suspect-case links.
+
+The bipartite graph suspects x cases is held as two CSR adjacencies (`suspect -> cases`
+and `case -> suspects`) whose `indptr` arrays are indexed directly by primary key. Two
+suspects are co-offenders when they share a case; k-hop neighbourhoods, shortest
+distances, connected components and centralities are all computed from these arrays in
+memory.
+
+`SuspectNetworkIndex` follows link changes in the change feed (core.services.indexes):
+links written or deleted since its last refresh are dropped, the written ones read back,
+and a new `SuspectNetwork` is built, so the CSR arrays are rebuilt only when a link changed.
+"""
+import numpy as np
+
+from core.services.indexes import LiveIndex
+from investigation.models import SuspectCaseLink
+
+MAX_HOPS = 4
+PAGERANK_DAMPING = 0.85
+PAGERANK_ITERATIONS = 100
+PAGERANK_TOLERANCE = 1e-9
+
+
+def _csr(rows, cols, size):
+    """indptr (length size + 1) and column indices for the edge list, grouped by row."""
+    order = np.argsort(rows, kind='stable')
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, cols[order]
+
+
+def _gather(indptr, indices, rows):
+    """Concatenated adjacency lists of `rows`, without a Python-level loop."""
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+    return indices[offsets]
+
+
+class SuspectNetwork:
+    """The graph of one set of links; never changed once built."""
+
+    def __init__(self, link_ids=(), suspects=(), cases=()):
+        self.link_ids = np.asarray(link_ids, dtype=np.int64)
+        self.edge_suspects = np.asarray(suspects, dtype=np.int64)
+        self.edge_cases = np.asarray(cases, dtype=np.int64)
+        self.n_suspects = int(self.edge_suspects.max()) + 1 if len(self.edge_suspects) else 0
+        self.n_cases = int(self.edge_cases.max()) + 1 if len(self.edge_cases) else 0
+        self.s2c_indptr, self.s2c = _csr(self.edge_suspects, self.edge_cases, self.n_suspects)
+        self.c2s_indptr, self.c2s = _csr(self.edge_cases, self.edge_suspects, self.n_cases)
+        self.suspect_degree = np.diff(self.s2c_indptr)
+        self.case_degree = np.diff(self.c2s_indptr)
+        self._labels = None
+        self._case_labels = None
+        self._pagerank = None
+
+    def __len__(self):
+        return len(self.edge_suspects)
+
+    def cases_of(self, suspect_id):
+        if not 0 <= suspect_id < self.n_suspects:
+            return np.empty(0, dtype=np.int64)
+        return self.s2c[self.s2c_indptr[suspect_id]:self.s2c_indptr[suspect_id + 1]]
+
+    def _suspects_of(self, case_ids):
+        return _gather(self.c2s_indptr, self.c2s, case_ids)
+
+    def _cases_of_all(self, suspect_ids):
+        return _gather(self.s2c_indptr, self.s2c, suspect_ids)
+
+    def co_offenders(self, suspect_id):
+        """[(suspect_id, shared case count)], most shared cases first."""
+        others = self._suspects_of(self.cases_of(suspect_id))
+        others = others[others != suspect_id]
+        if not len(others):
+            return []
+        ids, counts = np.unique(others, return_counts=True)
+        order = np.lexsort((ids, -counts))
+        return [(int(ids[i]), int(counts[i])) for i in order]
+
+    def neighborhood(self, suspect_id, hops=2):
+        """{suspect_id: distance} for suspects within `hops` co-offence steps (excluding the start)."""
+        if not 0 <= suspect_id < self.n_suspects:
+            return {}
+        visited = np.zeros(self.n_suspects, dtype=bool)
+        visited[suspect_id] = True
+        frontier = np.array([suspect_id], dtype=np.int64)
+        distances = {}
+        for distance in range(1, min(hops, MAX_HOPS) + 1):
+            reached = np.unique(self._suspects_of(np.unique(self._cases_of_all(frontier))))
+            frontier = reached[~visited[reached]]
+            if not len(frontier):
+                break
+            visited[frontier] = True
+            distances.update((int(s), distance) for s in frontier)
+        return distances
+
+    def distance(self, source_id, target_id, max_hops=MAX_HOPS):
+        """Number of co-offence steps between two suspects, or None if further than max_hops."""
+        if source_id == target_id:
+            return 0
+        return self.neighborhood(source_id, max_hops).get(target_id)
+
+    def component_labels(self):
+        """Per-suspect component label (smallest suspect id in the component); -1 for unlinked ids."""
+        if self._labels is None:
+            labels = np.full(self.n_suspects, -1, dtype=np.int64)
+            present = self.suspect_degree > 0
+            labels[present] = np.flatnonzero(present)
+            case_labels = np.full(self.n_cases, np.iinfo(np.int64).max, dtype=np.int64)
+            while True:
+                np.minimum.at(case_labels, self.edge_cases, labels[self.edge_suspects])
+                updated = labels.copy()
+                np.minimum.at(updated, self.edge_suspects, case_labels[self.edge_cases])
+                if np.array_equal(updated, labels):
+                    break
+                labels = updated
+            self._labels, self._case_labels = labels, case_labels
+        return self._labels
+
+    def component(self, suspect_id):
+        """(suspect count, case count) of the connected component containing the suspect."""
+        if not 0 <= suspect_id < self.n_suspects or not self.suspect_degree[suspect_id]:
+            return 0, 0
+        label = self.component_labels()[suspect_id]
+        return int((self._labels == label).sum()), int((self._case_labels == label).sum())
+
+    def co_offence_ties(self):
+        """Per-suspect number of co-offender pairings, counted once per shared case."""
+        ties = np.zeros(self.n_suspects, dtype=np.int64)
+        np.add.at(ties, self.edge_suspects, self.case_degree[self.edge_cases] - 1)
+        return ties
+
+    def pagerank(self):
+        """PageRank of a suspect -> case -> suspect random walk; 0 for unlinked ids."""
+        if self._pagerank is None:
+            rank = np.zeros(self.n_suspects, dtype=np.float64)
+            present = self.suspect_degree > 0
+            count = int(present.sum())
+            if count:
+                teleport = present / count
+                rank = teleport.copy()
+                s_out = self.suspect_degree[self.edge_suspects]
+                c_out = self.case_degree[self.edge_cases]
+                for _ in range(PAGERANK_ITERATIONS):
+                    case_mass = np.bincount(self.edge_cases, weights=rank[self.edge_suspects] / s_out, minlength=self.n_cases)
+                    walked = np.bincount(self.edge_suspects, weights=case_mass[self.edge_cases] / c_out, minlength=self.n_suspects)
+                    updated = (1 - PAGERANK_DAMPING) * teleport + PAGERANK_DAMPING * walked
+                    converged = np.abs(updated - rank).sum() < PAGERANK_TOLERANCE
+                    rank = updated
+                    if converged:
+                        break
+            self._pagerank = rank
+        return self._pagerank
+
+    def ranking(self, metric='pagerank', limit=20):
+        """[(suspect_id, score)] of the most central suspects."""
+        scores = self.pagerank() if metric == 'pagerank' else self.co_offence_ties().astype(np.float64)
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return [(int(s), float(scores[s])) for s in candidates]
+
+
+def _links(queryset):
+    return np.array(queryset.order_by('pk').values_list('pk', 'suspect_id', 'case_id'), dtype=np.int64).reshape(-1, 3)
+
+
+class SuspectNetworkIndex(LiveIndex):
+    watches = (SuspectCaseLink,)
+
+    def build(self):
+        links = _links(SuspectCaseLink.objects.all())
+        return SuspectNetwork(links[:, 0], links[:, 1], links[:, 2])
+
+    def update(self, network, changes):
+        keep = ~np.isin(network.link_ids, list(changes.touched(SuspectCaseLink)))
+        links = _links(SuspectCaseLink.objects.filter(pk__in=changes.written(SuspectCaseLink)))
+        return SuspectNetwork(
+            np.concatenate([network.link_ids[keep], links[:, 0]]),
+            np.concatenate([network.edge_suspects[keep], links[:, 1]]),
+            np.concatenate([network.edge_cases[keep], links[:, 2]]),
+        )
+
+
+def get_network():
+    """The process-wide network, brought up to date with the link changes since its last use."""
+    return SuspectNetworkIndex.shared().current()
+
+
+def reset_network():
+    SuspectNetworkIndex.reset_shared()
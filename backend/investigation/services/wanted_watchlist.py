@@ -0,0 +1,166 @@
+"""
+Wanted-person watchlist for checkpoint and front-desk identity checks.
+
+`WantedWatchlist` keeps the normalized national ids and phone numbers of wanted suspects
+(`Suspect.is_wanted`) in an immutable `WatchlistSnapshot`: two dicts from key to suspect
+ids, plus an optional Bloom filter in front of them. A check is one normalization and one
+dict lookup against whatever snapshot is current; no query is made.
+
+The watchlist is a `LiveIndex` (core.services.indexes) over `Suspect`: suspects written or
+deleted since the last refresh are dropped from its per-suspect table, the wanted ones read
+back, and a new snapshot is swapped in. Refreshes are throttled to one every
+`refresh_interval` seconds.
+
+The Bloom filter is off by default: in CPython its hash probes cost more than the dict
+lookup they guard (see `manage.py benchmark_wanted_watchlist --bloom`).
+"""
+import hashlib
+import math
+import time
+
+from core.services.indexes import LiveIndex
+from investigation.identity import normalize_national_id, normalize_phone
+from investigation.models import Suspect
+
+MAX_BATCH_CHECKS = 1000
+BLOOM_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """A fixed-size Bloom filter over strings using double hashing of one blake2b digest."""
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.num_bits = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 64)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class WatchlistSnapshot:
+    __slots__ = ('national_ids', 'phones', 'bloom', 'size')
+
+    def __init__(self, national_ids, phones, bloom, size):
+        self.national_ids = national_ids
+        self.phones = phones
+        self.bloom = bloom
+        self.size = size
+
+    def __len__(self):
+        return self.size
+
+
+def _build_snapshot(entries, bloom):
+    national_ids = {}
+    phones = {}
+    for suspect_id, (national_id, phone) in entries.items():
+        if national_id:
+            national_ids[national_id] = national_ids.get(national_id, ()) + (suspect_id,)
+        if phone:
+            phones[phone] = phones.get(phone, ()) + (suspect_id,)
+    front = None
+    if bloom:
+        front = BloomFilter(len(national_ids) + len(phones))
+        for key in national_ids:
+            front.add('n' + key)
+        for key in phones:
+            front.add('p' + key)
+    return WatchlistSnapshot(national_ids, phones, front, len(entries))
+
+
+def _entries(queryset):
+    rows = queryset.values_list('pk', 'national_id', 'national_id_is_synthetic', 'phone_number')
+    return {
+        pk: ('' if synthetic else normalize_national_id(national_id), normalize_phone(phone))
+        for pk, national_id, synthetic, phone in rows
+    }
+
+
+EMPTY_SNAPSHOT = WatchlistSnapshot({}, {}, None, 0)
+
+
+class WantedWatchlist(LiveIndex):
+    watches = (Suspect,)
+    refresh_interval = 2.0
+
+    def __init__(self, bloom=False, refresh_interval=None, clock=time.monotonic):
+        super().__init__(refresh_interval, clock)
+        self.bloom = bloom
+        self.entries = {}
+
+    def __len__(self):
+        return self.snapshot.size
+
+    @property
+    def snapshot(self):
+        return EMPTY_SNAPSHOT if self.state is None else self.state
+
+    def build(self):
+        self.entries = _entries(Suspect.objects.filter(is_wanted=True))
+        return _build_snapshot(self.entries, self.bloom)
+
+    def update(self, snapshot, changes):
+        touched = changes.touched(Suspect)
+        entries = {pk: entry for pk, entry in self.entries.items() if pk not in touched}
+        entries.update(_entries(Suspect.objects.filter(pk__in=changes.written(Suspect), is_wanted=True)))
+        self.entries = entries
+        return _build_snapshot(entries, self.bloom)
+
+    def replace(self, entries):
+        """Swap in a snapshot built from {suspect id: (national id, phone)} (normalized keys)."""
+        self.entries = entries
+        self.state = _build_snapshot(entries, self.bloom)
+
+    def check(self, national_id='', phone=''):
+        """Ids of wanted suspects matching the national id or the phone number, in that order."""
+        snapshot = self.snapshot
+        matches = ()
+        national_id = normalize_national_id(national_id)
+        if national_id and (snapshot.bloom is None or 'n' + national_id in snapshot.bloom):
+            matches = snapshot.national_ids.get(national_id, ())
+        phone = normalize_phone(phone)
+        if phone and (snapshot.bloom is None or 'p' + phone in snapshot.bloom):
+            matches += tuple(pk for pk in snapshot.phones.get(phone, ()) if pk not in matches)
+        return list(matches)
+
+    def check_many(self, national_ids=(), phones=()):
+        """[(kind, value, suspect ids)] for every value that matches, against one snapshot."""
+        snapshot = self.snapshot
+        bloom = snapshot.bloom
+        hits = []
+        for kind, values, index, normalize, prefix in (
+            ('national_id', national_ids, snapshot.national_ids, normalize_national_id, 'n'),
+            ('phone', phones, snapshot.phones, normalize_phone, 'p'),
+        ):
+            for value in values:
+                key = normalize(value)
+                if not key or (bloom is not None and prefix + key not in bloom):
+                    continue
+                suspect_ids = index.get(key)
+                if suspect_ids:
+                    hits.append((kind, value, list(suspect_ids)))
+        return hits
+
+
+def get_wanted_watchlist():
+    """The process-wide watchlist, refreshed at most every `refresh_interval` seconds."""
+    watchlist = WantedWatchlist.shared()
+    watchlist.maybe_refresh()
+    return watchlist
+
+
+def reset_wanted_watchlist():
+    WantedWatchlist.reset_shared()
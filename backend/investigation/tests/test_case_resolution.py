@@ -6,6 +6,9 @@ Test Case Resolution
 - Sergeant reviews: if agreement -> approval message, arrest begins; if disagreement -> disagreement message, case remains open.
 - New documents/evidence during resolution -> notification must reach the assigned detective.
 """
+from importlib import import_module
+
+from django.apps import apps
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -20,6 +23,7 @@ from investigation.models import (
     DetectiveReportStatus,
     Notification,
     ReportedSuspect,
+    Suspect,
     SuspectCaseLink,
 )
 from accounts.models import Role
@@ -241,6 +245,15 @@ class CaseResolutionFlowTestCase(TestCase):
         )
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(SuspectCaseLink.objects.filter(case=self.case).count(), 1)
+        suspect = SuspectCaseLink.objects.get(case=self.case).suspect
+        self.assertTrue(suspect.national_id_is_synthetic)
+
+        # Suspects created before the flag existed are found again by the backfill.
+        Suspect.objects.update(national_id_is_synthetic=False)
+        Suspect.objects.create(first_name='Real', last_name='Person', national_id='0000000001')
+        backfill = import_module('investigation.migrations.0011_backfill_synthetic_national_ids')
+        backfill.mark_synthetic_national_ids(apps, None)
+        self.assertEqual(list(Suspect.objects.filter(national_id_is_synthetic=True)), [suspect])
 
     def test_sergeant_disagrees_case_remains_open(self):
         """Sergeant disagrees -> disagreement message, case remains open."""
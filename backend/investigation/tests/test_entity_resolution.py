@@ -0,0 +1,219 @@
+"""
+Entity resolution: normalized identity keys, blocked candidate pairs, automatic person
+clusters, merge suggestions and incremental runs.
+"""
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, WitnessTestimony, DocumentEvidence
+from investigation.identity import normalize_phone, name_key, phonetic_key
+from investigation.models import (
+    Suspect,
+    PersonRecord,
+    PersonCluster,
+    PersonSource,
+    MergeSuggestion,
+    MergeSuggestionStatus,
+    ResolutionRun,
+)
+from investigation.services.entity_resolution import resolve, candidate_pairs
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class IdentityKeysTestCase(TestCase):
+
+    def test_phone_spellings_agree(self):
+        self.assertEqual(normalize_phone('+98 912 123 4567'), '9121234567')
+        self.assertEqual(normalize_phone('0912-123-4567'), '9121234567')
+        self.assertEqual(normalize_phone('۰۹۱۲۱۲۳۴۵۶۷'), '9121234567')
+
+    def test_name_keys(self):
+        self.assertEqual(name_key('Phelps, Cole'), name_key('cole PHELPS'))
+        self.assertEqual(phonetic_key('Kole Phelps'), phonetic_key('Cole Felps'))
+        self.assertEqual(phonetic_key('محمد رضایی'), phonetic_key('رزائی محمد'))
+        self.assertEqual(name_key('Unknown Suspect'), '')
+
+
+class EntityResolutionTestCase(TestCase):
+
+    def setUp(self):
+        self.case = Case.objects.create(
+            title='Case', description='D', incident_date=timezone.now(),
+            incident_location='L', status=CaseStatus.UNDER_INVESTIGATION,
+        )
+
+    def _witness(self, name, contact=''):
+        return WitnessTestimony.objects.create(
+            case=self.case, description='D', location='L', collected_date=timezone.now(),
+            evidence_type='WITNESS', witness_name=name, witness_contact=contact,
+            testimony_date=timezone.now(), testimony_text='Statement',
+        )
+
+    def _record(self, obj):
+        return PersonRecord.objects.get(object_id=obj.pk, content_type__model=obj._meta.model_name)
+
+    def test_same_national_id_links_suspect_user_and_document_owner(self):
+        suspect = Suspect.objects.create(first_name='Cole', last_name='Phelps', national_id='1234567890')
+        user = make_user('cphelps', national_id='1234567890', first_name='Cole', last_name='Phelps')
+        document = DocumentEvidence.objects.create(
+            case=self.case, description='ID card', location='L', collected_date=timezone.now(),
+            evidence_type='DOCUMENT', document_type='ID Card', owner_full_name='C. Phelps',
+            document_attributes={'ID Number': '1234567890'},
+        )
+        run = resolve(incremental=False)
+        self.assertFalse(run.incremental)
+        clusters = {self._record(obj).cluster_id for obj in (suspect, user, document)}
+        self.assertEqual(len(clusters), 1)
+        cluster = PersonCluster.objects.get(pk=clusters.pop())
+        self.assertEqual(cluster.record_count, 3)
+        self.assertEqual(cluster.national_id, '1234567890')
+        self.assertEqual(cluster.display_name, 'Cole Phelps')
+
+    def test_phone_and_name_link_witness_to_suspect(self):
+        suspect = Suspect.objects.create(
+            first_name='Roy', last_name='Earle', national_id='1111111111', phone_number='09121234567',
+        )
+        witness = self._witness('roy earle', '+98 912 123 4567')
+        resolve(incremental=False)
+        self.assertEqual(self._record(suspect).cluster_id, self._record(witness).cluster_id)
+
+    def test_phone_alone_becomes_a_merge_suggestion(self):
+        suspect = Suspect.objects.create(
+            first_name='Roy', last_name='Earle', national_id='1111111111', phone_number='09121234567',
+        )
+        witness = self._witness('Herschel Biggs', '09121234567')
+        resolve(incremental=False)
+        left, right = self._record(suspect), self._record(witness)
+        self.assertNotEqual(left.cluster_id, right.cluster_id)
+        suggestion = MergeSuggestion.objects.get()
+        self.assertEqual({suggestion.left_id, suggestion.right_id}, {left.pk, right.pk})
+        self.assertEqual(suggestion.reasons, ['phone'])
+
+    def test_conflicting_national_ids_never_link(self):
+        Suspect.objects.create(first_name='Ann', last_name='Doe', national_id='1111111111', phone_number='09120000000')
+        make_user('anndoe', national_id='2222222222', phone_number='09120000000', first_name='Ann', last_name='Doe')
+        resolve(incremental=False)
+        self.assertEqual(PersonCluster.objects.count(), 2)
+        self.assertFalse(MergeSuggestion.objects.exists())
+
+    def test_synthetic_national_id_is_ignored(self):
+        suspect = Suspect.objects.create(
+            first_name='Ann', last_name='Doe', national_id='5555555555', national_id_is_synthetic=True,
+        )
+        resolve(incremental=False)
+        self.assertEqual(self._record(suspect).national_id, '')
+
+    def test_oversized_blocks_are_skipped(self):
+        for name in ('Ann Doe', 'Bob Roe', 'Cid Poe', 'Dan Moe'):
+            self._witness(name, '02188776655')
+        with mock.patch('investigation.services.entity_resolution.MAX_BLOCK_SIZE', 3):
+            run = resolve(incremental=False)
+            _, pairs = candidate_pairs()
+        self.assertEqual(pairs, set())
+        self.assertEqual(run.pairs_scored, 0)
+
+    def test_incremental_run_only_reads_changed_rows(self):
+        Suspect.objects.create(first_name='Roy', last_name='Earle', national_id='1111111111', phone_number='09121234567')
+        resolve(incremental=False)
+        witness = self._witness('Roy Earle', '09121234567')
+        run = resolve(incremental=True)
+        self.assertTrue(run.incremental)
+        self.assertEqual(run.records_changed, 1)
+        self.assertEqual(run.records_linked, 2)
+        self.assertEqual(self._record(witness).cluster.record_count, 2)
+        self.assertEqual(ResolutionRun.objects.count(), 2)
+
+    def test_command(self):
+        Suspect.objects.create(first_name='Roy', last_name='Earle', national_id='1111111111')
+        out = StringIO()
+        call_command('resolve_entities', stdout=out)
+        call_command('resolve_entities', '--incremental', stdout=out)
+        self.assertIn('Completed full run', out.getvalue())
+        self.assertIn('Completed incremental run', out.getvalue())
+
+
+class MergeSuggestionApiTestCase(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.detective = make_user('detective_er')
+        self.detective.roles.add(Role.objects.get_or_create(name='Detective', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=self.detective)
+        case = Case.objects.create(
+            title='Case', description='D', incident_date=timezone.now(),
+            incident_location='L', status=CaseStatus.UNDER_INVESTIGATION,
+        )
+        self.suspect = Suspect.objects.create(
+            first_name='Roy', last_name='Earle', national_id='1111111111', phone_number='09121234567',
+        )
+        self.witness = WitnessTestimony.objects.create(
+            case=case, description='D', location='L', collected_date=timezone.now(), evidence_type='WITNESS',
+            witness_name='Herschel Biggs', witness_contact='09121234567',
+            testimony_date=timezone.now(), testimony_text='Statement',
+        )
+        resolve(incremental=False)
+
+    def _clusters(self):
+        return {
+            PersonRecord.objects.get(object_id=obj.pk, content_type__model=obj._meta.model_name).cluster_id
+            for obj in (self.suspect, self.witness)
+        }
+
+    def test_accept_merges_clusters(self):
+        resp = self.client.get('/api/v1/investigation/merge-suggestions/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        suggestion = resp.data['results'][0]
+        self.assertEqual(suggestion['reasons'], ['phone'])
+
+        resp = self.client.post(
+            f"/api/v1/investigation/merge-suggestions/{suggestion['id']}/review/", {'action': 'accept'}, format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual(resp.data['data']['status'], MergeSuggestionStatus.ACCEPTED)
+        self.assertEqual(len(self._clusters()), 1)
+
+        resp = self.client.get('/api/v1/investigation/persons/?national_id=1111111111')
+        person = resp.data['results'][0]
+        self.assertEqual(person['record_count'], 2)
+        self.assertEqual(
+            sorted(record['source'] for record in person['records']), [PersonSource.SUSPECT, PersonSource.WITNESS]
+        )
+
+        resolve(incremental=False)
+        self.assertEqual(len(self._clusters()), 1)
+        self.assertEqual(self.client.get('/api/v1/investigation/merge-suggestions/').data['count'], 0)
+
+    def test_reject_keeps_clusters_and_is_not_suggested_again(self):
+        suggestion = MergeSuggestion.objects.get()
+        resp = self.client.post(
+            f'/api/v1/investigation/merge-suggestions/{suggestion.pk}/review/', {'action': 'reject'}, format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        resolve(incremental=False)
+        self.assertEqual(MergeSuggestion.objects.count(), 1)
+        self.assertEqual(len(self._clusters()), 2)
+        self.assertEqual(self.client.get('/api/v1/investigation/merge-suggestions/').data['count'], 0)
@@ -0,0 +1,137 @@
+"""
+Judge docket: upcoming and ongoing trials with case headers, evidence counts and involved
+individuals, built in a constant number of queries and cached per judge until a trial, case
+or suspect link changes.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, CasePriority, OtherEvidence, WitnessTestimony
+from investigation.models import Suspect, SuspectCaseLink, Trial, TrialStatus
+from accounts.models import Role
+
+User = get_user_model()
+
+DOCKET_URL = '/api/v1/investigation/judges/me/docket/'
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class JudgeDocketTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        judge_role, _ = Role.objects.get_or_create(name='Judge', defaults={'is_active': True})
+        self.judge = make_user('judge_docket')
+        self.judge.roles.add(judge_role)
+        self.other_judge = make_user('judge_docket_2')
+        self.other_judge.roles.add(judge_role)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.judge)
+        self.now = timezone.now()
+
+    def make_trial(self, title, judge=None, trial_status=TrialStatus.SCHEDULED, days=1, suspects=1):
+        case = Case.objects.create(
+            title=title, description='D', incident_date=self.now, incident_location='Main St',
+            status=CaseStatus.SOLVED, priority=CasePriority.LEVEL1,
+        )
+        for i in range(suspects):
+            suspect = Suspect.objects.create(
+                first_name=f'{title}{i}', last_name='Doe', national_id=f'{abs(hash((title, i))) % 10**10:010d}',
+            )
+            SuspectCaseLink.objects.create(suspect=suspect, case=case, detective_guilt_score=7)
+        OtherEvidence.objects.create(
+            case=case, title='Knife', description='D', location='Scene', item_name='Knife',
+            item_category='Weapon', physical_description='Steel', condition='Used', evidence_type='OTHER',
+            status='COLLECTED', collected_date=self.now, collected_by=self.judge,
+        )
+        return Trial.objects.create(
+            case=case, judge=judge or self.judge, status=trial_status, scheduled_date=self.now + timedelta(days=days),
+        )
+
+    def test_docket_lists_upcoming_and_ongoing_trials(self):
+        later = self.make_trial('Later', days=3, suspects=2)
+        ongoing = self.make_trial('Ongoing', trial_status=TrialStatus.IN_PROGRESS, days=0)
+        self.make_trial('Done', trial_status=TrialStatus.COMPLETED)
+        self.make_trial('Elsewhere', judge=self.other_judge)
+        WitnessTestimony.objects.create(
+            case=later.case, title='Wit', description='D', location='L', witness_name='W',
+            testimony_date=self.now, testimony_text='T', evidence_type='WITNESS', status='COLLECTED',
+            collected_date=self.now, collected_by=self.judge,
+        )
+
+        resp = self.client.get(DOCKET_URL)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        data = resp.data['data']
+        self.assertEqual(data['count'], 2)
+        self.assertEqual([row['trial']['id'] for row in data['results']], [ongoing.pk, later.pk])
+        row = data['results'][1]
+        self.assertEqual(row['case']['case_number'], later.case.case_number)
+        self.assertEqual(row['case']['incident_location'], 'Main St')
+        self.assertEqual(row['evidence_counts']['other'], 1)
+        self.assertEqual(row['evidence_counts']['witness_testimony'], 1)
+        self.assertEqual(row['evidence_counts']['total'], 2)
+        self.assertEqual(len(row['involved_individuals']), 2)
+        self.assertEqual(row['involved_individuals'][0]['guilt_scores'], {'detective': 7, 'sergeant': None})
+
+        resp = self.client.get(DOCKET_URL, {'status': 'completed'})
+        self.assertEqual(resp.data['data']['results'][0]['case']['title'], 'Done')
+        resp = self.client.get(DOCKET_URL, {'status': 'ADJOURNED'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_query_count_is_constant_in_trials(self):
+        self.make_trial('First')
+        with self.assertNumQueries(4):
+            self.client.get(DOCKET_URL)
+        for i in range(5):
+            self.make_trial(f'More {i}', days=i + 2, suspects=3)
+        cache.clear()
+        with self.assertNumQueries(4):
+            resp = self.client.get(DOCKET_URL, {'page_size': 4})
+        self.assertEqual(resp.data['data']['pages'], 2)
+        self.assertEqual(len(resp.data['data']['results']), 4)
+
+    def test_cached_until_trial_case_or_link_changes(self):
+        trial = self.make_trial('Cached')
+        self.client.get(DOCKET_URL)
+        with self.assertNumQueries(2):
+            self.client.get(DOCKET_URL)
+
+        Case.objects.filter(pk=trial.case_id).update(title='Renamed', updated_at=timezone.now())
+        resp = self.client.get(DOCKET_URL)
+        self.assertEqual(resp.data['data']['results'][0]['case']['title'], 'Renamed')
+
+        SuspectCaseLink.objects.filter(case=trial.case).delete()
+        resp = self.client.get(DOCKET_URL)
+        self.assertEqual(resp.data['data']['results'][0]['involved_individuals'], [])
+
+        trial.status = TrialStatus.COMPLETED
+        trial.save()
+        resp = self.client.get(DOCKET_URL)
+        self.assertEqual(resp.data['data']['count'], 0)
+
+    def test_only_judges(self):
+        detective = make_user('detective_docket')
+        detective.roles.add(Role.objects.get_or_create(name='Detective', defaults={'is_active': True})[0])
+        client = APIClient()
+        client.force_authenticate(user=detective)
+        self.assertEqual(client.get(DOCKET_URL).status_code, status.HTTP_403_FORBIDDEN)
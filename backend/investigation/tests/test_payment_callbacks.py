@@ -0,0 +1,162 @@
+"""
+Payment callbacks: deduplicated ingestion keyed by gateway reference, micro-batch processing
+with set-wise release evaluation, and the local callback replayer.
+"""
+import hashlib
+import hmac
+import json
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, CasePriority
+from core.models import Payment, PaymentStatus
+from core.services.ledger import ACCOUNTS, account_ids
+from investigation.models import (
+    BailFine,
+    CallbackStatus,
+    Notification,
+    PaymentCallback,
+    Suspect,
+    SuspectCaseLink,
+    SuspectStatus,
+)
+from investigation.services.payment_callbacks import ingest, process_batch
+
+User = get_user_model()
+
+CALLBACK_URL = '/api/v1/investigation/payment-callbacks/'
+SECRET = 'test-callback-secret'
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+def callback(bail_fine, reference, kind='bail', amount='1000', succeeded=True):
+    return {
+        'gateway_reference': reference, 'payment_key': f'{kind}:{bail_fine.pk}',
+        'amount': Decimal(amount), 'succeeded': succeeded,
+    }
+
+
+class PaymentCallbackTestCase(TestCase):
+
+    def setUp(self):
+        self.detective = make_user('detective_callbacks')
+        self.case = self.make_case(CasePriority.LEVEL2)
+        self.level3_case = self.make_case(CasePriority.LEVEL3)
+        self.count = 0
+
+    def make_case(self, priority):
+        return Case.objects.create(
+            title=f'{priority} case', description='D', incident_date=timezone.now(), incident_location='L',
+            status=CaseStatus.UNDER_INVESTIGATION, priority=priority, assigned_detective=self.detective,
+        )
+
+    def make_bail_fine(self, case=None, **kwargs):
+        self.count += 1
+        suspect = Suspect.objects.create(
+            first_name='Cal', last_name=f'Back{self.count}', national_id=f'{5000000000 + self.count}',
+            status=SuspectStatus.DETAINED,
+        )
+        SuspectCaseLink.objects.create(suspect=suspect, case=case or self.case)
+        return BailFine.objects.create(suspect=suspect, bail_amount=Decimal('1000'), **kwargs)
+
+    def test_ingestion_dedupes_by_reference(self):
+        bail_fine = self.make_bail_fine()
+        self.assertEqual(ingest([callback(bail_fine, 'R1'), callback(bail_fine, 'R1')]), (1, 1))
+        self.assertEqual(ingest([callback(bail_fine, 'R1'), callback(bail_fine, 'R2')]), (1, 1))
+        self.assertEqual(PaymentCallback.objects.count(), 2)
+
+    def test_ingestion_counts_references_stored_concurrently_as_duplicates(self):
+        bail_fine = self.make_bail_fine()
+        ingest([callback(bail_fine, 'R1')])
+        # Another ingest stored R1 after this one checked for it.
+        with mock.patch.object(PaymentCallback.objects, 'filter', return_value=PaymentCallback.objects.none()):
+            self.assertEqual(ingest([callback(bail_fine, 'R1'), callback(bail_fine, 'R2')]), (1, 1))
+        self.assertEqual(PaymentCallback.objects.count(), 2)
+
+    def test_batch_applies_payments_and_releases_set_wise(self):
+        paid = self.make_bail_fine()
+        unapproved = self.make_bail_fine(self.level3_case)
+        approved = self.make_bail_fine(self.level3_case, sergeant_approval=True)
+        ingest([
+            callback(paid, 'F1', succeeded=False),
+            callback(paid, 'P1'),
+            callback(paid, 'P1-again'),
+            callback(unapproved, 'P2'),
+            callback(approved, 'P3', amount='999'),
+            {**callback(approved, 'X'), 'payment_key': 'refund:1'},
+        ])
+        result = process_batch()
+        self.assertEqual(tuple(result), (2, 2, 2, 1))
+
+        paid.refresh_from_db()
+        self.assertTrue(paid.bail_paid)
+        self.assertEqual(paid.bail_payment_reference, 'P1')
+        self.assertEqual(paid.suspect.__class__.objects.get(pk=paid.suspect_id).status, SuspectStatus.RELEASED)
+        self.assertEqual(Suspect.objects.get(pk=unapproved.suspect_id).status, SuspectStatus.DETAINED)
+        self.assertEqual(
+            dict(PaymentCallback.objects.values_list('gateway_reference', 'status')),
+            {'F1': CallbackStatus.IGNORED, 'P1': CallbackStatus.APPLIED, 'P1-again': CallbackStatus.IGNORED,
+             'P2': CallbackStatus.APPLIED, 'P3': CallbackStatus.REJECTED, 'X': CallbackStatus.REJECTED},
+        )
+        payment = Payment.objects.get(idempotency_key=f'bail:{paid.pk}')
+        self.assertEqual((payment.status, payment.gateway_reference), (PaymentStatus.CAPTURED, 'P1'))
+        self.assertEqual(Notification.objects.filter(recipient=self.detective, object_id=paid.suspect_id).count(), 1)
+        self.assertIsNone(process_batch())
+
+    def test_query_count_does_not_grow_with_batch(self):
+        account_ids(list(ACCOUNTS))
+
+        def run(n):
+            ingest([callback(self.make_bail_fine(), f'Q{self.count}') for _ in range(n)])
+            with self.assertNumQueries(20):
+                result = process_batch()
+            self.assertEqual((result.applied, result.released), (n, n))
+        run(2)
+        run(20)
+
+    @override_settings(PAYMENT_GATEWAY={'CALLBACK_SECRET': SECRET})
+    def test_endpoint_requires_signature(self):
+        bail_fine = self.make_bail_fine()
+        body = json.dumps([
+            {'reference': 'S1', 'payment_key': f'bail:{bail_fine.pk}', 'amount': '1000.00'},
+            {'reference': 'S1', 'payment_key': f'bail:{bail_fine.pk}', 'amount': '1000.00'},
+        ])
+        client = APIClient()
+        resp = client.post(CALLBACK_URL, body, content_type='application/json')
+        self.assertIn(resp.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        signature = hmac.new(SECRET.encode(), body.encode(), hashlib.sha256).hexdigest()
+        resp = client.post(CALLBACK_URL, body, content_type='application/json', HTTP_X_GATEWAY_SIGNATURE=signature)
+        self.assertEqual(resp.status_code, status.HTTP_202_ACCEPTED, resp.data)
+        self.assertEqual(resp.data['data'], {'queued': 1, 'duplicates': 1})
+
+        resp = client.post(CALLBACK_URL, body, content_type='application/json', HTTP_X_GATEWAY_SIGNATURE='0' * 64)
+        self.assertIn(resp.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+    def test_replayer(self):
+        out = StringIO()
+        call_command('replay_payment_callbacks', payments=300, request_size=100, batch_size=100, stdout=out)
+        self.assertIn('300 applied', out.getvalue())
+        self.assertFalse(PaymentCallback.objects.exists())
@@ -0,0 +1,129 @@
+"""
+Plate-sighting feed: in-memory watchlist of vehicles on open cases or tied to wanted suspects,
+incremental refresh, batch matching and detective notifications.
+"""
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from cases.models import Case, CaseStatus, VehicleEvidence
+from investigation.models import Notification, Suspect, SuspectCaseLink
+from investigation.services import PlateRead, PlateWatchlist, PlateFeedMatcher
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class PlateWatchTestCase(TestCase):
+
+    def setUp(self):
+        self.detective = make_user('detective_plates')
+        self.open_case = self._case('Open', CaseStatus.UNDER_INVESTIGATION)
+        self.closed_case = self._case('Closed', CaseStatus.CLOSED)
+        self.open_vehicle = self._vehicle(self.open_case, '12 B 345-67')
+        self.closed_vehicle = self._vehicle(self.closed_case, '99X11122')
+
+    def _case(self, title, case_status):
+        return Case.objects.create(
+            title=title,
+            description='D',
+            incident_date=timezone.now(),
+            incident_location='Here',
+            status=case_status,
+            assigned_detective=self.detective,
+        )
+
+    def _vehicle(self, case, plate):
+        return VehicleEvidence.objects.create(
+            case=case,
+            description='Car',
+            location='Street',
+            collected_date=timezone.now(),
+            evidence_type='VEHICLE',
+            vehicle_type='Car',
+            license_plate=plate,
+        )
+
+    def test_watchlist_holds_only_vehicles_of_interest(self):
+        watchlist = PlateWatchlist()
+        watchlist.refresh()
+        self.assertIn(self.open_vehicle.plate_ocr_key, watchlist)
+        self.assertNotIn(self.closed_vehicle.plate_ocr_key, watchlist)
+
+    def test_wanted_suspect_makes_closed_case_vehicle_of_interest(self):
+        watchlist = PlateWatchlist()
+        watchlist.refresh()
+        suspect = Suspect.objects.create(first_name='A', last_name='B', national_id='1234567890', is_wanted=True)
+        SuspectCaseLink.objects.create(suspect=suspect, case=self.closed_case)
+        watchlist.refresh()
+        self.assertEqual(watchlist.get(self.closed_vehicle.plate_ocr_key)[0].reason, 'wanted_suspect')
+
+    def test_incremental_refresh_follows_case_status(self):
+        watchlist = PlateWatchlist()
+        watchlist.refresh()
+        self.open_case.status = CaseStatus.CLOSED
+        self.open_case.save()
+        self._vehicle(self.open_case, '77Z88899')
+        watchlist.refresh()
+        self.assertEqual(len(watchlist), 0)
+
+    def test_refresh_drops_deleted_vehicles_and_links(self):
+        watchlist = PlateWatchlist()
+        watchlist.refresh()
+        suspect = Suspect.objects.create(first_name='A', last_name='B', national_id='1234567890', is_wanted=True)
+        link = SuspectCaseLink.objects.create(suspect=suspect, case=self.closed_case)
+        watchlist.refresh()
+        self.assertIn(self.closed_vehicle.plate_ocr_key, watchlist)
+
+        link.delete()
+        self.open_vehicle.delete()
+        watchlist.refresh()
+        self.assertEqual(len(watchlist), 0)
+
+    def test_batch_matching_notifies_detective_once_per_cooldown(self):
+        watchlist = PlateWatchlist()
+        watchlist.refresh()
+        matcher = PlateFeedMatcher(watchlist)
+        reads = [
+            PlateRead('12B34567', 'CAM-1', ''),
+            PlateRead('1Z8-345-67', 'CAM-2', ''),
+            PlateRead('99X11122', 'CAM-3', ''),
+            PlateRead('00A00000', 'CAM-4', ''),
+        ]
+        self.assertEqual(len(matcher.match(reads)), 2)
+        created = matcher.process(reads)
+        self.assertEqual(len(created), 1)
+        notification = Notification.objects.get(recipient=self.detective)
+        self.assertEqual(notification.object_id, self.open_vehicle.id)
+        self.assertIn('CAM-1', notification.message)
+
+    def test_command_processes_feed_and_benchmarks(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as feed:
+            feed.write('plate,camera,seen_at\n12B34567,CAM-1,2026-01-01T10:00\n55A55555,CAM-2,\n')
+        self.addCleanup(os.remove, feed.name)
+        out = StringIO()
+        call_command('watch_plate_feed', feed.name, stdout=out)
+        self.assertIn('2 reads, 1 alerts', out.getvalue())
+        out = StringIO()
+        call_command('watch_plate_feed', feed.name, '--benchmark', '--repeat', '3', stdout=out)
+        self.assertIn('Benchmark: 6 reads', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 1)
@@ -0,0 +1,147 @@
+"""
+Biological profile matching: STR / minutiae encoding, vectorized scoring against all stored
+profiles, persisted matches to evidence and suspects, automatic match_found/match_details.
+"""
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, BiologicalEvidence
+from investigation.models import Suspect, SuspectCaseLink, ProfileMatch
+from investigation.services.profile_matching import (
+    ProfileIndex,
+    create_profile,
+    encode_str,
+    get_index,
+    reset_indexes,
+)
+from accounts.models import Role
+
+User = get_user_model()
+
+PROFILE = {
+    'CSF1PO': [10, 12], 'D3S1358': [15, 16], 'D5S818': [11, 12], 'D7S820': [8, 10],
+    'D8S1179': [13, 14], 'D13S317': [11, 11], 'D16S539': [9, 13], 'D18S51': [14, 17],
+    'D21S11': [29, 30.2], 'FGA': [21, 24], 'TH01': [6, 9.3], 'vWA': [16, 18],
+}
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class ProfileMatchingTestCase(TestCase):
+
+    def setUp(self):
+        reset_indexes()
+        self.client = APIClient()
+        self.officer = make_user('officer_profiles')
+        self.officer.roles.add(Role.objects.get_or_create(name='Police Officer', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=self.officer)
+        self.case = Case.objects.create(
+            title='Scene',
+            description='D',
+            incident_date=timezone.now(),
+            incident_location='Here',
+            status=CaseStatus.UNDER_INVESTIGATION,
+        )
+        self.sample = self._sample('Blood on door')
+
+    def _sample(self, description):
+        return BiologicalEvidence.objects.create(
+            case=self.case,
+            description=description,
+            location='Door',
+            collected_date=timezone.now(),
+            evidence_type='BIOLOGICAL',
+            sample_type='Blood',
+            sample_quantity='2ml',
+            storage_location='Lab',
+        )
+
+    def test_str_encoding_is_order_insensitive_and_validated(self):
+        swapped = {locus: list(reversed(alleles)) for locus, alleles in PROFILE.items()}
+        self.assertTrue(np.array_equal(encode_str(PROFILE), encode_str(swapped)))
+        with self.assertRaises(ValidationError):
+            encode_str({'CSF1PO': [10, 12]})
+        with self.assertRaises(ValidationError):
+            encode_str({**PROFILE, 'NOT_A_LOCUS': [1, 2]})
+
+    def test_index_scores_partial_profiles_on_shared_loci(self):
+        full = encode_str(PROFILE)
+        partial = full.copy()
+        partial[:3] = -1
+        other = encode_str({locus: [alleles[0] + 1, alleles[1] + 1] for locus, alleles in PROFILE.items()})
+        index = ProfileIndex('STR', ids=[1, 2, 3], matrix=np.stack([full, partial, other]))
+        self.assertEqual([pk for pk, _ in index.candidates(full)], [1, 2])
+
+    def test_suspect_reference_matches_stored_sample(self):
+        suspect = Suspect.objects.create(first_name='Cole', last_name='Phelps', national_id='1234567890')
+        link = SuspectCaseLink.objects.create(suspect=suspect, case=self.case)
+        url = f'/api/v1/cases/{self.case.id}/biological-evidence/{self.sample.id}/profiles/'
+        resp = self.client.post(url, {'kind': 'STR', 'data': PROFILE}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(resp.data['data']['matches'], [])
+
+        detective = make_user('detective_profiles')
+        detective.roles.add(Role.objects.get_or_create(name='Detective', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=detective)
+        resp = self.client.post(
+            f'/api/v1/cases/{self.case.id}/investigation/suspect-links/{link.id}/profile/',
+            {'kind': 'STR', 'data': PROFILE},
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(len(resp.data['data']['matches']), 1)
+        self.assertEqual(resp.data['data']['matches'][0]['score'], 1.0)
+
+        self.sample.refresh_from_db()
+        self.assertTrue(self.sample.match_found)
+        self.assertIn('Cole Phelps (1234567890)', self.sample.match_details)
+
+    def test_minutiae_match_between_samples(self):
+        rng = np.random.default_rng(3)
+        features = rng.standard_normal(64)
+        create_profile('MINUTIAE', {'features': features.tolist()}, evidence=self.sample)
+        noisy = features + rng.normal(scale=0.05, size=64)
+        other = self._sample('Print on glass')
+        profile, matches = create_profile('MINUTIAE', {'features': noisy.tolist()}, evidence=other)
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(ProfileMatch.objects.get().candidate.evidence, self.sample)
+        other.refresh_from_db()
+        self.assertIn(self.sample.evidence_number, other.match_details)
+
+    def test_index_follows_changed_and_deleted_profiles(self):
+        first, _ = create_profile('STR', PROFILE, evidence=self.sample)
+        second, matches = create_profile('STR', PROFILE, evidence=self._sample('Blood on floor'))
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(list(get_index('STR').ids), [first.pk, second.pk])
+
+        other = {locus: [alleles[0] + 1, alleles[1] + 1] for locus, alleles in PROFILE.items()}
+        first.data, first.vector = other, encode_str(other).tobytes()
+        first.save()
+        second.delete()
+        index = get_index('STR')
+        self.assertEqual(list(index.ids), [first.pk])
+        self.assertEqual([pk for pk, _ in index.candidates(encode_str(other))], [first.pk])
+        self.assertEqual(index.candidates(encode_str(PROFILE)), [])
+
+    def test_invalid_profile_rejected(self):
+        url = f'/api/v1/cases/{self.case.id}/biological-evidence/{self.sample.id}/profiles/'
+        resp = self.client.post(url, {'kind': 'MINUTIAE', 'data': {'features': [1, 2]}}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,225 @@
+"""
+Scheduling: exclusion-constraint conflict checking for trials and interrogations, interval
+indexes, next-free-slot search and load-balanced trial auto-scheduling.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, CasePriority
+from investigation.models import Booking, Interrogation, ResourceKind, Suspect, SuspectCaseLink, Trial, TrialStatus
+from investigation.services.scheduling import (
+    IntervalIndex,
+    ScheduleConflict,
+    auto_schedule_trials,
+    next_free_slot,
+    person,
+    room,
+    schedule_trial,
+)
+from accounts.models import Role
+
+User = get_user_model()
+
+MONDAY_9 = datetime(2030, 1, 7, 9, 0, tzinfo=dt_timezone.utc)
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+def make_case(title, priority=CasePriority.LEVEL2):
+    return Case.objects.create(
+        title=title, description='D', incident_date=timezone.now(),
+        incident_location='L', status=CaseStatus.SOLVED, priority=priority,
+    )
+
+
+def with_role(user, name):
+    user.roles.add(Role.objects.get_or_create(name=name, defaults={'is_active': True})[0])
+    return user
+
+
+class IntervalIndexTestCase(TestCase):
+
+    def test_busy_until(self):
+        hour = timedelta(hours=1)
+        index = IntervalIndex([(MONDAY_9, MONDAY_9 + hour), (MONDAY_9 + 3 * hour, MONDAY_9 + 4 * hour)])
+        self.assertIsNone(index.busy_until(MONDAY_9 + hour, MONDAY_9 + 3 * hour))
+        self.assertEqual(index.busy_until(MONDAY_9 + hour / 2, MONDAY_9 + 2 * hour), MONDAY_9 + hour)
+        self.assertEqual(index.busy_until(MONDAY_9, MONDAY_9 + 5 * hour), MONDAY_9 + 4 * hour)
+        index.add(MONDAY_9 + hour, MONDAY_9 + 2 * hour)
+        self.assertEqual(index.busy_until(MONDAY_9 + hour, MONDAY_9 + 3 * hour), MONDAY_9 + 2 * hour)
+
+
+class SchedulingServiceTestCase(TestCase):
+
+    def setUp(self):
+        self.judge = with_role(make_user('judge_sched'), 'Judge')
+        self.other_judge = with_role(make_user('judge_sched_2'), 'Judge')
+
+    def test_overlapping_trials_for_one_judge_are_rejected(self):
+        schedule_trial(make_case('A'), self.judge, MONDAY_9, courtroom='Room 1')
+        with self.assertRaises(ScheduleConflict) as ctx:
+            schedule_trial(make_case('B'), self.judge, MONDAY_9 + timedelta(hours=1), courtroom='Room 2')
+        self.assertEqual([b.resource.kind for b in ctx.exception.conflicts], [ResourceKind.JUDGE])
+        self.assertEqual(Trial.objects.count(), 1)
+
+        with self.assertRaises(ScheduleConflict) as ctx:
+            schedule_trial(make_case('C'), self.other_judge, MONDAY_9, courtroom=' room  1 ')
+        self.assertEqual([b.resource.kind for b in ctx.exception.conflicts], [ResourceKind.COURTROOM])
+
+        schedule_trial(make_case('D'), self.judge, MONDAY_9 + timedelta(hours=2), courtroom='Room 1')
+        self.assertEqual(Booking.objects.count(), 4)
+
+    def test_next_free_slot_skips_bookings_and_off_hours(self):
+        schedule_trial(make_case('A'), self.judge, MONDAY_9)
+        schedule_trial(make_case('B'), self.judge, MONDAY_9 + timedelta(hours=2), courtroom='Room 1')
+        slot = next_free_slot(
+            [person(ResourceKind.JUDGE, self.judge.pk)], timedelta(hours=2), after=MONDAY_9
+        )
+        self.assertEqual(slot, (MONDAY_9 + timedelta(hours=4), MONDAY_9 + timedelta(hours=6)))
+
+        slot = next_free_slot(
+            [person(ResourceKind.JUDGE, self.other_judge.pk), room(ResourceKind.COURTROOM, 'Room 1')],
+            timedelta(minutes=90), after=MONDAY_9 + timedelta(minutes=5),
+        )
+        self.assertEqual(slot[0], MONDAY_9 + timedelta(minutes=15))
+
+        slot = next_free_slot(
+            [person(ResourceKind.JUDGE, self.other_judge.pk)], timedelta(hours=2), after=MONDAY_9 + timedelta(hours=8)
+        )
+        self.assertEqual(slot[0], MONDAY_9 + timedelta(days=1, hours=-1))
+
+    def test_auto_schedule_balances_judges_and_orders_by_priority(self):
+        schedule_trial(make_case('Existing'), self.judge, MONDAY_9)
+        cases = [make_case(f'Case {i}') for i in range(3)] + [make_case('Critical', CasePriority.CRITICAL)]
+        trials, unscheduled = auto_schedule_trials(
+            cases, [self.judge, self.other_judge], courtrooms=['Room 1'], after=MONDAY_9,
+        )
+        self.assertEqual(unscheduled, [])
+        self.assertEqual(trials[0].case.title, 'Critical')
+        self.assertEqual(trials[0].judge, self.other_judge)
+        load = {judge.pk: sum(t.judge_id == judge.pk for t in Trial.objects.all()) for judge in (self.judge, self.other_judge)}
+        self.assertEqual(sorted(load.values()), [2, 3])
+        starts = sorted(t.scheduled_date for t in trials)
+        self.assertEqual(len(set(starts)), len(starts))
+        self.assertTrue(all(t.courtroom == 'Room 1' for t in trials))
+
+
+class SchedulingApiTestCase(TestCase):
+
+    def setUp(self):
+        self.sergeant = with_role(make_user('sergeant_sched'), 'Sergeant')
+        self.detective = with_role(make_user('detective_sched'), 'Detective')
+        self.judge = with_role(make_user('judge_api'), 'Judge')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.sergeant)
+        self.case = make_case('Trial case')
+        suspect = Suspect.objects.create(first_name='Roy', last_name='Earle', national_id='1111111111')
+        self.link = SuspectCaseLink.objects.create(suspect=suspect, case=self.case)
+
+    def test_trial_create_rejects_conflict(self):
+        url = f'/api/v1/cases/{self.case.pk}/investigation/trial/'
+        resp = self.client.post(url, {
+            'judge_id': self.judge.pk, 'scheduled_date': MONDAY_9.isoformat(), 'courtroom': 'Room 1',
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+        self.assertEqual(resp.data['data']['courtroom'], 'Room 1')
+
+        other = make_case('Other')
+        resp = self.client.post(f'/api/v1/cases/{other.pk}/investigation/trial/', {
+            'judge_id': self.judge.pk, 'scheduled_date': (MONDAY_9 + timedelta(minutes=30)).isoformat(),
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT, resp.data)
+        self.assertEqual(resp.data['conflicts'][0]['resource_kind'], ResourceKind.JUDGE)
+        self.assertFalse(Trial.objects.filter(case=other).exists())
+
+    def test_interrogation_scheduling(self):
+        url = f'/api/v1/cases/{self.case.pk}/investigation/suspect-links/{self.link.pk}/interrogations/'
+        payload = {
+            'detective_id': self.detective.pk, 'sergeant_id': self.sergeant.pk,
+            'location': 'Interrogation Room 2', 'scheduled_date': MONDAY_9.isoformat(),
+        }
+        resp = self.client.post(url, payload, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED, resp.data)
+
+        resp = self.client.post(url, {**payload, 'location': 'Room 3'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_409_CONFLICT, resp.data)
+        self.assertEqual(
+            {row['resource_kind'] for row in resp.data['conflicts']}, {ResourceKind.DETECTIVE, ResourceKind.SERGEANT}
+        )
+
+        resp = self.client.get('/api/v1/investigation/schedule/next-free-slot/', {
+            'detective': self.detective.pk, 'interrogation_room': 'interrogation room 2',
+            'after': MONDAY_9.isoformat(), 'duration_minutes': 30,
+        })
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual(resp.data['data']['start'], MONDAY_9 + timedelta(hours=1))
+
+    def test_finished_interrogations_and_trials_free_their_bookings(self):
+        url = f'/api/v1/cases/{self.case.pk}/investigation/suspect-links/{self.link.pk}/interrogations/'
+        payload = {
+            'detective_id': self.detective.pk, 'sergeant_id': self.sergeant.pk,
+            'location': 'Interrogation Room 2', 'scheduled_date': MONDAY_9.isoformat(),
+        }
+        resp = self.client.post(url, payload, format='json')
+        interrogation = Interrogation.objects.get(pk=resp.data['data']['id'])
+        interrogation.cancel_interrogation('Suspect hospitalized')
+        self.assertFalse(Booking.objects.exists())
+        self.assertEqual(self.client.post(url, payload, format='json').status_code, status.HTTP_201_CREATED)
+
+        trial = schedule_trial(self.case, self.judge, MONDAY_9, 'Room 1')
+        trial.status = TrialStatus.COMPLETED
+        trial.save()
+        self.assertFalse(Booking.objects.filter(object_id=trial.pk, resource__kind=ResourceKind.JUDGE).exists())
+
+    def test_interrogation_detective_must_be_a_detective(self):
+        url = f'/api/v1/cases/{self.case.pk}/investigation/suspect-links/{self.link.pk}/interrogations/'
+        resp = self.client.post(url, {
+            'detective_id': self.judge.pk, 'sergeant_id': self.sergeant.pk,
+            'location': 'Interrogation Room 2', 'scheduled_date': MONDAY_9.isoformat(),
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Booking.objects.exists())
+
+    def test_next_free_slot_requires_a_resource(self):
+        resp = self.client.get('/api/v1/investigation/schedule/next-free-slot/')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_auto_schedule_endpoint(self):
+        cases = [make_case(f'Batch {i}') for i in range(2)]
+        resp = self.client.post('/api/v1/investigation/schedule/auto-schedule-trials/', {
+            'case_ids': [case.pk for case in cases] + [self.case.pk],
+            'after': MONDAY_9.isoformat(),
+        }, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual(len(resp.data['data']['scheduled']), 3)
+        self.assertEqual(Trial.objects.filter(judge=self.judge).count(), 3)
+
+        resp = self.client.post('/api/v1/investigation/schedule/auto-schedule-trials/', {
+            'case_ids': [cases[0].pk],
+        }, format='json')
+        self.assertEqual(resp.data['data']['skipped'], [cases[0].pk])
+
+        detective_client = APIClient()
+        detective_client.force_authenticate(user=self.detective)
+        resp = detective_client.post(
+            '/api/v1/investigation/schedule/auto-schedule-trials/', {'case_ids': [1]}, format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,159 @@
+"""
+Suspect dossier: every linked case with assessments, decisions and trial, interrogations and
+bail/fine in a fixed number of queries; version-checked cache; per-section pagination.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus, CasePriority
+from investigation.models import (
+    Suspect,
+    SuspectCaseLink,
+    Interrogation,
+    BailFine,
+    Trial,
+    TrialStatus,
+    TrialVerdict,
+)
+from investigation.services import build_dossier
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class SuspectDossierTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.detective = make_user('detective_dossier')
+        self.detective.roles.add(Role.objects.get_or_create(name='Detective', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=self.detective)
+        self.sergeant = make_user('sergeant_dossier')
+        self.judge = make_user('judge_dossier', first_name='Hal', last_name='Judge')
+        self.suspect = Suspect.objects.create(first_name='Roy', last_name='Earle', national_id='1111111111')
+        self.links = [self._link(i) for i in range(3)]
+        self.links[0].detective_guilt_score = 8
+        self.links[0].sergeant_guilt_score = 6
+        self.links[0].captain_opinion = 'Guilty beyond doubt'
+        self.links[0].save()
+        self._interrogation(self.links[0])
+        self._interrogation(self.links[1])
+        Trial.objects.create(
+            case=self.links[0].case, judge=self.judge, status=TrialStatus.COMPLETED,
+            scheduled_date=timezone.now(), verdict=TrialVerdict.GUILTY, punishment='5 years',
+        )
+        BailFine.objects.create(suspect=self.suspect, bail_amount=Decimal('1000000.00'))
+
+    def _link(self, i):
+        case = Case.objects.create(
+            title=f'Case {i}', description='D', incident_date=timezone.now() - timedelta(days=i),
+            incident_location='L', status=CaseStatus.UNDER_INVESTIGATION, priority=CasePriority.LEVEL2,
+        )
+        return SuspectCaseLink.objects.create(suspect=self.suspect, case=case, role_in_crime=f'Role {i}')
+
+    def _interrogation(self, link):
+        return Interrogation.objects.create(
+            suspect_case_link=link, scheduled_date=timezone.now(), location='Room 1',
+            detective=self.detective, sergeant=self.sergeant,
+        )
+
+    def test_dossier_contents(self):
+        resp = self.client.get(f'/api/v1/investigation/suspects/{self.suspect.pk}/dossier/')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        data = resp.data['data']
+        self.assertEqual(data['suspect']['full_name'], 'Roy Earle')
+        self.assertEqual(data['bail_fine']['bail_amount'], '1000000.00')
+        self.assertEqual(data['summary'], {
+            'cases': 3, 'open_cases': 3, 'interrogations': 2, 'convictions': 1, 'acquittals': 0,
+        })
+        self.assertEqual(data['cases']['count'], 3)
+        first = data['cases']['results'][0]
+        self.assertEqual(first['case'], self.links[0].case_id)
+        self.assertEqual(first['priority'], CasePriority.LEVEL2)
+        self.assertEqual(first['average_guilt_score'], 7.0)
+        self.assertEqual(first['captain_opinion'], 'Guilty beyond doubt')
+        self.assertEqual(first['interrogation_count'], 1)
+        self.assertEqual(first['trial']['verdict'], TrialVerdict.GUILTY)
+        self.assertEqual(first['trial']['judge_name'], 'Hal Judge')
+        self.assertIsNone(data['cases']['results'][2]['trial'])
+        self.assertEqual(data['interrogations']['count'], 2)
+        self.assertEqual(
+            {row['case'] for row in data['interrogations']['results']}, {self.links[0].case_id, self.links[1].case_id}
+        )
+
+    def test_query_count_does_not_grow_with_cases(self):
+        with CaptureQueriesContext(connection) as small:
+            build_dossier(self.suspect.pk)
+        for i in range(3, 13):
+            self._interrogation(self._link(i))
+        with CaptureQueriesContext(connection) as large:
+            dossier = build_dossier(self.suspect.pk)
+        self.assertEqual(len(dossier['cases']), 13)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertLessEqual(len(large.captured_queries), 3)
+
+    def test_cached_until_something_changes(self):
+        url = f'/api/v1/investigation/suspects/{self.suspect.pk}/dossier/'
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as cached:
+            resp = self.client.get(url)
+        self.assertEqual(resp.data['data']['summary']['interrogations'], 2)
+        # Role check and the version query only.
+        self.assertEqual(len(cached.captured_queries), 2)
+
+        self._interrogation(self.links[2])
+        self.assertEqual(self.client.get(url).data['data']['summary']['interrogations'], 3)
+
+        trial = Trial.objects.get()
+        trial.verdict = TrialVerdict.INNOCENT
+        trial.save()
+        self.assertEqual(self.client.get(url).data['data']['summary']['acquittals'], 1)
+
+        self.links[2].delete()
+        self.assertEqual(self.client.get(url).data['data']['summary']['cases'], 2)
+
+    def test_sections_paginate_independently(self):
+        url = f'/api/v1/investigation/suspects/{self.suspect.pk}/dossier/'
+        resp = self.client.get(url, {'page_size': 2, 'cases_page': 2})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        cases = resp.data['data']['cases']
+        self.assertEqual((cases['count'], cases['page'], cases['pages']), (3, 2, 2))
+        self.assertEqual([row['case'] for row in cases['results']], [self.links[2].case_id])
+        self.assertEqual(len(resp.data['data']['interrogations']['results']), 2)
+
+        resp = self.client.get(url, {'page_size': 'x'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_suspect_and_permissions(self):
+        resp = self.client.get('/api/v1/investigation/suspects/999999/dossier/')
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+        client = APIClient()
+        client.force_authenticate(user=make_user('cadet_dossier'))
+        resp = client.get(f'/api/v1/investigation/suspects/{self.suspect.pk}/dossier/')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
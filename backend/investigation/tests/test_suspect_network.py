@@ -0,0 +1,138 @@
+"""
+Co-offender network: CSR adjacency built from suspect-case links, incremental refresh,
+co-offenders, k-hop neighbourhoods, components, centrality and /suspects/{id}/network/.
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from cases.models import Case, CaseStatus
+from investigation.models import Suspect, SuspectCaseLink
+from investigation.services.suspect_network import SuspectNetworkIndex, reset_network
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class SuspectNetworkTestCase(TestCase):
+    """
+    Cases: c1 {a, b}, c2 {b, c}, c3 {a, b}, c4 {d, e}. So a-b share two cases, b-c one,
+    a is two hops from c, and {d, e} is a separate component.
+    """
+
+    def setUp(self):
+        reset_network()
+        self.addCleanup(reset_network)
+        self.cases = [self._case(f'Case {i}') for i in range(4)]
+        self.a, self.b, self.c, self.d, self.e = [
+            Suspect.objects.create(first_name=name, last_name='Doe', national_id=f'{i:010d}')
+            for i, name in enumerate(['Ann', 'Bob', 'Cid', 'Dan', 'Eve'], start=1)
+        ]
+        for suspect, case in [
+            (self.a, 0), (self.b, 0), (self.b, 1), (self.c, 1), (self.a, 2), (self.b, 2), (self.d, 3), (self.e, 3),
+        ]:
+            SuspectCaseLink.objects.create(suspect=suspect, case=self.cases[case])
+        self.index = SuspectNetworkIndex()
+        self.index.refresh()
+
+    @property
+    def network(self):
+        return self.index.state
+
+    def _case(self, title):
+        return Case.objects.create(
+            title=title, description='D', incident_date=timezone.now(),
+            incident_location='L', status=CaseStatus.UNDER_INVESTIGATION,
+        )
+
+    def test_co_offenders_ranked_by_shared_cases(self):
+        self.assertEqual(self.network.co_offenders(self.b.pk), [(self.a.pk, 2), (self.c.pk, 1)])
+        self.assertEqual(self.network.co_offenders(self.a.pk), [(self.b.pk, 2)])
+
+    def test_neighborhood_and_distance(self):
+        self.assertEqual(self.network.neighborhood(self.a.pk, hops=1), {self.b.pk: 1})
+        self.assertEqual(self.network.neighborhood(self.a.pk, hops=2), {self.b.pk: 1, self.c.pk: 2})
+        self.assertEqual(self.network.distance(self.a.pk, self.c.pk), 2)
+        self.assertIsNone(self.network.distance(self.a.pk, self.d.pk))
+
+    def test_components(self):
+        self.assertEqual(self.network.component(self.c.pk), (3, 3))
+        self.assertEqual(self.network.component(self.e.pk), (2, 1))
+
+    def test_centrality(self):
+        ranking = self.network.ranking('pagerank', limit=5)
+        self.assertEqual(ranking[0][0], self.b.pk)
+        ties = dict(self.network.ranking('ties', limit=5))
+        self.assertEqual(ties[self.b.pk], 3)
+        self.assertEqual(ties[self.d.pk], 1)
+
+    def test_refresh_adds_only_new_links(self):
+        old = self.network
+        self.assertEqual(self.index.refresh(), 0)
+        self.assertIs(self.network, old)
+        SuspectCaseLink.objects.create(suspect=self.c, case=self.cases[3])
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self.network.distance(self.a.pk, self.e.pk), 3)
+        self.assertEqual(self.network.component(self.a.pk), (5, 4))
+        self.assertIsNone(old.distance(self.a.pk, self.e.pk))
+
+    def test_refresh_follows_moved_and_deleted_links(self):
+        SuspectCaseLink.objects.filter(suspect=self.c).delete()
+        moved = SuspectCaseLink.objects.get(suspect=self.e)
+        moved.case = self.cases[0]
+        moved.save()
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self.network.co_offenders(self.b.pk), [(self.a.pk, 2), (self.e.pk, 1)])
+        self.assertEqual(self.network.component(self.d.pk), (1, 1))
+
+        self.d.delete()
+        self.index.refresh()
+        self.assertEqual(len(self.network), 6)
+
+    def test_network_endpoint(self):
+        client = APIClient()
+        detective = make_user('detective_network')
+        detective.roles.add(Role.objects.get_or_create(name='Detective', defaults={'is_active': True})[0])
+        client.force_authenticate(user=detective)
+
+        resp = client.get(f'/api/v1/investigation/suspects/{self.a.pk}/network/?hops=2&target={self.c.pk}')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        data = resp.data['data']
+        self.assertEqual(data['suspect']['full_name'], 'Ann Doe')
+        self.assertEqual([row['id'] for row in data['co_offenders']], [self.b.pk])
+        self.assertEqual(data['co_offenders'][0]['shared_cases'], 2)
+        self.assertEqual(
+            [(row['id'], row['distance']) for row in data['neighborhood']['suspects']],
+            [(self.b.pk, 1), (self.c.pk, 2)],
+        )
+        self.assertEqual(data['component'], {'suspects': 3, 'cases': 3})
+        self.assertEqual(data['distance'], {'target': self.c.pk, 'hops': 2})
+
+        resp = client.get('/api/v1/investigation/suspects/network/centrality/?metric=ties&limit=1')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual([row['id'] for row in resp.data['data']], [self.b.pk])
+
+    def test_network_endpoint_requires_detective_rank(self):
+        client = APIClient()
+        cadet = make_user('cadet_network')
+        cadet.roles.add(Role.objects.get_or_create(name='Cadet', defaults={'is_active': True})[0])
+        client.force_authenticate(user=cadet)
+        resp = client.get(f'/api/v1/investigation/suspects/{self.a.pk}/network/')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
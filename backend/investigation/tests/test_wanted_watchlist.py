@@ -0,0 +1,178 @@
+"""
+Wanted-person watchlist: snapshot lookups, Bloom filter front, incremental refresh from
+Suspect changes, and /investigation/watchlist/check/ single and batch checks.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from investigation.models import Suspect
+from investigation.services import BloomFilter, WantedWatchlist, reset_wanted_watchlist
+from accounts.models import Role
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class BloomFilterTestCase(TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        keys = [f'n{i:010d}' for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'p{i:010d}' in bloom for i in range(10000))
+        self.assertLess(false_positives, 50)
+
+
+class WantedWatchlistTestCase(TestCase):
+
+    def setUp(self):
+        self.wanted = Suspect.objects.create(
+            first_name='Roy', last_name='Earle', national_id='1111111111', phone_number='09121234567', is_wanted=True,
+        )
+        self.detained = Suspect.objects.create(first_name='Ann', last_name='Doe', national_id='2222222222')
+        self.clock = FakeClock()
+
+    def test_check_by_national_id_and_phone(self):
+        for bloom in (False, True):
+            watchlist = WantedWatchlist(bloom=bloom, clock=self.clock)
+            watchlist.refresh()
+            self.assertEqual(len(watchlist), 1)
+            self.assertEqual(watchlist.check(national_id='۱۱۱۱۱۱۱۱۱۱'), [self.wanted.pk])
+            self.assertEqual(watchlist.check(phone='+98 912 123 4567'), [self.wanted.pk])
+            self.assertEqual(watchlist.check('1111111111', '09121234567'), [self.wanted.pk])
+            self.assertEqual(watchlist.check(national_id='2222222222'), [])
+            self.assertEqual(watchlist.check(), [])
+
+    def test_synthetic_national_id_is_not_checked(self):
+        Suspect.objects.create(
+            first_name='X', last_name='Y', national_id='3333333333', national_id_is_synthetic=True, is_wanted=True,
+        )
+        watchlist = WantedWatchlist(clock=self.clock)
+        watchlist.refresh()
+        self.assertEqual(watchlist.check(national_id='3333333333'), [])
+
+    def test_check_many_returns_hits_only(self):
+        watchlist = WantedWatchlist(clock=self.clock)
+        watchlist.refresh()
+        hits = watchlist.check_many(national_ids=['1111111111', '2222222222', 'bad'], phones=['09121234567'])
+        self.assertEqual(hits, [
+            ('national_id', '1111111111', [self.wanted.pk]),
+            ('phone', '09121234567', [self.wanted.pk]),
+        ])
+
+    def test_refresh_follows_suspect_changes(self):
+        watchlist = WantedWatchlist(refresh_interval=2.0, clock=self.clock)
+        watchlist.maybe_refresh()
+        old_snapshot = watchlist.snapshot
+
+        self.detained.mark_as_wanted()
+        self.wanted.mark_as_captured('Central Station')
+        watchlist.maybe_refresh()
+        self.assertIs(watchlist.snapshot, old_snapshot)
+
+        self.clock.now = 2.0
+        watchlist.maybe_refresh()
+        self.assertIsNot(watchlist.snapshot, old_snapshot)
+        self.assertEqual(watchlist.check(national_id='2222222222'), [self.detained.pk])
+        self.assertEqual(watchlist.check(national_id='1111111111'), [])
+        self.assertEqual(old_snapshot.national_ids, {'1111111111': (self.wanted.pk,)})
+
+    def test_refresh_follows_updates_and_deletes(self):
+        watchlist = WantedWatchlist(clock=self.clock)
+        watchlist.refresh()
+        self.wanted.national_id = '4444444444'
+        self.wanted.save()
+        watchlist.refresh()
+        self.assertEqual(watchlist.check(national_id='4444444444'), [self.wanted.pk])
+        self.wanted.delete()
+        self.assertEqual(watchlist.refresh(), 1)
+        self.assertEqual(len(watchlist), 0)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_wanted_watchlist', '--wanted', '100', '--checks', '500', '--requests', '5', stdout=out)
+        self.assertIn('Single checks: 500', out.getvalue())
+        self.assertIn('POST requests', out.getvalue())
+
+
+class WantedCheckApiTestCase(TestCase):
+
+    def setUp(self):
+        reset_wanted_watchlist()
+        self.addCleanup(reset_wanted_watchlist)
+        self.client = APIClient()
+        officer = make_user('officer_watchlist')
+        officer.roles.add(Role.objects.get_or_create(name='Police Officer', defaults={'is_active': True})[0])
+        self.client.force_authenticate(user=officer)
+        self.wanted = Suspect.objects.create(
+            first_name='Roy', last_name='Earle', national_id='1111111111', phone_number='09121234567', is_wanted=True,
+        )
+
+    def test_single_check(self):
+        resp = self.client.get('/api/v1/investigation/watchlist/check/?national_id=1111111111')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual(resp.data['data'], {'wanted': True, 'suspect_ids': [self.wanted.pk]})
+
+        resp = self.client.get('/api/v1/investigation/watchlist/check/?phone=09350000000')
+        self.assertEqual(resp.data['data'], {'wanted': False, 'suspect_ids': []})
+
+        resp = self.client.get('/api/v1/investigation/watchlist/check/')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_check(self):
+        resp = self.client.post(
+            '/api/v1/investigation/watchlist/check/',
+            {'national_ids': ['1111111111', '4444444444'], 'phones': ['0912 123 4567']},
+            format='json',
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK, resp.data)
+        self.assertEqual(resp.data['data']['checked'], 3)
+        self.assertEqual(
+            [(hit['kind'], hit['value']) for hit in resp.data['data']['hits']],
+            [('national_id', '1111111111'), ('phone', '0912 123 4567')],
+        )
+
+    def test_batch_check_validation(self):
+        resp = self.client.post('/api/v1/investigation/watchlist/check/', {'national_ids': '1111111111'}, format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post(
+            '/api/v1/investigation/watchlist/check/', {'national_ids': ['1'] * 1001}, format='json'
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post('/api/v1/investigation/watchlist/check/', ['1111111111'], format='json')
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_police_role(self):
+        client = APIClient()
+        client.force_authenticate(user=make_user('civilian_watchlist'))
+        resp = client.get('/api/v1/investigation/watchlist/check/?national_id=1111111111')
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
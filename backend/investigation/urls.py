@@ -3,6 +3,12 @@ Investigation app URLs (global scope).
 Mount at: core/investigation/
 - Notifications (user's notifications)
 - Intensive Pursuit (PROJECT Suspect Status)
+- Suspects (co-offender network)
+- Persons and merge suggestions (entity resolution)
+- Wanted watchlist checks (watchlist/check/)
+- Scheduling (next free slot, trial auto-scheduling)
+- Judges (judges/me/docket/)
+- Bail/fine payment callbacks from the gateway (payment-callbacks/)
 Case-scoped routes (evidence-links, detective-reports, suspect-links, trial) are in case_urls.py, mounted at core/cases/<case_pk>/investigation/
 """
 from django.urls import path, include
@@ -10,6 +16,12 @@ from rest_framework.routers import DefaultRouter
 
 from .views.case_resolution import NotificationViewSet
 from .views.intensive_pursuit import IntensivePursuitViewSet
+from .views.suspect import SuspectViewSet
+from .views.identity import PersonClusterViewSet, MergeSuggestionViewSet
+from .views.watchlist import WantedCheckView
+from .views.scheduling import ScheduleViewSet
+from .views.judge import JudgeViewSet
+from .views.payment_callback import PaymentCallbackView
 
 from .views.content_types import ContentTypeViewSet
 
@@ -17,9 +29,16 @@ router = DefaultRouter()
 router.register(r'notifications', NotificationViewSet, basename='notification')
 router.register(r'intensive-pursuit', IntensivePursuitViewSet, basename='intensive-pursuit')
 router.register(r'content-types', ContentTypeViewSet, basename='content-types')
+router.register(r'suspects', SuspectViewSet, basename='suspect')
+router.register(r'persons', PersonClusterViewSet, basename='person')
+router.register(r'merge-suggestions', MergeSuggestionViewSet, basename='merge-suggestion')
+router.register(r'schedule', ScheduleViewSet, basename='schedule')
+router.register(r'judges', JudgeViewSet, basename='judge')
 
 app_name = 'investigation'
 
 urlpatterns = [
+    path('watchlist/check/', WantedCheckView.as_view(), name='wanted-check'),
+    path('payment-callbacks/', PaymentCallbackView.as_view(), name='payment-callbacks'),
     path('', include(router.urls)),
 ]
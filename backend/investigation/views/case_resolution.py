@@ -25,6 +25,7 @@ from investigation.serializers.case_resolution import (
     DetectiveReportCreateSerializer,
     NotificationSerializer,
 )
+from core.fieldsets import SparseFieldsetMixin
 from accounts.permissions import IsDetective, IsSergeant, IsDetectiveOrSergeantOrChief
 
 # Evidence model names that can be linked on the Detective Board (must have case_id)
@@ -113,14 +114,13 @@ def _build_suspect_from_evidence(case, report, reported_suspect):
             phone_number = obj.witness_contact
 
     if obj is not None and hasattr(obj, 'document_attributes'):
-        attrs = obj.document_attributes or {}
-        for key in ['national_id', 'id_number', 'ID_Number', 'nationalCode', 'national_code']:
-            candidate = _normalize_national_id(attrs.get(key))
-            if candidate:
-                national_id = candidate
-                break
-
-    if not national_id:
+        # Attribute keys are canonicalised on save, so every ID spelling is stored as national_id.
+        candidate = _normalize_national_id(obj.get_attribute('national_id'))
+        if candidate:
+            national_id = candidate
+
+    synthetic = not national_id
+    if synthetic:
         seed = f"{case.id}:{report.id}:{reported_suspect.content_type_id}:{reported_suspect.object_id}"
         national_id = _generate_unique_national_id(seed)
 
@@ -128,6 +128,7 @@ def _build_suspect_from_evidence(case, report, reported_suspect):
         'first_name': first_name,
         'last_name': last_name,
         'phone_number': phone_number,
+        'national_id_is_synthetic': synthetic,
     }
     suspect, _ = Suspect.objects.get_or_create(
         national_id=national_id,
@@ -148,7 +149,7 @@ def _build_suspect_from_evidence(case, report, reported_suspect):
     return link_created
 
 
-class EvidenceLinkViewSet(viewsets.ModelViewSet):
+class EvidenceLinkViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = EvidenceLinkSerializer
     permission_classes = [IsDetectiveOrSergeantOrChief]
 
@@ -191,7 +192,7 @@ class EvidenceLinkViewSet(viewsets.ModelViewSet):
         )
 
 
-class DetectiveReportViewSet(viewsets.ModelViewSet):
+class DetectiveReportViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = DetectiveReportSerializer
     permission_classes = [IsAuthenticated]
 
@@ -312,7 +313,7 @@ class DetectiveReportViewSet(viewsets.ModelViewSet):
         })
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
 
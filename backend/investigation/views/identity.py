@@ -0,0 +1,64 @@
+from django.db.models import F
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from investigation.models import PersonCluster, MergeSuggestion, MergeSuggestionStatus
+from investigation.serializers.identity import (
+    PersonClusterSerializer,
+    MergeSuggestionSerializer,
+    MergeSuggestionReviewSerializer,
+)
+from investigation.services.entity_resolution import review_suggestion
+from core.fieldsets import SparseFieldsetMixin
+from accounts.permissions import IsDetectiveOrSergeantOrChief
+
+
+class PersonClusterViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+    """Resolved persons with every suspect/user/witness/document-owner record assigned to them."""
+    serializer_class = PersonClusterSerializer
+    permission_classes = [IsDetectiveOrSergeantOrChief]
+
+    def get_queryset(self):
+        queryset = PersonCluster.objects.prefetch_related('records__content_type')
+        national_id = self.request.query_params.get('national_id')
+        if national_id:
+            queryset = queryset.filter(records__national_id=national_id).distinct()
+        return queryset
+
+
+class MergeSuggestionViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Pairs of person records that may be the same person (?status=PENDING by default,
+    best score first). Suggestions whose records were merged since are hidden.
+    """
+    serializer_class = MergeSuggestionSerializer
+    permission_classes = [IsDetectiveOrSergeantOrChief]
+
+    def get_queryset(self):
+        queryset = MergeSuggestion.objects.select_related(
+            'left__content_type', 'right__content_type', 'reviewed_by'
+        )
+        suggestion_status = self.request.query_params.get('status', MergeSuggestionStatus.PENDING)
+        queryset = queryset.filter(status=suggestion_status.upper())
+        if suggestion_status.upper() == MergeSuggestionStatus.PENDING:
+            queryset = queryset.exclude(left__cluster=F('right__cluster'))
+        return queryset
+
+    @action(detail=True, methods=['post'], url_path='review')
+    def review(self, request, pk=None):
+        suggestion = self.get_object()
+        if suggestion.status != MergeSuggestionStatus.PENDING:
+            return Response(
+                {'status': 'error', 'message': 'Suggestion has already been reviewed.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = MergeSuggestionReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        accept = serializer.validated_data['action'] == 'accept'
+        review_suggestion(suggestion, accept, request.user)
+        return Response({
+            'status': 'success',
+            'data': MergeSuggestionSerializer(suggestion).data,
+            'message': 'Records merged into one person.' if accept else 'Suggestion rejected.',
+        })
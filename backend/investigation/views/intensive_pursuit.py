@@ -10,9 +10,10 @@ from rest_framework.response import Response
 
 from investigation.models import Suspect
 from investigation.serializers.suspect import IntensivePursuitSerializer
+from core.fieldsets import SparseFieldsetMixin
 
 
-class IntensivePursuitViewSet(viewsets.ReadOnlyModelViewSet):
+class IntensivePursuitViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     List of suspects in Intensive Pursuit status (under pursuit > 30 days).
     Page that all users can see; each entry has photo, details, ranking, reward.
@@ -0,0 +1,37 @@
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from investigation.models import TrialStatus
+from investigation.services.docket import DOCKET_STATUSES, get_docket
+from accounts.permissions import IsJudge
+
+
+class JudgeViewSet(viewsets.ViewSet):
+    """The requesting judge's docket. URL: /api/v1/investigation/judges/me/docket/"""
+    permission_classes = [IsJudge]
+
+    @action(detail=False, methods=['get'], url_path='me/docket')
+    def docket(self, request):
+        """
+        Upcoming and ongoing trials with case header, evidence counts and involved individuals.
+        ?status= (comma-separated, default SCHEDULED,IN_PROGRESS), ?page=, ?page_size= (1-100).
+        """
+        statuses = [s for s in request.query_params.get('status', '').upper().split(',') if s] or DOCKET_STATUSES
+        if not set(statuses) <= set(TrialStatus.values):
+            return Response(
+                {'status': 'error', 'message': f'status must be among {", ".join(TrialStatus.values)}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+            page_size = min(max(int(request.query_params.get('page_size', 20)), 1), 100)
+        except ValueError:
+            return Response(
+                {'status': 'error', 'message': 'page and page_size must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response({
+            'status': 'success',
+            'data': get_docket(request.user.pk, statuses, page, page_size),
+        })
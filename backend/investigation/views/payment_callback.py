@@ -0,0 +1,53 @@
+import hashlib
+import hmac
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from investigation.serializers.payment_callback import PaymentCallbackSerializer
+from investigation.services.payment_callbacks import MAX_INGEST_BATCH, ingest
+
+
+class HasGatewaySignature(BasePermission):
+    """
+    The body is signed with the gateway's shared secret (X-Gateway-Signature: hex HMAC-SHA256),
+    or the caller is a superuser (manual replays).
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        if user and user.is_authenticated and user.is_superuser:
+            return True
+        secret = getattr(settings, 'PAYMENT_GATEWAY', {}).get('CALLBACK_SECRET', '')
+        signature = request.headers.get('X-Gateway-Signature', '')
+        if not secret or not signature:
+            return False
+        expected = hmac.new(secret.encode(), request.body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+
+class PaymentCallbackView(APIView):
+    """
+    Gateway callbacks for bail and fine payments: one callback object, or a list of up to
+    MAX_INGEST_BATCH. Callbacks are queued and applied by `manage.py process_payment_callbacks`;
+    references already received are dropped as duplicates.
+    """
+    permission_classes = [HasGatewaySignature]
+
+    def post(self, request):
+        many = isinstance(request.data, list)
+        if many and len(request.data) > MAX_INGEST_BATCH:
+            return Response(
+                {'status': 'error', 'message': f'At most {MAX_INGEST_BATCH} callbacks per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        ser = PaymentCallbackSerializer(data=request.data, many=many)
+        ser.is_valid(raise_exception=True)
+        queued, duplicates = ingest(ser.validated_data if many else [ser.validated_data])
+        return Response(
+            {'status': 'success', 'data': {'queued': queued, 'duplicates': duplicates}},
+            status=status.HTTP_202_ACCEPTED
+        )
@@ -0,0 +1,81 @@
+"""
+Scheduling: next free slot for a set of resources and batch auto-scheduling of trials.
+Conflict checking itself happens when trials and interrogations are booked (see
+investigation.services.scheduling).
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from cases.models import Case
+from investigation.models import ResourceKind
+from investigation.serializers.scheduling import NextFreeSlotSerializer, AutoScheduleTrialsSerializer
+from investigation.serializers.trial import TrialSerializer
+from investigation.services.scheduling import auto_schedule_trials, next_free_slot, person, room
+from accounts.permissions import IsPoliceRankExceptCadet, IsSergeantOrCaptainOrChiefOrAdmin, JUDGE
+
+RESOURCE_PARAMS = [
+    ('detective', ResourceKind.DETECTIVE, person),
+    ('sergeant', ResourceKind.SERGEANT, person),
+    ('judge', ResourceKind.JUDGE, person),
+    ('interrogation_room', ResourceKind.INTERROGATION_ROOM, room),
+    ('courtroom', ResourceKind.COURTROOM, room),
+]
+
+
+class ScheduleViewSet(viewsets.ViewSet):
+    """Free-slot search (police ranks) and trial auto-scheduling (sergeant, captain, chief, admin)."""
+
+    def get_permissions(self):
+        if self.action == 'auto_schedule_trials':
+            return [IsSergeantOrCaptainOrChiefOrAdmin()]
+        return [IsPoliceRankExceptCadet()]
+
+    @action(detail=False, methods=['get'], url_path='next-free-slot')
+    def next_free_slot(self, request):
+        """?detective=&sergeant=&judge=&interrogation_room=&courtroom=&duration_minutes=&after= (ISO)."""
+        ser = NextFreeSlotSerializer(data=request.query_params)
+        ser.is_valid(raise_exception=True)
+        params = ser.validated_data
+        resources = [build(kind, params[name]) for name, kind, build in RESOURCE_PARAMS if name in params]
+        slot = next_free_slot(resources, timedelta(minutes=params['duration_minutes']), params.get('after'))
+        if slot is None:
+            return Response(
+                {'status': 'error', 'message': 'No free slot for these resources within the search horizon.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'status': 'success', 'data': {'start': slot[0], 'end': slot[1]}})
+
+    @action(detail=False, methods=['post'], url_path='auto-schedule-trials')
+    def auto_schedule_trials(self, request):
+        """Schedule trials for the given cases across judges, balancing their load."""
+        ser = AutoScheduleTrialsSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        params = ser.validated_data
+        cases = list(Case.objects.filter(pk__in=params['case_ids'], trial__isnull=True))
+        judges = get_user_model().objects.filter(roles__name=JUDGE, roles__is_active=True).distinct()
+        if 'judge_ids' in params:
+            judges = judges.filter(pk__in=params['judge_ids'])
+        judges = list(judges)
+        if not judges:
+            return Response(
+                {'status': 'error', 'message': 'No judges available to schedule.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        trials, unscheduled = auto_schedule_trials(
+            cases, judges, params['courtrooms'], params.get('after'),
+            timedelta(minutes=params['duration_minutes']),
+        )
+        skipped = sorted(set(params['case_ids']) - {case.pk for case in cases})
+        return Response({
+            'status': 'success',
+            'data': {
+                'scheduled': TrialSerializer(trials, many=True).data,
+                'unscheduled': [case.pk for case in unscheduled],
+                'skipped': skipped,
+            },
+            'message': f'{len(trials)} trial(s) scheduled.',
+        })
@@ -1,3 +1,6 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -6,7 +9,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
 from cases.models import Case
-from investigation.models import SuspectCaseLink
+from investigation.models import Suspect, SuspectCaseLink
 from investigation.serializers.suspect import (
     SuspectCaseLinkSerializer,
     SuspectCaseLinkCreateSerializer,
@@ -14,6 +17,13 @@ from investigation.serializers.suspect import (
     CaptainOpinionSerializer,
     ChiefApprovalSerializer,
 )
+from investigation.serializers.profile import BiologicalProfileCreateSerializer, BiologicalProfileSerializer
+from investigation.services.profile_matching import create_profile
+from investigation.services.suspect_network import MAX_HOPS, get_network
+from investigation.services.dossier import get_dossier
+from investigation.serializers.scheduling import ScheduleInterrogationSerializer, InterrogationSerializer
+from investigation.services.scheduling import ScheduleConflict, describe_conflicts, schedule_interrogation
+from core.fieldsets import SparseFieldsetMixin
 from accounts.permissions import (
     IsDetective,
     IsSergeant,
@@ -21,10 +31,12 @@ from accounts.permissions import (
     IsPoliceChief,
     IsDetectiveOrSergeantOrChief,
     IsSergeantOrCaptainOrChief,
+    DETECTIVE,
+    SERGEANT,
 )
 
 
-class SuspectCaseLinkViewSet(viewsets.GenericViewSet):
+class SuspectCaseLinkViewSet(SparseFieldsetMixin, viewsets.GenericViewSet):
     """Suspect-case links: guilt scores (detective/sergeant), captain opinion, chief approval (critical cases)."""
     serializer_class = SuspectCaseLinkSerializer
     permission_classes = [IsAuthenticated]
@@ -48,8 +60,7 @@ class SuspectCaseLinkViewSet(viewsets.GenericViewSet):
         return [IsDetectiveOrSergeantOrChief()]
 
     def list(self, request, case_pk=None):
-        links = self.get_queryset()
-        return Response({'status': 'success', 'data': SuspectCaseLinkSerializer(links, many=True).data})
+        return Response({'status': 'success', 'data': self.serialize_list(self.get_queryset())})
 
     def retrieve(self, request, case_pk=None, pk=None):
         link = get_object_or_404(SuspectCaseLink, case_id=case_pk, pk=pk)
@@ -174,3 +185,191 @@ class SuspectCaseLinkViewSet(viewsets.GenericViewSet):
             'data': SuspectCaseLinkSerializer(link).data,
             'message': f'{suspect.full_name} marked as captured.',
         })
+
+    @action(detail=True, methods=['post'], url_path='interrogations')
+    def interrogations(self, request, case_pk=None, pk=None):
+        """Schedule an interrogation; 409 if the detective, sergeant or room is already booked then."""
+        link = get_object_or_404(SuspectCaseLink, case_id=case_pk, pk=pk)
+        ser = ScheduleInterrogationSerializer(data=request.data)
+        ser.is_valid(raise_exception=True)
+        User = get_user_model()
+        detective = get_object_or_404(User, pk=ser.validated_data.get('detective_id', request.user.pk))
+        sergeant = get_object_or_404(User, pk=ser.validated_data['sergeant_id'])
+        if not detective.has_role(DETECTIVE):
+            return Response(
+                {'status': 'error', 'message': 'Selected user must have the Detective role.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not sergeant.has_role(SERGEANT):
+            return Response(
+                {'status': 'error', 'message': 'Selected user must have the Sergeant role.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            interrogation = schedule_interrogation(
+                link, detective, sergeant,
+                ser.validated_data['location'],
+                ser.validated_data['scheduled_date'],
+                timedelta(minutes=ser.validated_data['duration_minutes']),
+            )
+        except ScheduleConflict as exc:
+            return Response(
+                {'status': 'error', 'message': str(exc), 'conflicts': describe_conflicts(exc.conflicts)},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(
+            {
+                'status': 'success',
+                'data': InterrogationSerializer(interrogation).data,
+                'message': f'Interrogation {interrogation.interrogation_number} scheduled.',
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(detail=True, methods=['post'], url_path='profile')
+    def profile(self, request, case_pk=None, pk=None):
+        """Store a reference STR / minutiae profile for the suspect and match it against stored samples."""
+        link = get_object_or_404(SuspectCaseLink, case_id=case_pk, pk=pk)
+        serializer = BiologicalProfileCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        profile, matches = create_profile(suspect=link.suspect, **serializer.validated_data)
+        return Response(
+            {
+                'status': 'success',
+                'data': BiologicalProfileSerializer(profile).data,
+                'message': f'{len(matches)} candidate match(es) found.',
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+def _int_param(query_params, name, default, low, high):
+    return min(max(int(query_params.get(name, default)), low), high)
+
+
+def _suspect_names(ids):
+    return {
+        row['id']: row for row in Suspect.objects.filter(pk__in=ids).values('id', 'first_name', 'last_name', 'national_id')
+    }
+
+
+def _describe_suspect(names, suspect_id, **extra):
+    row = names.get(suspect_id, {})
+    return {
+        'id': suspect_id,
+        'full_name': f"{row.get('first_name', '')} {row.get('last_name', '')}".strip(),
+        'national_id': row.get('national_id'),
+        **extra,
+    }
+
+
+def _section_page(items, page, page_size):
+    start = (page - 1) * page_size
+    return {
+        'count': len(items),
+        'page': page,
+        'pages': max((len(items) + page_size - 1) // page_size, 1),
+        'results': items[start:start + page_size],
+    }
+
+
+class SuspectViewSet(viewsets.GenericViewSet):
+    """Suspects across cases: dossier and co-offender network analytics (see investigation.services)."""
+    queryset = Suspect.objects.all()
+    permission_classes = [IsDetectiveOrSergeantOrChief]
+
+    @action(detail=True, methods=['get'], url_path='dossier')
+    def dossier(self, request, pk=None):
+        """
+        Full history across cases: cases (with scores, decisions and trial), interrogations, bail/fine.
+        The cases and interrogations sections are paginated separately: ?cases_page=, ?interrogations_page=,
+        ?page_size= (1-100).
+        """
+        try:
+            suspect_id = int(pk)
+            page_size = _int_param(request.query_params, 'page_size', 20, 1, 100)
+            cases_page = _int_param(request.query_params, 'cases_page', 1, 1, 10**6)
+            interrogations_page = _int_param(request.query_params, 'interrogations_page', 1, 1, 10**6)
+        except ValueError:
+            return Response(
+                {'status': 'error', 'message': 'Page numbers and page_size must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        dossier = get_dossier(suspect_id)
+        if dossier is None:
+            return Response({'status': 'error', 'message': 'Suspect not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({
+            'status': 'success',
+            'data': {
+                **dossier,
+                'cases': _section_page(dossier['cases'], cases_page, page_size),
+                'interrogations': _section_page(dossier['interrogations'], interrogations_page, page_size),
+            },
+        })
+
+    @action(detail=True, methods=['get'], url_path='network')
+    def network(self, request, pk=None):
+        """Co-offenders, k-hop neighbourhood (?hops=1-4), component size, centrality; ?target=<id> adds a distance."""
+        suspect = self.get_object()
+        try:
+            hops = _int_param(request.query_params, 'hops', 2, 1, MAX_HOPS)
+            limit = _int_param(request.query_params, 'limit', 50, 1, 500)
+            target = request.query_params.get('target')
+            target = int(target) if target else None
+        except ValueError:
+            return Response(
+                {'status': 'error', 'message': 'hops, limit and target must be integers.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        graph = get_network()
+        co_offenders = graph.co_offenders(suspect.pk)[:limit]
+        neighborhood = sorted(graph.neighborhood(suspect.pk, hops).items(), key=lambda item: (item[1], item[0]))
+        pagerank = graph.pagerank()
+        ties = graph.co_offence_ties()
+        score = float(pagerank[suspect.pk]) if suspect.pk < len(pagerank) else 0.0
+        component_suspects, component_cases = graph.component(suspect.pk)
+        names = _suspect_names(
+            [suspect.pk] + [pk for pk, _ in co_offenders] + [pk for pk, _ in neighborhood[:limit]]
+        )
+        data = {
+            'suspect': _describe_suspect(names, suspect.pk),
+            'cases': [int(case_id) for case_id in graph.cases_of(suspect.pk)],
+            'co_offenders': [_describe_suspect(names, pk, shared_cases=shared) for pk, shared in co_offenders],
+            'neighborhood': {
+                'hops': hops,
+                'total': len(neighborhood),
+                'suspects': [_describe_suspect(names, pk, distance=distance) for pk, distance in neighborhood[:limit]],
+            },
+            'component': {'suspects': component_suspects, 'cases': component_cases},
+            'centrality': {
+                'co_offence_ties': int(ties[suspect.pk]) if suspect.pk < len(ties) else 0,
+                'pagerank': score,
+                'pagerank_rank': int((pagerank > score).sum()) + 1 if score else None,
+            },
+        }
+        if target is not None:
+            data['distance'] = {'target': target, 'hops': graph.distance(suspect.pk, target)}
+        return Response({'status': 'success', 'data': data})
+
+    @action(detail=False, methods=['get'], url_path='network/centrality')
+    def centrality(self, request):
+        """Most central suspects of the co-offender network; ?metric=pagerank|ties, ?limit=."""
+        metric = request.query_params.get('metric', 'pagerank')
+        if metric not in ('pagerank', 'ties'):
+            return Response(
+                {'status': 'error', 'message': 'metric must be pagerank or ties.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = _int_param(request.query_params, 'limit', 20, 1, 200)
+        except ValueError:
+            return Response(
+                {'status': 'error', 'message': 'limit must be an integer.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        ranking = get_network().ranking(metric, limit)
+        names = _suspect_names([pk for pk, _ in ranking])
+        return Response({
+            'status': 'success',
+            'data': [_describe_suspect(names, pk, score=score) for pk, score in ranking],
+        })
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
@@ -15,6 +17,8 @@ from cases.models import (
 )
 from investigation.models import Trial, TrialStatus, TrialVerdict, SuspectCaseLink
 from investigation.serializers.trial import TrialSerializer, RecordVerdictSerializer, CreateTrialSerializer
+from investigation.services.docket import describe_individual
+from investigation.services.scheduling import ScheduleConflict, describe_conflicts, schedule_trial
 from accounts.permissions import IsJudge, IsSergeantOrCaptainOrChiefOrAdmin
 
 
@@ -40,20 +44,9 @@ def _evidence_summaries(case):
 
 def _involved_individuals(case):
     """Suspects and their details linked to this case (complete details of all involved individuals)."""
-    individuals = []
-    for link in SuspectCaseLink.objects.filter(case=case).select_related('suspect'):
-        s = link.suspect
-        individuals.append({
-            'id': s.id,
-            'full_name': s.full_name,
-            'national_id': s.national_id,
-            'role': 'suspect',
-            'guilt_scores': {
-                'detective': link.detective_guilt_score,
-                'sergeant': link.sergeant_guilt_score,
-            } if (link.detective_guilt_score is not None or link.sergeant_guilt_score is not None) else None,
-        })
-    return individuals
+    return [
+        describe_individual(link) for link in SuspectCaseLink.objects.filter(case=case).select_related('suspect')
+    ]
 
 
 class TrialViewSet(viewsets.ViewSet):
@@ -69,7 +62,7 @@ class TrialViewSet(viewsets.ViewSet):
         return [IsJudge()]
 
     def create(self, request, case_pk=None):
-        """Sergeant/Captain/Chief schedules a trial for a case."""
+        """Sergeant/Captain/Chief schedules a trial for a case; 409 if the judge or courtroom is already booked."""
         case = get_object_or_404(Case, pk=case_pk)
         if hasattr(case, 'trial') and case.trial:
             return Response(
@@ -88,12 +81,17 @@ class TrialViewSet(viewsets.ViewSet):
                 {'status': 'error', 'message': 'Selected user must have the Judge role.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        trial = Trial.objects.create(
-            case=case,
-            judge=judge,
-            scheduled_date=scheduled_date,
-            status=TrialStatus.SCHEDULED,
-        )
+        try:
+            trial = schedule_trial(
+                case, judge, scheduled_date,
+                courtroom=ser.validated_data['courtroom'],
+                duration=timedelta(minutes=ser.validated_data['duration_minutes']),
+            )
+        except ScheduleConflict as exc:
+            return Response(
+                {'status': 'error', 'message': str(exc), 'conflicts': describe_conflicts(exc.conflicts)},
+                status=status.HTTP_409_CONFLICT
+            )
         return Response(
             {
                 'status': 'success',
@@ -0,0 +1,62 @@
+from collections.abc import Mapping
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsCadetOrOfficer
+from investigation.services.wanted_watchlist import MAX_BATCH_CHECKS, get_wanted_watchlist
+
+
+def _values(data, key):
+    if not isinstance(data, Mapping):
+        return None
+    values = data.get(key) or []
+    if not isinstance(values, list):
+        return None
+    return [str(value) for value in values]
+
+
+class WantedCheckView(APIView):
+    """
+    Is this national id or phone number a wanted suspect's? Answered from the in-memory
+    watchlist with no serializer, pagination or query beyond authentication.
+
+    GET ?national_id=&phone= checks one person; POST {"national_ids": [...], "phones": [...]}
+    checks up to MAX_BATCH_CHECKS values and returns only the hits.
+    """
+    permission_classes = [IsCadetOrOfficer]
+
+    def get(self, request):
+        national_id = request.query_params.get('national_id', '')
+        phone = request.query_params.get('phone', '')
+        if not national_id and not phone:
+            return Response(
+                {'status': 'error', 'message': 'national_id or phone is required.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        suspect_ids = get_wanted_watchlist().check(national_id, phone)
+        return Response({'status': 'success', 'data': {'wanted': bool(suspect_ids), 'suspect_ids': suspect_ids}})
+
+    def post(self, request):
+        national_ids = _values(request.data, 'national_ids')
+        phones = _values(request.data, 'phones')
+        if national_ids is None or phones is None:
+            return Response(
+                {'status': 'error', 'message': 'Send an object whose national_ids and phones are lists.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        checked = len(national_ids) + len(phones)
+        if checked > MAX_BATCH_CHECKS:
+            return Response(
+                {'status': 'error', 'message': f'At most {MAX_BATCH_CHECKS} values per request.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        hits = get_wanted_watchlist().check_many(national_ids, phones)
+        return Response({
+            'status': 'success',
+            'data': {
+                'checked': checked,
+                'hits': [{'kind': kind, 'value': value, 'suspect_ids': ids} for kind, value, ids in hits],
+            },
+        })
@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_save
 
 
 class RewardsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rewards'
     verbose_name = 'Rewards (tips, reward codes, redemption)'
+
+    def ready(self):
+        from rewards.signals import sync_recipient_national_id
+        post_save.connect(sync_recipient_national_id, sender=settings.AUTH_USER_MODEL,
+                          dispatch_uid='rewards.sync_recipient_national_id')
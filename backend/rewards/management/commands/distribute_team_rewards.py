@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from rewards.models import RewardStatus, TeamReward
+from rewards.services.distribution import PAYOUT_BATCH_SIZE, distribute, pay_out_rewards, requeue_failed_payouts
+
+
+class Command(BaseCommand):
+    help = 'Distribute every approved team reward among its case team, then optionally pay the rewards out'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Team rewards distributed per transaction')
+        parser.add_argument('--pay', action='store_true', help='Send the queued payouts through the gateway')
+        parser.add_argument('--payout-batch-size', type=int, default=PAYOUT_BATCH_SIZE)
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Queue failed payouts of still-approved rewards again before paying')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        pending = list(
+            TeamReward.objects.filter(status=RewardStatus.APPROVED, distribution_completed=False)
+            .order_by('id').values_list('id', flat=True)
+        )
+        distributed = rewards = 0
+        skipped = []
+        for i in range(0, len(pending), options['chunk_size']):
+            result = distribute(pending[i:i + options['chunk_size']])
+            distributed += result.distributed
+            rewards += len(result.rewards)
+            skipped.extend(result.skipped)
+        self.stdout.write(self.style.SUCCESS(
+            f"Distributed {distributed} team rewards into {rewards} rewards "
+            f"in {time.perf_counter() - started:.1f}s."
+        ))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f"Skipped {len(skipped)} team rewards with no team: {', '.join(map(str, skipped))}"
+            ))
+        if options['retry_failed']:
+            self.stdout.write(f"Re-queued {requeue_failed_payouts()} failed payouts.")
+        if options['pay']:
+            started = time.perf_counter()
+            result = pay_out_rewards(options['payout_batch_size'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Paid {result.paid} rewards ({result.failed} failed, {result.requeued} queued for retry) in {time.perf_counter() - started:.1f}s."
+            ))
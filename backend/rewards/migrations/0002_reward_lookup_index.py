@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-19 05:14
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_national_ids(apps, schema_editor):
+    Reward = apps.get_model('rewards', 'Reward')
+    User = apps.get_model('accounts', 'UserProfile')
+    Reward.objects.filter(is_civilian_reward=True).update(
+        recipient_national_id=Subquery(User.objects.filter(pk=OuterRef('recipient_id')).values('national_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('rewards', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reward',
+            name='recipient_national_id',
+            field=models.CharField(blank=True, editable=False, help_text="Copy of the recipient's national ID for civilian rewards, for counter lookups", max_length=10, verbose_name='Recipient National ID'),
+        ),
+        migrations.RunPython(copy_national_ids, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reward',
+            index=models.Index(condition=models.Q(('is_civilian_reward', True)), fields=['recipient_national_id', 'reward_code'], include=('status',), name='reward_civilian_lookup_idx'),
+        ),
+    ]
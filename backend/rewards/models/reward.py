@@ -1,10 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
 from django.utils.crypto import get_random_string
 
-from core.models import BaseModel
+from core.models import BaseModel, ChangeTrackedModel, PaymentChannel
+from core.services.ledger import record_reward_payout
 
 
 class RewardStatus(models.TextChoices):
@@ -27,7 +28,7 @@ class RewardType(models.TextChoices):
     OTHER = 'OTHER', 'Other'
 
 
-class Reward(BaseModel):
+class Reward(ChangeTrackedModel, BaseModel):
     """
     Reward model for tracking payments to detectives, officers, and civilians.
     Civilians receive a unique code to claim their reward at police stations.
@@ -56,6 +57,14 @@ class Reward(BaseModel):
         verbose_name="Recipient"
     )
 
+    recipient_national_id = models.CharField(
+        max_length=10,
+        blank=True,
+        editable=False,
+        verbose_name="Recipient National ID",
+        help_text="Copy of the recipient's national ID for civilian rewards, for counter lookups"
+    )
+
     reward_type = models.CharField(
         max_length=30,
         choices=RewardType.choices,
@@ -174,26 +183,44 @@ class Reward(BaseModel):
             models.Index(fields=['case']),
             models.Index(fields=['reward_code']),
             models.Index(fields=['is_civilian_reward']),
+            models.Index(
+                fields=['recipient_national_id', 'reward_code'],
+                include=['status'],
+                condition=models.Q(is_civilian_reward=True),
+                name='reward_civilian_lookup_idx',
+            ),
         ]
 
     def __str__(self):
         return f"Reward {self.reward_code} - {self.recipient} - {self.amount}"
 
     def save(self, *args, **kwargs):
+        from rewards.services.lookup import invalidate_lookup
         if not self.reward_code:
             self.reward_code = self.generate_reward_code()
+        if self.is_civilian_reward and not self.recipient_national_id:
+            self.recipient_national_id = self.recipient.national_id
         super().save(*args, **kwargs)
+        invalidate_lookup(self)
 
     @staticmethod
     def generate_reward_code():
+        return Reward.generate_reward_codes(1)[0]
+
+    @staticmethod
+    def generate_reward_codes(count):
+        """`count` distinct unused reward codes, checked against the table one query per round."""
         from django.utils import timezone
         date_str = timezone.now().strftime('%Y%m%d')
-        random_str = get_random_string(5, allowed_chars='0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-        code = f"RWD-{date_str}-{random_str}"
-        while Reward.objects.filter(reward_code=code).exists():
-            random_str = get_random_string(5, allowed_chars='0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ')
-            code = f"RWD-{date_str}-{random_str}"
-        return code
+        codes = set()
+        while len(codes) < count:
+            candidates = {
+                f"RWD-{date_str}-{get_random_string(5, allowed_chars='0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ')}"
+                for _ in range(count - len(codes))
+            } - codes
+            taken = set(Reward.objects.filter(reward_code__in=candidates).values_list('reward_code', flat=True))
+            codes |= candidates - taken
+        return list(codes)
 
     def clean(self):
         if self.status == RewardStatus.REJECTED and not self.rejection_reason:
@@ -245,12 +272,14 @@ class Reward(BaseModel):
             raise ValidationError('Reward must be in READY_FOR_PAYMENT status.')
         if not verified:
             raise ValidationError('National ID verification is required.')
-        self.claimed_at_station = station_name
-        self.claimed_date = timezone.now()
-        self.verified_by_national_id = verified
-        self.status = RewardStatus.PAID
-        self.payment_date = timezone.now()
-        self.save()
+        with transaction.atomic():
+            self.claimed_at_station = station_name
+            self.claimed_date = timezone.now()
+            self.verified_by_national_id = verified
+            self.status = RewardStatus.PAID
+            self.payment_date = timezone.now()
+            self.save()
+            record_reward_payout(self, PaymentChannel.STATION)
 
     def mark_as_paid(self, payment_reference='', station_name=''):
         from django.utils import timezone
@@ -258,12 +287,14 @@ class Reward(BaseModel):
             raise ValidationError('Use claim_by_civilian() method for civilian rewards.')
         if self.status not in [RewardStatus.APPROVED, RewardStatus.READY_FOR_PAYMENT]:
             raise ValidationError('Only approved rewards can be marked as paid.')
-        self.status = RewardStatus.PAID
-        self.payment_date = timezone.now()
-        self.payment_reference = payment_reference
-        if station_name:
-            self.claimed_at_station = station_name
-        self.save()
+        with transaction.atomic():
+            self.status = RewardStatus.PAID
+            self.payment_date = timezone.now()
+            self.payment_reference = payment_reference
+            if station_name:
+                self.claimed_at_station = station_name
+            self.save()
+            record_reward_payout(self, PaymentChannel.GATEWAY, payment_reference)
 
     def reject(self, reason):
         self.status = RewardStatus.REJECTED
@@ -351,24 +382,10 @@ class TeamReward(BaseModel):
             raise ValidationError('Only approved team rewards can be distributed.')
         if self.distribution_completed:
             raise ValidationError('Team reward has already been distributed.')
-        team_members = list(self.case.team_members.all())
-        if self.case.assigned_detective:
-            team_members.append(self.case.assigned_detective)
-        if not team_members:
+        from rewards.services.distribution import distribute
+        result = distribute([self])
+        if self.pk in result.skipped:
             raise ValidationError('No team members to distribute reward to.')
-        per_member_amount = self.total_amount / len(team_members)
-        for member in team_members:
-            Reward.objects.create(
-                case=self.case,
-                recipient=member,
-                reward_type=RewardType.TEAM_BONUS,
-                amount=per_member_amount,
-                status=RewardStatus.APPROVED,
-                description=f"Team reward distribution from case {self.case.case_number}",
-                approved_by=self.approved_by,
-                approved_date=self.approved_date,
-                is_civilian_reward=False
-            )
         self.distribution_completed = True
         self.status = RewardStatus.PAID
-        self.save()
+        return result.rewards
@@ -2,6 +2,10 @@ from rest_framework import serializers
 
 from rewards.models import Reward, RewardStatus, RewardType
 from cases.models import Case
+from core.fieldsets import SKIP, full_name
+
+# Statuses in which the reward code is shown to the recipient and the police.
+CLAIMABLE = (RewardStatus.READY_FOR_PAYMENT, RewardStatus.PAID)
 
 
 class RewardCreateSerializer(serializers.ModelSerializer):
@@ -52,6 +56,16 @@ class RewardListSerializer(serializers.ModelSerializer):
             'is_civilian_reward',
             'created_at',
         ]
+        projection = {
+            'recipient_name': (('recipient__first_name', 'recipient__last_name'), full_name),
+            'reward_code': (('reward_code', 'status'), lambda code, status: code if status in CLAIMABLE else SKIP),
+        }
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if instance.status not in CLAIMABLE:
+            data.pop('reward_code', None)
+        return data
 
 
 class RewardDetailSerializer(serializers.ModelSerializer):
@@ -0,0 +1,9 @@
+from .distribution import allocate, distribute, pay_out_batch, pay_out_rewards, requeue_failed_payouts
+
+__all__ = [
+    'allocate',
+    'distribute',
+    'pay_out_batch',
+    'pay_out_rewards',
+    'requeue_failed_payouts',
+]
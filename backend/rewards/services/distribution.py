@@ -0,0 +1,232 @@
+"""
+Team reward distribution and the reward payout batch.
+
+`distribute` takes any number of approved team rewards and, in one transaction and a
+constant number of queries, splits each total among its case's team (team members plus the
+assigned detective) to the cent, creates the member `Reward`s with pre-allocated codes,
+accrues them in the ledger, and queues one PENDING outgoing `Payment` per reward. Those
+payments are the payout batch: `pay_out_batch` claims them in id order (SKIP LOCKED), sends
+them through the gateway concurrently outside any transaction, marks the paid rewards PAID
+and re-queues the refused payouts for a later run.
+
+Amounts are split with the largest remainder method: everyone gets the floor of their share
+in cents and the cents left over go to the largest fractional remainders (ties to the
+earlier member), so the parts always add up to the total exactly.
+"""
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from cases.models import Case
+from core.models import ChangeOp, Payment, PaymentChannel, PaymentDirection, PaymentPurpose, PaymentStatus
+from core.services.changes import record_changes
+from core.services.gateway import get_gateway_client
+from core.services.ledger import record_reward_accruals, record_reward_payouts
+from rewards.models import Reward, RewardStatus, RewardType, TeamReward
+
+CENT = Decimal('0.01')
+PAYOUT_BATCH_SIZE = 200
+PAYOUT_MAX_ATTEMPTS = 5
+PAYOUT_CLAIM_TIMEOUT = timedelta(minutes=15)
+
+Distribution = namedtuple('Distribution', ['distributed', 'skipped', 'rewards', 'payouts'])
+PayoutResult = namedtuple('PayoutResult', ['paid', 'failed', 'requeued'])
+
+
+def allocate(total, weights):
+    """Split `total` in proportion to integer `weights`, to the cent; the parts sum to `total`."""
+    cents = int(Decimal(total).quantize(CENT) / CENT)
+    weight_sum = sum(weights)
+    shares = [cents * weight // weight_sum for weight in weights]
+    remainders = [cents * weight % weight_sum for weight in weights]
+    for i in sorted(range(len(weights)), key=lambda i: -remainders[i])[:cents - sum(shares)]:
+        shares[i] += 1
+    return [share * CENT for share in shares]
+
+
+def team_members(cases):
+    """{case_id: [user_id, ...]}: team members by id, then the assigned detective, without repeats."""
+    members = defaultdict(list)
+    rows = Case.objects.filter(pk__in=[case.pk for case in cases], team_members__isnull=False)
+    for case_id, user_id in rows.order_by('pk', 'team_members').values_list('pk', 'team_members'):
+        members[case_id].append(user_id)
+    for case in cases:
+        if case.assigned_detective_id:
+            members[case.pk].append(case.assigned_detective_id)
+    return {case_id: list(dict.fromkeys(users)) for case_id, users in members.items()}
+
+
+def distribute(team_rewards):
+    """
+    Distribute the approved, undistributed ones among `team_rewards` (model instances or ids).
+    Team rewards whose case has no team are left untouched and reported as skipped.
+    """
+    ids = [getattr(team_reward, 'pk', team_reward) for team_reward in team_rewards]
+    with transaction.atomic():
+        locked = list(
+            TeamReward.objects.select_for_update(of=('self',)).select_related('case')
+            .filter(pk__in=ids, status=RewardStatus.APPROVED, distribution_completed=False).order_by('id')
+        )
+        members = team_members([team_reward.case for team_reward in locked])
+        distributed = [team_reward for team_reward in locked if members.get(team_reward.case_id)]
+        skipped = [team_reward.pk for team_reward in locked if not members.get(team_reward.case_id)]
+        if not distributed:
+            return Distribution(0, skipped, [], [])
+
+        shares = [
+            (team_reward, recipient, amount)
+            for team_reward in distributed
+            for recipient, amount in zip(
+                members[team_reward.case_id],
+                allocate(team_reward.total_amount, [1] * len(members[team_reward.case_id])),
+            )
+        ]
+        rewards = Reward.objects.bulk_create([
+            Reward(
+                reward_code=code,
+                case_id=team_reward.case_id,
+                recipient_id=recipient,
+                reward_type=RewardType.TEAM_BONUS,
+                amount=amount,
+                status=RewardStatus.APPROVED,
+                description=f"Team reward distribution from case {team_reward.case.case_number}",
+                approved_by_id=team_reward.approved_by_id,
+                approved_date=team_reward.approved_date,
+                is_civilian_reward=False,
+            )
+            for code, (team_reward, recipient, amount) in zip(Reward.generate_reward_codes(len(shares)), shares)
+        ])
+        record_changes(Reward, [reward.pk for reward in rewards], ChangeOp.INSERT)
+        record_reward_accruals(rewards)
+        payouts = Payment.objects.bulk_create([
+            Payment(
+                idempotency_key=f'reward:{reward.pk}', direction=PaymentDirection.OUT,
+                channel=PaymentChannel.GATEWAY, purpose=PaymentPurpose.REWARD, amount=reward.amount, source=reward,
+            )
+            for reward in rewards
+        ])
+
+        now = timezone.now()
+        for team_reward in distributed:
+            team_reward.distribution_completed = True
+            team_reward.status = RewardStatus.PAID
+            team_reward.updated_at = now
+        TeamReward.objects.bulk_update(distributed, ['distribution_completed', 'status', 'updated_at'])
+    return Distribution(len(distributed), skipped, rewards, payouts)
+
+
+def _queued_payouts(before):
+    claimable = Q(status=PaymentStatus.PENDING, updated_at__lt=before) | Q(
+        status=PaymentStatus.PROCESSING, updated_at__lt=timezone.now() - PAYOUT_CLAIM_TIMEOUT,
+    )
+    return Payment.objects.filter(
+        claimable, direction=PaymentDirection.OUT, purpose=PaymentPurpose.REWARD, channel=PaymentChannel.GATEWAY,
+    )
+
+
+def _claim_payouts(batch_size, before):
+    with transaction.atomic():
+        payments = list(_queued_payouts(before).select_for_update(skip_locked=True).order_by('id')[:batch_size])
+        if not payments:
+            return None, []
+        payable_ids = set(
+            Reward.objects.filter(pk__in=[payment.object_id for payment in payments], status=RewardStatus.APPROVED)
+            .values_list('pk', flat=True)
+        )
+        now = timezone.now()
+        claimed, failed = [], []
+        for payment in payments:
+            payment.updated_at = now
+            if payment.object_id in payable_ids:
+                payment.status = PaymentStatus.PROCESSING
+                payment.attempts += 1
+                claimed.append(payment)
+            else:
+                payment.status = PaymentStatus.FAILED
+                payment.failure_reason = 'Reward is no longer payable.'
+                failed.append(payment)
+        Payment.objects.bulk_update(payments, ['status', 'attempts', 'failure_reason', 'updated_at'])
+    return claimed, failed
+
+
+def _record_payouts(payments, results):
+    with transaction.atomic():
+        rewards = Reward.objects.select_for_update().in_bulk([payment.object_id for payment in payments])
+        now = timezone.now()
+        paid, references, requeued, failed = [], {}, [], []
+        for payment, result in zip(payments, results):
+            reward = rewards.get(payment.object_id)
+            if result.ok and reward is not None:
+                # The money has left: a reward cancelled while the call was out is paid all the same.
+                reward.status = RewardStatus.PAID
+                reward.payment_date = now
+                reward.payment_reference = result.reference
+                reward.updated_at = now
+                paid.append(reward)
+                references[reward.pk] = result.reference
+                continue
+            payment.failure_reason = (result.error or 'Reward is no longer payable.')[:255]
+            payment.gateway_reference = result.reference or ''
+            payment.updated_at = now
+            if result.ok or reward is None or reward.status != RewardStatus.APPROVED or payment.attempts >= PAYOUT_MAX_ATTEMPTS:
+                payment.status = PaymentStatus.FAILED
+                failed.append(payment)
+            else:
+                payment.status = PaymentStatus.PENDING
+                requeued.append(payment)
+
+        Reward.objects.bulk_update(paid, ['status', 'payment_date', 'payment_reference', 'updated_at'])
+        record_changes(Reward, [reward.pk for reward in paid], ChangeOp.UPDATE,
+                       ['status', 'payment_date', 'payment_reference'])
+        record_reward_payouts(paid, references)
+        Payment.objects.bulk_update(requeued + failed, ['status', 'failure_reason', 'gateway_reference', 'updated_at'])
+    return paid, requeued, failed
+
+
+def pay_out_batch(batch_size=PAYOUT_BATCH_SIZE, before=None):
+    """
+    Pay up to `batch_size` queued reward payouts through the gateway; None when none are queued.
+
+    The payouts are claimed (PROCESSING) and committed before the gateway is called, so no
+    lock is held while the calls are out, and the results are recorded in a second
+    transaction. A payout the gateway refused goes back to PENDING until it has had
+    PAYOUT_MAX_ATTEMPTS attempts, then FAILED. Only payouts queued before `before` (default:
+    now) are taken, so a run does not retry what it has just re-queued. A claim left
+    PROCESSING by a worker that died is taken again after PAYOUT_CLAIM_TIMEOUT; the gateway
+    deduplicates on the idempotency key, so the resend cannot pay twice.
+    """
+    claimed, failed = _claim_payouts(batch_size, before or timezone.now())
+    if claimed is None:
+        return None
+    results = get_gateway_client().call_many([
+        ('payout', payment.amount, payment.idempotency_key) for payment in claimed
+    ]) if claimed else []
+    paid, requeued, refused = _record_payouts(claimed, results)
+    return PayoutResult(len(paid), len(failed) + len(refused), len(requeued))
+
+
+def requeue_failed_payouts():
+    """Put FAILED reward payouts whose reward is still approved back in the queue; returns how many."""
+    approved = Reward.objects.filter(status=RewardStatus.APPROVED).values('pk')
+    return Payment.objects.filter(
+        status=PaymentStatus.FAILED, direction=PaymentDirection.OUT, purpose=PaymentPurpose.REWARD,
+        channel=PaymentChannel.GATEWAY, object_id__in=approved,
+    ).update(status=PaymentStatus.PENDING, attempts=0, failure_reason='', updated_at=timezone.now())
+
+
+def pay_out_rewards(batch_size=PAYOUT_BATCH_SIZE, max_batches=None):
+    """Pay batches until none are queued (or `max_batches` ran); returns the summed PayoutResult."""
+    total = PayoutResult(0, 0, 0)
+    batches = 0
+    started = timezone.now()
+    while max_batches is None or batches < max_batches:
+        result = pay_out_batch(batch_size, before=started)
+        if result is None:
+            break
+        total = PayoutResult(*(a + b for a, b in zip(total, result)))
+        batches += 1
+    return total
@@ -0,0 +1,62 @@
+"""
+Counter lookups of civilian rewards by (national ID, reward code).
+
+Rewards carry a copy of the recipient's national ID, and a covering partial index on
+(recipient_national_id, reward_code) over civilian rewards lets the lookup resolve with one
+index probe and no join to users. The serialized result is cached for a short time under
+the (national ID, code) pair; `Reward.save` drops the entry, so a status change (approval,
+claim) is visible at the next lookup. Misses are not cached: they count towards the
+officer's failure limit, and that of the station on the officer's profile, instead; an
+identity over the limit gets 429 until its window ends. Both the entries and the counters
+live in the default cache, which is shared by all workers when REDIS_URL is set
+(config.settings.CACHES).
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from core.cache import cache_key
+from core.ratelimit import FailureLimiter
+from rewards.models import Reward
+from rewards.serializers.reward import RewardLookupSerializer
+
+DEFAULT_LOOKUP = {
+    'CACHE_TIMEOUT': 60,
+    'MAX_FAILURES': 20,
+    'FAILURE_WINDOW': 300,
+}
+
+
+def _config():
+    return {**DEFAULT_LOOKUP, **getattr(settings, 'REWARD_LOOKUP', {})}
+
+
+def lookup_key(national_id, reward_code):
+    return cache_key('reward-lookup', national_id, reward_code)
+
+
+def get_limiter():
+    config = _config()
+    return FailureLimiter('reward-lookup-failures', config['MAX_FAILURES'], config['FAILURE_WINDOW'])
+
+
+def find_civilian_reward(national_id, reward_code):
+    """Lookup payload for the civilian reward with this national ID and code, or None."""
+    key = lookup_key(national_id, reward_code)
+    data = cache.get(key)
+    if data is not None:
+        return data
+    reward = next(iter(
+        Reward.objects.filter(
+            is_civilian_reward=True, recipient_national_id=national_id, reward_code=reward_code,
+        ).select_related('case', 'recipient').order_by()[:1]
+    ), None)
+    if reward is None:
+        return None
+    data = dict(RewardLookupSerializer(reward).data)
+    cache.set(key, data, _config()['CACHE_TIMEOUT'])
+    return data
+
+
+def invalidate_lookup(reward):
+    if reward.recipient_national_id:
+        cache.delete(lookup_key(reward.recipient_national_id, reward.reward_code))
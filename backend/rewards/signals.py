@@ -0,0 +1,20 @@
+def sync_recipient_national_id(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the national ID copied onto civilian rewards in step with the user's."""
+    from django.db import transaction
+    from core.models import ChangeOp
+    from core.services.changes import record_changes
+    from rewards.models import Reward
+    from rewards.services.lookup import invalidate_lookup
+    if created or (update_fields is not None and 'national_id' not in update_fields):
+        return
+    stale = list(
+        Reward.objects.filter(recipient=instance, is_civilian_reward=True)
+        .exclude(recipient_national_id=instance.national_id)
+    )
+    for reward in stale:
+        invalidate_lookup(reward)
+    if stale:
+        ids = [reward.pk for reward in stale]
+        with transaction.atomic():
+            Reward.objects.filter(pk__in=ids).update(recipient_national_id=instance.national_id)
+            record_changes(Reward, ids, ChangeOp.UPDATE, ['recipient_national_id'])
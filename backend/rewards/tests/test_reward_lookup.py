@@ -0,0 +1,91 @@
+"""
+Counter lookups of civilian rewards: the denormalized national ID, the short-lived cache and
+its invalidation on status change, and the per-station limit on failed lookups.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from accounts.models import Role
+from rewards.models import Reward, RewardStatus
+
+User = get_user_model()
+
+LOOKUP_URL = '/api/v1/rewards/lookups/'
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class RewardLookupTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.civilian = make_user('civilian_lookup')
+        self.officer = make_user('officer_lookup', station='Central')
+        self.officer.roles.add(Role.objects.get_or_create(name='Police Officer')[0])
+        self.reward = Reward.objects.create(
+            recipient=self.civilian, information_submitted='Tip', status=RewardStatus.READY_FOR_PAYMENT,
+            is_civilian_reward=True, amount=5000, approved_by=self.officer,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.officer)
+
+    def lookup(self, national_id=None, reward_code=None, **params):
+        return self.client.get(LOOKUP_URL, {
+            'national_id': national_id or self.civilian.national_id,
+            'reward_code': reward_code or self.reward.reward_code,
+            **params,
+        })
+
+    def test_national_id_is_copied_and_kept_in_sync(self):
+        self.assertEqual(self.reward.recipient_national_id, self.civilian.national_id)
+        self.civilian.national_id = '9990001112'
+        self.civilian.save()
+        self.reward.refresh_from_db()
+        self.assertEqual(self.reward.recipient_national_id, '9990001112')
+        self.assertEqual(self.lookup('9990001112').status_code, status.HTTP_200_OK)
+
+    def test_hit_is_cached_until_status_changes(self):
+        resp = self.lookup()
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.data['data']['is_ready_for_claim'])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.lookup().status_code, status.HTTP_200_OK)
+
+        self.reward.claim_by_civilian('Central')
+        resp = self.lookup()
+        self.assertEqual(resp.data['data']['status'], RewardStatus.PAID)
+        self.assertFalse(resp.data['data']['is_ready_for_claim'])
+
+    @override_settings(REWARD_LOOKUP={'MAX_FAILURES': 3, 'FAILURE_WINDOW': 60})
+    def test_failed_lookups_are_limited_per_station(self):
+        for _ in range(3):
+            self.assertEqual(self.lookup(reward_code='RWD-00000000-XXXXX').status_code, status.HTTP_404_NOT_FOUND)
+        resp = self.lookup()
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', resp)
+
+        # The station is the officer's own, not a parameter the client can change.
+        other = make_user('officer_lookup_other', station='central ')
+        other.roles.add(Role.objects.get_or_create(name='Police Officer')[0])
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.lookup(station='North').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        other.station = 'North'
+        other.save()
+        self.assertEqual(self.lookup().status_code, status.HTTP_200_OK)
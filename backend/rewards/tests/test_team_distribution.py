@@ -0,0 +1,145 @@
+"""
+Team reward distribution: exact largest-remainder splits, bulk distribution of many team
+rewards in a constant number of queries, and the reward payout batch.
+"""
+from decimal import Decimal
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from cases.models import Case, CaseStatus, CasePriority
+from core.models import Payment, PaymentStatus
+from core.services.gateway import GatewayClient, SimulatedGateway, reset_gateway_client
+from core.services.ledger import ACCOUNTS, GATEWAY_CLEARING, REWARDS_PAYABLE, account_ids, balances
+from rewards.models import Reward, RewardStatus, TeamReward
+from rewards.services.distribution import (
+    PAYOUT_MAX_ATTEMPTS, allocate, distribute, pay_out_rewards, requeue_failed_payouts,
+)
+
+User = get_user_model()
+
+
+def make_user(username, **kwargs):
+    h = abs(hash(username)) % 10**12
+    defaults = dict(
+        username=username,
+        email=f'{username}@test.com',
+        phone_number=f'09{h:013d}'[:15],
+        national_id=f'{h:010d}'[:10],
+        first_name='First',
+        last_name='Last',
+        password='TestPass123!',
+    )
+    defaults.update(kwargs)
+    return User.objects.create_user(**defaults)
+
+
+class AllocateTestCase(TestCase):
+
+    def test_parts_sum_to_total(self):
+        self.assertEqual(allocate(Decimal('100'), [1, 1, 1]), [Decimal('33.34'), Decimal('33.33'), Decimal('33.33')])
+        self.assertEqual(allocate(Decimal('0.05'), [1] * 7), [Decimal('0.01')] * 5 + [Decimal('0.00')] * 2)
+        self.assertEqual(allocate(Decimal('10'), [1, 2]), [Decimal('3.33'), Decimal('6.67')])
+        for total in ('1000.01', '7', '123456.78'):
+            self.assertEqual(sum(allocate(Decimal(total), [3, 1, 4, 1, 5])), Decimal(total))
+
+
+class TeamDistributionTestCase(TestCase):
+
+    def setUp(self):
+        self.approver = make_user('chief_distribution')
+        self.members = [make_user(f'officer_distribution_{i}') for i in range(3)]
+        self.count = 0
+
+    def make_team_reward(self, total='100', members=2, detective=True):
+        self.count += 1
+        case = Case.objects.create(
+            title=f'Team case {self.count}', description='D', incident_date=timezone.now(), incident_location='L',
+            status=CaseStatus.SOLVED, priority=CasePriority.LEVEL2,
+            assigned_detective=self.members[0] if detective else None,
+        )
+        case.team_members.set(self.members[:members])
+        return TeamReward.objects.create(
+            case=case, total_amount=Decimal(total), status=RewardStatus.APPROVED,
+            approved_by=self.approver, approved_date=timezone.now(),
+        )
+
+    def test_distribute_to_team_splits_exactly(self):
+        team_reward = self.make_team_reward('100', members=3)
+        rewards = team_reward.distribute_to_team()
+        self.assertEqual(sorted(r.amount for r in rewards), [Decimal('33.33'), Decimal('33.33'), Decimal('33.34')])
+        self.assertEqual(len({r.reward_code for r in rewards}), 3)
+        team_reward.refresh_from_db()
+        self.assertTrue(team_reward.distribution_completed)
+        self.assertEqual(team_reward.status, RewardStatus.PAID)
+        self.assertEqual(balances()[REWARDS_PAYABLE], Decimal('-100'))
+        self.assertEqual(
+            Payment.objects.filter(status=PaymentStatus.PENDING).aggregate(total=Sum('amount'))['total'],
+            Decimal('100'),
+        )
+        with self.assertRaises(ValidationError):
+            team_reward.distribute_to_team()
+
+    def test_team_without_members_is_skipped(self):
+        team_reward = self.make_team_reward(members=0, detective=False)
+        with self.assertRaises(ValidationError):
+            team_reward.distribute_to_team()
+        self.assertFalse(Reward.objects.exists())
+        self.assertEqual(distribute([team_reward]).skipped, [team_reward.pk])
+
+    def test_query_count_does_not_grow_with_team_rewards(self):
+        account_ids(list(ACCOUNTS))
+
+        def run(n):
+            team_rewards = [self.make_team_reward(f'{100 + i}.01', members=3) for i in range(n)]
+            with self.assertNumQueries(15):
+                result = distribute(team_rewards)
+            self.assertEqual((result.distributed, len(result.rewards)), (n, 3 * n))
+        run(2)
+        run(30)
+
+    def test_payout_batch(self):
+        reset_gateway_client(GatewayClient(SimulatedGateway(latency=0, seed=3)))
+        self.addCleanup(reset_gateway_client)
+        distribute([self.make_team_reward('90'), self.make_team_reward('10')])
+        cancelled = Reward.objects.order_by('id').last()
+        cancelled.cancel()
+
+        result = pay_out_rewards(batch_size=2)
+        self.assertEqual(tuple(result), (3, 1, 0))
+        self.assertEqual(Reward.objects.filter(status=RewardStatus.PAID).count(), 3)
+        self.assertFalse(Payment.objects.filter(status=PaymentStatus.PENDING).exists())
+        self.assertEqual(balances()[GATEWAY_CLEARING], -(Decimal('100') - cancelled.amount))
+        self.assertEqual(tuple(pay_out_rewards()), (0, 0, 0))
+
+    def test_refused_payouts_are_retried_on_later_runs(self):
+        gateway = SimulatedGateway(latency=0, failure_rate=1.0)
+        reset_gateway_client(GatewayClient(gateway, retries=0))
+        self.addCleanup(reset_gateway_client)
+        distribute([self.make_team_reward('90')])
+
+        for attempt in range(1, PAYOUT_MAX_ATTEMPTS):
+            self.assertEqual(tuple(pay_out_rewards()), (0, 0, 2))
+            self.assertEqual(set(Payment.objects.values_list('status', 'attempts')), {(PaymentStatus.PENDING, attempt)})
+        self.assertEqual(tuple(pay_out_rewards()), (0, 2, 0))
+        self.assertEqual(set(Payment.objects.values_list('status', flat=True)), {PaymentStatus.FAILED})
+
+        gateway.failure_rate = 0.0
+        self.assertEqual(requeue_failed_payouts(), 2)
+        self.assertEqual(tuple(pay_out_rewards()), (2, 0, 0))
+        self.assertEqual(Reward.objects.filter(status=RewardStatus.PAID).count(), 2)
+
+    def test_command(self):
+        reset_gateway_client(GatewayClient(SimulatedGateway(latency=0)))
+        self.addCleanup(reset_gateway_client)
+        for _ in range(3):
+            self.make_team_reward()
+        out = StringIO()
+        call_command('distribute_team_rewards', chunk_size=2, pay=True, stdout=out)
+        self.assertIn('Distributed 3 team rewards into 6 rewards', out.getvalue())
+        self.assertIn('Paid 6 rewards', out.getvalue())
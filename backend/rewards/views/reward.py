@@ -18,10 +18,13 @@ from rewards.serializers.reward import (
     DetectiveReviewSerializer,
     RewardClaimSerializer,
 )
+from rewards.services.lookup import find_civilian_reward, get_limiter
+from core.fieldsets import SparseFieldsetMixin
+from core.streaming import stream_json, wants_stream
 from accounts.permissions import IsOfficer, IsDetective, IsCadetOrOfficer
 
 
-class RewardViewSet(viewsets.ModelViewSet):
+class RewardViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Reward.objects.select_related(
         'case', 'recipient', 'officer_reviewed_by', 'approved_by'
     ).order_by('-created_at')
@@ -111,12 +114,9 @@ class RewardViewSet(viewsets.ModelViewSet):
         return Response({'status': 'success', 'data': data})
 
     def list(self, request, *args, **kwargs):
-        qs = self.get_queryset()
-        serializer = RewardListSerializer(qs, many=True)
-        for item in serializer.data:
-            if item.get('status') not in (RewardStatus.READY_FOR_PAYMENT, RewardStatus.PAID):
-                item.pop('reward_code', None)
-        return Response({'status': 'success', 'data': serializer.data})
+        if wants_stream(request):
+            return stream_json(self.iter_list(self.get_queryset()))
+        return Response({'status': 'success', 'data': self.serialize_list(self.get_queryset())})
 
     @action(detail=True, methods=['post'], url_path='officer-reviews')
     def officer_reviews(self, request, pk=None):
@@ -229,19 +229,25 @@ class RewardViewSet(viewsets.ModelViewSet):
                 {'status': 'error', 'message': 'national_id and reward_code are required.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        reward = Reward.objects.filter(
-            is_civilian_reward=True,
-            recipient__national_id=national_id,
-            reward_code=reward_code.strip()
-        ).select_related('case', 'recipient').first()
-        if not reward:
+        station = request.user.station.strip().lower()
+        identities = [f'user:{request.user.pk}'] + ([f'station:{station}'] if station else [])
+        limiter = get_limiter()
+        if limiter.blocked(identities):
+            return Response(
+                {'status': 'error', 'message': 'Too many failed lookups. Try again later.'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(limiter.retry_after())},
+            )
+        data = find_civilian_reward(national_id.strip(), reward_code.strip())
+        if data is None:
+            limiter.fail(identities)
             return Response(
                 {'status': 'error', 'message': 'No reward found for this national ID and code.'},
                 status=status.HTTP_404_NOT_FOUND
             )
         return Response({
             'status': 'success',
-            'data': RewardLookupSerializer(reward).data,
+            'data': data,
         })
 
     @action(detail=True, methods=['post'], url_path='claim-payment')